@@ -0,0 +1,149 @@
+"""One interface over marshmallow schemas and pydantic models.
+
+Batch helpers (streaming, parallel validation, ...) work with either library;
+``adapt`` wraps the schema or model so they only need ``load_many``/``load_one``
+and a way to turn per-record failures back into the library's own error.
+"""
+
+import typing
+
+import marshmallow
+import pydantic
+from marshmallow.decorators import POST_DUMP, PRE_DUMP
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.json import pydantic_encoder
+from pydantic.tools import _get_parsing_type
+
+
+class SchemaAdapter:
+    error_class = marshmallow.ValidationError
+
+    def __init__(self, schema: marshmallow.Schema):
+        self.schema = schema
+
+    def load_many(self, records: list) -> list:
+        return self.schema.load(records, many=True)
+
+    def load_one(self, record: typing.Any) -> typing.Any:
+        return self.schema.load(record, many=False)
+
+    def messages(self, error: marshmallow.ValidationError) -> typing.Any:
+        return error.messages
+
+    def many_error(
+        self, errors: dict[int, marshmallow.ValidationError]
+    ) -> marshmallow.ValidationError:
+        """Error as ``load(many=True)`` reports it, keyed by record index."""
+        return marshmallow.ValidationError(
+            {index: error.messages for index, error in errors.items()}
+        )
+
+    def dump_item(self, obj: typing.Any) -> typing.Any:
+        """One item exactly as it appears inside ``dump(objs, many=True)``.
+
+        Only the per-item hooks run; ``pass_many`` hooks see the whole
+        collection and are left to ``many_template``.
+        """
+        schema = self.schema
+        processed = obj
+        if schema._hooks[PRE_DUMP]:
+            processed = schema._invoke_processors(
+                PRE_DUMP, pass_many=False, data=[obj], many=True, original_data=[obj]
+            )[0]
+        result = schema._serialize(processed, many=False)
+        if schema._hooks[POST_DUMP]:
+            result = schema._invoke_processors(
+                POST_DUMP,
+                pass_many=False,
+                data=[result],
+                many=True,
+                original_data=[obj],
+            )[0]
+        return result
+
+    def dumps_item(self, obj: typing.Any) -> str:
+        return self.render(self.dump_item(obj))
+
+    def many_template(self) -> typing.Any:
+        """``dump([], many=True)``: the envelope the items are written into."""
+        schema = self.schema
+        if any(hook_many for _, hook_many, _ in schema._hooks[PRE_DUMP]):
+            raise ValueError("pre_dump(pass_many=True) hooks need the whole collection")
+        return schema._invoke_processors(
+            POST_DUMP, pass_many=True, data=[], many=True, original_data=[]
+        )
+
+    def render(self, data: typing.Any) -> str:
+        return self.schema.opts.render_module.dumps(data)
+
+
+class ModelAdapter:
+    error_class = pydantic.ValidationError
+
+    def __init__(self, model: type[pydantic.BaseModel]):
+        self.model = model
+
+    def load_many(self, records: list) -> list:
+        return pydantic.parse_obj_as(list[self.model], records)
+
+    def load_one(self, record: typing.Any) -> pydantic.BaseModel:
+        return self.model.parse_obj(record)
+
+    def messages(self, error: pydantic.ValidationError) -> list[dict]:
+        return error.errors()
+
+    def many_error(
+        self, errors: dict[int, pydantic.ValidationError]
+    ) -> pydantic.ValidationError:
+        """Error as ``parse_obj_as(list[Model], ...)`` reports it."""
+        return pydantic.ValidationError(
+            [
+                ErrorWrapper(error, loc=("__root__", index))
+                for index, error in errors.items()
+            ],
+            _get_parsing_type(list[self.model]),
+        )
+
+    def _coerce(self, obj: typing.Any) -> pydantic.BaseModel:
+        if isinstance(obj, self.model):
+            return obj
+        if self.model.__config__.orm_mode and not isinstance(obj, dict):
+            return self.model.from_orm(obj)
+        return self.model.parse_obj(obj)
+
+    def dump_item(self, obj: typing.Any) -> dict:
+        return self._coerce(obj).dict()
+
+    def dumps_item(self, obj: typing.Any) -> str:
+        return self._coerce(obj).json()
+
+    def many_template(self) -> list:
+        return []
+
+    def render(self, data: typing.Any) -> str:
+        return self.model.__config__.json_dumps(data, default=pydantic_encoder)
+
+
+Adapter = SchemaAdapter | ModelAdapter
+
+
+def adapt(
+    target: (
+        marshmallow.Schema
+        | type[marshmallow.Schema]
+        | type[pydantic.BaseModel]
+        | Adapter
+    ),
+) -> Adapter:
+    """Wrap a schema (instance or class) or a model class."""
+    if isinstance(target, (SchemaAdapter, ModelAdapter)):
+        return target
+    if isinstance(target, marshmallow.Schema):
+        return SchemaAdapter(target)
+    if isinstance(target, type) and issubclass(target, marshmallow.Schema):
+        return SchemaAdapter(target())
+    if isinstance(target, type) and issubclass(target, pydantic.BaseModel):
+        return ModelAdapter(target)
+    raise TypeError(
+        f"expected a marshmallow schema or a pydantic model, got {target!r}"
+    )
@@ -0,0 +1,730 @@
+"""Validators that await I/O: ``await schema.aload(data)``, ``await Model.avalidate(data)``.
+
+A validator that checks a store (does this SKU exist, is this username taken)
+blocks the event loop when it runs inside ``load``. With ``AsyncSchema`` and
+``AsyncModel`` such validators are written as ``async def`` with the usual
+decorators and awaited:
+
+    class ItemSchema(AsyncSchema):
+        sku = fields.Str(validate=sku_exists)          # async def sku_exists(value)
+        quantity = fields.Integer(validate=validate_quantity)
+
+        @validates_schema
+        async def in_stock(self, data, **kwargs):
+            ...
+
+    items = await ItemSchema(many=True).aload(records, concurrency=20)
+
+    class UserModel(AsyncModel):
+        username: str
+
+        @validator("username")
+        async def username_free(cls, v):
+            ...
+
+    user = await UserModel.avalidate(data)
+    users = await UserModel.avalidate_many(records)
+
+Synchronous validation runs first, as ``load``/``parse_obj`` would; then the
+async field validators of every record run concurrently, at most
+``concurrency`` at a time; then the async schema/root validators. Errors are
+reported in the library's own format. Within one call, a field validator that
+only takes the value is awaited once per distinct value, so a ``many=True``
+load of 10k records with 300 SKUs makes 300 lookups. ``BatchLoader`` goes
+further and turns the lookups that are in flight together into one
+``get_many`` call.
+
+``load()`` (and ``parse_obj``) on a class with async validators raises
+``TypeError``: the async validators would be skipped.
+"""
+
+import asyncio
+import functools
+import inspect
+import typing
+from collections import defaultdict
+from types import SimpleNamespace
+
+import marshmallow
+from marshmallow import Schema
+from marshmallow.decorators import POST_LOAD, VALIDATES, VALIDATES_SCHEMA
+from marshmallow.error_store import ErrorStore
+from marshmallow.exceptions import SCHEMA
+from marshmallow.schema import SchemaMeta
+from pydantic import BaseModel, ValidationError, validate_model
+from pydantic.class_validators import make_generic_validator
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.errors import ConfigError, MissingError
+from pydantic.utils import ROOT_KEY
+
+from app.adapters import ModelAdapter
+
+DEFAULT_CONCURRENCY = 10
+
+_PYDANTIC_ERRORS = (ValueError, TypeError, AssertionError)
+_MISSING = object()
+
+
+def _is_async(func: typing.Any) -> bool:
+    func = getattr(func, "__func__", func)
+    return inspect.iscoroutinefunction(func) or inspect.iscoroutinefunction(
+        getattr(func, "__call__", None)
+    )
+
+
+async def _gather(aws: typing.Iterable[typing.Awaitable]) -> list:
+    """``asyncio.gather`` that cancels the rest when one raises."""
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+class _Calls:
+    """The async validator calls of one ``aload``/``avalidate``."""
+
+    def __init__(self, concurrency: int):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self._semaphore = asyncio.Semaphore(concurrency)
+        # (validator, value) -> its task, for validators that only see the value
+        self._shared: dict[tuple, asyncio.Future] = {}
+
+    async def _limited(self, func: typing.Callable, args: tuple) -> typing.Any:
+        async with self._semaphore:
+            return await func(*args)
+
+    def call(
+        self, func: typing.Callable, *args: typing.Any, key: typing.Any = None
+    ) -> asyncio.Future:
+        if key is None:
+            return asyncio.ensure_future(self._limited(func, args))
+        try:
+            task = self._shared.get(key)
+        except TypeError:
+            # unhashable value
+            return asyncio.ensure_future(self._limited(func, args))
+        if task is None:
+            task = self._shared[key] = asyncio.ensure_future(self._limited(func, args))
+        return task
+
+
+class BatchLoader:
+    """Coalesce concurrent ``load(key)`` calls into ``batch_fn(keys)``.
+
+    ``batch_fn`` is an async function taking a list of distinct keys and
+    returning their results in the same order. Keys requested while a batch
+    is being collected (the same event loop iteration) go in one call; results
+    are cached per loader, so make one per ``aload``/``avalidate`` or per
+    request.
+    """
+
+    def __init__(
+        self,
+        batch_fn: typing.Callable[[list], typing.Awaitable[typing.Sequence]],
+        max_batch_size: int | None = None,
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self._futures: dict[typing.Hashable, asyncio.Future] = {}
+        self._pending: list = []
+
+    def load(self, key: typing.Hashable) -> typing.Awaitable:
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._futures[key] = loop.create_future()
+            if not self._pending:
+                loop.call_soon(self._dispatch)
+            self._pending.append(key)
+        return future
+
+    def _dispatch(self) -> None:
+        keys, self._pending = self._pending, []
+        size = self.max_batch_size or len(keys)
+        for start in range(0, len(keys), size):
+            asyncio.ensure_future(self._run(keys[start : start + size]))
+
+    async def _run(self, keys: list) -> None:
+        self.batches += 1
+        try:
+            results = await self.batch_fn(keys)
+            if len(results) != len(keys):
+                raise ValueError(
+                    f"batch_fn returned {len(results)} results for {len(keys)} keys"
+                )
+        except Exception as exc:
+            for key in keys:
+                # not cached: the next load tries again
+                future = self._futures.pop(key)
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for key, result in zip(keys, results):
+            future = self._futures[key]
+            if not future.done():
+                future.set_result(result)
+
+    def clear(self) -> None:
+        self._futures.clear()
+
+
+# marshmallow
+
+
+class AsyncSchemaMeta(SchemaMeta):
+    def resolve_hooks(cls) -> dict[str, list[tuple[str, bool, dict]]]:
+        # keep the async validators away from the synchronous _do_load
+        hooks = super().resolve_hooks()
+        cls._async_hooks = defaultdict(list)
+        for tag in (VALIDATES, VALIDATES_SCHEMA):
+            sync = []
+            for hook in hooks[tag]:
+                if _is_async(getattr(cls, hook[0])):
+                    cls._async_hooks[tag].append(hook)
+                else:
+                    sync.append(hook)
+            hooks[tag] = sync
+        return hooks
+
+
+class AsyncSchema(Schema, metaclass=AsyncSchemaMeta):
+    """``Schema`` whose ``async def`` validators run in ``aload``.
+
+    Async validators are ``validate=`` callables of the schema's fields and
+    ``@validates``/``@validates_schema`` methods.
+    """
+
+    _async_hooks: dict[str, list[tuple[str, bool, dict]]]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # field name -> its async validate= callables
+        self._async_validators: dict[str, list[typing.Callable]] = {}
+        for name, field in self.load_fields.items():
+            async_validators = [v for v in field.validators if _is_async(v)]
+            if async_validators:
+                self._async_validators[name] = async_validators
+                field.validators = [v for v in field.validators if not _is_async(v)]
+
+    @property
+    def has_async_validators(self) -> bool:
+        return bool(
+            self._async_validators
+            or self._async_hooks[VALIDATES]
+            or self._async_hooks[VALIDATES_SCHEMA]
+        )
+
+    def _check_sync(self) -> None:
+        if self.has_async_validators:
+            raise TypeError(f"{type(self).__name__} has async validators, use aload()")
+
+    def load(self, data, *, many=None, partial=None, unknown=None):
+        self._check_sync()
+        return super().load(data, many=many, partial=partial, unknown=unknown)
+
+    def validate(self, data, *, many=None, partial=None):
+        self._check_sync()
+        return super().validate(data, many=many, partial=partial)
+
+    def _data_key(self, field_name: str) -> str:
+        # as Schema._run_validator reports errors raised by schema validators
+        if field_name == SCHEMA:
+            return SCHEMA
+        field = self.fields.get(field_name) or self.declared_fields.get(field_name)
+        if field is None or field.data_key is None:
+            return field_name
+        return field.data_key
+
+    async def _validate_value(
+        self,
+        calls: _Calls,
+        field: marshmallow.fields.Field,
+        validators: list[typing.Callable],
+        value: typing.Any,
+    ) -> None:
+        # Field._validate: every validator runs, messages are collected
+        results = await _gather(
+            _outcome(calls.call(v, value, key=(v, value))) for v in validators
+        )
+        errors, kwargs = [], {}
+        for ok, result in results:
+            if ok and result is not False:
+                continue
+            error = (
+                result
+                if not ok
+                else marshmallow.ValidationError(
+                    field.error_messages["validator_failed"]
+                )
+            )
+            kwargs.update(error.kwargs)
+            if isinstance(error.messages, dict):
+                errors.append(error.messages)
+            else:
+                errors.extend(error.messages)
+        if errors:
+            raise marshmallow.ValidationError(errors, **kwargs)
+
+    async def _field_validators(
+        self, calls: _Calls, error_store: ErrorStore, items: list, many: bool
+    ) -> None:
+        checks = []  # (awaitable, item, attribute, data key, index)
+        for idx, item in enumerate(items):
+            index = idx if many and self.opts.index_errors else None
+            for name, validators in self._async_validators.items():
+                field = self.fields[name]
+                attribute = field.attribute or name
+                if attribute in item:
+                    checks.append(
+                        (
+                            self._validate_value(
+                                calls, field, validators, item[attribute]
+                            ),
+                            item,
+                            attribute,
+                            field.data_key if field.data_key is not None else name,
+                            index,
+                        )
+                    )
+            for attr_name, _, hook_kwargs in self._async_hooks[VALIDATES]:
+                name = hook_kwargs["field_name"]
+                try:
+                    field = self.fields[name]
+                except KeyError as error:
+                    if name in self.declared_fields:
+                        continue
+                    raise ValueError(f'"{name}" field does not exist.') from error
+                attribute = field.attribute or name
+                if attribute in item:
+                    validator = getattr(self, attr_name)
+                    value = item[attribute]
+                    checks.append(
+                        (
+                            calls.call(validator, value, key=(validator, value)),
+                            item,
+                            attribute,
+                            field.data_key if field.data_key is not None else name,
+                            index,
+                        )
+                    )
+        outcomes = await _gather(_outcome(check[0]) for check in checks)
+        for (_, item, attribute, data_key, index), (ok, error) in zip(checks, outcomes):
+            if not ok:
+                error_store.store_error(error.messages, data_key, index=index)
+                # as invalid values are left out of the loaded data
+                item.pop(attribute, None)
+
+    async def _schema_validators(
+        self,
+        calls: _Calls,
+        error_store: ErrorStore,
+        result: typing.Any,
+        original_data: typing.Any,
+        many: bool,
+        partial: typing.Any,
+    ) -> None:
+        field_errors = bool(error_store.errors)
+        checks = []  # (awaitable, index)
+        # pass_many validators first, as Schema._do_load runs them
+        for pass_many in (True, False):
+            for attr_name, hook_many, hook_kwargs in self._async_hooks[
+                VALIDATES_SCHEMA
+            ]:
+                if hook_many != pass_many or (
+                    field_errors and hook_kwargs["skip_on_field_errors"]
+                ):
+                    continue
+                validator = getattr(self, attr_name)
+                pass_original = hook_kwargs.get("pass_original", False)
+                if many and not pass_many:
+                    pairs = [
+                        (idx, item, original)
+                        for idx, (item, original) in enumerate(
+                            zip(result, original_data)
+                        )
+                    ]
+                else:
+                    pairs = [(None, result, original_data)]
+                for index, data, original in pairs:
+                    args = (data, original) if pass_original else (data,)
+                    call = functools.partial(validator, partial=partial, many=many)
+                    checks.append((calls.call(call, *args), index))
+        outcomes = await _gather(_outcome(check[0]) for check in checks)
+        for (_, index), (ok, error) in zip(checks, outcomes):
+            if not ok:
+                error_store.store_error(
+                    error.messages, self._data_key(error.field_name), index=index
+                )
+
+    async def aload(
+        self,
+        data: typing.Any,
+        *,
+        many: bool | None = None,
+        partial: typing.Any = None,
+        unknown: str | None = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> typing.Any:
+        """``load`` with the async validators awaited, ``concurrency`` at a time."""
+        many = self.many if many is None else bool(many)
+        if partial is None:
+            partial = self.partial
+        error_store = ErrorStore()
+        try:
+            result = self._do_load(
+                data, many=many, partial=partial, unknown=unknown, postprocess=False
+            )
+        except marshmallow.ValidationError as error:
+            if error.valid_data is None:
+                # pre_load failed, nothing to validate further
+                raise
+            result = error.valid_data
+            error_store.errors = error.normalized_messages()
+
+        calls = _Calls(concurrency)
+        items = result if many else [result]
+        if self._async_validators or self._async_hooks[VALIDATES]:
+            await self._field_validators(calls, error_store, items, many)
+        if self._async_hooks[VALIDATES_SCHEMA]:
+            await self._schema_validators(
+                calls, error_store, result, data, many, partial
+            )
+
+        errors = error_store.errors
+        if not errors and self._hooks[POST_LOAD]:
+            try:
+                result = self._invoke_load_processors(
+                    POST_LOAD, result, many=many, original_data=data, partial=partial
+                )
+            except marshmallow.ValidationError as error:
+                errors = error.normalized_messages()
+        if errors:
+            exc = marshmallow.ValidationError(errors, data=data, valid_data=result)
+            self.handle_error(exc, data, many=many, partial=partial)
+            raise exc
+        return result
+
+
+async def _outcome(aw: typing.Awaitable) -> tuple[bool, typing.Any]:
+    """(True, result), or (False, the marshmallow ValidationError raised)."""
+    try:
+        return True, await aw
+    except marshmallow.ValidationError as error:
+        return False, error
+
+
+# pydantic
+
+
+def _takes_value_only(func: typing.Callable) -> bool:
+    parameters = list(inspect.signature(func).parameters.values())[1:]
+    return len(parameters) == 1 and parameters[0].kind in (
+        parameters[0].POSITIONAL_ONLY,
+        parameters[0].POSITIONAL_OR_KEYWORD,
+    )
+
+
+def _reads_values(func: typing.Callable) -> bool:
+    parameters = inspect.signature(func).parameters.values()
+    return any(p.name == "values" or p.kind is p.VAR_KEYWORD for p in parameters)
+
+
+class _AsyncFieldValidator(typing.NamedTuple):
+    call: typing.Callable
+    # awaited once per distinct value: it does not read values/field/config
+    shared: bool
+
+
+class AsyncModel(BaseModel):
+    """``BaseModel`` whose ``async def`` validators run in ``avalidate``.
+
+    Async ``@validator``s run after the field's synchronous validation (``pre``
+    and ``each_item`` are not supported); async ``@root_validator(pre=True)``
+    before validation, async ``@root_validator``s after it. A field whose
+    validators take ``values`` and that follows a field with async validators
+    is validated once those are done, so it sees their results.
+    """
+
+    __async_validators__: typing.ClassVar[dict[str, list[_AsyncFieldValidator]]] = {}
+    __async_pre_root_validators__: typing.ClassVar[list[typing.Callable]] = []
+    __async_post_root_validators__: typing.ClassVar[
+        list[tuple[bool, typing.Callable]]
+    ] = []
+    # validated after the async field validators of the fields before them
+    __async_deferred__: typing.ClassVar[tuple[str, ...]] = ()
+    # stands in for the model in validate_model: no deferred fields, no roots
+    __async_eager__: typing.ClassVar[SimpleNamespace]
+
+    def __init_subclass__(cls, **kwargs: typing.Any) -> None:
+        super().__init_subclass__(**kwargs)
+        field_validators = {}
+        deferred = []
+        for name, field in cls.__fields__.items():
+            if field_validators and any(
+                _reads_values(v.func) for v in (field.class_validators or {}).values()
+            ):
+                deferred.append(name)
+            found = {
+                key: v
+                for key, v in (field.class_validators or {}).items()
+                if _is_async(v.func)
+            }
+            if not found:
+                continue
+            for v in found.values():
+                if v.pre or v.each_item:
+                    raise ConfigError(
+                        f"{cls.__name__}.{v.func.__name__}: async validators "
+                        "can not be pre or each_item"
+                    )
+            field.class_validators = {
+                key: v for key, v in field.class_validators.items() if key not in found
+            }
+            field.populate_validators()
+            field_validators[name] = [
+                _AsyncFieldValidator(
+                    make_generic_validator(v.func), _takes_value_only(v.func)
+                )
+                for v in found.values()
+            ]
+        cls.__async_validators__ = field_validators
+        cls.__async_deferred__ = tuple(deferred)
+        cls.__async_pre_root_validators__ = [
+            v for v in cls.__pre_root_validators__ if _is_async(v)
+        ]
+        cls.__pre_root_validators__ = [
+            v for v in cls.__pre_root_validators__ if not _is_async(v)
+        ]
+        cls.__async_post_root_validators__ = [
+            (skip, v) for skip, v in cls.__post_root_validators__ if _is_async(v)
+        ]
+        cls.__post_root_validators__ = [
+            (skip, v) for skip, v in cls.__post_root_validators__ if not _is_async(v)
+        ]
+        cls.__async_eager__ = SimpleNamespace(
+            __fields__={
+                name: f for name, f in cls.__fields__.items() if name not in deferred
+            },
+            __config__=cls.__config__,
+            __pre_root_validators__=[],
+            __post_root_validators__=[],
+        )
+
+    @classmethod
+    def _has_async_validators(cls) -> bool:
+        return bool(
+            cls.__async_validators__
+            or cls.__async_pre_root_validators__
+            or cls.__async_post_root_validators__
+        )
+
+    def __init__(__pydantic_self__, **data: typing.Any) -> None:
+        if type(__pydantic_self__)._has_async_validators():
+            raise TypeError(
+                f"{type(__pydantic_self__).__name__} has async validators, "
+                "use avalidate()"
+            )
+        super().__init__(**data)
+
+    @classmethod
+    async def _field(
+        cls, calls: _Calls, name: str, value: typing.Any, values: dict
+    ) -> typing.Any:
+        field = cls.__fields__[name]
+        config = cls.__config__
+        # chained, as pydantic runs a field's validators
+        for validator in cls.__async_validators__[name]:
+            key = (validator.call, value) if validator.shared else None
+            value = await calls.call(
+                validator.call, cls, value, values, field, config, key=key
+            )
+        return value
+
+    @classmethod
+    async def _validate(cls, calls: _Calls, data: typing.Any) -> tuple[dict, set, list]:
+        if not isinstance(data, dict):
+            try:
+                data = dict(data)
+            except (TypeError, ValueError) as exc:
+                raise ValidationError([ErrorWrapper(exc, loc=ROOT_KEY)], cls) from exc
+        for validator in cls.__async_pre_root_validators__:
+            try:
+                data = await calls.call(validator, cls, data)
+            except _PYDANTIC_ERRORS as exc:
+                raise ValidationError([ErrorWrapper(exc, loc=ROOT_KEY)], cls)
+        for validator in cls.__pre_root_validators__:
+            try:
+                data = validator(cls, data)
+            except _PYDANTIC_ERRORS as exc:
+                raise ValidationError([ErrorWrapper(exc, loc=ROOT_KEY)], cls)
+        deferred = cls.__async_deferred__
+        if deferred:
+            data = dict(data)
+            raw = {name: cls._pop_input(data, name) for name in deferred}
+
+        values, fields_set, error = validate_model(cls.__async_eager__, data, cls)
+        errors = list(error.raw_errors) if error else []
+
+        names = [
+            name
+            for name in cls.__async_validators__
+            if name in values and name not in deferred
+        ]
+        if names:
+            outcomes = await _gather(
+                _pydantic_outcome(
+                    cls._field(calls, name, values[name], cls._preceding(values, name))
+                )
+                for name in names
+            )
+            for name, (ok, result) in zip(names, outcomes):
+                if ok:
+                    values[name] = result
+                else:
+                    values.pop(name)
+                    errors.append(ErrorWrapper(result, loc=cls.__fields__[name].alias))
+
+        if deferred:
+            # in field order, each one after the async results before it
+            for name in deferred:
+                await cls._validate_deferred(calls, name, raw[name], values, errors)
+                if raw[name] is not _MISSING:
+                    fields_set.add(name)
+            ordered = {name: values[name] for name in cls.__fields__ if name in values}
+            # Extra.allow values after the fields
+            ordered.update((k, v) for k, v in values.items() if k not in ordered)
+            values = ordered
+
+        for skip_on_failure, validator in cls.__post_root_validators__:
+            if skip_on_failure and errors:
+                continue
+            try:
+                values = validator(cls, values)
+            except _PYDANTIC_ERRORS as exc:
+                errors.append(ErrorWrapper(exc, loc=ROOT_KEY))
+        for skip_on_failure, validator in cls.__async_post_root_validators__:
+            if skip_on_failure and errors:
+                continue
+            try:
+                values = await calls.call(validator, cls, values)
+            except _PYDANTIC_ERRORS as exc:
+                errors.append(ErrorWrapper(exc, loc=ROOT_KEY))
+        return values, fields_set, errors
+
+    @classmethod
+    def _preceding(cls, values: dict, name: str) -> dict:
+        # the valid fields before this one, as pydantic passes them
+        order = list(cls.__fields__)
+        return {k: values[k] for k in order[: order.index(name)] if k in values}
+
+    @classmethod
+    def _pop_input(cls, data: dict, name: str) -> typing.Any:
+        field = cls.__fields__[name]
+        if field.alias in data:
+            return data.pop(field.alias)
+        if cls.__config__.allow_population_by_field_name and name in data:
+            return data.pop(name)
+        return _MISSING
+
+    @classmethod
+    async def _validate_deferred(
+        cls, calls: _Calls, name: str, value: typing.Any, values: dict, errors: list
+    ) -> None:
+        field = cls.__fields__[name]
+        if value is _MISSING:
+            if field.required:
+                errors.append(ErrorWrapper(MissingError(), loc=field.alias))
+                return
+            value = field.get_default()
+            # defaults skip the sync validators only, as in validate_model
+            check = cls.__config__.validate_all or field.validate_always
+        else:
+            check = True
+        preceding = cls._preceding(values, name)
+        if check:
+            value, error = field.validate(value, preceding, loc=field.alias, cls=cls)
+            if isinstance(error, list):
+                errors.extend(error)
+                return
+            if error:
+                errors.append(error)
+                return
+        if name in cls.__async_validators__:
+            ok, value = await _pydantic_outcome(
+                cls._field(calls, name, value, preceding)
+            )
+            if not ok:
+                errors.append(ErrorWrapper(value, loc=field.alias))
+                return
+        values[name] = value
+
+    @classmethod
+    def _build(cls, values: dict, fields_set: set) -> "AsyncModel":
+        m = cls.__new__(cls)
+        object.__setattr__(m, "__dict__", values)
+        object.__setattr__(m, "__fields_set__", fields_set)
+        m._init_private_attributes()
+        return m
+
+    @classmethod
+    async def avalidate(
+        cls: type["Model"],
+        data: typing.Any,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> "Model":
+        """``parse_obj(data)`` with the async validators awaited."""
+        values, fields_set, errors = await cls._validate(_Calls(concurrency), data)
+        if errors:
+            raise ValidationError(errors, cls)
+        return cls._build(values, fields_set)
+
+    @classmethod
+    async def avalidate_many(
+        cls: type["Model"],
+        records: typing.Iterable[typing.Any],
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> list["Model"]:
+        """``parse_obj_as(list[cls], records)`` with the async validators awaited.
+
+        The records share the concurrency limit and the per-value results.
+        """
+        calls = _Calls(concurrency)
+        outcomes = await _gather(
+            _model_outcome(cls._validate(calls, record)) for record in records
+        )
+        errors = {}
+        models = []
+        for index, (ok, result) in enumerate(outcomes):
+            if not ok:
+                errors[index] = result
+            elif result[2]:
+                errors[index] = ValidationError(result[2], cls)
+            else:
+                models.append(cls._build(result[0], result[1]))
+        if errors:
+            raise ModelAdapter(cls).many_error(errors)
+        return models
+
+
+Model = typing.TypeVar("Model", bound=AsyncModel)
+
+
+async def _pydantic_outcome(aw: typing.Awaitable) -> tuple[bool, typing.Any]:
+    try:
+        return True, await aw
+    except _PYDANTIC_ERRORS as exc:
+        return False, exc
+
+
+async def _model_outcome(aw: typing.Awaitable) -> tuple[bool, typing.Any]:
+    try:
+        return True, await aw
+    except ValidationError as error:
+        return False, error
@@ -0,0 +1,328 @@
+"""Validators that check every distinct value of a batch in one call.
+
+A validator that asks a service whether a SKU exists runs once per record:
+10k records with 300 distinct SKUs make 10k lookups. A batch validator takes
+the set of distinct values and returns the failures, keyed by value:
+
+    def skus_exist(skus: set[str]) -> dict[str, str]:
+        known = catalogue.lookup(skus)
+        return {sku: "Unknown SKU." for sku in skus - known}
+
+    class ItemSchema(BatchSchema):
+        sku = fields.Str(validate=BatchValidator(skus_exist))
+
+    class Item(BatchModel):
+        sku: str
+
+        @batch_validator("sku")
+        def skus_exist(cls, skus):
+            ...
+
+    ItemSchema(many=True).load(records)   # skus_exist called once
+    Item.validate_many(records)           # same, as parse_obj_as(list[Item], ...)
+
+A failure is a message (``str``), a list of messages or an exception
+(``ValidationError`` for marshmallow, ``ValueError``/``TypeError``/
+``AssertionError`` for pydantic). Each failure is reported at every record
+holding that value, in the library's own error format, and the value is left
+out of the loaded data.
+
+Batch validators run after the record's other field validators, and after
+``@validates_schema``/``@root_validator``s. Single records go through the same
+path, as a batch of one; ``BatchValidator`` used in a plain ``Schema`` checks
+one value per call. Values must be hashable.
+"""
+
+import typing
+
+import marshmallow
+from marshmallow import Schema, validate
+from marshmallow.decorators import POST_LOAD
+from marshmallow.error_store import ErrorStore
+from pydantic import BaseModel, ValidationError, validate_model
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.errors import ConfigError
+from pydantic.utils import ROOT_KEY
+
+from app.adapters import ModelAdapter
+
+Failures = typing.Mapping[typing.Any, typing.Any]
+
+
+def _distinct(values: typing.Iterable) -> set:
+    try:
+        return set(values)
+    except TypeError as error:
+        raise TypeError(f"batch validators need hashable values: {error}") from None
+
+
+# marshmallow
+
+
+class BatchValidator(validate.Validator):
+    """marshmallow validator checking all distinct values of a load at once.
+
+    ``check`` takes a set of values and returns ``{value: failure}`` for the
+    invalid ones.
+    """
+
+    def __init__(self, check: typing.Callable[[set], Failures]):
+        self.check = check
+
+    def _repr_args(self) -> str:
+        return f"check={self.check!r}"
+
+    def messages(self, values: set) -> dict[typing.Any, typing.Any]:
+        """Error messages of the invalid ``values``."""
+        return {
+            value: (
+                failure
+                if isinstance(failure, marshmallow.ValidationError)
+                else marshmallow.ValidationError(failure)
+            ).messages
+            for value, failure in (self.check(values) or {}).items()
+            if failure is not None
+        }
+
+    def __call__(self, value: typing.Any) -> typing.Any:
+        messages = self.messages(_distinct([value]))
+        if value in messages:
+            raise marshmallow.ValidationError(messages[value])
+        return value
+
+
+class BatchSchema(Schema):
+    """``Schema`` running its ``BatchValidator``s once per ``load``."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # field name -> its batch validators, taken out of the per-value chain
+        self._batch_validators: dict[str, list[BatchValidator]] = {}
+        for name, field in self.load_fields.items():
+            batch = [v for v in field.validators if isinstance(v, BatchValidator)]
+            if batch:
+                self._batch_validators[name] = batch
+                field.validators = [v for v in field.validators if v not in batch]
+
+    def _run_batch_validators(
+        self, error_store: ErrorStore, items: list, many: bool
+    ) -> None:
+        for name, validators in self._batch_validators.items():
+            field = self.fields[name]
+            attribute = field.attribute or name
+            data_key = field.data_key if field.data_key is not None else name
+            for validator in validators:
+                rows = [
+                    (index, item[attribute])
+                    for index, item in enumerate(items)
+                    if attribute in item
+                ]
+                if not rows:
+                    continue
+                failures = validator.messages(_distinct(value for _, value in rows))
+                if not failures:
+                    continue
+                for index, value in rows:
+                    if value in failures:
+                        error_store.store_error(
+                            failures[value],
+                            data_key,
+                            index=index if many and self.opts.index_errors else None,
+                        )
+                        # invalid values are left out, the next validator
+                        # does not see them either
+                        items[index].pop(attribute)
+
+    def _do_load(
+        self, data, *, many=None, partial=None, unknown=None, postprocess=True
+    ):
+        if not self._batch_validators:
+            return super()._do_load(
+                data,
+                many=many,
+                partial=partial,
+                unknown=unknown,
+                postprocess=postprocess,
+            )
+        many = self.many if many is None else bool(many)
+        if partial is None:
+            partial = self.partial
+        error_store = ErrorStore()
+        try:
+            result = super()._do_load(
+                data, many=many, partial=partial, unknown=unknown, postprocess=False
+            )
+        except marshmallow.ValidationError as error:
+            if error.valid_data is None:
+                # pre_load failed, nothing to validate further
+                raise
+            result = error.valid_data
+            error_store.errors = error.normalized_messages()
+
+        self._run_batch_validators(error_store, result if many else [result], many)
+
+        errors = error_store.errors
+        if not errors and postprocess and self._hooks[POST_LOAD]:
+            try:
+                result = self._invoke_load_processors(
+                    POST_LOAD, result, many=many, original_data=data, partial=partial
+                )
+            except marshmallow.ValidationError as error:
+                errors = error.normalized_messages()
+        if errors:
+            exc = marshmallow.ValidationError(errors, data=data, valid_data=result)
+            self.handle_error(exc, data, many=many, partial=partial)
+            raise exc
+        return result
+
+
+# pydantic
+
+_BATCH_VALIDATOR_KEY = "__batch_validator__"
+
+_PYDANTIC_ERRORS = (ValueError, TypeError, AssertionError)
+
+
+def batch_validator(
+    *fields: str,
+) -> typing.Callable[[typing.Callable], classmethod]:
+    """Declare a ``BatchModel`` validator of the distinct values of ``fields``.
+
+    The validator is called as ``validator(cls, values: set)`` and returns
+    ``{value: failure}`` for the invalid ones.
+    """
+    if not fields or not all(isinstance(field, str) for field in fields):
+        raise ConfigError("batch_validator needs the names of the fields it checks")
+
+    def decorator(func: typing.Callable) -> classmethod:
+        method = func if isinstance(func, classmethod) else classmethod(func)
+        setattr(method, _BATCH_VALIDATOR_KEY, fields)
+        return method
+
+    return decorator
+
+
+def _as_exception(failure: typing.Any) -> Exception:
+    if isinstance(failure, _PYDANTIC_ERRORS):
+        return failure
+    if isinstance(failure, (list, tuple)):
+        failure = "; ".join(str(message) for message in failure)
+    return ValueError(failure)
+
+
+class BatchModel(BaseModel):
+    """``BaseModel`` with ``@batch_validator``s, run once per ``validate_many``."""
+
+    # field -> names of its batch validators, in declaration order
+    __batch_validators__: typing.ClassVar[dict[str, list[str]]] = {}
+
+    def __init_subclass__(cls, **kwargs: typing.Any) -> None:
+        super().__init_subclass__(**kwargs)
+        validators: dict[str, list[str]] = {}
+        seen = set()
+        for base in cls.__mro__:
+            for attr_name, attr in vars(base).items():
+                fields = getattr(attr, _BATCH_VALIDATOR_KEY, None)
+                if fields is None or attr_name in seen:
+                    continue
+                seen.add(attr_name)
+                unknown = [field for field in fields if field not in cls.__fields__]
+                if unknown:
+                    raise ConfigError(
+                        f"{cls.__name__}.{attr_name}: batch validator for "
+                        f"unknown fields {unknown}"
+                    )
+                for field in fields:
+                    validators.setdefault(field, []).append(attr_name)
+        cls.__batch_validators__ = {
+            name: validators[name] for name in cls.__fields__ if name in validators
+        }
+
+    def __init__(__pydantic_self__, **data: typing.Any) -> None:
+        cls = type(__pydantic_self__)
+        if not cls.__batch_validators__:
+            super().__init__(**data)
+            return
+        values, fields_set, error = validate_model(cls, data)
+        errors = list(error.raw_errors) if error else []
+        errors += cls._batch_errors([values])[0]
+        if errors:
+            raise ValidationError(errors, cls)
+        object.__setattr__(__pydantic_self__, "__dict__", values)
+        object.__setattr__(__pydantic_self__, "__fields_set__", fields_set)
+        __pydantic_self__._init_private_attributes()
+
+    @classmethod
+    def _batch_errors(cls, records: list[dict]) -> list[list[ErrorWrapper]]:
+        """Run the batch validators over validated ``records``, in place."""
+        errors: list[list[ErrorWrapper]] = [[] for _ in records]
+        for name, attr_names in cls.__batch_validators__.items():
+            alias = cls.__fields__[name].alias
+            for attr_name in attr_names:
+                rows = [
+                    (index, values[name])
+                    for index, values in enumerate(records)
+                    if name in values
+                ]
+                if not rows:
+                    continue
+                try:
+                    failures = getattr(cls, attr_name)(
+                        _distinct(value for _, value in rows)
+                    )
+                except _PYDANTIC_ERRORS as exc:
+                    # the whole batch fails
+                    failures = {value: exc for _, value in rows}
+                if not failures:
+                    continue
+                for index, value in rows:
+                    failure = failures.get(value)
+                    if failure is not None:
+                        errors[index].append(
+                            ErrorWrapper(_as_exception(failure), loc=alias)
+                        )
+                        records[index].pop(name)
+        return errors
+
+    @classmethod
+    def validate_many(
+        cls: type["Model"], records: typing.Iterable[typing.Any]
+    ) -> list["Model"]:
+        """``parse_obj_as(list[cls], records)``, batch validators run once."""
+        adapter = ModelAdapter(cls)
+        validated, errors = [], {}
+        for index, record in enumerate(records):
+            if not isinstance(record, dict):
+                try:
+                    record = dict(record)
+                except (TypeError, ValueError):
+                    exc = TypeError(
+                        f"{cls.__name__} expected dict not {record.__class__.__name__}"
+                    )
+                    errors[index] = ValidationError([ErrorWrapper(exc, ROOT_KEY)], cls)
+                    validated.append(({}, set(), None))
+                    continue
+            validated.append(validate_model(cls, record))
+
+        batch_errors = cls._batch_errors([values for values, _, _ in validated])
+        models = []
+        for index, ((values, fields_set, error), extra) in enumerate(
+            zip(validated, batch_errors)
+        ):
+            if index in errors:
+                continue
+            raw_errors = (list(error.raw_errors) if error else []) + extra
+            if raw_errors:
+                errors[index] = ValidationError(raw_errors, cls)
+                continue
+            m = cls.__new__(cls)
+            object.__setattr__(m, "__dict__", values)
+            object.__setattr__(m, "__fields_set__", fields_set)
+            m._init_private_attributes()
+            models.append(m)
+        if errors:
+            raise adapter.many_error(dict(sorted(errors.items())))
+        return models
+
+
+Model = typing.TypeVar("Model", bound=BatchModel)
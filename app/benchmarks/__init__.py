@@ -0,0 +1,4 @@
+"""Benchmarks comparing marshmallow schemas and pydantic models.
+
+Run ``python -m app.benchmarks --help`` from the repository root.
+"""
@@ -0,0 +1,32 @@
+import argparse
+
+from app.benchmarks.runner import CASES, DEFAULT_SIZES, run
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare marshmallow schemas and pydantic models on the same payloads"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=None)
+    parser.add_argument("--repeat", type=int, default=None)
+    parser.add_argument("--output", default="bench_output.json")
+    args = parser.parse_args()
+
+    report = run(tuple(args.sizes), args.cases and tuple(args.cases), args.repeat)
+    report.write_json(args.output)
+    for r in report.results:
+        # too few samples for a p99 on big batches
+        slow = (
+            f"p99={r.p99_ms:.3f}ms" if r.p99_ms is not None else f"max={r.max_ms:.3f}ms"
+        )
+        print(
+            f"{r.library:<22}{r.case:<12}{r.operation:<6}{r.records:>8}"
+            f"{r.records_per_sec:>14.0f} rec/s"
+            f"  p50={r.p50_ms:.3f}ms  {slow}"
+            f"  peak={r.peak_memory_bytes}B"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Cost of schema hooks per call: Schema vs PipelineSchema.
+
+python -m app.benchmarks.hooks --records 10000 --hooks 4
+"""
+
+import argparse
+
+from marshmallow import Schema, fields, post_dump, post_load, pre_load
+
+from app.benchmarks.runner import BenchResult, measure
+from app.hook_pipeline import PipelineSchema, constructs
+from app.models import User
+
+BASES = {"marshmallow": Schema, "marshmallow-pipeline": PipelineSchema}
+
+
+def _passthrough():
+    # a new function each time: hook decorators tag the function itself
+    def hook(self, data, **kwargs):
+        return data
+
+    return hook
+
+
+def make_hooked_schema(base: type[Schema], hooks: int) -> type[Schema]:
+    """Schema with ``hooks`` no-op ``pre_load``, ``post_load`` and ``post_dump``s."""
+    namespace = {"name": fields.Str(), "email": fields.Str()}
+    for i in range(hooks):
+        namespace[f"pre_load_{i}"] = pre_load(_passthrough())
+        namespace[f"post_load_{i}"] = post_load(_passthrough())
+        namespace[f"post_dump_{i}"] = post_dump(_passthrough())
+    return type(base)(f"Hooked{hooks}Schema", (base,), namespace)
+
+
+def make_envelope_schema(base: type[Schema]) -> type[Schema]:
+    class EnvelopeSchema(base):
+        name = fields.Str()
+        email = fields.Str()
+
+        @pre_load(pass_many=True)
+        def unwrap_envelope(self, data, many, **kwargs):
+            return data["users" if many else "user"]
+
+        @post_dump(pass_many=True)
+        def wrap_with_envelope(self, data, many, **kwargs):
+            return {"users" if many else "user": data}
+
+        make_object = constructs(User)
+
+    return EnvelopeSchema
+
+
+def bench_hooks(
+    records: int, hooks: int = 4, repeat: int | None = None
+) -> list[BenchResult]:
+    """Single-record loads/dumps with 0 and ``hooks`` hooks, and an envelope."""
+    payload = [
+        {"name": f"user {i}", "email": f"user{i}@python.org"} for i in range(records)
+    ]
+    users = [User(**item) for item in payload]
+    results = []
+    for library, base in BASES.items():
+        for count in (0, hooks):
+            schema = make_hooked_schema(base, count)()
+            case = f"hooks_{count}"
+            results.append(
+                measure(
+                    library,
+                    case,
+                    "load",
+                    lambda schema=schema: [schema.load(item) for item in payload],
+                    records,
+                    repeat,
+                )
+            )
+            results.append(
+                measure(
+                    library,
+                    case,
+                    "dump",
+                    lambda schema=schema: [schema.dump(item) for item in payload],
+                    records,
+                    repeat,
+                )
+            )
+        schema = make_envelope_schema(base)(many=True)
+        envelope = schema.dump(users)
+        results.append(
+            measure(
+                library,
+                "envelope",
+                "load",
+                lambda schema=schema, envelope=envelope: schema.load(envelope),
+                records,
+                repeat,
+            )
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=10_000)
+    parser.add_argument("--hooks", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=None)
+    args = parser.parse_args()
+
+    results = bench_hooks(args.records, args.hooks, args.repeat)
+    ns = {(r.library, r.case, r.operation): 1e9 / r.records_per_sec for r in results}
+    for r in results:
+        print(
+            f"{r.library:<21} {r.case:<9} {r.operation:<5}"
+            f" {ns[r.library, r.case, r.operation]:>8,.0f} ns/record"
+        )
+    for library in BASES:
+        for operation in ("load", "dump"):
+            per_hook = (
+                ns[library, f"hooks_{args.hooks}", operation]
+                - ns[library, "hooks_0", operation]
+            ) / (args.hooks * (2 if operation == "load" else 1))
+            print(f"{library:<21} {operation:<5} {per_hook:>8,.0f} ns/hook")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Bytes per instance: BaseModel vs CompactModel.
+
+python -m app.benchmarks.memory --records 100000
+"""
+
+import argparse
+import gc
+import tracemalloc
+import typing
+
+from pydantic import BaseModel, SecretStr
+
+from app.compact_model import CompactModel
+
+
+class MemoryResult(typing.NamedTuple):
+    library: str
+    case: str
+    records: int
+    bytes_per_instance: float
+
+
+def make_models(base: type[BaseModel]) -> dict[str, type[BaseModel]]:
+    class Bar(base):
+        count: int
+        name = "Jane Doe"
+
+    class Foo(base):
+        id: int
+        bar: Bar
+
+    class User(base):
+        id: int
+        username: str
+        password: SecretStr
+
+    class Transaction(base):
+        id: str
+        user: User
+        value: int
+
+    return {"bar": Bar, "foo": Foo, "transaction": Transaction}
+
+
+def make_payload(case: str, i: int) -> dict:
+    if case == "bar":
+        return {"count": i}
+    if case == "foo":
+        return {"id": i, "bar": {"count": i}}
+    return {
+        "id": str(i),
+        "user": {"id": i, "username": f"user{i}", "password": "hashed"},
+        "value": i,
+    }
+
+
+def retained_bytes(build: typing.Callable[[], list]) -> int:
+    """Memory still allocated once ``build()`` returns, its result kept alive."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def bench_memory(records: int) -> list[MemoryResult]:
+    results = []
+    for library, base in (("pydantic", BaseModel), ("pydantic-compact", CompactModel)):
+        for case, model in make_models(base).items():
+            payload = [make_payload(case, i) for i in range(records)]
+            # the list holding the instances is the same for both
+            baseline = retained_bytes(lambda: [None] * records)
+            used = retained_bytes(lambda: [model(**p) for p in payload])
+            results.append(
+                MemoryResult(library, case, records, (used - baseline) / records)
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=100_000)
+    args = parser.parse_args()
+
+    for result in bench_memory(args.records):
+        print(
+            f"{result.library:<17} {result.case:<12}"
+            f" {result.bytes_per_instance:>8,.0f} bytes/instance"
+        )
+
+
+if __name__ == "__main__":
+    main()
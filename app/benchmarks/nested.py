@@ -0,0 +1,57 @@
+"""Nested/Pluck dumps of clients with many tasks, plain vs ``fast_nested``.
+
+python -m app.benchmarks.nested --tasks 10000
+"""
+
+import argparse
+
+from app.benchmarks.payloads import make_clients
+from app.benchmarks.runner import BenchResult, measure
+from app.models import CleintSchema, CleintSchemaFlat
+from app.nested_dump import fast_nested
+
+
+def bench_nested(
+    tasks: int, clients: int = 1, repeat: int | None = None
+) -> list[BenchResult]:
+    """Dump ``clients`` clients of ``tasks`` tasks each; records are tasks."""
+    objects = make_clients(clients, tasks_per_client=tasks)
+    results = []
+    for case, schema_class in (
+        ("client", CleintSchema),
+        ("client_flat", CleintSchemaFlat),
+    ):
+        for library, schema in (
+            ("marshmallow", schema_class(many=True)),
+            ("marshmallow-nested", fast_nested(schema_class(many=True))),
+        ):
+            results.append(
+                measure(
+                    library,
+                    case,
+                    "dump",
+                    lambda schema=schema: schema.dump(objects),
+                    tasks * clients,
+                    repeat,
+                )
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--clients", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=None)
+    args = parser.parse_args()
+
+    for result in bench_nested(args.tasks, args.clients, args.repeat):
+        ns = 1e9 / result.records_per_sec
+        print(
+            f"{result.library:<19} {result.case:<12} {ns:>8,.0f} ns/task"
+            f"  p50={result.p50_ms:.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
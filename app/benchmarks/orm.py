@@ -0,0 +1,64 @@
+"""Per-row ``from_orm`` vs ``from_orm_many`` on ``CompanyOrm`` results.
+
+python -m app.benchmarks.orm --sizes 1000 50000
+"""
+
+import argparse
+from collections import namedtuple
+
+from app.benchmarks.payloads import make_companies
+from app.benchmarks.runner import BenchResult, measure
+from app.models import CompanyModel, CompanyOrm
+from app.orm_bulk import from_orm_many
+
+CompanyRow = namedtuple("CompanyRow", "id public_key name domains")
+
+
+def bench_orm(records: int, repeat: int | None = None) -> list[BenchResult]:
+    companies = make_companies(records)
+    # what session.execute(select(CompanyOrm.__table__)) yields
+    rows = [CompanyRow(c.id, c.public_key, c.name, c.domains) for c in companies]
+    return [
+        measure(
+            "pydantic",
+            "company",
+            "from_orm",
+            lambda: [CompanyModel.from_orm(c) for c in companies],
+            records,
+            repeat,
+        ),
+        measure(
+            "pydantic-bulk",
+            "company",
+            "from_orm",
+            lambda: from_orm_many(CompanyModel, companies),
+            records,
+            repeat,
+        ),
+        measure(
+            "pydantic-bulk",
+            "company_rows",
+            "from_orm",
+            lambda: from_orm_many(CompanyModel, rows, CompanyOrm),
+            records,
+            repeat,
+        ),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 50_000])
+    parser.add_argument("--repeat", type=int, default=None)
+    args = parser.parse_args()
+
+    for records in args.sizes:
+        for result in bench_orm(records, args.repeat):
+            print(
+                f"{result.library:<14} {result.case:<13} records={records:<7}"
+                f" {result.records_per_sec:>12,.0f} rec/s  p50={result.p50_ms:.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
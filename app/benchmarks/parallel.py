@@ -0,0 +1,60 @@
+"""Where ParallelValidator starts to pay off on this machine.
+
+python -m app.benchmarks.parallel --records 20000 --workers 4
+"""
+
+import argparse
+import pickle
+import time
+
+from app.benchmarks.payloads import make_users
+from app.models import UserModel, UserSchema
+from app.parallel import ParallelValidator
+
+
+def per_record_costs(target, payload: list) -> dict[str, float]:
+    """Seconds per record: validating in-process vs shipping to a worker and back."""
+    validator = ParallelValidator(target, min_batch=len(payload) + 1)
+    start = time.perf_counter()
+    results = validator.validate(payload)
+    validate = (time.perf_counter() - start) / len(payload)
+
+    start = time.perf_counter()
+    pickle.loads(pickle.dumps(payload))
+    pickle.loads(pickle.dumps(results))
+    transfer = (time.perf_counter() - start) / len(payload)
+    return {"validate": validate, "transfer": transfer}
+
+
+def break_even(costs: dict[str, float], workers: int, startup: float) -> float:
+    """Records from which the pool beats one core (inf if it never does)."""
+    # sequential: n * v, parallel: startup + n * (t + v / workers)
+    saved = costs["validate"] - costs["transfer"] - costs["validate"] / workers
+    return startup / saved if saved > 0 else float("inf")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    payload = UserSchema(many=True).dump(make_users(args.records))
+    start = time.perf_counter()
+    with ParallelValidator(UserSchema, workers=args.workers, min_batch=0) as pool:
+        pool.validate(payload[: args.workers])
+    startup = time.perf_counter() - start
+
+    for name, target in (("marshmallow", UserSchema), ("pydantic", UserModel)):
+        costs = per_record_costs(target, payload)
+        records = break_even(costs, args.workers, startup)
+        print(
+            f"{name:<12} validate={costs['validate'] * 1e6:.1f}us/rec"
+            f"  transfer={costs['transfer'] * 1e6:.1f}us/rec"
+            f"  pool startup={startup * 1000:.0f}ms"
+            f"  pays off from ~{records:.0f} records on {args.workers} workers"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+from app.models import Client, CompanyOrm, Task, User
+
+
+def make_users(n: int) -> list[User]:
+    return [User(name=f"user {i}", email=f"user{i}@python.org") for i in range(n)]
+
+
+def make_clients(n: int, tasks_per_client: int = 3) -> list[Client]:
+    clients = []
+    for i in range(n):
+        client = Client(name=f"client {i}", email=f"client{i}@mail.ru")
+        client.tasks = [Task(f"task {i}-{j}") for j in range(tasks_per_client)]
+        clients.append(client)
+    return clients
+
+
+def make_companies(n: int, domains_per_company: int = 3) -> list[CompanyOrm]:
+    return [
+        CompanyOrm(
+            id=i,
+            public_key=f"key{i}",
+            name=f"company {i}",
+            domains=[f"site{j}.company{i}.com" for j in range(domains_per_company)],
+        )
+        for i in range(n)
+    ]
+
+
+def make_timestamps(n: int) -> list[str]:
+    """Canonical ISO 8601 datetimes, a third of them with an offset."""
+    offsets = ("", "Z", "+02:30")
+    return [
+        f"2014-08-{1 + i % 28:02d}T{i % 24:02d}:{i % 60:02d}:03.{i % 999_999:06d}"
+        + offsets[i % 3]
+        for i in range(n)
+    ]
@@ -0,0 +1,184 @@
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from importlib.metadata import version
+from typing import Any, Callable
+
+from pydantic import parse_obj_as
+
+from app.benchmarks.payloads import make_clients, make_users
+from app.compiled_dump import SchemaCompileError, compile_dumper
+from app.models import (
+    CleintSchema,
+    CleintSchemaFlat,
+    ClientModel,
+    ClientModelFlat,
+    UserModel,
+    UserSchema,
+)
+
+DEFAULT_SIZES = (1, 1_000, 100_000)
+
+# name -> (marshmallow schema, pydantic model, payload factory)
+CASES = {
+    "user": (UserSchema, UserModel, make_users),
+    "client": (CleintSchema, ClientModel, make_clients),
+    "client_flat": (CleintSchemaFlat, ClientModelFlat, make_clients),
+}
+
+
+@dataclass
+class BenchResult:
+    library: str
+    case: str
+    operation: str
+    records: int
+    repeat: int
+    records_per_sec: float
+    p50_ms: float
+    # None when there are too few samples for one, see max_ms
+    p99_ms: float | None
+    max_ms: float
+    peak_memory_bytes: int
+
+
+@dataclass
+class BenchReport:
+    python: str = field(default_factory=platform.python_version)
+    marshmallow: str = field(default_factory=lambda: version("marshmallow"))
+    pydantic: str = field(default_factory=lambda: version("pydantic"))
+    created_at: str = field(
+        default_factory=lambda: datetime.now(timezone.utc).isoformat()
+    )
+    results: list[BenchResult] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def write_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as fp:
+            json.dump(self.to_dict(), fp, indent=2)
+
+
+# below this a p99 is just the slowest sample
+P99_MIN_SAMPLES = 100
+
+
+def default_repeat(records: int) -> int:
+    # enough samples for a meaningful p99 on small batches, a handful on big ones
+    return max(3, min(1000, 100_000 // max(records, 1)))
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def measure(
+    library: str,
+    case: str,
+    operation: str,
+    func: Callable[[], Any],
+    records: int,
+    repeat: int | None = None,
+) -> BenchResult:
+    """Time ``func`` (one call handles ``records`` records) ``repeat`` times.
+
+    Peak memory is taken from a separate traced call, so tracemalloc overhead
+    does not leak into the timings.
+    """
+    repeat = repeat or default_repeat(records)
+    func()  # warm up caches and lazily built validators
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    median = statistics.median(samples)
+    return BenchResult(
+        library=library,
+        case=case,
+        operation=operation,
+        records=records,
+        repeat=repeat,
+        records_per_sec=records / median if median else float("inf"),
+        p50_ms=percentile(samples, 50) * 1000,
+        p99_ms=(percentile(samples, 99) * 1000 if repeat >= P99_MIN_SAMPLES else None),
+        max_ms=max(samples) * 1000,
+        peak_memory_bytes=peak,
+    )
+
+
+def bench_case(case: str, records: int, repeat: int | None = None) -> list[BenchResult]:
+    schema_class, model_class, factory = CASES[case]
+    objects = factory(records)
+    schema = schema_class(many=True)
+    # both libraries load the same serialized payload
+    payload = schema.dump(objects)
+
+    results = [
+        measure(
+            "marshmallow", case, "dump", lambda: schema.dump(objects), records, repeat
+        ),
+        measure(
+            "marshmallow", case, "load", lambda: schema.load(payload), records, repeat
+        ),
+        # pydantic has no object -> primitives step, from_orm + dict() is the closest
+        measure(
+            "pydantic",
+            case,
+            "dump",
+            lambda: [model_class.from_orm(obj).dict() for obj in objects],
+            records,
+            repeat,
+        ),
+        measure(
+            "pydantic",
+            case,
+            "load",
+            lambda: parse_obj_as(list[model_class], payload),
+            records,
+            repeat,
+        ),
+    ]
+    try:
+        dumper = compile_dumper(schema)
+    except SchemaCompileError:
+        return results
+    results.append(
+        measure(
+            "marshmallow-compiled",
+            case,
+            "dump",
+            lambda: dumper.dump(objects),
+            records,
+            repeat,
+        )
+    )
+    return results
+
+
+def run(
+    sizes: tuple[int, ...] = DEFAULT_SIZES,
+    cases: tuple[str, ...] | None = None,
+    repeat: int | None = None,
+) -> BenchReport:
+    report = BenchReport()
+    for case in cases or tuple(CASES):
+        for records in sizes:
+            report.results.extend(bench_case(case, records, repeat))
+    return report
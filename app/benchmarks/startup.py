@@ -0,0 +1,141 @@
+"""Import time of N generated models/schemas, with and without StartupCache.
+
+python -m app.benchmarks.startup --models 300 --repeat 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import typing
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+CASES = ("no-cache", "cache")
+
+# one model/schema per i, shaped like the test fixtures
+SOURCES = {
+    "pydantic": (
+        "from datetime import datetime\n"
+        "from pydantic import BaseModel, constr, validator\n",
+        """
+class UserModel{i}(BaseModel):
+    name: str
+    email: constr(max_length=63)
+    age: int = 0
+    score: float | None = None
+    created_at: datetime | None = None
+    tags: list[str] = []
+
+    @validator("name")
+    def strip_name(cls, v):
+        return v.strip()
+""",
+    ),
+    "marshmallow": (
+        "from marshmallow import Schema, fields, post_load, validates\n",
+        """
+class UserSchema{i}(Schema):
+    name = fields.Str(required=True)
+    email = fields.Email()
+    age = fields.Int()
+    created_at = fields.DateTime()
+    tags = fields.List(fields.Str())
+
+    @validates("name")
+    def check_name(self, value, **kwargs):
+        pass
+
+    @post_load
+    def make_user(self, data, **kwargs):
+        return data
+""",
+    ),
+}
+
+# imports the generated module in a fresh interpreter and prints the seconds
+CHILD = """
+import sys, time
+import marshmallow, pydantic
+from app.startup_cache import StartupCache
+
+module, case = sys.argv[1:]
+cache = StartupCache() if case == "cache" else None
+if cache:
+    cache.enable()
+start = time.perf_counter()
+__import__(module)
+print(time.perf_counter() - start)
+if cache:
+    cache.disable()
+"""
+
+
+class StartupResult(typing.NamedTuple):
+    library: str
+    case: str
+    models: int
+    seconds: float
+
+
+def write_module(directory: Path, library: str, models: int) -> str:
+    header, body = SOURCES[library]
+    name = f"generated_{library}_{models}"
+    source = header + "".join(body.format(i=i) for i in range(models))
+    (directory / f"{name}.py").write_text(source, encoding="utf-8")
+    return name
+
+
+def import_seconds(directory: Path, module: str, case: str = "no-cache") -> float:
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(
+            [str(directory), str(ROOT), os.environ.get("PYTHONPATH", "")]
+        ),
+    }
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD, module, case],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return float(output)
+
+
+def bench_startup(models: int, repeat: int = 5) -> list[StartupResult]:
+    """Median import time of ``models`` classes per library and cache state."""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        for library in SOURCES:
+            module = write_module(directory, library, models)
+            import_seconds(directory, module)  # writes the .pyc
+            for case in CASES:
+                samples = [
+                    import_seconds(directory, module, case) for _ in range(repeat)
+                ]
+                results.append(
+                    StartupResult(library, case, models, statistics.median(samples))
+                )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for r in bench_startup(args.models, args.repeat):
+        print(
+            f"{r.library:<12} {r.case:<11} {r.seconds * 1000:>8.1f} ms"
+            f" {r.seconds / r.models * 1e6:>8.0f} us/class"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Regex vs fast ISO 8601 parsing, per parser.
+
+python -m app.benchmarks.temporal --records 10000
+"""
+
+import argparse
+
+from app.benchmarks.payloads import make_timestamps
+from app.benchmarks.runner import BenchResult, measure
+from app.temporal import FAST_BACKEND, REGEX_BACKEND
+
+
+def bench_temporal(records: int, repeat: int | None = None) -> list[BenchResult]:
+    timestamps = make_timestamps(records)
+    payloads = {
+        "datetime": timestamps,
+        "date": [t[:10] for t in timestamps],
+        "time": [t[11:19] for t in timestamps],
+        "duration": [f"P{i % 9}DT{i % 24}H{i % 60}M{i % 60}S" for i in range(records)],
+    }
+    parsers = {
+        ("pydantic", "datetime"): "parse_datetime",
+        ("pydantic", "date"): "parse_date",
+        ("pydantic", "time"): "parse_time",
+        ("pydantic", "duration"): "parse_duration",
+        ("marshmallow", "datetime"): "from_iso_datetime",
+        ("marshmallow", "date"): "from_iso_date",
+        ("marshmallow", "time"): "from_iso_time",
+    }
+    results = []
+    for (library, case), name in parsers.items():
+        values = payloads[case]
+        for backend, suffix in ((REGEX_BACKEND, ""), (FAST_BACKEND, "-fast")):
+            parse = getattr(backend, name)
+            results.append(
+                measure(
+                    library + suffix,
+                    case,
+                    "parse",
+                    lambda parse=parse, values=values: [parse(v) for v in values],
+                    records,
+                    repeat,
+                )
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=None)
+    args = parser.parse_args()
+
+    for result in bench_temporal(args.records, args.repeat):
+        ns = 1e9 / result.records_per_sec
+        print(
+            f"{result.library:<17} {result.case:<9} {ns:>8,.0f} ns/value"
+            f"  p50={result.p50_ms:.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
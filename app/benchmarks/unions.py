@@ -0,0 +1,74 @@
+"""Union validation with 3, 40 and 200 event models.
+
+python -m app.benchmarks.unions --members 3 40 200
+"""
+
+import argparse
+from typing import Literal, Union
+
+from pydantic import BaseModel, Field, create_model
+
+from app.benchmarks.runner import BenchResult, measure
+from app.union_dispatch import DispatchModel
+
+DEFAULT_MEMBERS = (3, 40, 200)
+
+
+def make_events(members: int) -> list[type[BaseModel]]:
+    return [
+        create_model(f"Event{i}", kind=(Literal[f"event-{i}"], ...), value=(int, ...))
+        for i in range(members)
+    ]
+
+
+def make_payload(members: int, records: int) -> list[dict]:
+    # every member equally often, so plain unions try half of them on average
+    return [
+        {"event": {"kind": f"event-{i % members}", "value": i}} for i in range(records)
+    ]
+
+
+def bench_unions(
+    members: int, records: int = 1000, repeat: int | None = None
+) -> list[BenchResult]:
+    event = Union[tuple(make_events(members))]
+    models = {
+        "pydantic": create_model("Plain", event=(event, ...)),
+        "pydantic-discriminator": create_model(
+            "Discriminated", event=(event, Field(..., discriminator="kind"))
+        ),
+        "dispatch": create_model(
+            "Dispatched", __base__=DispatchModel, event=(event, ...)
+        ),
+    }
+    payload = make_payload(members, records)
+    return [
+        measure(
+            library,
+            f"union_{members}",
+            "load",
+            lambda model=model: [model(**record) for record in payload],
+            records,
+            repeat,
+        )
+        for library, model in models.items()
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--members", type=int, nargs="+", default=DEFAULT_MEMBERS)
+    parser.add_argument("--records", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=None)
+    args = parser.parse_args()
+
+    for members in args.members:
+        for result in bench_unions(members, args.records, args.repeat):
+            print(
+                f"{result.library:<23} members={members:<4}"
+                f" {result.records_per_sec:>10,.0f} rec/s  p50={result.p50_ms:.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
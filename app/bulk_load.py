@@ -0,0 +1,442 @@
+"""Columnar bulk loading of flat records.
+
+``schema.load(data, many=True)`` and ``parse_obj_as(list[Item], data)`` walk the
+input record by record and dispatch every value through the field machinery.
+For flat records most values are already of the target type, so the loaders
+below split the batch into per-field columns and run each conversion and
+validator over a whole column at once:
+
+    loader = SchemaBulkLoader(FileTypeSchema())
+    loader.load(rows)                # same result as schema.load(rows, many=True)
+
+    ModelBulkLoader(Item).parse(rows)  # same result as parse_obj_as(list[Item], rows)
+
+Values that do not take the fast path (wrong type, failed validator, missing
+key) are handed to the original field, so results and error messages are the
+ones the libraries produce today.
+"""
+
+import typing
+from datetime import datetime
+
+from marshmallow import EXCLUDE, INCLUDE, RAISE, Schema, ValidationError, fields
+from marshmallow import missing, utils, validate
+from marshmallow.decorators import (
+    POST_LOAD,
+    PRE_LOAD,
+    VALIDATES,
+    VALIDATES_SCHEMA,
+)
+from pydantic import BaseModel, ConstrainedInt, Extra
+from pydantic import ValidationError as PydanticValidationError
+from pydantic.datetime_parse import parse_datetime
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.fields import SHAPE_SINGLETON
+from pydantic.tools import _get_parsing_type
+
+from app.compiled_dump import SchemaCompileError
+
+# column cell that has to go through the original field
+_SLOW = object()
+# column cell whose field failed validation
+_FAILED = object()
+# model column cell that takes the field default
+_DEFAULT = object()
+
+
+def _check_validators(column: list, validators: list) -> None:
+    """Run validators over a converted column, marking failures as ``_SLOW``."""
+    for validator in validators:
+        if isinstance(validator, validate.OneOf):
+            try:
+                choices = frozenset(validator.choices)
+            except TypeError:
+                choices = None
+            if choices is not None:
+                column[:] = [
+                    v if v is _SLOW or v is None or v in choices else _SLOW
+                    for v in column
+                ]
+                continue
+        if type(validator) is validate.Range:
+            low, high = validator.min, validator.max
+            if low is not None:
+                if validator.min_inclusive:
+                    column[:] = [
+                        v if v is _SLOW or v is None or v >= low else _SLOW
+                        for v in column
+                    ]
+                else:
+                    column[:] = [
+                        v if v is _SLOW or v is None or v > low else _SLOW
+                        for v in column
+                    ]
+            if high is not None:
+                if validator.max_inclusive:
+                    column[:] = [
+                        v if v is _SLOW or v is None or v <= high else _SLOW
+                        for v in column
+                    ]
+                else:
+                    column[:] = [
+                        v if v is _SLOW or v is None or v < high else _SLOW
+                        for v in column
+                    ]
+            continue
+        for i, v in enumerate(column):
+            if v is _SLOW or v is None:
+                continue
+            try:
+                if validator(v) is False:
+                    column[i] = _SLOW
+            except ValidationError:
+                column[i] = _SLOW
+
+
+def _convert_column(field: fields.Field, raw: list) -> list:
+    """Fast-path conversion of a raw marshmallow column, ``_SLOW`` where unsure."""
+    field_class = type(field)
+    none = None if field.allow_none else _SLOW
+
+    if isinstance(field, fields.Integer) and (
+        field_class._deserialize is fields.Number._deserialize
+        and field_class._validated is fields.Integer._validated
+    ):
+        column = [
+            v if v.__class__ is int else (none if v is None else _SLOW) for v in raw
+        ]
+    elif isinstance(field, fields.Float) and (
+        field_class._deserialize is fields.Number._deserialize
+        and field_class._validated is fields.Float._validated
+    ):
+        if field.allow_nan:
+            column = [
+                v if v.__class__ is float else (none if v is None else _SLOW)
+                for v in raw
+            ]
+        else:
+            # v - v is nan for both nan and inf
+            column = [
+                (
+                    v
+                    if v.__class__ is float and v - v == 0.0
+                    else (none if v is None else _SLOW)
+                )
+                for v in raw
+            ]
+    elif field_class._deserialize is fields.String._deserialize:
+        column = [
+            v if v.__class__ is str else (none if v is None else _SLOW) for v in raw
+        ]
+    elif field_class._deserialize is fields.DateTime._deserialize:
+        parse = field.DESERIALIZATION_FUNCS.get(field.format or field.DEFAULT_FORMAT)
+        column = []
+        for v in raw:
+            if v.__class__ is str and parse is not None:
+                try:
+                    v = parse(v)
+                except (TypeError, AttributeError, ValueError):
+                    v = _SLOW
+            else:
+                v = none if v is None else _SLOW
+            column.append(v)
+    else:
+        return [_SLOW] * len(raw)
+
+    _check_validators(column, field.validators)
+    return column
+
+
+class SchemaBulkLoader:
+    """Columnar replacement for ``schema.load(data, many=True)`` on flat schemas.
+
+    Load hooks, ``@validates`` methods, ``partial`` loading and
+    ``index_errors = False`` are not supported and raise ``SchemaCompileError``.
+    """
+
+    def __init__(self, schema: Schema):
+        hooks = schema._hooks
+        if hooks[PRE_LOAD] or hooks[POST_LOAD] or hooks[VALIDATES]:
+            raise SchemaCompileError("load hooks and @validates are not supported")
+        if hooks[VALIDATES_SCHEMA]:
+            raise SchemaCompileError("@validates_schema is not supported")
+        if not schema.opts.index_errors:
+            raise SchemaCompileError("index_errors = False is not supported")
+        if schema.partial:
+            raise SchemaCompileError("partial loading is not supported")
+        self.schema = schema
+        # (data key, attribute, field)
+        self.columns = [
+            (
+                field.data_key if field.data_key is not None else name,
+                field.attribute or name,
+                field,
+            )
+            for name, field in schema.load_fields.items()
+        ]
+        self.data_keys = frozenset(data_key for data_key, _, _ in self.columns)
+
+    def load(
+        self, data: typing.Iterable[typing.Mapping], *, unknown: str | None = None
+    ):
+        schema = self.schema
+        unknown = schema.unknown if unknown is None else unknown
+        if not utils.is_collection(data):
+            return schema.load(data, many=True, unknown=unknown)
+        # generators are read once, by the check below
+        records = data = list(data)
+        if not all(isinstance(d, typing.Mapping) for d in records):
+            # rare shapes, let marshmallow report them
+            return schema.load(data, many=True, unknown=unknown)
+
+        errors: dict[int, dict[str, list]] = {}
+        columns = []
+        for data_key, _, field in self.columns:
+            raw = [d.get(data_key, missing) for d in records]
+            column = _convert_column(field, raw)
+            for i, value in enumerate(column):
+                if value is not _SLOW:
+                    continue
+                try:
+                    column[i] = field.deserialize(raw[i], data_key, records[i])
+                except ValidationError as error:
+                    errors.setdefault(i, {})[data_key] = error.messages
+                    column[i] = error.valid_data or _FAILED
+            columns.append(column)
+
+        result = self._rebuild(records, columns)
+
+        if unknown != EXCLUDE:
+            data_keys = self.data_keys
+            for i, d in enumerate(records):
+                if data_keys.issuperset(d):
+                    continue
+                for key in set(d) - data_keys:
+                    if unknown == INCLUDE:
+                        result[i][key] = d[key]
+                    elif unknown == RAISE:
+                        errors.setdefault(i, {})[key] = [
+                            schema.error_messages["unknown"]
+                        ]
+
+        if errors:
+            exc = ValidationError(errors, data=data, valid_data=result)
+            schema.handle_error(exc, data, many=True, partial=None)
+            raise exc
+        return result
+
+    def _rebuild(self, records: list, columns: list[list]) -> list:
+        attributes = [attribute for _, attribute, _ in self.columns]
+        dict_class = self.schema.dict_class
+        plain = dict_class is dict and not any("." in a for a in attributes)
+        if plain and not any(
+            missing in column or _FAILED in column for column in columns
+        ):
+            return [dict(zip(attributes, row)) for row in zip(*columns)]
+
+        result = []
+        for row in zip(*columns) if columns else ([] for _ in records):
+            ret = dict_class()
+            for attribute, value in zip(attributes, row):
+                if value is missing or value is _FAILED:
+                    continue
+                if plain:
+                    ret[attribute] = value
+                else:
+                    utils.set_value(ret, attribute, value)
+            result.append(ret)
+        return result
+
+
+def _model_column_kind(model: type[BaseModel], field) -> str | None:
+    config = model.__config__
+    if field.shape != SHAPE_SINGLETON or field.class_validators or field.sub_fields:
+        return None
+    type_ = field.outer_type_
+    if type_ is int:
+        return "int"
+    if isinstance(type_, type) and issubclass(type_, ConstrainedInt):
+        return "conint"
+    if type_ is float and getattr(config, "allow_inf_nan", True):
+        return "float"
+    if type_ is str and not (
+        config.anystr_strip_whitespace
+        or config.anystr_upper
+        or config.anystr_lower
+        or config.min_anystr_length
+        or config.max_anystr_length is not None
+    ):
+        return "str"
+    if type_ is datetime:
+        return "datetime"
+    return None
+
+
+def _model_column(kind: str | None, field, raw: list) -> list:
+    none = None if field.allow_none else _SLOW
+    if kind in ("int", "conint"):
+        column = [
+            v if v.__class__ is int else (none if v is None else _SLOW) for v in raw
+        ]
+        if kind == "conint":
+            bounds = field.outer_type_
+            for attr, check in (
+                ("gt", lambda v, b: v > b),
+                ("ge", lambda v, b: v >= b),
+                ("lt", lambda v, b: v < b),
+                ("le", lambda v, b: v <= b),
+                ("multiple_of", lambda v, b: v % b == 0),
+            ):
+                bound = getattr(bounds, attr)
+                if bound is not None:
+                    column = [
+                        v if v is _SLOW or v is None or check(v, bound) else _SLOW
+                        for v in column
+                    ]
+        return column
+    if kind == "float":
+        return [
+            v if v.__class__ is float else (none if v is None else _SLOW) for v in raw
+        ]
+    if kind == "str":
+        return [
+            v if v.__class__ is str else (none if v is None else _SLOW) for v in raw
+        ]
+    if kind == "datetime":
+        column = []
+        for v in raw:
+            if v.__class__ is datetime:
+                pass
+            elif v.__class__ is str:
+                try:
+                    v = parse_datetime(v)
+                except (TypeError, ValueError):
+                    v = _SLOW
+            else:
+                v = none if v is None else _SLOW
+            column.append(v)
+        return column
+    return [_SLOW] * len(raw)
+
+
+class ModelBulkLoader:
+    """Columnar replacement for ``parse_obj_as(list[Model], data)``.
+
+    Models with validators, non-default ``extra`` handling or
+    ``allow_population_by_field_name`` raise ``SchemaCompileError``.
+    """
+
+    def __init__(self, model: type[BaseModel]):
+        config = model.__config__
+        if model.__pre_root_validators__ or model.__post_root_validators__:
+            raise SchemaCompileError("root validators are not supported")
+        if config.extra != Extra.ignore or config.allow_population_by_field_name:
+            raise SchemaCompileError("only Extra.ignore with aliases is supported")
+        self.model = model
+        self.fields = [
+            (name, field, _model_column_kind(model, field))
+            for name, field in model.__fields__.items()
+        ]
+        if any(field.class_validators for _, field, _ in self.fields):
+            raise SchemaCompileError("field validators are not supported")
+        self.names = frozenset(model.__fields__)
+        # defaults pydantic validates: Config.validate_all, validate_always
+        self.validated_defaults = frozenset(
+            name
+            for name, field in model.__fields__.items()
+            if config.validate_all or field.validate_always
+        )
+        self.parsing_type = _get_parsing_type(list[model])
+
+    def parse(self, data: typing.Iterable[typing.Any]) -> list[BaseModel]:
+        model = self.model
+        records = list(data)
+        dict_indices = [i for i, d in enumerate(records) if d.__class__ is dict]
+        dicts = [records[i] for i in dict_indices]
+        failed = set()
+        # (row, field name) -> validated default
+        defaults = {}
+
+        columns = []
+        for name, field, kind in self.fields:
+            alias = field.alias
+            raw = [d.get(alias, _SLOW) for d in dicts]
+            column = _model_column(kind, field, raw)
+            for j, value in enumerate(column):
+                if value is not _SLOW:
+                    continue
+                if raw[j] is _SLOW:
+                    if field.required:
+                        failed.add(j)
+                        column[j] = _FAILED
+                        continue
+                    column[j] = _DEFAULT
+                    if name in self.validated_defaults:
+                        value, error = field.validate(
+                            field.get_default(), {}, loc=alias, cls=model
+                        )
+                        if error:
+                            failed.add(j)
+                            column[j] = _FAILED
+                        else:
+                            defaults[j, name] = value
+                    continue
+                value, error = field.validate(raw[j], {}, loc=alias, cls=model)
+                if error:
+                    failed.add(j)
+                    column[j] = _FAILED
+                else:
+                    column[j] = value
+            columns.append(column)
+
+        built = self._build(dicts, columns, failed, defaults)
+        result: list[typing.Any] = list(records)
+        for j, i in enumerate(dict_indices):
+            result[i] = built[j]
+
+        bad = {dict_indices[j] for j in failed}
+        bad.update(i for i, d in enumerate(records) if d.__class__ is not dict)
+        errors = []
+        for i in sorted(bad):
+            try:
+                result[i] = model.validate(records[i])
+            except (ValueError, TypeError, AssertionError) as exc:
+                errors.append(ErrorWrapper(exc, loc=("__root__", i)))
+        if errors:
+            raise PydanticValidationError(errors, self.parsing_type)
+        return result
+
+    def _build(
+        self, dicts: list, columns: list[list], failed: set, defaults: dict
+    ) -> list:
+        model = self.model
+        names = [name for name, _, _ in self.fields]
+        fields_map = {name: field for name, field, _ in self.fields}
+        object_setattr = object.__setattr__
+        init_private = bool(model.__private_attributes__)
+        all_names = self.names
+
+        built = []
+        for j, row in enumerate(zip(*columns) if columns else ([] for _ in dicts)):
+            if j in failed:
+                built.append(None)
+                continue
+            values = dict(zip(names, row))
+            if _DEFAULT in row:
+                fields_set = set()
+                for name, value in values.items():
+                    if value is not _DEFAULT:
+                        fields_set.add(name)
+                    elif (j, name) in defaults:
+                        values[name] = defaults[j, name]
+                    else:
+                        values[name] = fields_map[name].get_default()
+            else:
+                fields_set = set(all_names)
+            m = model.__new__(model)
+            object_setattr(m, "__dict__", values)
+            object_setattr(m, "__fields_set__", fields_set)
+            if init_private:
+                m._init_private_attributes()
+            built.append(m)
+        return built
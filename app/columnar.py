@@ -0,0 +1,321 @@
+"""Many records of one model or schema, stored column by column.
+
+A list of 100k ``Item`` models is 100k objects, each with its own dict, and
+reading one column touches all of them. ``Columns`` keeps one array per field
+instead:
+
+    items = columnar(parse_obj_as(list[Item], data))
+    users = columnar(UserSchema(many=True).load(data), UserSchema)
+
+    items.column("price")                    # array('d', ...) / numpy float64
+    items[3].name, items[3].dict()           # row views
+    items.select("id", "name")[10:20]        # column and row slicing
+    items.filter(lambda row: row.price > 1)  # or a list / numpy array of bools
+    items.dumps()                            # JSON, as the model/schema renders it
+
+Column types come from the declared field types: ``int``/``float`` fields
+(``Integer``/``Float`` in marshmallow) go to NumPy arrays when NumPy is
+installed, ``array.array`` otherwise; ``bool`` to NumPy or a list; ``str`` to
+a list of interned strings, so repeated values are stored once. Nullable
+fields, subclasses such as ``IntEnum``, ints beyond 64 bits and everything
+else are kept in plain lists.
+"""
+
+import sys
+import typing
+from array import array
+from operator import attrgetter
+
+import marshmallow
+import pydantic
+from marshmallow import fields
+from marshmallow.decorators import POST_DUMP, PRE_DUMP
+from pydantic.fields import SHAPE_SINGLETON
+
+from app.adapters import ModelAdapter, SchemaAdapter, adapt
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+Column = typing.Union[list, array, "numpy.ndarray"]
+
+_NUMPY_DTYPES = {"int": "int64", "float": "float64", "bool": "bool"}
+_TYPECODES = {"int": "q", "float": "d"}
+
+# these hand back str/int/float/bool values as they are
+_IDENTITY_SERIALIZERS = (
+    fields.String._serialize,
+    fields.Number._serialize,
+    fields.Boolean._serialize,
+)
+
+_EXACT_KINDS = {bool: "bool", int: "int", float: "float", str: "str"}
+_CONSTRAINED_TYPES = {
+    "int": pydantic.ConstrainedInt,
+    "float": pydantic.ConstrainedFloat,
+    "str": pydantic.ConstrainedStr,
+}
+
+
+def _model_kind(field: pydantic.fields.ModelField) -> str:
+    if field.shape != SHAPE_SINGLETON or field.allow_none:
+        return "object"
+    type_ = field.type_
+    # conint() and friends validate to plain values; other subclasses (IntEnum,
+    # str enums, ...) must come back as they are
+    for kind, constrained in _CONSTRAINED_TYPES.items():
+        if isinstance(type_, type) and issubclass(type_, constrained):
+            return kind
+    return _EXACT_KINDS.get(type_, "object")
+
+
+def _schema_kind(field: fields.Field) -> str:
+    if field.allow_none:
+        return "object"
+    for kind, base in (
+        ("bool", fields.Boolean),
+        ("int", fields.Integer),
+        ("float", fields.Float),
+        ("str", fields.String),
+    ):
+        if isinstance(field, base):
+            return kind
+    return "object"
+
+
+def _kinds(adapter: SchemaAdapter | ModelAdapter) -> dict[str, str]:
+    """Column name -> kind, in field order."""
+    if isinstance(adapter, ModelAdapter):
+        return {
+            name: _model_kind(field) for name, field in adapter.model.__fields__.items()
+        }
+    return {
+        field.attribute or name: _schema_kind(field)
+        for name, field in adapter.schema.load_fields.items()
+    }
+
+
+def _column(kind: str, values: list) -> Column:
+    if kind == "str":
+        intern = sys.intern
+        return [intern(v) if v.__class__ is str else v for v in values]
+    try:
+        if numpy is not None and kind in _NUMPY_DTYPES:
+            return numpy.array(values, dtype=_NUMPY_DTYPES[kind])
+        if kind in _TYPECODES:
+            return array(_TYPECODES[kind], values)
+    except (OverflowError, TypeError):
+        pass
+    return values
+
+
+def _take(column: Column, indices: list[int]) -> Column:
+    if numpy is not None and isinstance(column, numpy.ndarray):
+        return column[numpy.asarray(indices, dtype="intp")]
+    if isinstance(column, array):
+        return array(column.typecode, [column[i] for i in indices])
+    return [column[i] for i in indices]
+
+
+def _as_list(column: Column) -> list:
+    return column if isinstance(column, list) else column.tolist()
+
+
+def _getter(column: Column) -> typing.Callable[[int], typing.Any]:
+    # ndarray.item gives Python scalars, not numpy ones
+    if numpy is not None and isinstance(column, numpy.ndarray):
+        return column.item
+    return column.__getitem__
+
+
+class Row:
+    """Read-only view of one record of a ``Columns``."""
+
+    __slots__ = ("_columns", "_index")
+
+    def __init__(self, columns: "Columns", index: int):
+        self._columns = columns
+        self._index = index
+
+    def __getattr__(self, name: str) -> typing.Any:
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __getitem__(self, name: str) -> typing.Any:
+        value = self._columns._getters[name](self._index)
+        if value is marshmallow.missing:
+            raise KeyError(name)
+        return value
+
+    def keys(self) -> list[str]:
+        return list(self.dict())
+
+    def dict(self) -> dict[str, typing.Any]:
+        getters = self._columns._getters
+        return {
+            name: value
+            for name, get in getters.items()
+            if (value := get(self._index)) is not marshmallow.missing
+        }
+
+    def __eq__(self, other: typing.Any) -> bool:
+        if isinstance(other, Row):
+            other = other.dict()
+        return self.dict() == other
+
+    def __repr__(self) -> str:
+        return f"Row({self.dict()!r})"
+
+
+class Columns:
+    """Records of one model or schema, one array per field."""
+
+    __slots__ = ("adapter", "kinds", "_columns", "_getters", "_length")
+
+    def __init__(
+        self,
+        adapter: SchemaAdapter | ModelAdapter,
+        columns: dict[str, Column],
+        kinds: dict[str, str],
+        length: int,
+    ):
+        self.adapter = adapter
+        self.kinds = kinds
+        self._columns = columns
+        self._getters = {name: _getter(column) for name, column in columns.items()}
+        self._length = length
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._columns)
+
+    def column(self, name: str) -> Column:
+        return self._columns[name]
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> typing.Iterator[Row]:
+        return (Row(self, i) for i in range(self._length))
+
+    def __getitem__(self, key: int | slice | str) -> typing.Any:
+        if isinstance(key, str):
+            return self._columns[key]
+        if isinstance(key, slice):
+            length = len(range(*key.indices(self._length)))
+            return self._copy({n: c[key] for n, c in self._columns.items()}, length)
+        if key < 0:
+            key += self._length
+        if not 0 <= key < self._length:
+            raise IndexError("row index out of range")
+        return Row(self, key)
+
+    def _copy(self, columns: dict[str, Column], length: int) -> "Columns":
+        kinds = {name: self.kinds[name] for name in columns}
+        return Columns(self.adapter, columns, kinds, length)
+
+    def select(self, *names: str) -> "Columns":
+        """The same rows with only the ``names`` columns."""
+        return self._copy({name: self._columns[name] for name in names}, len(self))
+
+    def filter(
+        self, condition: typing.Callable[[Row], bool] | typing.Sequence[bool]
+    ) -> "Columns":
+        """Rows for which ``condition(row)`` is true, or where a mask is set."""
+        if callable(condition):
+            indices = [i for i, row in enumerate(self) if condition(row)]
+        else:
+            if len(condition) != self._length:
+                raise ValueError(f"mask of {len(condition)} for {self._length} rows")
+            indices = [i for i, keep in enumerate(condition) if keep]
+        return self._copy(
+            {n: _take(c, indices) for n, c in self._columns.items()}, len(indices)
+        )
+
+    def to_dicts(self) -> list[dict[str, typing.Any]]:
+        names = self.names
+        if not names:
+            return [{} for _ in range(self._length)]
+        rows = [
+            dict(zip(names, values))
+            for values in zip(*map(_as_list, self._columns.values()))
+        ]
+        if any(self.kinds[n] == "object" for n in names) and isinstance(
+            self.adapter, SchemaAdapter
+        ):
+            # fields a record did not have
+            missing = marshmallow.missing
+            rows = [{k: v for k, v in row.items() if v is not missing} for row in rows]
+        return rows
+
+    def _dump_is_identity(self) -> bool:
+        """The schema would dump every column value unchanged."""
+        schema = self.adapter.schema
+        if schema._hooks[PRE_DUMP] or schema._hooks[POST_DUMP]:
+            return False
+        by_attribute = {
+            field.attribute or name: field for name, field in schema.dump_fields.items()
+        }
+        return by_attribute.keys() == self._columns.keys() and all(
+            self.kinds[name] != "object"
+            and type(field)._serialize in _IDENTITY_SERIALIZERS
+            and not getattr(field, "as_string", False)
+            and (field.data_key or name) == name
+            for name, field in by_attribute.items()
+        )
+
+    def dump(self) -> list[dict[str, typing.Any]]:
+        """``[m.dict() for m in models]`` / ``schema.dump(records, many=True)``."""
+        rows = self.to_dicts()
+        if isinstance(self.adapter, ModelAdapter):
+            # construct() fills in defaults, keep to the selected columns
+            model, names = self.adapter.model, set(self._columns)
+            return [model.construct(**row).dict(include=names) for row in rows]
+        if self._dump_is_identity():
+            return rows
+        return self.adapter.schema.dump(rows, many=True)
+
+    def dumps(self) -> str:
+        """JSON of all rows, rendered as the model or schema renders it."""
+        if isinstance(self.adapter, ModelAdapter):
+            model = self.adapter.model
+            if all(kind != "object" for kind in self.kinds.values()) and not any(
+                field.field_info.exclude for field in model.__fields__.values()
+            ):
+                return self.adapter.render(self.to_dicts())
+        return self.adapter.render(self.dump())
+
+
+def columnar(
+    records: typing.Sequence,
+    target: marshmallow.Schema | type | None = None,
+) -> Columns:
+    """``Columns`` of ``records``: models, or the dicts ``target`` loaded.
+
+    ``target`` defaults to the class of the first record for pydantic models.
+    """
+    if target is None:
+        if not records or not isinstance(records[0], pydantic.BaseModel):
+            raise TypeError("records are not pydantic models, pass their schema")
+        target = type(records[0])
+    adapter = adapt(target)
+    kinds = _kinds(adapter)
+    if isinstance(adapter, ModelAdapter):
+        extract = {name: attrgetter(name) for name in kinds}
+    else:
+        missing = marshmallow.missing
+        extract = {
+            name: (lambda record, name=name: record.get(name, missing))
+            for name in kinds
+        }
+    columns = {}
+    for name, kind in kinds.items():
+        values = list(map(extract[name], records))
+        if kind != "object" and any(v is marshmallow.missing for v in values):
+            kind = kinds[name] = "object"
+        columns[name] = _column(kind, values)
+    return Columns(adapter, columns, kinds, len(records))
@@ -0,0 +1,197 @@
+"""Models that keep their field values in ``__slots__``.
+
+A ``BaseModel`` instance carries a ``__dict__`` (184 bytes for a two field
+model) and a ``__fields_set__`` set (216 bytes) next to the values themselves.
+``CompactModel`` stores each field in a slot and shares one frozenset for all
+instances with the same set fields:
+
+    class Bar(CompactModel):
+        count: int
+        name = "Jane Doe"
+
+    sys.getsizeof(Bar(count=1))   # no __dict__, no per-instance set
+
+``__dict__`` and ``__fields_set__`` are properties built from the slots, so
+everything pydantic does through them keeps working: ``.dict()``/``.json()``
+with ``include``/``exclude``, ``copy()``, ``from_orm`` (``orm_mode``),
+``validate_assignment``, pickling. Reading a field is a slot read. Defaults are
+stored as pydantic hands them out: immutable ones (``"Jane Doe"``) are the same
+object in every instance.
+
+``Config.extra = "allow"`` is not supported: extra values have no slot.
+"""
+
+import typing
+from operator import attrgetter
+from types import MemberDescriptorType
+
+from pydantic import BaseModel, Extra
+from pydantic.config import BaseConfig, inherit_config
+from pydantic.errors import ConfigError
+from pydantic.fields import Undefined, is_finalvar_with_default_val
+from pydantic.main import (
+    ANNOTATED_FIELD_UNTOUCHED_TYPES,
+    UNTOUCHED_TYPES,
+    ModelMetaclass,
+)
+from pydantic.types import PyObject
+from pydantic.typing import (
+    get_args,
+    get_origin,
+    is_classvar,
+    is_union,
+    resolve_annotations,
+)
+from pydantic.utils import is_valid_field, lenient_issubclass
+
+# BaseModel's own __fields_set__ slot, it holds the shared frozenset
+_fields_set_slot = BaseModel.__dict__["__fields_set__"]
+
+_fields_sets: dict[frozenset, frozenset] = {}
+
+
+def _shared(fields_set: typing.Iterable[str]) -> frozenset:
+    fields_set = frozenset(fields_set)
+    return _fields_sets.setdefault(fields_set, fields_set)
+
+
+def _slotted(bases: tuple[type, ...]) -> set[str]:
+    return {
+        name
+        for base in bases
+        for cls in base.__mro__
+        for name, attr in vars(cls).items()
+        if isinstance(attr, MemberDescriptorType)
+    }
+
+
+def _values_getter(names: tuple[str, ...]) -> typing.Callable[[typing.Any], dict]:
+    if not names:
+        return lambda model: {}
+    get = attrgetter(*names)
+    if len(names) == 1:
+        return lambda model: {names[0]: get(model)}
+    return lambda model: dict(zip(names, get(model)))
+
+
+def _is_untouched(value: typing.Any, untouched_types: tuple) -> bool:
+    return (
+        isinstance(value, untouched_types)
+        or value.__class__.__name__ == "cython_function_or_method"
+    )
+
+
+def _field_names(
+    bases: tuple[type, ...], namespace: dict, kwargs: dict
+) -> dict[str, None]:
+    """Names ``ModelMetaclass`` makes fields of, by its own rules."""
+    names: dict[str, None] = {}
+    config = BaseConfig
+    class_vars: set[str] = set()
+    for base in reversed(bases):
+        if issubclass(base, BaseModel) and base is not BaseModel:
+            names.update(dict.fromkeys(base.__fields__))
+            config = inherit_config(base.__config__, config)
+            class_vars.update(base.__class_vars__)
+    keep_untouched = kwargs.get(
+        "keep_untouched",
+        inherit_config(namespace.get("Config"), config).keep_untouched,
+    )
+
+    annotations = resolve_annotations(
+        namespace.get("__annotations__", {}), namespace.get("__module__")
+    )
+    for ann_name, ann_type in annotations.items():
+        value = namespace.get(ann_name, Undefined)
+        if is_classvar(ann_type) or is_finalvar_with_default_val(ann_type, value):
+            class_vars.add(ann_name)
+        elif is_valid_field(ann_name):
+            allowed_types = (
+                get_args(ann_type) if is_union(get_origin(ann_type)) else (ann_type,)
+            )
+            if (
+                _is_untouched(value, ANNOTATED_FIELD_UNTOUCHED_TYPES)
+                and ann_type != PyObject
+                and not any(
+                    lenient_issubclass(get_origin(allowed_type), type)
+                    for allowed_type in allowed_types
+                )
+            ):
+                continue
+            names[ann_name] = None
+    untouched_types = UNTOUCHED_TYPES + tuple(keep_untouched)
+    for var_name, value in namespace.items():
+        if (
+            is_valid_field(var_name)
+            and var_name not in annotations
+            and var_name not in class_vars
+            and not _is_untouched(value, untouched_types)
+        ):
+            names[var_name] = None
+    return names
+
+
+class CompactMeta(ModelMetaclass):
+    def __new__(mcs, name, bases, namespace, **kwargs):
+        # slots have to be declared when the class is created, before pydantic
+        # has decided what the fields are
+        slotted = _slotted(bases)
+        new = tuple(
+            field
+            for field in _field_names(bases, namespace, kwargs)
+            if field not in slotted
+        )
+        if new:
+            namespace = dict(namespace)
+            slots = namespace.get("__slots__", ())
+            slots = (slots,) if isinstance(slots, str) else tuple(slots)
+            namespace["__slots__"] = slots + new
+        cls = super().__new__(mcs, name, bases, namespace, **kwargs)
+        if cls.__config__.extra is Extra.allow:
+            raise ConfigError(f"{name}: compact models can not store extra fields")
+        unslotted = set(cls.__fields__).difference(slotted, new)
+        if unslotted:
+            raise ConfigError(f"{name}: no slots for fields {sorted(unslotted)}")
+        cls.__compact_values__ = _values_getter(tuple(cls.__fields__))
+        return cls
+
+
+class CompactModel(BaseModel, metaclass=CompactMeta):
+    """``BaseModel`` with field values in slots and shared ``__fields_set__``."""
+
+    __slots__ = ()
+
+    @property
+    def __dict__(self) -> dict[str, typing.Any]:
+        try:
+            return type(self).__compact_values__(self)
+        except AttributeError:
+            # ``construct()`` may leave fields unset
+            return {
+                name: getattr(self, name)
+                for name in self.__fields__
+                if hasattr(self, name)
+            }
+
+    @__dict__.setter
+    def __dict__(self, values: dict[str, typing.Any]) -> None:
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    @property
+    def __fields_set__(self) -> set[str]:
+        return set(_fields_set_slot.__get__(self))
+
+    @__fields_set__.setter
+    def __fields_set__(self, fields_set: typing.Iterable[str]) -> None:
+        _fields_set_slot.__set__(self, _shared(fields_set))
+
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        super().__setattr__(name, value)
+        if name in self.__fields__:
+            # BaseModel only wrote to a copy of ``__dict__`` and ``__fields_set__``
+            if not self.__config__.validate_assignment:
+                object.__setattr__(self, name, value)
+            _fields_set_slot.__set__(
+                self, _shared(_fields_set_slot.__get__(self) | {name})
+            )
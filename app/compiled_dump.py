@@ -0,0 +1,145 @@
+"""Compiled fast path for dumping flat marshmallow schemas.
+
+``Schema.dump`` walks ``dump_fields`` and calls ``Field.serialize`` for every
+field of every object. For flat schemas (string and datetime fields only) the
+whole walk can be generated once as plain Python source, which removes the
+per-field dispatch while producing exactly the same output.
+
+    dumper = compile_dumper(UserSchema(only=("name", "email")))
+    dumper.dump(user)            # same as UserSchema(only=...).dump(user)
+    dumper.dumps(users, many=True)
+"""
+
+import typing
+
+from marshmallow import Schema, fields, missing, utils
+from marshmallow.decorators import POST_DUMP, PRE_DUMP
+
+
+class SchemaCompileError(ValueError):
+    """The schema uses something a compiled fast path can not reproduce."""
+
+
+def _check_field(name: str, field: fields.Field) -> None:
+    field_class = type(field)
+    if (
+        field_class.serialize is not fields.Field.serialize
+        or field_class.get_value is not fields.Field.get_value
+        or not field._CHECK_ATTRIBUTE
+    ):
+        raise SchemaCompileError(
+            f"field {name!r} ({field_class.__name__}) customises value access"
+        )
+    if field_class._serialize not in (
+        fields.String._serialize,
+        fields.DateTime._serialize,
+    ):
+        raise SchemaCompileError(
+            f"field {name!r} ({field_class.__name__}) is not a string or datetime field"
+        )
+
+
+def _check_schema(schema: Schema) -> None:
+    if schema._hooks[PRE_DUMP] or schema._hooks[POST_DUMP]:
+        raise SchemaCompileError("pre_dump/post_dump hooks are not supported")
+    if type(schema).get_attribute is not Schema.get_attribute:
+        raise SchemaCompileError("custom Schema.get_attribute is not supported")
+    for name, field in schema.dump_fields.items():
+        _check_field(name, field)
+
+
+def _serialize_expr(index: int, field: fields.Field, namespace: dict) -> str:
+    """Python expression equal to ``field._serialize(value, ...)``."""
+    if type(field)._serialize is fields.String._serialize:
+        # utils.ensure_text_type: str(value) is value for exact str
+        namespace["_ensure_text"] = utils.ensure_text_type
+        return (
+            "None if value is None else "
+            "(value if value.__class__ is str else _ensure_text(value))"
+        )
+
+    data_format = field.format or field.DEFAULT_FORMAT
+    format_func = field.SERIALIZATION_FUNCS.get(data_format)
+    if format_func is utils.isoformat:
+        return "None if value is None else value.isoformat()"
+    if format_func is not None:
+        namespace[f"_format_{index}"] = format_func
+        return f"None if value is None else _format_{index}(value)"
+    namespace[f"_strftime_{index}"] = data_format
+    return f"None if value is None else value.strftime(_strftime_{index})"
+
+
+def _generate(schema: Schema) -> tuple[str, dict]:
+    namespace: dict[str, typing.Any] = {
+        "missing": missing,
+        "_dict_class": schema.dict_class,
+        "_get_value_for_key": utils._get_value_for_key,
+        "_get_value": utils.get_value,
+    }
+    lines = [
+        "def dump_one(obj):",
+        "    if hasattr(obj, '__getitem__'):",
+        "        get = _get_value_for_key",
+        "    else:",
+        "        get = getattr",
+        "    ret = {}" if schema.dict_class is dict else "    ret = _dict_class()",
+    ]
+    for index, (attr_name, field) in enumerate(schema.dump_fields.items()):
+        key = attr_name if field.attribute is None else field.attribute
+        data_key = field.data_key if field.data_key is not None else attr_name
+        if "." in key:
+            lines.append(f"    value = _get_value(obj, {key!r}, missing)")
+        else:
+            lines.append(f"    value = get(obj, {key!r}, missing)")
+
+        default = field.dump_default
+        if default is not missing:
+            namespace[f"_default_{index}"] = default
+            call = "()" if callable(default) else ""
+            lines.append("    if value is missing:")
+            lines.append(f"        value = _default_{index}{call}")
+
+        lines.append("    if value is not missing:")
+        lines.append(
+            f"        ret[{data_key!r}] = {_serialize_expr(index, field, namespace)}"
+        )
+    lines.append("    return ret")
+    return "\n".join(lines) + "\n", namespace
+
+
+class CompiledDumper:
+    """Drop-in replacement for ``schema.dump``/``schema.dumps``."""
+
+    def __init__(self, schema: Schema):
+        _check_schema(schema)
+        self.schema = schema
+        self.source, namespace = _generate(schema)
+        code = compile(
+            self.source, f"<compiled dumper {type(schema).__name__}>", "exec"
+        )
+        exec(code, namespace)
+        self.dump_one = namespace["dump_one"]
+
+    def dump(self, obj: typing.Any, *, many: bool | None = None):
+        many = self.schema.many if many is None else bool(many)
+        if many and obj is not None:
+            dump_one = self.dump_one
+            return [dump_one(d) for d in obj]
+        return self.dump_one(obj)
+
+    def dumps(self, obj: typing.Any, *args, many: bool | None = None, **kwargs) -> str:
+        serialized = self.dump(obj, many=many)
+        return self.schema.opts.render_module.dumps(serialized, *args, **kwargs)
+
+
+def compile_dumper(schema: Schema | type[Schema], **schema_kwargs) -> CompiledDumper:
+    """Build a ``CompiledDumper`` for a schema instance or class.
+
+    ``schema_kwargs`` (``only``, ``exclude``, ``many``...) are passed to the
+    schema class when a class is given.
+    """
+    if isinstance(schema, type):
+        schema = schema(**schema_kwargs)
+    elif schema_kwargs:
+        raise TypeError("schema_kwargs are only accepted together with a schema class")
+    return CompiledDumper(schema)
@@ -0,0 +1,309 @@
+"""Cheaper error reporting for payloads that are rejected anyway.
+
+A rejected payload normally validates every field and builds the whole error
+report (messages, ``valid_data``, ``loc`` tuples). Two lighter modes can be
+picked per call, for marshmallow schemas and pydantic models alike:
+
+    load(UserSchema(), data)                    # "full": the library's ValidationError
+    load(UserSchema(), data, errors="first")    # FirstError(("email",), "invalid")
+    load_many(UserModel, records, errors="count")
+    # CountResult(valid=[...], invalid=3, codes=Counter({"value_error.missing": 3}))
+
+``"first"`` stops at the first failing field and raises ``FirstError``, which
+only holds the location and a short code: the error key of the field
+(``"required"``, ``"invalid"``, ...) or the validator (``"email"``,
+``"length"``) for marshmallow, the error type (``"type_error.integer"``) for
+pydantic. ``"count"`` validates every record in ``"first"`` mode and returns
+the valid ones with per-code counts of the rejected ones.
+
+Fields are visited in the order the libraries use, so the first error is the
+first one the full report would list. Nested schemas and models still build
+their own errors.
+"""
+
+import typing
+from collections import Counter
+from collections.abc import Mapping
+
+import marshmallow
+import pydantic
+from marshmallow import EXCLUDE, INCLUDE, RAISE, fields, missing, validate
+from marshmallow.decorators import POST_LOAD, PRE_LOAD, VALIDATES_SCHEMA
+from marshmallow.error_store import ErrorStore
+from marshmallow.utils import is_collection, set_value
+from pydantic.error_wrappers import ErrorWrapper, get_exc_type
+from pydantic.utils import ROOT_KEY
+
+from app.adapters import SchemaAdapter, adapt
+
+ErrorMode = typing.Literal["full", "first", "count"]
+
+
+class FirstError(ValueError):
+    """The first error of a payload: where it is and a short code."""
+
+    __slots__ = ("loc", "code")
+
+    def __init__(self, loc: tuple, code: str):
+        self.loc = loc
+        self.code = code
+
+    def __str__(self) -> str:
+        return f"{' -> '.join(map(str, self.loc)) or ROOT_KEY}: {self.code}"
+
+    def __repr__(self) -> str:
+        return f"FirstError(loc={self.loc!r}, code={self.code!r})"
+
+
+class CountResult(typing.NamedTuple):
+    valid: list
+    invalid: int
+    # first error code of each rejected record -> number of records
+    codes: Counter
+
+
+def _message_codes() -> dict[str, str]:
+    """Default marshmallow messages -> error key or validator name."""
+    codes = {}
+    for validator in vars(validate).values():
+        message = getattr(validator, "default_message", None)
+        if isinstance(message, str) and "{" not in message:
+            codes[message] = validator.__name__.lower()
+    for field_class in vars(fields).values():
+        if isinstance(field_class, type) and issubclass(field_class, fields.Field):
+            for key, message in field_class.default_error_messages.items():
+                if isinstance(message, str) and "{" not in message:
+                    codes.setdefault(message, key)
+    for key, message in marshmallow.Schema._default_error_messages.items():
+        codes.setdefault(message, key)
+    return codes
+
+
+_MESSAGE_CODES = _message_codes()
+
+
+def _schema_first(messages: typing.Any, loc: tuple = (), field=None) -> FirstError:
+    """First leaf of marshmallow error messages."""
+    while isinstance(messages, dict) and messages:
+        key, messages = next(iter(messages.items()))
+        loc += (key,)
+    if isinstance(messages, list) and messages:
+        messages = messages[0]
+    if isinstance(messages, dict):
+        return _schema_first(messages, loc)
+    code = None
+    if field is not None:
+        code = next((k for k, m in field.error_messages.items() if m == messages), None)
+    return FirstError(loc, code or _MESSAGE_CODES.get(messages, "invalid"))
+
+
+def _model_first(error: typing.Any, loc: tuple = ()) -> FirstError:
+    """First error of pydantic raw errors, nested ``ValidationError`` unwrapped."""
+    while isinstance(error, list):
+        error = error[0]
+    loc += error.loc_tuple()
+    exc = error.exc
+    if isinstance(exc, pydantic.ValidationError):
+        return _model_first(exc.raw_errors, loc)
+    return FirstError(loc, get_exc_type(exc.__class__))
+
+
+def _schema_first_error(
+    schema: marshmallow.Schema, data: typing.Any, unknown: str | None = None
+) -> typing.Any:
+    """``schema.load(data)`` that raises ``FirstError`` at the first error."""
+    unknown = schema.unknown if unknown is None else unknown
+    partial = schema.partial
+    hooks = schema._hooks
+    original_data = data
+    if hooks[PRE_LOAD]:
+        try:
+            data = schema._invoke_load_processors(
+                PRE_LOAD, data, many=False, original_data=data, partial=partial
+            )
+        except marshmallow.ValidationError as error:
+            raise _schema_first(error.normalized_messages()) from None
+    if not isinstance(data, Mapping):
+        raise FirstError((), "type")
+
+    result = schema.dict_class()
+    partial_is_collection = is_collection(partial)
+    for attr_name, field in schema.load_fields.items():
+        data_key = field.data_key if field.data_key is not None else attr_name
+        raw = data.get(data_key, missing)
+        if raw is missing and (
+            partial is True or (partial_is_collection and attr_name in partial)
+        ):
+            continue
+        kwargs = {}
+        if partial_is_collection:
+            prefix = data_key + "."
+            kwargs["partial"] = [
+                p[len(prefix) :] for p in partial if p.startswith(prefix)
+            ]
+        elif partial is not None:
+            kwargs["partial"] = partial
+        try:
+            value = field.deserialize(raw, data_key, data, **kwargs)
+        except marshmallow.ValidationError as error:
+            raise _schema_first(error.messages, (data_key,), field) from None
+        if value is not missing:
+            set_value(result, field.attribute or attr_name, value)
+
+    if unknown != EXCLUDE:
+        data_keys = {
+            f.data_key if f.data_key is not None else name
+            for name, f in schema.load_fields.items()
+        }
+        for key in data:
+            if key in data_keys:
+                continue
+            if unknown == RAISE:
+                raise FirstError((key,), "unknown")
+            if unknown == INCLUDE:
+                result[key] = data[key]
+
+    # @validates and @validates_schema report through an ErrorStore
+    error_store = ErrorStore()
+    schema._invoke_field_validators(error_store=error_store, data=result, many=False)
+    if not error_store.errors and hooks[VALIDATES_SCHEMA]:
+        for pass_many in (True, False):
+            schema._invoke_schema_validators(
+                error_store=error_store,
+                pass_many=pass_many,
+                data=result,
+                original_data=original_data,
+                many=False,
+                partial=partial,
+                field_errors=False,
+            )
+    if error_store.errors:
+        raise _schema_first(error_store.errors)
+    if hooks[POST_LOAD]:
+        try:
+            result = schema._invoke_load_processors(
+                POST_LOAD,
+                result,
+                many=False,
+                original_data=original_data,
+                partial=partial,
+            )
+        except marshmallow.ValidationError as error:
+            raise _schema_first(error.normalized_messages()) from None
+    return result
+
+
+_missing = object()
+
+
+def _model_first_error(
+    model: type[pydantic.BaseModel], data: typing.Any
+) -> pydantic.BaseModel:
+    """``model.parse_obj(data)`` that raises ``FirstError`` at the first error.
+
+    Follows ``parse_obj`` and ``pydantic.main.validate_model``.
+    """
+    data = model._enforce_dict_if_root(data)
+    if not isinstance(data, dict):
+        try:
+            data = dict(data)
+        except (TypeError, ValueError):
+            raise FirstError((ROOT_KEY,), "type_error") from None
+    config = model.__config__
+    for validator in model.__pre_root_validators__:
+        try:
+            data = validator(model, data)
+        except (ValueError, TypeError, AssertionError) as exc:
+            raise _model_first(ErrorWrapper(exc, loc=ROOT_KEY)) from None
+
+    values, fields_set, names_used = {}, set(), set()
+    check_extra = config.extra is not pydantic.Extra.ignore
+    for name, field in model.__fields__.items():
+        value = data.get(field.alias, _missing)
+        using_name = False
+        if (
+            value is _missing
+            and config.allow_population_by_field_name
+            and field.alt_alias
+        ):
+            value = data.get(field.name, _missing)
+            using_name = True
+        if value is _missing:
+            if field.required:
+                raise FirstError((field.alias,), "value_error.missing")
+            value = field.get_default()
+            if not config.validate_all and not field.validate_always:
+                values[name] = value
+                continue
+        else:
+            fields_set.add(name)
+            if check_extra:
+                names_used.add(field.name if using_name else field.alias)
+        value, error = field.validate(value, values, loc=field.alias, cls=model)
+        if error:
+            raise _model_first(error)
+        values[name] = value
+
+    if check_extra:
+        extra = data.keys() - names_used
+        if extra:
+            if config.extra is pydantic.Extra.forbid:
+                key = next(k for k in data if k in extra)
+                raise FirstError((key,), "value_error.extra")
+            for key in extra:
+                values[key] = data[key]
+
+    for _, validator in model.__post_root_validators__:
+        try:
+            values = validator(model, values)
+        except (ValueError, TypeError, AssertionError) as exc:
+            raise _model_first(ErrorWrapper(exc, loc=ROOT_KEY)) from None
+
+    m = model.__new__(model)
+    object.__setattr__(m, "__dict__", values)
+    object.__setattr__(m, "__fields_set__", fields_set)
+    m._init_private_attributes()
+    return m
+
+
+def _first_error_loader(target) -> typing.Callable[[typing.Any], typing.Any]:
+    adapter = adapt(target)
+    if isinstance(adapter, SchemaAdapter):
+        return lambda record: _schema_first_error(adapter.schema, record)
+    return lambda record: _model_first_error(adapter.model, record)
+
+
+def load(target, data: typing.Any, *, errors: ErrorMode = "full") -> typing.Any:
+    """Load one record; ``errors="first"`` raises ``FirstError`` instead."""
+    if errors == "full":
+        return adapt(target).load_one(data)
+    if errors == "first":
+        return _first_error_loader(target)(data)
+    raise ValueError(f"errors must be 'full' or 'first', got {errors!r}")
+
+
+def load_many(
+    target, records: typing.Iterable, *, errors: ErrorMode = "full"
+) -> list | CountResult:
+    """Load a batch.
+
+    ``"full"`` is ``load(many=True)`` / ``parse_obj_as``; ``"first"`` raises a
+    ``FirstError`` located under the index of the first bad record; ``"count"``
+    returns a ``CountResult``.
+    """
+    if errors == "full":
+        return adapt(target).load_many(list(records))
+    if errors not in ("first", "count"):
+        raise ValueError(f"errors must be 'full', 'first' or 'count', got {errors!r}")
+    load_one = _first_error_loader(target)
+    valid, codes = [], Counter()
+    for index, record in enumerate(records):
+        try:
+            valid.append(load_one(record))
+        except FirstError as error:
+            if errors == "first":
+                raise FirstError((index,) + error.loc, error.code) from None
+            codes[error.code] += 1
+    if errors == "first":
+        return valid
+    return CountResult(valid, sum(codes.values()), codes)
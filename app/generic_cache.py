@@ -0,0 +1,187 @@
+"""Bounded cache of parametrised ``GenericModel`` classes.
+
+``Response[DataModel]`` creates a new model class, with its own fields and
+validators. pydantic keeps these classes in a ``WeakValueDictionary``. A class
+parametrised inside a request handler is garbage once the handler returns, and
+the first request after a garbage collection builds it again. ``GenericCache``
+replaces that dictionary. It keeps the ``maxsize`` most recently used classes
+alive, and still finds evicted classes for as long as something else uses them:
+
+    generic_cache.enable()
+    generic_cache.warm(Response, [int, str, DataModel])   # at startup
+    Response[DataModel]                                   # from the cache
+    generic_cache.stats()
+
+With nothing else holding them, the classes of at most ``maxsize`` entries stay
+in memory, however many distinct parametrisations are created. ``Response[X] is Response[X]``
+holds while the class is in use, as it does with pydantic's own cache.
+Lookups and stores are thread-safe. Classes are still built by pydantic,
+outside the cache: two threads parametrising the same type for the first time
+can each build a class, and the last one stored is kept. Warming the cache at
+startup avoids this.
+"""
+
+import threading
+import typing
+import weakref
+from collections import OrderedDict
+
+from pydantic import generics
+from pydantic.generics import GenericModel
+
+DEFAULT_MAXSIZE = 256
+
+_MISS = object()
+
+
+class GenericCache:
+    """Thread-safe LRU of parametrised generic models, used while enabled.
+
+    Keyed like pydantic's own cache: ``Response[int]`` and ``Response[(int,)]``
+    are two entries for the same class. Hits take no lock, so under concurrent
+    use the counters are approximate.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # hits on evicted classes that were still in use
+        self.revivals = 0
+        self._models: OrderedDict[tuple, type[GenericModel]] = OrderedDict()
+        self._evicted: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+        self._replaced: typing.MutableMapping | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return generics._generic_types_cache is self
+
+    def enable(self) -> None:
+        """Use this cache for every ``GenericModel`` parametrisation."""
+        if self.enabled:
+            return
+        if isinstance(generics._generic_types_cache, GenericCache):
+            raise RuntimeError(f"another {type(self).__name__} is already enabled")
+        self._replaced = generics._generic_types_cache
+        with self._lock:
+            # classes parametrised so far stay the same objects
+            self._evicted.update(self._replaced)
+        generics._generic_types_cache = self
+
+    def disable(self) -> None:
+        """Hand the cached classes back to pydantic's weak cache."""
+        if not self.enabled:
+            return
+        replaced = self._replaced
+        with self._lock:
+            replaced.update(self._evicted)
+            replaced.update(self._models)
+        generics._generic_types_cache = replaced
+        self._replaced = None
+
+    def __enter__(self) -> "GenericCache":
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.disable()
+
+    def get(self, key: tuple, default: typing.Any = None) -> typing.Any:
+        # hits skip the lock: single OrderedDict calls are atomic, an entry
+        # evicted in between is still found below
+        model = self._models.get(key)
+        if model is not None:
+            try:
+                self._models.move_to_end(key)
+            except KeyError:
+                pass
+            else:
+                self.hits += 1
+                return model
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self.hits += 1
+                return model
+            model = self._evicted.get(key)
+            if model is not None:
+                self.hits += 1
+                self.revivals += 1
+                self._store(key, model)
+                return model
+            self.misses += 1
+            return default
+
+    def __getitem__(self, key: tuple) -> type[GenericModel]:
+        model = self.get(key, _MISS)
+        if model is _MISS:
+            raise KeyError(key)
+        return model
+
+    def __setitem__(self, key: tuple, model: type[GenericModel]) -> None:
+        with self._lock:
+            self._store(key, model)
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return key in self._models or key in self._evicted
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def _store(self, key: tuple, model: type[GenericModel]) -> None:
+        self._evicted.pop(key, None)
+        self._models[key] = model
+        self._models.move_to_end(key)
+        while len(self._models) > self.maxsize:
+            old_key, old_model = self._models.popitem(last=False)
+            self._evicted[old_key] = old_model
+            self.evictions += 1
+
+    def warm(
+        self, model: type[GenericModel], params: typing.Iterable
+    ) -> list[type[GenericModel]]:
+        """Parametrise ``model`` with each of ``params`` ahead of time.
+
+        Use tuples for models with several type variables:
+        ``warm(Pair, [(int, str), (str, str)])``.
+        """
+        if not self.enabled:
+            raise RuntimeError("enable() the cache before warming it")
+        models = []
+        for each in params:
+            parametrised = model[each]
+            # pydantic names the calling module, i.e. this one
+            if parametrised.__module__ == __name__:
+                parametrised.__module__ = model.__module__
+            models.append(parametrised)
+        return models
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict[str, typing.Any]:
+        with self._lock:
+            return {
+                "size": len(self._models),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "revivals": self.revivals,
+                "hit_rate": self.hit_rate,
+            }
+
+    def clear(self) -> None:
+        """Drop the cached classes; ones still in use are still found."""
+        with self._lock:
+            self._evicted.update(self._models)
+            self._models.clear()
+            self.hits = self.misses = self.evictions = self.revivals = 0
+
+
+generic_cache = GenericCache()
@@ -0,0 +1,234 @@
+"""Schema hooks resolved once into flat call lists.
+
+``Schema`` keeps its ``@pre_load``/``@post_load``/``@pre_dump``/``@post_dump``
+and ``@validates_schema`` hooks as ``(name, pass_many, kwargs)`` entries and,
+on every ``load``/``dump``, walks all of them per tag: skips the ones of the
+other ``pass_many`` kind, looks each method up with ``getattr`` and reads its
+options again. ``PipelineSchema`` orders them once per class, inherited hooks
+(an ``__envelope__`` unwrapping base schema) included, and binds them once per
+instance:
+
+    class BaseSchema(PipelineSchema):
+        @pre_load(pass_many=True)
+        def unwrap_envelope(self, data, many, **kwargs): ...
+
+        make_object = constructs("__model__")
+
+    class UserSchema(BaseSchema):
+        __model__ = User
+        name = fields.Str()
+
+    UserSchema(many=True).load(data)   # [User(**item) for item in items]
+
+``constructs(model)`` is a ``@post_load`` hook building ``model(**data)``; a
+``PipelineSchema`` runs it over all items of a ``many=True`` load in one go,
+a plain ``Schema`` item by item. ``model`` can be the name of a schema
+attribute holding the class. Hooks are called in the same order, with the same
+arguments, as ``Schema`` calls them.
+"""
+
+import typing
+from itertools import zip_longest
+
+from marshmallow import Schema, post_load
+from marshmallow.decorators import (
+    POST_DUMP,
+    POST_LOAD,
+    PRE_DUMP,
+    PRE_LOAD,
+    VALIDATES_SCHEMA,
+)
+from marshmallow.error_store import ErrorStore
+from marshmallow.schema import SchemaMeta
+
+_CONSTRUCTS_KEY = "__constructs__"
+
+# tag -> pass_many values in the order Schema runs them
+_ORDER = {
+    PRE_LOAD: (True, False),
+    POST_LOAD: (True, False),
+    PRE_DUMP: (False, True),
+    POST_DUMP: (False, True),
+}
+
+
+class Step(typing.NamedTuple):
+    """One hook of a compiled pipeline."""
+
+    name: str
+    pass_many: bool
+    pass_original: bool
+    # constructs() hooks: the model, or the name of the attribute holding it
+    model: type | str | None = None
+
+
+class SchemaValidatorStep(typing.NamedTuple):
+    name: str
+    pass_original: bool
+    skip_on_field_errors: bool
+
+
+def constructs(model: type | str) -> typing.Callable:
+    """``@post_load`` hook returning ``model(**data)``.
+
+    ``model`` is a class, or the name of the schema attribute holding it
+    (``"__model__"``), looked up on the schema instance.
+    """
+
+    def make_object(self, data, **kwargs):
+        cls = getattr(self, model) if isinstance(model, str) else model
+        return cls(**data)
+
+    setattr(make_object, _CONSTRUCTS_KEY, model)
+    return post_load(make_object)
+
+
+def compile_hooks(
+    schema_class: type[Schema], hooks: dict[str, list[tuple[str, bool, dict]]]
+) -> dict[typing.Any, tuple]:
+    """Hooks of ``schema_class`` as flat lists in call order.
+
+    Processors are keyed by tag, ``@validates_schema`` hooks by
+    ``(VALIDATES_SCHEMA, pass_many)``.
+    """
+    pipeline: dict[typing.Any, tuple] = {}
+    for tag, order in _ORDER.items():
+        pipeline[tag] = tuple(
+            Step(
+                name,
+                many,
+                kwargs.get("pass_original", False),
+                getattr(getattr(schema_class, name), _CONSTRUCTS_KEY, None),
+            )
+            for pass_many in order
+            for name, many, kwargs in hooks.get(tag, ())
+            if many == pass_many
+        )
+    for pass_many in (True, False):
+        pipeline[VALIDATES_SCHEMA, pass_many] = tuple(
+            SchemaValidatorStep(
+                name,
+                kwargs.get("pass_original", False),
+                kwargs.get("skip_on_field_errors", True),
+            )
+            for name, many, kwargs in hooks.get(VALIDATES_SCHEMA, ())
+            if many == pass_many
+        )
+    return pipeline
+
+
+def _constructor(model: type) -> typing.Callable:
+    def construct(data, many):
+        if many:
+            return [model(**item) for item in data]
+        return model(**data)
+
+    return construct
+
+
+class PipelineSchemaMeta(SchemaMeta):
+    def resolve_hooks(cls) -> dict[str, list[tuple[str, bool, dict]]]:
+        hooks = super().resolve_hooks()
+        cls._pipeline = compile_hooks(cls, hooks)
+        return hooks
+
+
+class PipelineSchema(Schema, metaclass=PipelineSchemaMeta):
+    """``Schema`` calling its hooks from lists compiled once per class."""
+
+    _pipeline: dict[typing.Any, tuple]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # key -> (bound hook, pass_many, pass_original) in call order; constructs()
+        # hooks become one call handling every item
+        self._calls: dict[typing.Any, tuple] = {}
+        for key, steps in self._pipeline.items():
+            if key in _ORDER:
+                self._calls[key] = tuple(self._bind(step) for step in steps)
+            else:
+                self._calls[key] = tuple(
+                    (
+                        getattr(self, step.name),
+                        step.pass_original,
+                        step.skip_on_field_errors,
+                    )
+                    for step in steps
+                )
+
+    def _bind(self, step: Step) -> tuple:
+        if step.model is None:
+            return getattr(self, step.name), step.pass_many, step.pass_original
+        model = step.model
+        if isinstance(model, str):
+            model = getattr(self, model)
+        return _constructor(model), None, False
+
+    def _invoke_calls(self, tag: str, data, *, many: bool, original_data, **kwargs):
+        for call, pass_many, pass_original in self._calls[tag]:
+            if pass_many is None:
+                data = call(data, many)
+            elif many and not pass_many:
+                if pass_original:
+                    data = [
+                        call(item, original, many=many, **kwargs)
+                        for item, original in zip_longest(data, original_data)
+                    ]
+                else:
+                    data = [call(item, many=many, **kwargs) for item in data]
+            elif pass_original:
+                data = call(data, original_data, many=many, **kwargs)
+            else:
+                data = call(data, many=many, **kwargs)
+        return data
+
+    def _invoke_dump_processors(
+        self, tag: str, data, *, many: bool, original_data=None
+    ):
+        return self._invoke_calls(tag, data, many=many, original_data=original_data)
+
+    def _invoke_load_processors(
+        self, tag: str, data, *, many: bool, original_data, partial
+    ):
+        return self._invoke_calls(
+            tag, data, many=many, original_data=original_data, partial=partial
+        )
+
+    def _invoke_schema_validators(
+        self,
+        *,
+        error_store: ErrorStore,
+        pass_many: bool,
+        data,
+        original_data,
+        many: bool,
+        partial,
+        field_errors: bool = False,
+    ):
+        for validator, pass_original, skip_on_field_errors in self._calls[
+            VALIDATES_SCHEMA, pass_many
+        ]:
+            if field_errors and skip_on_field_errors:
+                continue
+            if many and not pass_many:
+                for index, (item, original) in enumerate(zip(data, original_data)):
+                    self._run_validator(
+                        validator,
+                        item,
+                        original_data=original,
+                        error_store=error_store,
+                        many=many,
+                        partial=partial,
+                        index=index,
+                        pass_original=pass_original,
+                    )
+            else:
+                self._run_validator(
+                    validator,
+                    data,
+                    original_data=original_data,
+                    error_store=error_store,
+                    many=many,
+                    pass_original=pass_original,
+                    partial=partial,
+                )
@@ -0,0 +1,269 @@
+"""Re-validate only what a change can affect.
+
+Patching a model by rebuilding it, ``UserModel(**{**user.dict(), **changes})``,
+runs every field and every ``@validator``/``@root_validator`` again.
+``patch`` validates the changed fields, the fields whose validators read them
+from ``values`` (and so on, transitively) and the root validators that read
+any of those, and copies the rest over:
+
+    user = patch(user, {"name": "guido van rossum"})   # name validators only
+    user = patch(user, {"password1": "qwerty"})        # + passwords_match
+
+Which fields a validator reads is inferred from its source: ``values["x"]``,
+``values.get("x")`` and ``"x" in values``. Any other use of ``values`` (passing
+it on, iterating it) counts as reading every field, as does a validator
+without source. ``@depends_on("x", "y")`` declares the fields instead:
+
+    @validator("password2")
+    @depends_on("password1")
+    def passwords_match(cls, v, values):
+        ...
+
+The result is a new instance whose unchanged values are the same objects as
+the original's. Errors are raised as ``ValidationError``, as the model would.
+"""
+
+import ast
+import inspect
+import textwrap
+import threading
+import typing
+
+from pydantic import BaseModel, ValidationError
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.utils import ROOT_KEY
+
+# field names a validator reads from ``values``; None: all of them
+Dependencies = frozenset[str] | None
+
+_F = typing.TypeVar("_F", bound=typing.Callable)
+
+
+def depends_on(*fields: str) -> typing.Callable[[_F], _F]:
+    """Declare the fields a validator reads from ``values``."""
+
+    def decorator(func: _F) -> _F:
+        func.__depends_on__ = frozenset(fields)
+        return func
+
+    return decorator
+
+
+def _function_node(func: typing.Callable) -> ast.AST | None:
+    try:
+        source = textwrap.dedent(inspect.getsource(func))
+    except (OSError, TypeError):
+        return None
+    for node in ast.walk(ast.parse(source)):
+        if (
+            isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+            and node.name == func.__name__
+        ):
+            return node
+    return None
+
+
+def _str_constant(node: ast.AST) -> str | None:
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return None
+
+
+def _keys_read(func: typing.Callable, param: str) -> Dependencies:
+    """Keys ``func`` reads from its ``param`` mapping, None if it can't tell."""
+    node = _function_node(func)
+    if node is None:
+        return None
+    parents = {
+        child: parent
+        for parent in ast.walk(node)
+        for child in ast.iter_child_nodes(parent)
+    }
+    keys = set()
+    for name in ast.walk(node):
+        if not (isinstance(name, ast.Name) and name.id == param):
+            continue
+        if not isinstance(name.ctx, ast.Load):
+            return None
+        parent = parents[name]
+        key = None
+        if isinstance(parent, ast.Subscript) and parent.value is name:
+            key = _str_constant(parent.slice)
+        elif (
+            isinstance(parent, ast.Attribute)
+            and parent.attr in ("get", "pop", "setdefault")
+            and isinstance(parents.get(parent), ast.Call)
+            and parents[parent].args
+        ):
+            key = _str_constant(parents[parent].args[0])
+        elif (
+            isinstance(parent, ast.Compare)
+            and len(parent.ops) == 1
+            and isinstance(parent.ops[0], (ast.In, ast.NotIn))
+            and parent.comparators[0] is name
+        ):
+            key = _str_constant(parent.left)
+        elif isinstance(parent, ast.Return):
+            # handing the mapping back reads nothing
+            continue
+        if key is None:
+            return None
+        keys.add(key)
+    return frozenset(keys)
+
+
+def _field_validator_reads(func: typing.Callable) -> Dependencies:
+    declared = getattr(func, "__depends_on__", None)
+    if declared is not None:
+        return declared
+    parameters = inspect.signature(func).parameters
+    if "values" in parameters:
+        return _keys_read(func, "values")
+    # pydantic passes ``values`` to a **kwargs validator too
+    if any(p.kind is p.VAR_KEYWORD for p in parameters.values()):
+        return None
+    return frozenset()
+
+
+def _root_validator_reads(func: typing.Callable) -> Dependencies:
+    declared = getattr(func, "__depends_on__", None)
+    if declared is not None:
+        return declared
+    parameters = list(inspect.signature(func).parameters)
+    if len(parameters) < 2:
+        return None
+    return _keys_read(func, parameters[1])
+
+
+class UpdatePlan(typing.NamedTuple):
+    # field -> fields to re-validate when it changes (itself excluded)
+    dependents: dict[str, frozenset[str]]
+    # (validator, fields it reads), in the order the model runs them
+    pre_roots: list[tuple[typing.Callable, Dependencies]]
+    post_roots: list[tuple[bool, typing.Callable, Dependencies]]
+
+
+def _build_plan(model: type[BaseModel]) -> UpdatePlan:
+    names = list(model.__fields__)
+    by_alias = {field.alias: name for name, field in model.__fields__.items()}
+
+    def as_names(keys: Dependencies) -> Dependencies:
+        if keys is None:
+            return None
+        return frozenset(by_alias.get(key, key) for key in keys) & set(names)
+
+    dependents: dict[str, set[str]] = {name: set() for name in names}
+    for name, field in model.__fields__.items():
+        for validator in (field.class_validators or {}).values():
+            reads = _field_validator_reads(validator.func)
+            for source in names if reads is None else reads & set(names):
+                if source != name:
+                    dependents[source].add(name)
+    return UpdatePlan(
+        {name: frozenset(fields) for name, fields in dependents.items()},
+        [
+            (v, as_names(_root_validator_reads(v)))
+            for v in model.__pre_root_validators__
+        ],
+        [
+            (skip_on_failure, v, as_names(_root_validator_reads(v)))
+            for skip_on_failure, v in model.__post_root_validators__
+        ],
+    )
+
+
+_plans: dict[type[BaseModel], UpdatePlan] = {}
+_plans_lock = threading.Lock()
+
+
+def update_plan(model: type[BaseModel]) -> UpdatePlan:
+    """The dependency graph of ``model`` (built once per model)."""
+    with _plans_lock:
+        plan = _plans.get(model)
+        if plan is None:
+            plan = _plans[model] = _build_plan(model)
+        return plan
+
+
+def _affected(plan: UpdatePlan, changed: set[str]) -> set[str]:
+    affected = set(changed)
+    pending = list(changed)
+    while pending:
+        for name in plan.dependents[pending.pop()]:
+            if name not in affected:
+                affected.add(name)
+                pending.append(name)
+    return affected
+
+
+def _runs(reads: Dependencies, changed: set[str]) -> bool:
+    return reads is None or not reads.isdisjoint(changed)
+
+
+_missing = object()
+
+Model = typing.TypeVar("Model", bound=BaseModel)
+
+
+def patch(instance: Model, changes: typing.Mapping[str, typing.Any]) -> Model:
+    """A copy of ``instance`` with ``changes`` (by field name) validated in."""
+    model = type(instance)
+    fields = model.__fields__
+    unknown = [name for name in changes if name not in fields]
+    if unknown:
+        raise ValueError(f"{model.__name__} has no fields {unknown}")
+    plan = update_plan(model)
+    current = instance.__dict__
+    data = dict(changes)
+    changed = set(changes)
+
+    pre_roots = [v for v, reads in plan.pre_roots if _runs(reads, changed)]
+    if pre_roots:
+        raw = {f.alias: data.get(n, current.get(n)) for n, f in fields.items()}
+        for validator in pre_roots:
+            try:
+                raw = validator(model, raw)
+            except (ValueError, TypeError, AssertionError) as exc:
+                raise ValidationError([ErrorWrapper(exc, loc=ROOT_KEY)], model)
+        # whatever the validators replaced is a change too
+        for name, field in fields.items():
+            value = raw.get(field.alias, _missing)
+            if value is not _missing and value is not data.get(name, current[name]):
+                data[name] = value
+                changed.add(name)
+
+    affected = _affected(plan, changed)
+    values, errors = {}, []
+    for name, field in fields.items():
+        if name not in affected:
+            values[name] = current[name]
+            continue
+        value, error = field.validate(
+            data.get(name, current[name]), values, loc=field.alias, cls=model
+        )
+        if error:
+            errors.append(error)
+        else:
+            values[name] = value
+    for key, value in current.items():
+        if key not in fields:
+            values[key] = value
+
+    for skip_on_failure, validator, reads in plan.post_roots:
+        if (skip_on_failure and errors) or not _runs(reads, affected):
+            continue
+        try:
+            values = validator(model, values)
+        except (ValueError, TypeError, AssertionError) as exc:
+            errors.append(ErrorWrapper(exc, loc=ROOT_KEY))
+    if errors:
+        raise ValidationError(errors, model)
+
+    m = model.__new__(model)
+    object.__setattr__(m, "__dict__", values)
+    object.__setattr__(m, "__fields_set__", instance.__fields_set__ | set(changes))
+    for name in model.__private_attributes__:
+        value = getattr(instance, name, _missing)
+        if value is not _missing:
+            object.__setattr__(m, name, value)
+    return m
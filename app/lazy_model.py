@@ -0,0 +1,224 @@
+"""Lazy validation of nested model and list fields.
+
+``Spam(foo=..., bars=[...])`` validates every nested ``Bar`` up front even when
+the caller only reads ``foo.count``. With ``LazyModel`` as base, fields holding
+submodels or collections keep their raw input until first attribute access;
+the validated value is then cached:
+
+    class Spam(LazyModel):
+        foo: Foo
+        bars: list[Bar]
+
+    m = Spam(foo={"count": 4}, bars=[...])   # bars not validated yet
+    m.bars                                   # validated now, ValidationError if bad
+    m.dict()                                 # validates everything that is left
+
+Errors carry the same ``loc`` as eager validation. Required lazy fields are
+still checked for presence up front. Models with a ``@root_validator``
+need all values, or may rewrite the input, so their fields are validated
+eagerly, as is every field before one whose validator takes ``values``.
+"""
+
+import inspect
+import typing
+from types import SimpleNamespace
+
+from pydantic import BaseModel, PrivateAttr, ValidationError
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.errors import MissingError
+from pydantic.fields import SHAPE_SINGLETON, ModelField
+from pydantic.main import validate_model
+
+object_setattr = object.__setattr__
+
+
+def is_lazy_field(field: ModelField) -> bool:
+    """Submodel and collection fields are validated lazily."""
+    return field.shape != SHAPE_SINGLETON or (
+        isinstance(field.type_, type) and issubclass(field.type_, BaseModel)
+    )
+
+
+def reads_values(field: ModelField) -> bool:
+    """Whether a validator of ``field`` takes ``values``."""
+    for validator in field.class_validators.values():
+        parameters = inspect.signature(validator.func).parameters.values()
+        if any(p.name == "values" or p.kind is p.VAR_KEYWORD for p in parameters):
+            return True
+    return False
+
+
+class _LazyPlan(typing.NamedTuple):
+    # stands in for the model in validate_model, without the lazy fields
+    eager: SimpleNamespace
+    lazy: dict[str, ModelField]
+    order: dict[str, int]
+
+
+def _plan(cls: type["LazyModel"]) -> _LazyPlan:
+    plan = cls.__dict__.get("__lazy_plan__")
+    if plan is not None:
+        return plan
+    fields = cls.__fields__
+    lazy = {}
+    if not (cls.__pre_root_validators__ or cls.__post_root_validators__):
+        for name, field in fields.items():
+            if reads_values(field):
+                # validators see every field before theirs
+                lazy.clear()
+            if is_lazy_field(field):
+                lazy[name] = field
+    eager = SimpleNamespace(
+        __fields__={name: f for name, f in fields.items() if name not in lazy},
+        __config__=cls.__config__,
+        __pre_root_validators__=cls.__pre_root_validators__,
+        __post_root_validators__=cls.__post_root_validators__,
+    )
+    order = {f.alias: i for i, f in enumerate(fields.values())}
+    plan = _LazyPlan(eager, lazy, order)
+    # set on the class itself, so subclasses build their own plan
+    type.__setattr__(cls, "__lazy_plan__", plan)
+    return plan
+
+
+def _error_position(error: typing.Any, order: dict[str, int]) -> int:
+    if isinstance(error, ErrorWrapper):
+        return order.get(error.loc_tuple()[0], len(order))
+    return len(order)
+
+
+class LazyModel(BaseModel):
+    """``BaseModel`` that defers validation of submodel and collection fields."""
+
+    # field name -> raw input not validated yet
+    _lazy_pending: dict = PrivateAttr(default_factory=dict)
+
+    def __init__(__pydantic_self__, **data: typing.Any) -> None:
+        cls = __pydantic_self__.__class__
+        plan = _plan(cls)
+        pending = {}
+        missing_errors = []
+        defaults = {}
+        for name, field in plan.lazy.items():
+            if field.alias in data:
+                pending[name] = data.pop(field.alias)
+            elif field.required:
+                missing_errors.append(ErrorWrapper(MissingError(), loc=field.alias))
+            else:
+                defaults[name] = field.get_default()
+
+        values, fields_set, error = validate_model(plan.eager, data, cls)
+        if error or missing_errors:
+            # failing anyway: report the lazy fields too, as eager validation does
+            errors = (error.raw_errors if error else []) + missing_errors
+            for name, raw in pending.items():
+                field = plan.lazy[name]
+                _, lazy_error = field.validate(raw, values, loc=field.alias, cls=cls)
+                if isinstance(lazy_error, list):
+                    errors.extend(lazy_error)
+                elif lazy_error:
+                    errors.append(lazy_error)
+            # same order as eager validation: by field, root errors last
+            errors.sort(key=lambda e: _error_position(e, plan.order))
+            raise ValidationError(errors, cls)
+
+        values.update(defaults)
+        fields_set.update(pending)
+        object_setattr(
+            __pydantic_self__, "__dict__", __pydantic_self__._ordered(values)
+        )
+        object_setattr(__pydantic_self__, "__fields_set__", fields_set)
+        __pydantic_self__._init_private_attributes()
+        object_setattr(__pydantic_self__, "_lazy_pending", pending)
+
+    def _ordered(self, values: dict) -> dict:
+        ordered = {name: values[name] for name in self.__fields__ if name in values}
+        if len(ordered) != len(values):
+            # Extra.allow values after the fields
+            ordered.update((k, v) for k, v in values.items() if k not in ordered)
+        return ordered
+
+    def _validate_pending(self, names: typing.Iterable[str]) -> None:
+        pending = self._lazy_pending
+        lazy = _plan(self.__class__).lazy
+        validated, errors = {}, []
+        for name in names:
+            field = lazy[name]
+            values = {}
+            if field.class_validators:
+                # only the fields before it, as in eager validation
+                for other in self.__fields__:
+                    if other == name:
+                        break
+                    if other in self.__dict__:
+                        values[other] = self.__dict__[other]
+            value, error = field.validate(
+                pending[name], values, loc=field.alias, cls=self.__class__
+            )
+            if isinstance(error, list):
+                errors.extend(error)
+            elif error:
+                errors.append(error)
+            else:
+                validated[name] = value
+        for name in validated:
+            del pending[name]
+        if validated:
+            object_setattr(
+                self, "__dict__", self._ordered({**self.__dict__, **validated})
+            )
+        if errors:
+            raise ValidationError(errors, self.__class__)
+
+    def validate_lazy(self) -> None:
+        """Validate every field that is still pending."""
+        if self._lazy_pending:
+            self._validate_pending(list(self._lazy_pending))
+
+    @property
+    def lazy_pending(self) -> frozenset[str]:
+        """Names of fields not validated yet."""
+        return frozenset(self._lazy_pending)
+
+    def __getattr__(self, name: str) -> typing.Any:
+        if name != "_lazy_pending":
+            try:
+                pending = object.__getattribute__(self, "_lazy_pending")
+            except AttributeError:
+                pending = {}
+            if name in pending:
+                self._validate_pending([name])
+                return self.__dict__[name]
+        raise AttributeError(
+            f"{self.__class__.__name__!r} object has no attribute {name!r}"
+        )
+
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        pending = self._lazy_pending
+        if pending and name in self.__fields__:
+            if self.__config__.validate_assignment:
+                # root validators see the whole model
+                self.validate_lazy()
+            else:
+                pending.pop(name, None)
+        super().__setattr__(name, value)
+
+    def _iter(self, *args, **kwargs):
+        self.validate_lazy()
+        return super()._iter(*args, **kwargs)
+
+    def __iter__(self):
+        self.validate_lazy()
+        return super().__iter__()
+
+    def __getstate__(self) -> dict:
+        self.validate_lazy()
+        return super().__getstate__()
+
+    def __repr_args__(self):
+        try:
+            self.validate_lazy()
+        except ValidationError:
+            # repr must not raise: show raw input of invalid fields
+            return super().__repr_args__() + list(self._lazy_pending.items())
+        return super().__repr_args__()
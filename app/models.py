@@ -0,0 +1,125 @@
+"""Objects, marshmallow schemas and pydantic models shared by the tests and benchmarks."""
+
+from datetime import datetime
+
+from marshmallow import Schema, fields
+from pydantic import BaseModel, constr, validator
+from sqlalchemy import Column, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import declarative_base
+
+
+class User:
+    def __init__(self, name, email):
+        self.name = name
+        self.email = email
+        self.created_at = datetime.now()
+
+    def __repr__(self):
+        return "<User(name={self.name!r})>".format(self=self)
+
+
+class Client:
+    def __init__(self, name, email):
+        self.name = name
+        self.email = email
+        self.created_at = datetime.now()
+        self.tasks = []
+
+
+class Task:
+    def __init__(self, title):
+        self.title = title
+
+
+class UserSchema(Schema):
+    name = fields.Str()
+    email = fields.Email()
+    created_at = fields.DateTime()
+
+
+class TaskSchema(Schema):
+    title = fields.Str()
+
+
+class CleintSchema(Schema):
+    name = fields.Str()
+    email = fields.Email()
+    created_at = fields.DateTime()
+    tasks = fields.List(fields.Nested(TaskSchema))
+
+
+class CleintSchemaFlat(Schema):
+    name = fields.Str()
+    email = fields.Email()
+    created_at = fields.DateTime()
+    tasks = fields.Pluck(TaskSchema, "title", many=True)
+
+
+# pydantic counterparts of the schemas above
+# EmailStr needs the optional `email-validator` package, so email is a plain str here
+class UserModel(BaseModel):
+    name: str
+    email: str
+    created_at: datetime | None = None
+
+    class Config:
+        orm_mode = True
+
+
+class TaskModel(BaseModel):
+    title: str
+
+    class Config:
+        orm_mode = True
+
+
+class ClientModel(BaseModel):
+    name: str
+    email: str
+    created_at: datetime | None = None
+    tasks: list[TaskModel] = []
+
+    class Config:
+        orm_mode = True
+
+
+class ClientModelFlat(BaseModel):
+    name: str
+    email: str
+    created_at: datetime | None = None
+    # same as fields.Pluck(TaskSchema, "title", many=True)
+    tasks: list[str] = []
+
+    @validator("tasks", pre=True, each_item=True)
+    def pluck_title(cls, v):
+        if isinstance(v, str):
+            return v
+        if isinstance(v, dict):
+            return v["title"]
+        return v.title
+
+    class Config:
+        orm_mode = True
+
+
+# the ORM example of the pydantic docs (TestModelConfig.test_orm_mode)
+OrmBase = declarative_base()
+
+
+class CompanyOrm(OrmBase):
+    __tablename__ = "companies"
+    id = Column(Integer, primary_key=True, nullable=False)
+    public_key = Column(String(20), index=True, nullable=False, unique=True)
+    name = Column(String(63), unique=True)
+    domains = Column(ARRAY(String(255)))
+
+
+class CompanyModel(BaseModel):
+    id: int
+    public_key: constr(max_length=20)
+    name: constr(max_length=63)
+    domains: list[constr(max_length=255)]
+
+    class Config:
+        orm_mode = True
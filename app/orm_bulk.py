@@ -0,0 +1,314 @@
+"""Bulk ``from_orm`` for SQLAlchemy query results.
+
+``[CompanyModel.from_orm(obj) for obj in result]`` wraps every row in a
+``GetterDict``, reads each attribute through the instrumented descriptor,
+copies ``ARRAY`` columns and revalidates every ``constr``. ``from_orm_many``
+converts a batch column by column instead:
+
+    companies = from_orm_many(CompanyModel, session.query(CompanyOrm))
+    companies = from_orm_many(
+        CompanyModel, session.execute(select(CompanyOrm.__table__)), CompanyOrm
+    )
+
+The source may hold mapped instances or ``Row`` tuples (anything with
+``_fields``, e.g. a named tuple). Values are read from the instance
+``__dict__`` / by position, falling back to ``getattr`` for expired or
+deferred attributes.
+
+Constraints the database schema already guarantees are not checked again: a
+``str`` from a ``String(20)`` column fits ``constr(max_length=20)`` and a list
+of ``str`` from ``ARRAY(String(255))`` fits ``list[constr(max_length=255)]``,
+so those values are taken as they are (without copying the list). Values of
+an unexpected type (e.g. ``None`` from a nullable column) and fields without a
+column go through the field, so results and errors are the ones ``from_orm``
+gives. The length guarantee is only as good as the database: SQLite does not
+enforce ``String(n)``.
+"""
+
+import inspect
+import typing
+
+import sqlalchemy
+from pydantic import BaseModel, ConstrainedStr, ValidationError
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.errors import ConfigError, MissingError
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON, ModelField
+from pydantic.tools import _get_parsing_type
+from pydantic.utils import GetterDict
+from sqlalchemy.orm.attributes import InstrumentedAttribute
+
+from app.bulk_load import _SLOW, _model_column, _model_column_kind
+from app.compiled_dump import SchemaCompileError
+from app.streaming import _chunks
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def _guaranteed_constr(type_: typing.Any, column_type: typing.Any) -> bool:
+    """``type_`` is a ``constr(max_length=n)`` that any value of the column fits."""
+    if not (isinstance(type_, type) and issubclass(type_, ConstrainedStr)):
+        return False
+    if (
+        type_.strip_whitespace
+        or type_.to_upper
+        or type_.to_lower
+        or type_.min_length
+        or type_.curtail_length is not None
+        or type_.regex is not None
+    ):
+        return False
+    length = getattr(column_type, "length", None)
+    return (
+        isinstance(column_type, sqlalchemy.String)
+        and length is not None
+        and (type_.max_length is None or length <= type_.max_length)
+    )
+
+
+def _str_config_is_plain(model: type[BaseModel]) -> bool:
+    config = model.__config__
+    return not (
+        config.anystr_strip_whitespace
+        or config.anystr_upper
+        or config.anystr_lower
+        or config.min_anystr_length
+    )
+
+
+def _field_kind(
+    model: type[BaseModel], field: ModelField, column: typing.Any
+) -> str | None:
+    """How values of ``field`` are checked; ``None``: by the field itself."""
+    kind = _model_column_kind(model, field)
+    if kind is not None or field.class_validators or column is None:
+        return kind
+    if not _str_config_is_plain(model):
+        return None
+    if field.shape == SHAPE_SINGLETON and _guaranteed_constr(
+        field.outer_type_, column.type
+    ):
+        return "str"
+    if (
+        field.shape == SHAPE_LIST
+        and isinstance(column.type, sqlalchemy.ARRAY)
+        and column.type.dimensions in (None, 1)
+        and not field.sub_fields[0].class_validators
+        and _guaranteed_constr(field.sub_fields[0].outer_type_, column.type.item_type)
+    ):
+        return "str_list"
+    return None
+
+
+def _columns_of(mapped: typing.Any) -> typing.Mapping[str, typing.Any]:
+    """Columns of a mapped class or ``Table`` by attribute key."""
+    if isinstance(mapped, sqlalchemy.Table):
+        return mapped.c
+    return sqlalchemy.inspect(mapped).columns
+
+
+def _reads_dict(cls: type, alias: str) -> bool:
+    """``getattr(obj, alias)`` returns ``obj.__dict__[alias]`` when it is set."""
+    attr = inspect.getattr_static(cls, alias, None)
+    return attr is None or isinstance(attr, InstrumentedAttribute)
+
+
+def _column(kind: str | None, field: ModelField, raw: list) -> list:
+    if kind == "str_list":
+        none = None if field.allow_none else _SLOW
+        return [
+            (
+                v
+                if v.__class__ is list and None not in v
+                else (none if v is None else _SLOW)
+            )
+            for v in raw
+        ]
+    if kind is None:
+        return [_SLOW] * len(raw)
+    return _model_column(kind, field, raw)
+
+
+class OrmBulkConverter:
+    """Converts batches of ORM instances or rows to ``model`` instances.
+
+    ``mapped`` is the mapped class or ``Table`` the rows come from; it is
+    taken from the first instance when the source holds mapped instances.
+    Models with root validators or a custom ``getter_dict`` raise
+    ``SchemaCompileError``.
+    """
+
+    def __init__(self, model: type[BaseModel], mapped: typing.Any = None):
+        config = model.__config__
+        if not config.orm_mode:
+            raise ConfigError(
+                "You must have the config attribute orm_mode=True to use from_orm"
+            )
+        if model.__pre_root_validators__ or model.__post_root_validators__:
+            raise SchemaCompileError("root validators are not supported")
+        if config.getter_dict is not GetterDict:
+            raise SchemaCompileError("custom getter_dict is not supported")
+        self.model = model
+        self.mapped = mapped
+        self.parsing_type = _get_parsing_type(list[model])
+        self._kinds: list[str | None] | None = None
+
+    def _plan(self, first: typing.Any) -> list[str | None]:
+        if self._kinds is None:
+            mapped = self.mapped
+            if mapped is None and not hasattr(first, "_fields"):
+                try:
+                    sqlalchemy.inspect(type(first))
+                    mapped = type(first)
+                except sqlalchemy.exc.NoInspectionAvailable:
+                    pass
+            columns = _columns_of(mapped) if mapped is not None else {}
+            self._kinds = [
+                _field_kind(self.model, field, columns.get(field.alias))
+                for field in self.model.__fields__.values()
+            ]
+        return self._kinds
+
+    def _read(self, batch: list) -> list[list]:
+        """Raw values per field; ``_SLOW`` where the source has no value."""
+        aliases = [field.alias for field in self.model.__fields__.values()]
+        first = batch[0]
+        if hasattr(first, "_fields"):
+            positions = {key: i for i, key in enumerate(first._fields)}
+            transposed = list(zip(*batch))
+            return [
+                (
+                    list(transposed[positions[alias]])
+                    if alias in positions
+                    else [_SLOW] * len(batch)
+                )
+                for alias in aliases
+            ]
+
+        cls = first.__class__
+        same_class = all(obj.__class__ is cls for obj in batch)
+        dicts = [getattr(obj, "__dict__", {}) for obj in batch]
+        columns = []
+        for alias in aliases:
+            if same_class and _reads_dict(cls, alias):
+                column = [d.get(alias, _SLOW) for d in dicts]
+            else:
+                column = [_SLOW] * len(batch)
+            if any(v is _SLOW for v in column):
+                # expired, deferred or computed attributes
+                column = [
+                    getattr(obj, alias, _SLOW) if v is _SLOW else v
+                    for obj, v in zip(batch, column)
+                ]
+            columns.append(column)
+        return columns
+
+    def convert_batch(self, batch: list, offset: int = 0) -> list[BaseModel]:
+        """Models for ``batch``; errors are keyed by ``offset`` + row index."""
+        if not batch:
+            return []
+        model = self.model
+        fields = list(model.__fields__.items())
+        kinds = self._plan(batch[0])
+        raw_columns = self._read(batch)
+        columns = [
+            _column(kind, field, raw)
+            for (_, field), kind, raw in zip(fields, kinds, raw_columns)
+        ]
+
+        object_setattr = object.__setattr__
+        init_private = bool(model.__private_attributes__)
+        all_names = set(model.__fields__)
+        validate_all = model.__config__.validate_all
+        built, errors = [], []
+        for index, (row, raw_row) in enumerate(
+            zip(zip(*columns), zip(*raw_columns)), start=offset
+        ):
+            if _SLOW not in row:
+                values = {name: value for (name, _), value in zip(fields, row)}
+                fields_set = set(all_names)
+            else:
+                values, fields_set, row_errors = {}, set(), []
+                for (name, field), value, raw in zip(fields, row, raw_row):
+                    if value is not _SLOW:
+                        values[name] = value
+                        fields_set.add(name)
+                    elif raw is _SLOW:
+                        if field.required:
+                            row_errors.append(
+                                ErrorWrapper(MissingError(), loc=field.alias)
+                            )
+                        elif validate_all or field.validate_always:
+                            value, error = field.validate(
+                                field.get_default(), values, loc=field.alias, cls=model
+                            )
+                            if error:
+                                row_errors.append(error)
+                            else:
+                                values[name] = value
+                        else:
+                            values[name] = field.get_default()
+                    else:
+                        fields_set.add(name)
+                        value, error = field.validate(
+                            raw, values, loc=field.alias, cls=model
+                        )
+                        if error:
+                            row_errors.append(error)
+                        else:
+                            values[name] = value
+                if row_errors:
+                    errors.append(
+                        ErrorWrapper(
+                            ValidationError(row_errors, model), loc=("__root__", index)
+                        )
+                    )
+                    continue
+            m = model.__new__(model)
+            object_setattr(m, "__dict__", values)
+            object_setattr(m, "__fields_set__", fields_set)
+            if init_private:
+                m._init_private_attributes()
+            built.append(m)
+        if errors:
+            raise ValidationError(errors, self.parsing_type)
+        return built
+
+    def iter_batches(
+        self, source: typing.Iterable, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> typing.Iterator[list[BaseModel]]:
+        """Yield converted batches of ``batch_size`` rows."""
+        offset = 0
+        for batch in _chunks(source, batch_size):
+            yield self.convert_batch(batch, offset)
+            offset += len(batch)
+
+    def convert(
+        self, source: typing.Iterable, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> list[BaseModel]:
+        """Convert the whole source, reporting the errors of every batch."""
+        result, errors = [], []
+        offset = 0
+        for batch in _chunks(source, batch_size):
+            try:
+                result.extend(self.convert_batch(batch, offset))
+            except ValidationError as e:
+                errors.extend(e.raw_errors)
+            offset += len(batch)
+        if errors:
+            raise ValidationError(errors, self.parsing_type)
+        return result
+
+
+def from_orm_many(
+    model: type[BaseModel],
+    source: typing.Iterable,
+    mapped: typing.Any = None,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> list[BaseModel]:
+    """``[model.from_orm(row) for row in source]``, converted in batches.
+
+    Errors are reported like ``parse_obj_as(list[model], ...)``: one
+    ``ValidationError`` with the row index under ``__root__``.
+    """
+    return OrmBulkConverter(model, mapped).convert(source, batch_size)
@@ -0,0 +1,246 @@
+"""Read-only views over ORM rows, serialised without building models.
+
+``CompanyModel.from_orm(row).json()`` builds a model (and its ``__dict__``,
+``__fields_set__`` and copies of list columns) only to throw it away. A view
+wraps the row as it is; attributes are read from the row and validated on
+access, and ``json()`` renders straight from the row:
+
+    CompanyView = orm_view(CompanyModel, CompanyOrm)
+    CompanyView(row).name                          # validated on access
+    CompanyView(row).json()                        # same as from_orm(row).json()
+    CompanyView.json_many(session.query(CompanyOrm))
+
+``json_many`` reuses one view for all rows, so the only allocation per row is
+the dict handed to ``json.dumps``. Values of the expected type are taken as
+they are: plain ``int``/``str``/``float`` fields, and ``constr(max_length=n)``
+fields (or lists of them) whose ``String(m)`` column guarantees ``m <= n`` when
+``mapped`` is given. Everything else goes through the model field, so values
+and errors are the ones ``from_orm`` gives.
+"""
+
+import threading
+import typing
+
+from pydantic import BaseModel, ValidationError
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.errors import ConfigError, MissingError
+from pydantic.fields import ModelField
+
+from app.compiled_dump import SchemaCompileError
+from app.orm_bulk import _columns_of, _field_kind
+
+_MISSING = object()
+
+# kind from _field_kind -> classes taken without validation
+_FAST_CLASSES = {"int": int, "str": str, "float": float, "str_list": list}
+
+
+class _ViewField(typing.NamedTuple):
+    name: str
+    alias: str
+    field: ModelField
+    fast_class: type | None
+    # list values that must not contain None
+    check_items: bool
+
+
+class OrmView:
+    """Base of the classes built by ``orm_view``."""
+
+    __slots__ = ("_source", "_values")
+
+    __model__: typing.ClassVar[type[BaseModel]]
+    __view_fields__: typing.ClassVar[tuple[_ViewField, ...]]
+
+    def __init__(self, source: typing.Any):
+        object.__setattr__(self, "_source", source)
+        object.__setattr__(self, "_values", None)
+
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        raise AttributeError(
+            f"{type(self).__name__} views are read-only, can not set {name!r}"
+        )
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(
+            f"{type(self).__name__} views are read-only, can not delete {name!r}"
+        )
+
+    @property
+    def source(self) -> typing.Any:
+        """The wrapped ORM instance or row."""
+        return self._source
+
+    def _value(self, view_field: _ViewField) -> typing.Any:
+        """Validated value of one field, not cached."""
+        name, alias, field, fast_class, check_items = view_field
+        raw = getattr(self._source, alias, _MISSING)
+        if raw.__class__ is fast_class and not (check_items and None in raw):
+            return raw
+        if raw is None and field.allow_none and not field.class_validators:
+            return None
+        if raw is _MISSING:
+            if field.required:
+                raise ValidationError(
+                    [ErrorWrapper(MissingError(), loc=alias)], self.__model__
+                )
+            return field.get_default()
+        values = self._preceding(name) if field.class_validators else {}
+        value, error = field.validate(raw, values, loc=alias, cls=self.__model__)
+        if error:
+            raise ValidationError(
+                error if isinstance(error, list) else [error], self.__model__
+            )
+        return value
+
+    def _preceding(self, name: str) -> dict[str, typing.Any]:
+        # what ``values`` holds in a validator: fields before it that are valid
+        values = {}
+        for view_field in self.__view_fields__:
+            if view_field.name == name:
+                break
+            try:
+                values[view_field.name] = self._get(view_field)
+            except ValidationError:
+                pass
+        return values
+
+    def _get(self, view_field: _ViewField) -> typing.Any:
+        values = self._values
+        if values is None:
+            values = {}
+            object.__setattr__(self, "_values", values)
+        elif view_field.name in values:
+            return values[view_field.name]
+        value = values[view_field.name] = self._value(view_field)
+        return value
+
+    def _data(self) -> dict[str, typing.Any]:
+        """``dict()`` of the model; raises the errors of every invalid field."""
+        data, errors = {}, []
+        get_value = self.__model__._get_value
+        for view_field in self.__view_fields__:
+            try:
+                value = self._value(view_field)
+            except ValidationError as e:
+                errors.extend(e.raw_errors)
+                continue
+            if view_field.fast_class is None or view_field.fast_class is list:
+                value = get_value(
+                    value,
+                    to_dict=True,
+                    by_alias=False,
+                    include=None,
+                    exclude=None,
+                    exclude_unset=False,
+                    exclude_defaults=False,
+                    exclude_none=False,
+                )
+            data[view_field.name] = value
+        if errors:
+            raise ValidationError(errors, self.__model__)
+        return data
+
+    def dict(self) -> dict[str, typing.Any]:
+        return self._data()
+
+    def json(self, **dumps_kwargs: typing.Any) -> str:
+        model = self.__model__
+        return model.__config__.json_dumps(
+            self._data(), default=model.__json_encoder__, **dumps_kwargs
+        )
+
+    def to_model(self) -> BaseModel:
+        """The model ``from_orm`` would build."""
+        return self.__model__.from_orm(self._source)
+
+    @classmethod
+    def json_many(cls, sources: typing.Iterable, **dumps_kwargs: typing.Any) -> str:
+        """``json.dumps([from_orm(row).dict() for row in sources])``."""
+        view = cls.__new__(cls)
+        data = []
+        for source in sources:
+            # validators reading ``values`` must see this row's fields
+            object.__setattr__(view, "_values", None)
+            object.__setattr__(view, "_source", source)
+            data.append(view._data())
+        model = cls.__model__
+        return model.__config__.json_dumps(
+            data, default=model.__json_encoder__, **dumps_kwargs
+        )
+
+    def __eq__(self, other: typing.Any) -> bool:
+        if isinstance(other, OrmView) and other.__model__ is self.__model__:
+            return self._data() == other._data()
+        if isinstance(other, self.__model__):
+            return self._data() == other.dict()
+        if isinstance(other, dict):
+            # as BaseModel.__eq__
+            return self._data() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        try:
+            fields = ", ".join(f"{k}={v!r}" for k, v in self._data().items())
+        except ValidationError:
+            fields = f"source={self._source!r}"
+        return f"{type(self).__name__}({fields})"
+
+
+_views: dict[tuple, type[OrmView]] = {}
+_views_lock = threading.Lock()
+
+
+def _field_property(view_field: _ViewField) -> property:
+    def get(self: OrmView) -> typing.Any:
+        return self._get(view_field)
+
+    return property(get, doc=f"``{view_field.name}``, validated on first access")
+
+
+def orm_view(model: type[BaseModel], mapped: typing.Any = None) -> type[OrmView]:
+    """The read-only view class of ``model`` (built once per model and mapping).
+
+    ``mapped`` is the mapped class or ``Table`` the rows come from; it lets
+    ``constr`` columns whose length the database guarantees skip validation.
+    """
+    key = (model, mapped)
+    with _views_lock:
+        view = _views.get(key)
+        if view is not None:
+            return view
+        if not model.__config__.orm_mode:
+            raise ConfigError(
+                "You must have the config attribute orm_mode=True to use from_orm"
+            )
+        if model.__pre_root_validators__ or model.__post_root_validators__:
+            raise SchemaCompileError("root validators are not supported")
+        if model.__custom_root_type__:
+            raise SchemaCompileError("custom root types are not supported")
+
+        columns = _columns_of(mapped) if mapped is not None else {}
+        view_fields = []
+        for name, field in model.__fields__.items():
+            kind = _field_kind(model, field, columns.get(field.alias))
+            view_fields.append(
+                _ViewField(
+                    name,
+                    field.alias,
+                    field,
+                    _FAST_CLASSES.get(kind),
+                    kind == "str_list",
+                )
+            )
+        namespace = {
+            "__slots__": (),
+            "__module__": model.__module__,
+            "__qualname__": f"{model.__qualname__}View",
+            "__model__": model,
+            "__view_fields__": tuple(view_fields),
+        }
+        namespace.update((f.name, _field_property(f)) for f in view_fields)
+        view = type(f"{model.__name__}View", (OrmView,), namespace)
+        _views[key] = view
+        return view
@@ -0,0 +1,155 @@
+"""Validate large batches on several cores.
+
+``schema.load(records, many=True)`` and ``parse_obj_as(list[Model], records)``
+run on one core. ``ParallelValidator`` shards the batch over a
+``ProcessPoolExecutor``; each worker builds its schema or model once (in the
+pool initializer) and then only receives shards of records:
+
+    with ParallelValidator(UserSchemaWichPostLoad) as validator:
+        users = validator.validate(records)  # same as load(records, many=True)
+
+Results come back in input order. Errors are merged into the library's own
+``ValidationError`` keyed by the index of the record in the whole batch,
+as ``load(many=True)`` / ``parse_obj_as`` report them.
+
+When it pays off: every record is pickled to a worker and its result pickled
+back. ``python -m app.benchmarks.parallel`` measures both sides; for flat
+``UserSchema``-like records it gave ~25 us to validate vs ~5 us to transfer a
+record with marshmallow, and ~17 us vs ~15 us with pydantic (models are costly
+to pickle), plus ~30 ms to start the pool. So marshmallow batches pay off from
+about 2k records on 4 workers, while flat pydantic models only win with 8+
+workers and 50k+ records, or with heavier models (nested models, validators).
+Below ``min_batch`` records the batch is validated in-process.
+
+Schemas, models and result objects must be picklable (defined at module
+level) unless the pool uses the ``fork`` start method, where the target is
+inherited by the workers.
+"""
+
+import math
+import os
+import typing
+from concurrent.futures import ProcessPoolExecutor
+
+from app.adapters import Adapter, adapt
+
+DEFAULT_MIN_BATCH = 2000
+
+# adapter of the current worker process, set by the pool initializer
+_worker_adapter: Adapter | None = None
+
+
+def _init_worker(target) -> None:
+    global _worker_adapter
+    _worker_adapter = adapt(target() if _is_factory(target) else target)
+
+
+def _is_factory(target) -> bool:
+    # a schema/model class is callable too, only plain factories are called
+    return callable(target) and not isinstance(target, type)
+
+
+def _validate_shard(records: list) -> tuple[list, dict[int, Exception]]:
+    return _validate_with(_worker_adapter, records)
+
+
+def _validate_with(adapter: Adapter, records: list) -> tuple[list, dict]:
+    """Validate a shard; on failure revalidate record by record for exact errors."""
+    try:
+        return adapter.load_many(records), {}
+    except adapter.error_class:
+        pass
+    results, errors = [], {}
+    for index, record in enumerate(records):
+        try:
+            results.append(adapter.load_one(record))
+        except adapter.error_class as error:
+            errors[index] = error
+            results.append(None)
+    return results, errors
+
+
+class ParallelValidator:
+    """Drop-in for ``load(many=True)`` / ``parse_obj_as`` on a process pool.
+
+    ``target`` is a schema (instance or class), a model class or a zero
+    argument factory returning one of those, e.g.
+    ``functools.partial(UserSchema, only=("name", "email"))``.
+    """
+
+    def __init__(
+        self,
+        target,
+        *,
+        workers: int | None = None,
+        chunk_size: int | None = None,
+        min_batch: int = DEFAULT_MIN_BATCH,
+        mp_context=None,
+    ):
+        self.target = target
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.min_batch = min_batch
+        self._mp_context = mp_context
+        self._executor: ProcessPoolExecutor | None = None
+        self._local: Adapter | None = None
+
+    @property
+    def local_adapter(self) -> Adapter:
+        if self._local is None:
+            target = self.target
+            self._local = adapt(target() if _is_factory(target) else target)
+        return self._local
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=self._mp_context,
+                initializer=_init_worker,
+                initargs=(self.target,),
+            )
+        return self._executor
+
+    def _shards(self, records: list) -> list[list]:
+        size = self.chunk_size or max(1, math.ceil(len(records) / (self.workers * 4)))
+        return [records[i : i + size] for i in range(0, len(records), size)]
+
+    def validate(self, records: typing.Iterable) -> list:
+        records = list(records)
+        adapter = self.local_adapter
+        if len(records) < self.min_batch:
+            outcomes = [_validate_with(adapter, records)]
+            shard_sizes = [len(records)]
+        else:
+            shards = self._shards(records)
+            outcomes = list(self._pool().map(_validate_shard, shards))
+            shard_sizes = [len(shard) for shard in shards]
+
+        results, errors = [], {}
+        offset = 0
+        for (shard_results, shard_errors), size in zip(outcomes, shard_sizes):
+            results.extend(shard_results)
+            for index, error in shard_errors.items():
+                errors[offset + index] = error
+            offset += size
+        if errors:
+            raise adapter.many_error(errors)
+        return results
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> "ParallelValidator":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def validate_parallel(target, records: typing.Iterable, **kwargs) -> list:
+    """One-off ``ParallelValidator(target, **kwargs).validate(records)``."""
+    with ParallelValidator(target, **kwargs) as validator:
+        return validator.validate(records)
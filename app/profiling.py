@@ -0,0 +1,560 @@
+"""Where validation time goes: per schema, model, field and validator.
+
+``profile`` instruments a marshmallow schema or a pydantic model in place. While
+its profiler is enabled, every load/construction, field and validator call is
+counted and timed, nested schemas and models under the field holding them:
+
+    profile(UserSchema)                 # schema class or instance
+    profile(UserModel)                  # model class
+    with validation_profiler:
+        UserSchema().load(data)
+        UserModel(**data)
+
+    validation_profiler.stats()       # {"UserSchema.email:Email": {"calls": 2, ...}}
+    validation_profiler.prometheus()  # text exposition format snapshot
+    validation_profiler.collapsed()   # "UserSchema;UserSchema.email 42" lines, in µs
+
+What is timed: ``Schema._do_load`` (``load``/``validate``), ``Field.deserialize``
+(custom ``_deserialize`` included) and ``validate=`` validators,
+``@validates``/``@validates_schema`` methods; ``BaseModel.__init__``,
+``ModelField.validate`` and each field validator (``@validator`` included) and
+``@root_validator``. An error is any exception leaving the call.
+
+The instrumentation is put in place by ``Profiler.enable()`` and taken out by
+``disable()``: while the profiler is off, schemas and models run their own
+code. Fields are switched to a subclass of their class once, which has no
+methods of its own until profiling starts. Models subclassed while profiling
+do not inherit the instrumentation: ``profile`` them separately.
+"""
+
+import copy
+import functools
+import threading
+import time
+import typing
+import weakref
+
+import marshmallow
+from marshmallow import fields, validate
+from marshmallow.decorators import VALIDATES, VALIDATES_SCHEMA
+from pydantic import BaseModel
+from pydantic.fields import ModelField
+
+
+class Frame(typing.NamedTuple):
+    """What a timed call belongs to."""
+
+    kind: str  # "schema", "model", "field" or "validator"
+    target: str
+    field: str = ""
+    validator: str = ""
+
+    def __str__(self) -> str:
+        name = self.target
+        if self.field:
+            name += f".{self.field}"
+        if self.validator:
+            name += f":{self.validator}"
+        return name
+
+
+_ABSENT = object()
+
+
+class Switch(typing.NamedTuple):
+    """``obj.attr`` is ``on`` while profiling and ``off`` otherwise.
+
+    ``off`` is ``_ABSENT`` for attributes that are only there while profiling.
+    """
+
+    obj: typing.Any
+    attr: str
+    on: typing.Any
+    off: typing.Any
+
+    def apply(self, value: typing.Any) -> None:
+        if value is not _ABSENT:
+            setattr(self.obj, self.attr, value)
+        elif self.attr in vars(self.obj):
+            delattr(self.obj, self.attr)
+
+
+class _ListSwitch(typing.NamedTuple):
+    """The contents of ``items`` are ``on`` while profiling and ``off`` otherwise."""
+
+    items: list
+    on: list
+    off: list
+
+    def apply(self, value: list) -> None:
+        self.items[:] = value
+
+
+class Stats:
+    __slots__ = ("calls", "seconds", "errors")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.errors = 0
+
+
+class Profiler:
+    """Call counts, time and errors of instrumented code, by call stack."""
+
+    def __init__(self, clock: typing.Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self.enabled = False
+        # stack of frames, outermost first -> stats
+        self._stats: dict[tuple[Frame, ...], Stats] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # instrumentation, installed while enabled
+        self._switches: list[Switch | _ListSwitch] = []
+        self._targets: weakref.WeakSet = weakref.WeakSet()
+        # field class -> its subclass timing deserialize
+        self._field_classes: dict[type, type] = {}
+
+    def enable(self) -> None:
+        with self._lock:
+            if not self.enabled:
+                for switch in self._switches:
+                    switch.apply(switch.on)
+                self.enabled = True
+
+    def disable(self) -> None:
+        with self._lock:
+            if self.enabled:
+                self.enabled = False
+                for switch in reversed(self._switches):
+                    switch.apply(switch.off)
+
+    def install(self, target: typing.Any, switches: list[Switch | _ListSwitch]) -> None:
+        """Add the instrumentation of ``target``, in place while enabled."""
+        with self._lock:
+            self._targets.add(target)
+            self._switches.extend(switches)
+            if self.enabled:
+                for switch in switches:
+                    switch.apply(switch.on)
+
+    def __enter__(self) -> "Profiler":
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.disable()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def call(self, frame: Frame, func: typing.Callable, /, *args, **kwargs):
+        """``func(*args, **kwargs)``, recorded under ``frame``."""
+        try:
+            stack = self._local.stack
+        except AttributeError:
+            stack = self._local.stack = []
+        path = stack[-1] + (frame,) if stack else (frame,)
+        stack.append(path)
+        failed = False
+        start = self.clock()
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            elapsed = self.clock() - start
+            stack.pop()
+            with self._lock:
+                stats = self._stats.get(path)
+                if stats is None:
+                    stats = self._stats[path] = Stats()
+                stats.calls += 1
+                stats.seconds += elapsed
+                stats.errors += failed
+
+    def _snapshot(self) -> dict[tuple[Frame, ...], tuple[int, float, int]]:
+        with self._lock:
+            return {
+                path: (stats.calls, stats.seconds, stats.errors)
+                for path, stats in self._stats.items()
+            }
+
+    def stats(self) -> dict[str, dict[str, typing.Any]]:
+        """Totals per schema, model, field and validator, whatever called them."""
+        totals: dict[Frame, list] = {}
+        for path, (calls, seconds, errors) in self._snapshot().items():
+            frame = path[-1]
+            total = totals.setdefault(frame, [0, 0.0, 0])
+            total[0] += calls
+            total[2] += errors
+            # a recursive call's time is already in the outer one
+            if frame not in path[:-1]:
+                total[1] += seconds
+        return {
+            str(frame): {
+                **frame._asdict(),
+                "calls": calls,
+                "seconds": seconds,
+                "errors": errors,
+            }
+            for frame, (calls, seconds, errors) in sorted(
+                totals.items(), key=lambda item: str(item[0])
+            )
+        }
+
+    def prometheus(self, prefix: str = "validation") -> str:
+        """Snapshot of ``stats()`` in the Prometheus text exposition format."""
+        stats = self.stats().values()
+        lines = []
+        for metric, key, help_text in (
+            ("calls_total", "calls", "Calls"),
+            ("seconds_total", "seconds", "Time spent in calls"),
+            ("errors_total", "errors", "Calls that raised"),
+        ):
+            name = f"{prefix}_{metric}"
+            lines.append(
+                f"# HELP {name} {help_text}, per schema, model, field and validator."
+            )
+            lines.append(f"# TYPE {name} counter")
+            for entry in stats:
+                labels = ",".join(
+                    f'{label}="{_escape(entry[label])}"' for label in Frame._fields
+                )
+                lines.append(f"{name}{{{labels}}} {entry[key]}")
+        return "\n".join(lines) + "\n"
+
+    def collapsed(self) -> str:
+        """Collapsed stacks (``a;b;c value``) of self time in µs, for flamegraphs."""
+        snapshot = self._snapshot()
+        self_seconds = {path: seconds for path, (_, seconds, _) in snapshot.items()}
+        for path, (_, seconds, _) in snapshot.items():
+            if len(path) > 1 and path[:-1] in self_seconds:
+                self_seconds[path[:-1]] -= seconds
+        lines = []
+        for path, seconds in sorted(self_seconds.items()):
+            micros = round(seconds * 1e6)
+            if micros > 0:
+                lines.append(";".join(map(str, path)) + f" {micros}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+validation_profiler = Profiler()
+
+
+def _name(func: typing.Any) -> str:
+    func = getattr(func, "__func__", func)
+    return getattr(func, "__name__", None) or type(func).__name__
+
+
+def _own(obj: typing.Any, attr: str) -> typing.Any:
+    """``obj``'s own ``attr``, not an inherited one."""
+    return vars(obj).get(attr, _ABSENT)
+
+
+def _timed(func: typing.Callable, frame: Frame, profiler: Profiler) -> typing.Callable:
+    @functools.wraps(func)
+    def timed(*args, **kwargs):
+        if not profiler.enabled:
+            return func(*args, **kwargs)
+        return profiler.call(frame, func, *args, **kwargs)
+
+    return timed
+
+
+# marshmallow
+
+
+class ProfiledValidator:
+    """marshmallow ``validate=`` callable, timed."""
+
+    __slots__ = ("validator", "frame", "profiler")
+
+    def __init__(self, validator: typing.Callable, frame: Frame, profiler: Profiler):
+        self.validator = validator
+        self.frame = frame
+        self.profiler = profiler
+
+    def __deepcopy__(self, memo: dict) -> "ProfiledValidator":
+        return self
+
+    def __repr__(self) -> str:
+        return f"<ProfiledValidator({self.validator!r})>"
+
+    def __call__(self, value: typing.Any) -> typing.Any:
+        if self.profiler.enabled:
+            result = self.profiler.call(self.frame, self.validator, value)
+        else:
+            result = self.validator(value)
+        # only plain functions fail by returning False, Validator instances raise
+        if result is False and isinstance(self.validator, validate.Validator):
+            return None
+        return result
+
+
+def _field_class(
+    field_class: type[fields.Field], profiler: Profiler
+) -> tuple[type[fields.Field], list[Switch]]:
+    """Subclass of ``field_class`` whose ``deserialize`` is timed while profiling."""
+    cls = profiler._field_classes.get(field_class)
+    if cls is not None:
+        return cls, []
+    original = field_class.deserialize
+
+    def deserialize(self, value, attr=None, data=None, **kwargs):
+        if not profiler.enabled:
+            return original(self, value, attr, data, **kwargs)
+        return profiler.call(
+            self._profile_frame, original, self, value, attr, data, **kwargs
+        )
+
+    cls = profiler._field_classes[field_class] = type(field_class)(
+        field_class.__name__,
+        (field_class,),
+        {
+            "__module__": field_class.__module__,
+            "__qualname__": field_class.__qualname__,
+        },
+    )
+    return cls, [Switch(cls, "deserialize", deserialize, _ABSENT)]
+
+
+def _field_switches(
+    field: fields.Field,
+    schema_name: str,
+    name: str,
+    profiler: Profiler,
+    declared: bool,
+) -> list[Switch | _ListSwitch]:
+    switches: list = []
+    if type(field) not in profiler._field_classes.values():
+        # no per-call cost: the subclass only has methods of its own while profiling
+        field.__class__, switches = _field_class(type(field), profiler)
+    field._profile_frame = Frame("field", schema_name, name)
+    validators = field.validators
+    if validators:
+        timed = [
+            ProfiledValidator(
+                v, Frame("validator", schema_name, name, _name(v)), profiler
+            )
+            for v in validators
+        ]
+        if declared:
+            # the copies schema instances make of a field share its list
+            switches.append(_ListSwitch(validators, timed, list(validators)))
+        else:
+            switches.append(Switch(field, "validators", timed, validators))
+    return switches
+
+
+def _profiled_do_load(do_load: typing.Callable, profiler: Profiler) -> typing.Callable:
+    @functools.wraps(do_load)
+    def _do_load(self, data, **kwargs):
+        if not profiler.enabled:
+            return do_load(self, data, **kwargs)
+        frame = Frame("schema", type(self).__name__)
+        return profiler.call(frame, do_load, self, data, **kwargs)
+
+    return _do_load
+
+
+def _schema_hooks(schema_class: type[marshmallow.Schema]) -> list[tuple[str, str]]:
+    """``(method name, field name)`` of the ``@validates*`` hooks."""
+    return [
+        (name, kwargs["field_name"])
+        for name, _, kwargs in schema_class._hooks[VALIDATES]
+    ] + [(name, "") for name, _, _ in schema_class._hooks[VALIDATES_SCHEMA]]
+
+
+def _schema_class_switches(
+    schema_class: type[marshmallow.Schema], profiler: Profiler
+) -> list[Switch | _ListSwitch]:
+    name = schema_class.__name__
+    switches = []
+    for field_name, field in schema_class._declared_fields.items():
+        switches += _field_switches(field, name, field_name, profiler, True)
+    do_load = _profiled_do_load(schema_class._do_load, profiler)
+    switches.append(
+        Switch(schema_class, "_do_load", do_load, _own(schema_class, "_do_load"))
+    )
+    for hook, field_name in _schema_hooks(schema_class):
+        method = getattr(schema_class, hook)
+        frame = Frame("validator", name, field_name, hook)
+        switches.append(
+            Switch(
+                schema_class,
+                hook,
+                _timed(method, frame, profiler),
+                _own(schema_class, hook),
+            )
+        )
+    return switches
+
+
+def _schema_switches(
+    schema: marshmallow.Schema, profiler: Profiler
+) -> list[Switch | _ListSwitch]:
+    name = type(schema).__name__
+    switches = []
+    for field_name, field in schema.fields.items():
+        switches += _field_switches(field, name, field_name, profiler, False)
+    do_load = _profiled_do_load(type(schema)._do_load, profiler)
+    switches.append(Switch(schema, "_do_load", do_load.__get__(schema), _ABSENT))
+    for hook, field_name in _schema_hooks(type(schema)):
+        frame = Frame("validator", name, field_name, hook)
+        timed = _timed(getattr(schema, hook), frame, profiler)
+        switches.append(Switch(schema, hook, timed, _ABSENT))
+    return switches
+
+
+# pydantic
+
+
+class ProfiledModelValidator:
+    """pydantic field validator (``(cls, v, values, field, config)``), timed."""
+
+    __slots__ = ("validator", "frame", "profiler")
+
+    def __init__(self, validator: typing.Callable, frame: Frame, profiler: Profiler):
+        self.validator = validator
+        self.frame = frame
+        self.profiler = profiler
+
+    def __deepcopy__(self, memo: dict) -> typing.Callable:
+        # copies, as in the fields of a subclass, are not profiled
+        return self.validator
+
+    def __call__(self, cls, v, values, field, config):
+        if not self.profiler.enabled:
+            return self.validator(cls, v, values, field, config)
+        return self.profiler.call(
+            self.frame, self.validator, cls, v, values, field, config
+        )
+
+
+def _model_field_switches(
+    field: ModelField, model_name: str, profiler: Profiler
+) -> list[Switch]:
+    frame = Frame("field", model_name, field.name)
+    field_class = type(field)
+    original = field_class.validate
+
+    def validate(self, v, values, *, loc, cls=None):
+        if not profiler.enabled:
+            return original(self, v, values, loc=loc, cls=cls)
+        return profiler.call(frame, original, self, v, values, loc=loc, cls=cls)
+
+    slots = [
+        slot
+        for klass in field_class.__mro__
+        for slot in vars(klass).get("__slots__", ())
+    ]
+
+    def __deepcopy__(self, memo):
+        # pydantic copies the fields of subclasses: those are not profiled
+        copied = field_class.__new__(field_class)
+        memo[id(self)] = copied
+        for slot in slots:
+            try:
+                value = getattr(self, slot)
+            except AttributeError:
+                continue
+            object.__setattr__(copied, slot, copy.deepcopy(value, memo))
+        return copied
+
+    # ModelField has __slots__: the frame lives on a class of its own
+    profiled_class = type(
+        field_class.__name__,
+        (field_class,),
+        {"__slots__": (), "validate": validate, "__deepcopy__": __deepcopy__},
+    )
+    switches = [Switch(field, "__class__", profiled_class, field_class)]
+    for attr in ("pre_validators", "validators", "post_validators"):
+        validators = getattr(field, attr)
+        if validators:
+            timed = [
+                ProfiledModelValidator(
+                    v, Frame("validator", model_name, field.name, _name(v)), profiler
+                )
+                for v in validators
+            ]
+            switches.append(Switch(field, attr, timed, validators))
+    return switches
+
+
+def _profiled_init(init: typing.Callable, profiler: Profiler) -> typing.Callable:
+    @functools.wraps(init)
+    def __init__(__pydantic_self__, **data: typing.Any) -> None:
+        if not profiler.enabled:
+            return init(__pydantic_self__, **data)
+        frame = Frame("model", type(__pydantic_self__).__name__)
+        return profiler.call(frame, init, __pydantic_self__, **data)
+
+    return __init__
+
+
+def _model_switches(model: type[BaseModel], profiler: Profiler) -> list[Switch]:
+    name = model.__name__
+    switches = []
+    for field in model.__fields__.values():
+        switches += _model_field_switches(field, name, profiler)
+    init = _profiled_init(model.__init__, profiler)
+    switches.append(Switch(model, "__init__", init, _own(model, "__init__")))
+
+    def timed(validator: typing.Callable) -> typing.Callable:
+        frame = Frame("validator", name, "", _name(validator))
+
+        @functools.wraps(validator)
+        def timed_validator(cls, values):
+            # subclasses created while profiling inherit the wrapper
+            if not profiler.enabled or cls is not model:
+                return validator(cls, values)
+            return profiler.call(frame, validator, cls, values)
+
+        return timed_validator
+
+    pre = model.__pre_root_validators__
+    post = model.__post_root_validators__
+    switches += [
+        Switch(model, "__pre_root_validators__", [timed(v) for v in pre], pre),
+        Switch(
+            model,
+            "__post_root_validators__",
+            [(skip_on_failure, timed(v)) for skip_on_failure, v in post],
+            post,
+        ),
+    ]
+    return switches
+
+
+Target = typing.TypeVar("Target")
+
+
+def profile(target: Target, profiler: Profiler | None = None) -> Target:
+    """Instrument a schema class or instance, or a model class, in place.
+
+    ``profiler`` (``validation_profiler`` by default) records the calls while
+    it is enabled; the instrumentation is only installed while it is. Profiling
+    a target twice does nothing. Returns ``target``.
+    """
+    profiler = validation_profiler if profiler is None else profiler
+    if target in profiler._targets:
+        return target
+    if isinstance(target, marshmallow.Schema):
+        switches = _schema_switches(target, profiler)
+    elif isinstance(target, type) and issubclass(target, marshmallow.Schema):
+        switches = _schema_class_switches(target, profiler)
+    elif isinstance(target, type) and issubclass(target, BaseModel):
+        switches = _model_switches(target, profiler)
+    else:
+        raise TypeError(
+            f"expected a marshmallow Schema or a pydantic model, got {target!r}"
+        )
+    profiler.install(target, switches)
+    return target
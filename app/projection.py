@@ -0,0 +1,430 @@
+"""Include/exclude specs compiled once, applied many times.
+
+``t.dict(exclude={"user": {"username", "password"}, "value": True})`` merges
+the spec with the model's own field excludes, builds ``ValueItems`` and set
+differences for the model and again for every nested model and list, on every
+call. A projection does that work once per model class and then only looks
+keys up:
+
+    public = projection(Transaction, exclude={"user": {"password"}})
+    public(t)                    # == t.dict(exclude={"user": {"password"}})
+    public.many(transactions)    # [t.dict(...) for t in transactions]
+    public.json(t)
+
+    names = projection(UserSchema, only=("name", "email"))
+    names.dump(user)             # == UserSchema(only=("name", "email")).dump(user)
+
+Model projections follow ``dict()`` exactly: nested models, dicts, lists and
+tuples (``"__all__"`` and index keys), ``Field(exclude=...)``, ``by_alias``
+and the ``exclude_*`` options, which are fixed when the projection is made.
+Models that override ``dict()`` are handed the spec as is. Schema projections
+share one read-only schema (``get_schema``) and use the compiled dumper when
+the schema allows it.
+"""
+
+import typing
+from collections.abc import Mapping, Set
+from enum import Enum
+
+import marshmallow
+from pydantic import BaseModel
+from pydantic.typing import is_namedtuple
+from pydantic.utils import ROOT_KEY, ValueItems, sequence_like
+
+from app.compiled_dump import SchemaCompileError, compile_dumper
+from app.schema_cache import get_schema
+
+# a spec as dict() takes it: a set of keys or a mapping of key -> nested spec
+Spec = typing.Union[Set, Mapping, None]
+
+_DUMP_METHODS = ("dict", "_iter", "_get_value", "_calculate_keys")
+
+_SCALARS = frozenset({str, int, float, bool, type(None)})
+
+# marks a key or index that is not in the projection
+_DROP = object()
+
+_is_true = ValueItems.is_true
+_merge = ValueItems.merge
+
+
+def _as_mapping(items: Spec) -> Mapping:
+    # ValueItems._coerce_items
+    if isinstance(items, Mapping):
+        return items
+    if isinstance(items, Set):
+        return dict.fromkeys(items, ...)
+    raise TypeError(f"Unexpected type of exclude value {items.__class__}")
+
+
+def _for_element(items: Mapping | None, key: typing.Any) -> Spec:
+    if items is None:
+        return None
+    item = items.get(key)
+    return None if _is_true(item) else item
+
+
+def _custom_dump(model: type[BaseModel]) -> bool:
+    mro = model.__mro__
+    return any(
+        name in vars(base)
+        for base in mro[: mro.index(BaseModel)]
+        for name in _DUMP_METHODS
+    )
+
+
+class Options(typing.NamedTuple):
+    by_alias: bool = False
+    exclude_unset: bool = False
+    exclude_defaults: bool = False
+    exclude_none: bool = False
+
+
+class _ModelPlan(typing.NamedTuple):
+    # field -> (dict key, projector of the value, skip if equal to default,
+    # the default) or _DROP
+    entries: dict[str, typing.Any]
+    include: Mapping | None
+    exclude: Mapping | None
+    enum_values: bool
+    custom: bool
+
+
+def _normalized(items: Mapping) -> tuple[dict, typing.Any] | None:
+    """``ValueItems._normalize_indexes`` for any length: (by index, the rest).
+
+    The rest is ``_DROP`` when the spec has no ``"__all__"``. None if the spec
+    has negative or invalid indexes, whose meaning depends on the length.
+    """
+    explicit = {}
+    all_items = None
+    for i, v in items.items():
+        if not (isinstance(v, (Mapping, Set)) or _is_true(v)):
+            return None
+        if i == "__all__":
+            all_items = ValueItems._coerce_value(v)
+        elif not isinstance(i, int) or i < 0:
+            return None
+        else:
+            explicit[i] = _merge(v, None)
+    if not all_items:
+        return explicit, _DROP
+    if _is_true(all_items):
+        return explicit, ...
+    return {
+        i: v if _is_true(v) else _merge(all_items, v) for i, v in explicit.items()
+    }, _merge(all_items, {})
+
+
+class _Projector:
+    """One level of a spec: what to keep of a model, a dict or a sequence."""
+
+    __slots__ = (
+        "include",
+        "exclude",
+        "options",
+        "_items",
+        "_item_default",
+        "_indexes",
+        "_index_default",
+        "_plans",
+    )
+
+    def __init__(self, include: Spec, exclude: Spec, options: Options):
+        self.include = include
+        self.exclude = exclude
+        self.options = options
+        self._plans: dict[type, _ModelPlan] = {}
+
+        # dicts and sequences ignore empty specs (``if include`` in _get_value)
+        include = _as_mapping(include) if include else None
+        exclude = _as_mapping(exclude) if exclude else None
+        if include is None and exclude is None:
+            plain = self.include is None and self.exclude is None
+            default = self if plain else _projector(None, None, options)
+            self._items, self._item_default = {}, default
+            self._indexes, self._index_default = {}, default
+            return
+
+        self._items = {
+            key: self._keep(include, exclude, key)
+            for key in {*(include or ()), *(exclude or ())}
+        }
+        self._item_default = (
+            _DROP if include is not None else _projector(None, None, options)
+        )
+
+        # lists and tuples: "__all__" applies to every index
+        included = _normalized(include) if include is not None else ({}, None)
+        excluded = _normalized(exclude) if exclude is not None else ({}, None)
+        if included is None or excluded is None:
+            self._indexes = self._index_default = None
+            return
+        (included, include_rest), (excluded, exclude_rest) = included, excluded
+        self._indexes = {
+            i: self._child(included.get(i, include_rest), excluded.get(i, exclude_rest))
+            for i in {*included, *excluded}
+        }
+        self._index_default = self._child(include_rest, exclude_rest)
+
+    def _keep(
+        self, include: Mapping | None, exclude: Mapping | None, key: typing.Any
+    ) -> typing.Any:
+        if (include is not None and key not in include) or (
+            exclude is not None and _is_true(exclude.get(key))
+        ):
+            return _DROP
+        return _projector(
+            _for_element(include, key), _for_element(exclude, key), self.options
+        )
+
+    def _child(self, include: typing.Any, exclude: typing.Any) -> typing.Any:
+        # include: None (no include), _DROP (not included) or a nested spec;
+        # exclude: None or _DROP (not excluded) or a nested spec
+        if include is _DROP or _is_true(exclude):
+            return _DROP
+        return _projector(
+            None if _is_true(include) else include,
+            None if exclude is _DROP else exclude,
+            self.options,
+        )
+
+    # models
+
+    def _plan(self, model: type[BaseModel]) -> _ModelPlan:
+        # BaseModel._iter: the spec is merged with the model's Field(exclude=...)
+        include, exclude = self.include, self.exclude
+        if exclude is not None or model.__exclude_fields__ is not None:
+            exclude = _merge(model.__exclude_fields__, exclude)
+        if include is not None or model.__include_fields__ is not None:
+            include = _merge(model.__include_fields__, include, intersect=True)
+        include = None if include is None else _as_mapping(include)
+        exclude = None if exclude is None else _as_mapping(exclude)
+        entries = {
+            name: self._entry(include, exclude, name, field)
+            for name, field in model.__fields__.items()
+        }
+        return _ModelPlan(
+            entries,
+            include,
+            exclude,
+            getattr(model.Config, "use_enum_values", False),
+            _custom_dump(model),
+        )
+
+    def _entry(
+        self,
+        include: Mapping | None,
+        exclude: Mapping | None,
+        key: str,
+        field: typing.Any,
+    ) -> typing.Any:
+        child = self._keep(include, exclude, key)
+        if child is _DROP:
+            return _DROP
+        by_alias, _, exclude_defaults, _ = self.options
+        check_default = exclude_defaults and field is not None and not field.required
+        return (
+            field.alias if by_alias and field is not None else key,
+            child,
+            check_default,
+            field.default if check_default else None,
+        )
+
+    def model(self, m: BaseModel) -> dict[str, typing.Any]:
+        """``m.dict(include=..., exclude=..., **options)``."""
+        model = m.__class__
+        plan = self._plans.get(model)
+        if plan is None:
+            # two threads may both build it, either result is the same
+            plan = self._plans.setdefault(model, self._plan(model))
+        if plan.custom:
+            return m.dict(
+                include=self.include, exclude=self.exclude, **self.options._asdict()
+            )
+
+        _, exclude_unset, _, exclude_none = self.options
+        fields_set = m.__fields_set__ if exclude_unset else None
+        entries, enum_values = plan.entries, plan.enum_values
+        result = {}
+        for key, v in m.__dict__.items():
+            try:
+                entry = entries[key]
+            except KeyError:
+                # an extra value
+                entry = self._entry(plan.include, plan.exclude, key, None)
+            if (
+                entry is _DROP
+                or (fields_set is not None and key not in fields_set)
+                or (exclude_none and v is None)
+            ):
+                continue
+            dict_key, child, check_default, default = entry
+            if check_default and default == v:
+                continue
+            result[dict_key] = child.value(v, enum_values)
+        return result
+
+    # values
+
+    def value(self, v: typing.Any, enum_values: bool = False) -> typing.Any:
+        """``BaseModel._get_value(v, to_dict=True, ...)``."""
+        cls = v.__class__
+        if cls in _SCALARS:
+            return v
+        if isinstance(v, BaseModel):
+            data = self.model(v)
+            return data[ROOT_KEY] if ROOT_KEY in data else data
+        if isinstance(v, dict):
+            children, default = self._items, self._item_default
+            if not children:
+                return {key: default.value(x, enum_values) for key, x in v.items()}
+            result = {}
+            for key, x in v.items():
+                child = children.get(key, default)
+                if child is not _DROP:
+                    result[key] = child.value(x, enum_values)
+            return result
+        if sequence_like(v):
+            if isinstance(v, (list, tuple)):
+                children, default = self._indexes, self._index_default
+                if children is None:
+                    children, default = self._index_table(v)
+            else:
+                children, default = self._items, self._item_default
+            if not children:
+                if default is _DROP:
+                    items = ()
+                elif cls is list:
+                    return [default.value(x, enum_values) for x in v]
+                else:
+                    items = (default.value(x, enum_values) for x in v)
+            else:
+                items = (
+                    child.value(x, enum_values)
+                    for i, x in enumerate(v)
+                    if (child := children.get(i, default)) is not _DROP
+                )
+            return cls(*items) if is_namedtuple(cls) else cls(items)
+        if enum_values and isinstance(v, Enum):
+            return v.value
+        return v
+
+    def _index_table(self, v: list | tuple) -> tuple[dict, typing.Any]:
+        # negative indexes: normalise against this length, as pydantic does
+        include = ValueItems(v, self.include) if self.include else None
+        exclude = ValueItems(v, self.exclude) if self.exclude else None
+        children = {}
+        for i in range(len(v)):
+            if (exclude and exclude.is_excluded(i)) or (
+                include and not include.is_included(i)
+            ):
+                children[i] = _DROP
+            else:
+                children[i] = _projector(
+                    include and include.for_element(i),
+                    exclude and exclude.for_element(i),
+                    self.options,
+                )
+        return children, _DROP
+
+
+_plain: dict[Options, _Projector] = {}
+
+
+def _projector(include: Spec, exclude: Spec, options: Options) -> _Projector:
+    if include is None and exclude is None:
+        plain = _plain.get(options)
+        if plain is None:
+            plain = _plain.setdefault(options, _Projector(None, None, options))
+        return plain
+    return _Projector(include, exclude, options)
+
+
+class ModelProjection:
+    """``dict()``/``json()`` of a model with a fixed include/exclude spec."""
+
+    def __init__(
+        self,
+        model: type[BaseModel],
+        *,
+        include: Spec = None,
+        exclude: Spec = None,
+        by_alias: bool = False,
+        exclude_unset: bool = False,
+        exclude_defaults: bool = False,
+        exclude_none: bool = False,
+    ):
+        self.model = model
+        self.include = include
+        self.exclude = exclude
+        self.options = Options(by_alias, exclude_unset, exclude_defaults, exclude_none)
+        self._root = _Projector(include, exclude, self.options)
+        self._root._plans[model] = self._root._plan(model)
+
+    def __repr__(self) -> str:
+        return (
+            f"ModelProjection({self.model.__name__}, "
+            f"include={self.include!r}, exclude={self.exclude!r})"
+        )
+
+    def __call__(self, m: BaseModel) -> dict[str, typing.Any]:
+        return self._root.model(m)
+
+    def many(self, models: typing.Iterable[BaseModel]) -> list[dict[str, typing.Any]]:
+        project = self._root.model
+        return [project(m) for m in models]
+
+    def json(self, m: BaseModel, **dumps_kwargs: typing.Any) -> str:
+        """``m.json(include=..., exclude=..., **options)``."""
+        data = self._root.model(m)
+        if m.__custom_root_type__:
+            data = data[ROOT_KEY]
+        return m.__config__.json_dumps(data, default=m.__json_encoder__, **dumps_kwargs)
+
+
+class SchemaProjection:
+    """``schema_class(only=..., exclude=...)`` built once, dumped many times."""
+
+    def __init__(
+        self,
+        schema_class: type[marshmallow.Schema],
+        *,
+        only: typing.Iterable[str] | None = None,
+        exclude: typing.Iterable[str] = (),
+    ):
+        self.schema = get_schema(schema_class, only=only, exclude=exclude)
+        try:
+            self._dumper = compile_dumper(self.schema)
+        except SchemaCompileError:
+            self._dumper = self.schema
+
+    def __repr__(self) -> str:
+        schema = self.schema
+        return (
+            f"SchemaProjection({type(schema).__name__}, "
+            f"only={schema.only!r}, exclude={schema.exclude!r})"
+        )
+
+    def dump(self, obj: typing.Any, *, many: bool | None = None) -> typing.Any:
+        return self._dumper.dump(obj, many=many)
+
+    def dumps(self, obj: typing.Any, *args, many: bool | None = None, **kwargs) -> str:
+        return self._dumper.dumps(obj, *args, many=many, **kwargs)
+
+
+def projection(
+    target: type[BaseModel] | type[marshmallow.Schema], **spec: typing.Any
+) -> ModelProjection | SchemaProjection:
+    """A projection of a pydantic model or a marshmallow schema class.
+
+    Models take ``dict()``'s ``include``/``exclude``/``by_alias``/``exclude_*``
+    arguments, schemas their ``only``/``exclude`` arguments.
+    """
+    if isinstance(target, type) and issubclass(target, BaseModel):
+        return ModelProjection(target, **spec)
+    if isinstance(target, type) and issubclass(target, marshmallow.Schema):
+        return SchemaProjection(target, **spec)
+    raise TypeError(
+        f"expected a pydantic model or a marshmallow Schema class, got {target!r}"
+    )
@@ -0,0 +1,186 @@
+"""Shared, read-only schema instances.
+
+Building a schema binds every field and resolves ``only``/``exclude`` and
+nested schemas, which is wasted work when a request handler builds the same
+``UserSchema(only=("name", "email"))`` on every call. ``get_schema`` returns a
+cached instance instead:
+
+    schema = get_schema(UserSchema, only=("name", "email"))
+    schema.dump(user)
+
+Cached instances are read-only: setting attributes raises ``AttributeError``,
+``context`` and the field maps are ``MappingProxyType``. Only contexts of
+plain immutable data (strings, numbers, ``None`` and tuples/frozensets of
+them) are cached; any other value (a request, a user object, a dict) is taken
+as per-call, and such calls get a fresh schema that is not kept.
+"""
+
+import threading
+import typing
+import weakref
+from collections import OrderedDict
+from types import MappingProxyType
+
+from marshmallow import Schema
+
+DEFAULT_MAXSIZE = 256
+
+
+class ReadOnlySchemaMixin:
+    """Blocks attribute assignment once ``_read_only`` is set."""
+
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        if self.__dict__.get("_read_only"):
+            raise AttributeError(
+                f"cached {type(self).__name__} instances are read-only, "
+                f"can not set {name!r}"
+            )
+        super().__setattr__(name, value)
+
+
+_read_only_classes: "weakref.WeakKeyDictionary[type, type]" = (
+    weakref.WeakKeyDictionary()
+)
+_read_only_lock = threading.Lock()
+
+
+def read_only_class(schema_class: type[Schema]) -> type[Schema]:
+    """Subclass of ``schema_class`` whose instances can be made read-only.
+
+    It keeps the name of the original class and, like ``Schema.from_dict``,
+    is not added to the class registry.
+    """
+    with _read_only_lock:
+        cls = _read_only_classes.get(schema_class)
+        if cls is None:
+            meta = type("Meta", (schema_class.Meta,), {"register": False})
+            cls = type(schema_class)(
+                schema_class.__name__,
+                (ReadOnlySchemaMixin, schema_class),
+                {
+                    "Meta": meta,
+                    "__module__": schema_class.__module__,
+                    "__qualname__": schema_class.__qualname__,
+                },
+            )
+            _read_only_classes[schema_class] = cls
+        return cls
+
+
+def _freeze(schema: Schema) -> Schema:
+    object.__setattr__(schema, "context", MappingProxyType(dict(schema.context)))
+    for name in ("fields", "load_fields", "dump_fields"):
+        object.__setattr__(schema, name, MappingProxyType(getattr(schema, name)))
+    object.__setattr__(schema, "_read_only", True)
+    return schema
+
+
+_PLAIN_TYPES = (str, bytes, int, float, bool, type(None))
+
+
+def _plain(value: typing.Any) -> bool:
+    """Immutable data only: nothing a cached schema could keep alive or see change."""
+    if isinstance(value, (tuple, frozenset)):
+        return all(_plain(item) for item in value)
+    return type(value) in _PLAIN_TYPES
+
+
+def _names(names: typing.Iterable[str] | None) -> frozenset | None:
+    return None if names is None else frozenset(names)
+
+
+class SchemaRegistry:
+    """Thread-safe LRU cache of read-only schema instances.
+
+    Keyed on schema class, ``only``, ``exclude``, ``many``, ``unknown`` and
+    ``context``.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.uncacheable = 0
+        self._schemas: OrderedDict[tuple, Schema] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        schema_class: type[Schema],
+        *,
+        only: typing.Iterable[str] | None = None,
+        exclude: typing.Iterable[str] = (),
+        many: bool = False,
+        unknown: str | None = None,
+        context: dict | None = None,
+    ) -> Schema:
+        kwargs: dict[str, typing.Any] = {"many": many, "exclude": tuple(exclude)}
+        if only is not None:
+            kwargs["only"] = tuple(only)
+        if unknown is not None:
+            kwargs["unknown"] = unknown
+        if context:
+            kwargs["context"] = dict(context)
+
+        if context and not all(_plain(k) and _plain(v) for k, v in context.items()):
+            # per-call context, not shared and not kept
+            with self._lock:
+                self.uncacheable += 1
+            return schema_class(**kwargs)
+        key = (
+            schema_class,
+            _names(only),
+            _names(exclude),
+            bool(many),
+            unknown,
+            frozenset(context.items()) if context else None,
+        )
+
+        with self._lock:
+            schema = self._schemas.get(key)
+            if schema is not None:
+                self._schemas.move_to_end(key)
+                self.hits += 1
+                return schema
+            self.misses += 1
+
+        # build outside the lock, the first one stored wins
+        schema = _freeze(read_only_class(schema_class)(**kwargs))
+        with self._lock:
+            schema = self._schemas.setdefault(key, schema)
+            self._schemas.move_to_end(key)
+            while len(self._schemas) > self.maxsize:
+                self._schemas.popitem(last=False)
+                self.evictions += 1
+        return schema
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict[str, typing.Any]:
+        with self._lock:
+            return {
+                "size": len(self._schemas),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "uncacheable": self.uncacheable,
+                "hit_rate": self.hit_rate,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._schemas.clear()
+            self.hits = self.misses = self.evictions = self.uncacheable = 0
+
+
+schema_registry = SchemaRegistry()
+
+
+def get_schema(schema_class: type[Schema], **kwargs) -> Schema:
+    """``schema_registry.get``: a shared read-only ``schema_class(**kwargs)``."""
+    return schema_registry.get(schema_class, **kwargs)
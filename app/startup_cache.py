@@ -0,0 +1,231 @@
+"""Class-creation introspection done once per process.
+
+Creating a pydantic model runs ``inspect.signature`` on every validator of
+every field, pydantic's own ``str_validator`` and friends included, to find out
+which of ``values``, ``field`` and ``config`` it takes, and wraps each one
+again. Creating a marshmallow schema rescans all attributes of ``Schema``,
+``ABC`` and ``object`` for fields and hooks. With hundreds of classes that is
+a large part of the import time of a worker. While a ``StartupCache`` is
+enabled, validator signatures are read once per code object, pydantic's
+wrappers are shared by every field using the same validator, and every base
+class is read once:
+
+    cache = StartupCache()
+    with cache:                   # or cache.enable() ... cache.disable()
+        import api.models         # classes are created as usual, minus the repeats
+    cache.stats()
+
+Nothing is kept across processes: reading the signatures back from a file
+costs as much as computing them. Import the models before forking so
+pre-fork workers share the classes instead. Class bodies are read when the
+first class deriving from them is created: hooks or fields assigned to a
+schema class afterwards are not seen by later subclasses.
+"""
+
+import functools
+import inspect
+import typing
+from collections import defaultdict
+from types import CodeType
+from weakref import WeakKeyDictionary
+
+from marshmallow import schema as marshmallow_schema
+from marshmallow.schema import SchemaMeta, _get_fields
+from pydantic import class_validators
+from pydantic import fields as pydantic_fields
+
+_active: "StartupCache | None" = None
+
+# what enable() replaces
+_ORIGINALS = {
+    (pydantic_fields, "prep_validators"): pydantic_fields.prep_validators,
+    (pydantic_fields, "make_generic_validator"): (
+        pydantic_fields.make_generic_validator
+    ),
+    (marshmallow_schema, "_get_fields_by_mro"): marshmallow_schema._get_fields_by_mro,
+    (SchemaMeta, "resolve_hooks"): SchemaMeta.resolve_hooks,
+}
+
+
+class _LazySignature:
+    """``inspect.signature(func)``, computed if an error message prints it."""
+
+    __slots__ = ("func",)
+
+    def __init__(self, func: typing.Callable):
+        self.func = func
+
+    def __str__(self) -> str:
+        return str(inspect.signature(self.func))
+
+
+class StartupCache:
+    """Validator signatures and wrappers reused while enabled.
+
+    One cache can be enabled at a time: it replaces functions of pydantic and
+    marshmallow for the whole process.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        # code object -> argument names
+        self._names: dict[CodeType, list[str]] = {}
+        # validator -> its generic wrapper, shared by every field using it
+        self._wrappers: WeakKeyDictionary = WeakKeyDictionary()
+
+    def __enter__(self) -> "StartupCache":
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.disable()
+
+    @property
+    def enabled(self) -> bool:
+        return _active is self
+
+    def enable(self) -> None:
+        """Use the cache for classes created from now on."""
+        global _active
+        if _active is self:
+            return
+        if _active is not None:
+            raise RuntimeError(f"{_active!r} is already enabled")
+        pydantic_fields.prep_validators = self.prep_validators
+        pydantic_fields.make_generic_validator = self.make_generic_validator
+        marshmallow_schema._get_fields_by_mro = _get_fields_by_mro
+        SchemaMeta.resolve_hooks = _resolve_hooks
+        _active = self
+
+    def disable(self) -> None:
+        """Put pydantic and marshmallow back."""
+        global _active
+        if _active is not self:
+            return
+        for (owner, name), original in _ORIGINALS.items():
+            setattr(owner, name, original)
+        _active = None
+
+    def clear(self) -> None:
+        """Forget all signatures and wrappers."""
+        self._names.clear()
+        self._wrappers.clear()
+        self.hits = self.misses = 0
+
+    def stats(self) -> dict[str, typing.Any]:
+        return {
+            "entries": len(self._names),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def arg_names(self, func: typing.Any) -> list[str] | None:
+        """Parameter names ``inspect.signature(func)`` lists.
+
+        ``None`` for callables whose signature does not come from their code:
+        partials, wrapped functions, objects with ``__signature__`` or
+        ``__call__``.
+        """
+        if hasattr(func, "__wrapped__") or hasattr(func, "__signature__"):
+            return None
+        method = inspect.ismethod(func)
+        function = func.__func__ if method else func
+        code = getattr(function, "__code__", None)
+        if not isinstance(code, CodeType):
+            return None
+        names = self._names.get(code)
+        if names is None:
+            self.misses += 1
+            names = self._names[code] = list(inspect.signature(function).parameters)
+        else:
+            self.hits += 1
+        # bound methods drop self/cls
+        return names[1:] if method else names
+
+    def make_generic_validator(self, validator: typing.Callable) -> typing.Callable:
+        """``pydantic.class_validators.make_generic_validator`` on cached names."""
+        try:
+            return self._wrappers[validator]
+        except (KeyError, TypeError):
+            pass
+        args = self.arg_names(validator)
+        if not args or args[0] == "self":
+            # pydantic's own path and errors
+            return _ORIGINALS[pydantic_fields, "make_generic_validator"](validator)
+        signature = _LazySignature(validator)
+        if args[0] == "cls":
+            generic = class_validators._generic_validator_cls(
+                validator, signature, set(args[2:])
+            )
+        else:
+            generic = class_validators._generic_validator_basic(
+                validator, signature, set(args[1:])
+            )
+        generic = functools.wraps(validator)(generic)
+        if not inspect.ismethod(validator):
+            try:
+                self._wrappers[validator] = generic
+            except TypeError:
+                pass
+        return generic
+
+    def prep_validators(self, v_funcs: typing.Iterable) -> list[typing.Callable]:
+        return [self.make_generic_validator(f) for f in v_funcs if f]
+
+
+# class -> fields in its __dict__, for bases without _declared_fields
+_base_fields: WeakKeyDictionary = WeakKeyDictionary()
+# class -> names in its __dict__ carrying marshmallow hooks
+_hook_names: WeakKeyDictionary = WeakKeyDictionary()
+
+
+def _get_fields_by_mro(klass: SchemaMeta) -> list:
+    """``marshmallow.schema._get_fields_by_mro`` scanning each plain base once."""
+    inherited = []
+    for base in klass.__mro__[:0:-1]:
+        declared = getattr(base, "_declared_fields", None)
+        if declared is not None:
+            inherited += _get_fields(declared)
+            continue
+        try:
+            found = _base_fields[base]
+        except KeyError:
+            found = _base_fields[base] = _get_fields(base.__dict__)
+        inherited += found
+    return inherited
+
+
+def _hooked(klass: type) -> tuple[str, ...]:
+    try:
+        return _hook_names[klass]
+    except KeyError:
+        pass
+    names = tuple(
+        name
+        for name, attr in vars(klass).items()
+        if hasattr(attr, "__marshmallow_hook__")
+    )
+    _hook_names[klass] = names
+    return names
+
+
+def _resolve_hooks(cls: SchemaMeta) -> dict[str, list[tuple[str, bool, dict]]]:
+    """``SchemaMeta.resolve_hooks`` looking only at names carrying hooks."""
+    mro = cls.__mro__
+    hooks: dict[str, list[tuple[str, bool, dict]]] = defaultdict(list)
+    # dir() order; a name counts if its first definition in the MRO is a hook
+    for attr_name in sorted({name for parent in mro for name in _hooked(parent)}):
+        for parent in mro:
+            try:
+                attr = parent.__dict__[attr_name]
+            except KeyError:
+                continue
+            break
+        try:
+            hook_config = attr.__marshmallow_hook__
+        except AttributeError:
+            continue
+        for tag, config in hook_config.items():
+            hooks[tag].extend((attr_name, many, kwargs) for many, kwargs in config)
+    return hooks
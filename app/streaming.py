@@ -0,0 +1,359 @@
+"""Streaming loader for JSON Lines files and large top-level JSON arrays.
+
+Records are read lazily and validated ``chunk_size`` at a time, so memory
+stays flat however large the file is:
+
+    for user in load_stream("users.jsonl", UserSchemaWichPostLoad()):
+        ...  # User objects
+
+    for item in load_stream(fp, Item, errors="yield"):
+        if isinstance(item, RecordError):
+            log(item.index, item.errors)
+
+``StreamWriter`` goes the other way and writes dumps one object at a time:
+
+    with StreamWriter("users.json", UserSchema(), format="array") as writer:
+        writer.write_many(users)
+"""
+
+import codecs
+import io
+import json
+import os
+import typing
+from contextlib import contextmanager
+
+from app.adapters import adapt
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_READ_SIZE = 64 * 1024
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\r\n"
+_DELIMITERS = ",]" + _WHITESPACE
+
+
+class RecordError(typing.NamedTuple):
+    """A record that failed validation, with the library's error messages."""
+
+    index: int
+    errors: typing.Any
+
+
+@contextmanager
+def _open(source: str | os.PathLike | typing.IO):
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding="utf-8") as fp:
+            yield fp
+    else:
+        yield source
+
+
+def _text_reader(fp: typing.IO, read_size: int) -> typing.Callable[[], str]:
+    """``read()`` returning text for both text and binary file objects."""
+    decoder = None
+
+    def read() -> str:
+        nonlocal decoder
+        chunk = fp.read(read_size)
+        if isinstance(chunk, bytes):
+            decoder = decoder or codecs.getincrementaldecoder("utf-8")()
+            return decoder.decode(chunk, final=not chunk)
+        return chunk
+
+    return read
+
+
+def _expect_end(read: typing.Callable[[], str], buf: str, eof: bool) -> None:
+    """Raise if anything but whitespace follows the top-level array."""
+    while True:
+        rest = buf.lstrip(_WHITESPACE)
+        if rest:
+            raise ValueError(
+                "unexpected data after the top-level JSON array: "
+                f"{rest[:20]!r} (JSON Lines records can not be arrays)"
+            )
+        if eof:
+            return
+        buf = read()
+        eof = not buf
+
+
+def _iter_array(read: typing.Callable[[], str], buf: str) -> typing.Iterator:
+    decoder = json.JSONDecoder()
+    pos = 0
+    eof = False
+    expect_comma = False
+    while True:
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+        if pos == len(buf):
+            if eof:
+                raise ValueError("unterminated JSON array")
+            buf, pos = read(), 0
+            eof = not buf
+            continue
+        if buf[pos] == "]":
+            _expect_end(read, buf[pos + 1 :], eof)
+            return
+        if expect_comma:
+            if buf[pos] != ",":
+                raise ValueError(f"expected ',' or ']' in JSON array, got {buf[pos]!r}")
+            pos += 1
+            expect_comma = False
+            continue
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            end = None
+        # a scalar cut by the end of the buffer decodes, but may be incomplete:
+        # "12." reads as 12 and "1e" as 1, so one must be followed by a delimiter
+        if (
+            end is not None
+            and not eof
+            and buf[pos] not in '{["'
+            and (end == len(buf) or buf[end] not in _DELIMITERS)
+        ):
+            end = None
+        if end is None:
+            more = read()
+            eof = not more
+            buf, pos = buf[pos:] + more, 0
+            continue
+        yield value
+        pos = end
+        expect_comma = True
+
+
+def iter_json_records(
+    source: str | os.PathLike | typing.IO,
+    *,
+    read_size: int = DEFAULT_READ_SIZE,
+) -> typing.Iterator[typing.Any]:
+    """Yield records from a JSON Lines file or a file with one top-level array.
+
+    The format is picked from the first non-whitespace character: a file
+    starting with ``[`` is one array, and ``ValueError`` is raised when
+    anything but whitespace follows it, as it does for JSON Lines whose
+    records are arrays.
+    """
+    with _open(source) as fp:
+        read = _text_reader(fp, read_size)
+        buf = read()
+        start = 0
+        while True:
+            while start < len(buf) and buf[start] in _WHITESPACE:
+                start += 1
+            if start < len(buf) or not buf:
+                break
+            buf, start = read(), 0
+        if not buf:
+            return
+
+        if buf[start] == "[":
+            yield from _iter_array(read, buf[start + 1 :])
+            return
+
+        tail = ""
+        while buf:
+            lines = (tail + buf).split("\n")
+            tail = lines.pop()
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+            buf = read()
+        if tail.strip():
+            yield json.loads(tail)
+
+
+def _chunks(records: typing.Iterable, size: int) -> typing.Iterator[list]:
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def load_stream(
+    source: str | os.PathLike | typing.IO,
+    target,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    errors: typing.Literal["raise", "yield", "skip"] = "raise",
+    read_size: int = DEFAULT_READ_SIZE,
+) -> typing.Iterator[typing.Any]:
+    """Yield validated records from ``source``.
+
+    ``target`` is a marshmallow schema (instance or class) or a pydantic model.
+    Records are validated ``chunk_size`` at a time with ``load(many=True)`` /
+    ``parse_obj_as(list[Model], ...)``; a chunk that fails is revalidated record
+    by record. With ``errors="raise"`` the library's ``ValidationError`` for
+    that chunk is raised, keyed by the index of the record in the file; with
+    ``"yield"`` a ``RecordError(index, errors)`` takes the place of each bad
+    record; ``"skip"`` drops bad records.
+    """
+    if errors not in ("raise", "yield", "skip"):
+        raise ValueError(f"errors must be 'raise', 'yield' or 'skip', got {errors!r}")
+    adapter = adapt(target)
+    offset = 0
+    records = iter_json_records(source, read_size=read_size)
+    for chunk in _chunks(records, chunk_size):
+        try:
+            yield from adapter.load_many(chunk)
+        except adapter.error_class:
+            failed = {}
+            loaded = []
+            for index, record in enumerate(chunk, start=offset):
+                try:
+                    loaded.append(adapter.load_one(record))
+                except adapter.error_class as error:
+                    failed[index] = error
+                    loaded.append(RecordError(index, adapter.messages(error)))
+            if errors == "raise":
+                raise adapter.many_error(failed) from None
+            for value in loaded:
+                if errors == "skip" and isinstance(value, RecordError):
+                    continue
+                yield value
+        offset += len(chunk)
+
+
+def _split_template(template: typing.Any, render: typing.Callable) -> tuple[str, str]:
+    """Text before and after the item list of a ``dump([], many=True)`` result."""
+    marker = "\x00stream items\x00"
+
+    def replace(node):
+        nonlocal found
+        if isinstance(node, list) and not node:
+            found += 1
+            return marker
+        if isinstance(node, dict):
+            return {key: replace(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [replace(value) for value in node]
+        return node
+
+    found = 0
+    text = render(replace(template))
+    if found != 1:
+        raise ValueError(
+            f"can not find where items go in the many=True envelope {template!r}"
+        )
+    prefix, suffix = text.split(render(marker))
+    return prefix + "[", "]" + suffix
+
+
+class StreamWriter:
+    """Write dumps to a path, file object or socket without building the full list.
+
+    ``format="jsonl"`` writes one JSON document per line. ``format="array"``
+    writes the same text as ``schema.dumps(objs, many=True)``, including
+    envelopes added by ``post_dump(pass_many=True)`` hooks; ``envelope="users"``
+    wraps the array as ``{"users": [...]}`` explicitly. Output is buffered and
+    flushed every ``buffer_size`` characters.
+    """
+
+    def __init__(
+        self,
+        sink: str | os.PathLike | typing.IO,
+        target,
+        *,
+        format: typing.Literal["jsonl", "array"] = "jsonl",
+        envelope: str | None = None,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+    ):
+        if format not in ("jsonl", "array"):
+            raise ValueError(f"format must be 'jsonl' or 'array', got {format!r}")
+        self.adapter = adapt(target)
+        self.format = format
+        self.buffer_size = buffer_size
+        self.bytes_written = 0
+        self.records_written = 0
+        self.closed = False
+        self._parts: list[str] = []
+        self._size = 0
+
+        self._owned = isinstance(sink, (str, os.PathLike))
+        if self._owned:
+            sink = open(sink, "w", encoding="utf-8")
+        self._sink = sink
+        if hasattr(sink, "sendall"):
+            self._send = sink.sendall
+            self._binary = True
+        else:
+            self._send = sink.write
+            self._binary = not isinstance(sink, io.TextIOBase)
+
+        if format == "array":
+            if envelope is not None:
+                template = {envelope: []}
+            else:
+                template = self.adapter.many_template()
+            self._prefix, self._suffix = _split_template(template, self.adapter.render)
+            self._buffer(self._prefix)
+
+    def _buffer(self, text: str) -> None:
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._parts:
+            return
+        text = "".join(self._parts)
+        data = text.encode("utf-8")
+        self._parts = []
+        self._size = 0
+        self._send(data if self._binary else text)
+        self.bytes_written += len(data)
+
+    def write(self, obj: typing.Any) -> None:
+        if self.closed:
+            raise ValueError("write to a closed StreamWriter")
+        text = self.adapter.dumps_item(obj)
+        if self.format == "jsonl":
+            self._buffer(text + "\n")
+        elif self.records_written:
+            # json.dumps separator, so the output matches dumps(many=True)
+            self._buffer(", " + text)
+        else:
+            self._buffer(text)
+        self.records_written += 1
+
+    def write_many(self, objs: typing.Iterable) -> None:
+        for obj in objs:
+            self.write(obj)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        if self.format == "array":
+            self._buffer(self._suffix)
+        self.flush()
+        self.closed = True
+        if self._owned:
+            self._sink.close()
+
+    def __enter__(self) -> "StreamWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def dump_stream(
+    objs: typing.Iterable,
+    sink: str | os.PathLike | typing.IO,
+    target,
+    **kwargs,
+) -> int:
+    """Write ``objs`` with a ``StreamWriter`` and return the bytes written."""
+    with StreamWriter(sink, target, **kwargs) as writer:
+        writer.write_many(objs)
+    return writer.bytes_written
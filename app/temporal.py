@@ -0,0 +1,357 @@
+"""Fast parsing of canonical ISO 8601 dates, times and durations.
+
+marshmallow's ``DateTime``/``Date``/``Time`` fields and pydantic's
+``datetime``/``date``/``time``/``timedelta`` validators parse strings with
+regular expressions. Most payloads use one canonical layout,
+``2014-08-11T05:26:03.869245`` with an optional ``Z`` or ``+02:30`` offset,
+``2014-08-11``, ``05:26:03`` and ``P3DT12H30M5S``, which is checked by position
+here and handed to the C ``fromisoformat`` parsers. Anything else, and every
+value the fast path rejects, goes to the library's own parser, so results
+(time zone objects included) and errors are the same.
+
+The parsers are grouped in a ``TemporalBackend``:
+
+    set_backend(FAST_BACKEND)      # all DateTime fields, and models defined after
+    set_backend(REGEX_BACKEND)     # back to the library parsers
+
+    class Event(FastTemporalModel):   # one model only
+        at: datetime
+
+    class EventSchema(Schema):        # one field only
+        at = FastDateTime()
+"""
+
+import typing
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta, timezone
+
+from marshmallow import fields, utils
+from pydantic import BaseModel, datetime_parse
+from pydantic import validators as pydantic_validators
+from pydantic.class_validators import prep_validators
+from pydantic.fields import SHAPE_GENERIC, ModelField
+
+_DIGITS = "0123456789"
+
+
+def _fraction_and_offset(value: str, start: int) -> str | None:
+    """Offset of ``value[start:]`` = ``[.ffffff][Z|+HH:MM]``; None if not canonical."""
+    end = len(value)
+    if start < end and value[start] == ".":
+        i = start + 1
+        while i < end and value[i] in _DIGITS:
+            i += 1
+        if not 1 < i - start <= 7:
+            return None
+        start = i
+    offset = value[start:]
+    if offset == "" or offset == "Z":
+        return offset
+    if (
+        len(offset) == 6
+        and offset[0] in "+-"
+        and offset[3] == ":"
+        and offset[1:3].isdigit()
+        and offset[4:].isdigit()
+    ):
+        return offset
+    return None
+
+
+def _datetime_offset(value: str) -> str | None:
+    if (
+        len(value) < 19
+        or value[4] != "-"
+        or value[7] != "-"
+        or value[10] not in "T "
+        or value[13] != ":"
+        or value[16] != ":"
+        or not value.isascii()
+    ):
+        return None
+    return _fraction_and_offset(value, 19)
+
+
+def _time_offset(value: str) -> str | None:
+    if len(value) < 8 or value[2] != ":" or value[5] != ":" or not value.isascii():
+        return None
+    return _fraction_and_offset(value, 8)
+
+
+def _is_canonical_date(value: str) -> bool:
+    return len(value) == 10 and value[4] == "-" and value[7] == "-" and value.isascii()
+
+
+_TIME_UNITS = (("H", 3600), ("M", 60), ("S", 1))
+
+
+def _amount(digits: str) -> int | None:
+    # up to 9 digits, so pydantic's float arithmetic is exact too
+    if 0 < len(digits) <= 9 and digits.isdigit():
+        return int(digits)
+    return None
+
+
+def _iso_duration(value: str) -> timedelta | None:
+    """``P[nD][T[nH][nM][nS]]`` with integer amounts; None if not that."""
+    if not value.isascii():
+        return None
+    date_part, has_time, time_part = value[1:].partition("T")
+    if has_time and not time_part or not (date_part or time_part):
+        return None
+    days = seconds = 0
+    if date_part:
+        days = _amount(date_part[:-1]) if date_part[-1] == "D" else None
+        if days is None:
+            return None
+    for unit, factor in _TIME_UNITS:
+        amount, has_unit, rest = time_part.partition(unit)
+        if has_unit:
+            amount = _amount(amount)
+            if amount is None:
+                return None
+            seconds += amount * factor
+            time_part = rest
+    if time_part:
+        return None
+    try:
+        return timedelta(days, seconds)
+    except OverflowError:
+        return None
+
+
+# pydantic validators
+
+
+def parse_datetime(value: typing.Any) -> datetime:
+    """``pydantic.datetime_parse.parse_datetime`` with a fast path."""
+    if value.__class__ is str and _datetime_offset(value) is not None:
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    return datetime_parse.parse_datetime(value)
+
+
+def parse_date(value: typing.Any) -> date:
+    """``pydantic.datetime_parse.parse_date`` with a fast path."""
+    if value.__class__ is str and _is_canonical_date(value):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            pass
+    return datetime_parse.parse_date(value)
+
+
+def parse_time(value: typing.Any) -> time:
+    """``pydantic.datetime_parse.parse_time`` with a fast path."""
+    if value.__class__ is str and _time_offset(value) is not None:
+        try:
+            return time.fromisoformat(value)
+        except ValueError:
+            pass
+    return datetime_parse.parse_time(value)
+
+
+def parse_duration(value: typing.Any) -> timedelta:
+    """``pydantic.datetime_parse.parse_duration`` with a fast path."""
+    if value.__class__ is str and value[:1] == "P":
+        duration = _iso_duration(value)
+        if duration is not None:
+            return duration
+    return datetime_parse.parse_duration(value)
+
+
+# marshmallow DESERIALIZATION_FUNCS
+
+_fixed_timezones: dict[str, timezone] = {}
+
+
+def _fixed_timezone(offset: str) -> timezone:
+    # marshmallow names its offsets ("+0230"), pydantic and fromisoformat do not
+    tz = _fixed_timezones.get(offset)
+    if tz is None:
+        minutes = 60 * int(offset[1:3]) + int(offset[4:6])
+        tz = utils.get_fixed_timezone(-minutes if offset[0] == "-" else minutes)
+        _fixed_timezones[offset] = tz
+    return tz
+
+
+def from_iso_datetime(value: typing.Any) -> datetime:
+    """``marshmallow.utils.from_iso_datetime`` with a fast path."""
+    offset = _datetime_offset(value) if value.__class__ is str else None
+    if offset is not None:
+        try:
+            result = datetime.fromisoformat(value)
+        except ValueError:
+            pass
+        else:
+            if offset and offset != "Z":
+                result = result.replace(tzinfo=_fixed_timezone(offset))
+            return result
+    return utils.from_iso_datetime(value)
+
+
+def from_iso_date(value: typing.Any) -> date:
+    """``marshmallow.utils.from_iso_date`` with a fast path."""
+    if value.__class__ is str and _is_canonical_date(value):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            pass
+    return utils.from_iso_date(value)
+
+
+def from_iso_time(value: typing.Any) -> time:
+    """``marshmallow.utils.from_iso_time`` with a fast path."""
+    # marshmallow times have no offset
+    if value.__class__ is str and _time_offset(value) == "":
+        try:
+            return time.fromisoformat(value)
+        except ValueError:
+            pass
+    return utils.from_iso_time(value)
+
+
+class TemporalBackend(typing.NamedTuple):
+    # pydantic validators, as in pydantic.datetime_parse
+    parse_datetime: typing.Callable[[typing.Any], datetime]
+    parse_date: typing.Callable[[typing.Any], date]
+    parse_time: typing.Callable[[typing.Any], time]
+    parse_duration: typing.Callable[[typing.Any], timedelta]
+    # "iso" parsers of marshmallow's DateTime, Date and Time fields
+    from_iso_datetime: typing.Callable[[str], datetime]
+    from_iso_date: typing.Callable[[str], date]
+    from_iso_time: typing.Callable[[str], time]
+
+
+REGEX_BACKEND = TemporalBackend(
+    datetime_parse.parse_datetime,
+    datetime_parse.parse_date,
+    datetime_parse.parse_time,
+    datetime_parse.parse_duration,
+    utils.from_iso_datetime,
+    utils.from_iso_date,
+    utils.from_iso_time,
+)
+
+FAST_BACKEND = TemporalBackend(
+    parse_datetime,
+    parse_date,
+    parse_time,
+    parse_duration,
+    from_iso_datetime,
+    from_iso_date,
+    from_iso_time,
+)
+
+_backend = REGEX_BACKEND
+
+
+def get_backend() -> TemporalBackend:
+    return _backend
+
+
+def _install_pydantic(backend: TemporalBackend) -> None:
+    parsers = {
+        datetime: backend.parse_datetime,
+        date: backend.parse_date,
+        time: backend.parse_time,
+        timedelta: backend.parse_duration,
+    }
+    table = pydantic_validators._VALIDATORS
+    for i, (type_, _) in enumerate(table):
+        if type_ in parsers:
+            table[i] = (type_, [parsers[type_]])
+
+
+def set_backend(backend: TemporalBackend) -> TemporalBackend:
+    """Use ``backend`` for marshmallow fields and new pydantic models.
+
+    marshmallow fields pick it up at once; pydantic binds validators when a
+    model class is created, so existing models keep their parsers. Returns
+    the previous backend.
+    """
+    global _backend
+    previous, _backend = _backend, backend
+    for field_class, parse in (
+        (fields.DateTime, backend.from_iso_datetime),
+        (fields.Date, backend.from_iso_date),
+        (fields.Time, backend.from_iso_time),
+    ):
+        field_class.DESERIALIZATION_FUNCS = {
+            **field_class.DESERIALIZATION_FUNCS,
+            "iso": parse,
+            "iso8601": parse,
+        }
+    _install_pydantic(backend)
+    return previous
+
+
+@contextmanager
+def use_backend(backend: TemporalBackend) -> typing.Iterator[TemporalBackend]:
+    previous = set_backend(backend)
+    try:
+        yield backend
+    finally:
+        set_backend(previous)
+
+
+# opt-in per field / per model
+
+
+class FastDateTime(fields.DateTime):
+    DESERIALIZATION_FUNCS = {
+        **fields.DateTime.DESERIALIZATION_FUNCS,
+        "iso": from_iso_datetime,
+        "iso8601": from_iso_datetime,
+    }
+
+
+class FastDate(fields.Date):
+    DESERIALIZATION_FUNCS = {"iso": from_iso_date, "iso8601": from_iso_date}
+
+
+class FastTime(fields.Time):
+    DESERIALIZATION_FUNCS = {"iso": from_iso_time, "iso8601": from_iso_time}
+
+
+_FAST_PARSERS = (
+    (datetime, parse_datetime),
+    (date, parse_date),
+    (time, parse_time),
+    (timedelta, parse_duration),
+)
+
+
+def _use_fast_parsers(field: ModelField) -> None:
+    """Rebuild the validators of temporal ``field``s with ``FAST_BACKEND``."""
+    for sub_field in field.sub_fields or ():
+        _use_fast_parsers(sub_field)
+    if field.key_field is not None:
+        _use_fast_parsers(field.key_field)
+    if field.sub_fields and field.shape != SHAPE_GENERIC:
+        return
+    for type_, parse in _FAST_PARSERS:
+        if field.type_ is type_:
+            break
+    else:
+        return
+    # as ModelField.populate_validators, with the parser pydantic would find
+    class_validators = field.class_validators.values()
+    field.validators = prep_validators(
+        (
+            *[v.func for v in class_validators if v.each_item and v.pre],
+            parse,
+            *[v.func for v in class_validators if v.each_item and not v.pre],
+        )
+    )
+
+
+class FastTemporalModel(BaseModel):
+    """``BaseModel`` whose temporal fields use ``FAST_BACKEND``."""
+
+    def __init_subclass__(cls, **kwargs: typing.Any) -> None:
+        super().__init_subclass__(**kwargs)
+        for field in cls.__fields__.values():
+            _use_fast_parsers(field)
@@ -0,0 +1,157 @@
+import json
+
+import pytest
+from app.benchmarks.generics import bench_generics
+from app.benchmarks.hooks import bench_hooks
+from app.benchmarks.memory import bench_memory
+from app.benchmarks.nested import bench_nested
+from app.benchmarks.orm import bench_orm
+from app.benchmarks.parallel import break_even
+
+from app.benchmarks.runner import CASES, bench_case, percentile, run
+from app.benchmarks.startup import bench_startup
+from app.benchmarks.temporal import bench_temporal
+from app.benchmarks.unions import bench_unions
+
+
+class TestRunner:
+    def test_percentile(self):
+        samples = [float(i) for i in range(1, 101)]
+        assert percentile(samples, 50) == 51.0
+        assert percentile(samples, 99) == 99.0
+        assert percentile([3.0], 99) == 3.0
+
+    def test_bench_case_covers_both_libraries(self):
+        results = bench_case("user", records=10, repeat=3)
+        assert {(r.library, r.operation) for r in results} == {
+            ("marshmallow", "dump"),
+            ("marshmallow", "load"),
+            ("pydantic", "dump"),
+            ("pydantic", "load"),
+            ("marshmallow-compiled", "dump"),
+        }
+        for r in results:
+            assert r.records == 10
+            assert r.records_per_sec > 0
+            assert r.p50_ms <= r.max_ms
+            # three samples are too few for a p99
+            assert r.p99_ms is None
+            assert r.peak_memory_bytes > 0
+
+    def test_p99_needs_enough_samples(self):
+        results = bench_case("user", records=1, repeat=100)
+        for r in results:
+            assert r.p50_ms <= r.p99_ms <= r.max_ms
+
+    def test_report_to_json(self, tmp_path):
+        report = run(sizes=(1, 5), repeat=3)
+        path = tmp_path / "bench.json"
+        report.write_json(str(path))
+
+        data = json.loads(path.read_text())
+        # the compiled dumper only handles the flat user schema
+        assert len(data["results"]) == (len(CASES) * 4 + 1) * 2
+        assert {"python", "marshmallow", "pydantic"} <= data.keys()
+
+
+class TestParallelBreakEven:
+    def test_break_even(self):
+        costs = {"validate": 20e-6, "transfer": 5e-6}
+        assert break_even(costs, workers=4, startup=0.03) == pytest.approx(3000)
+        assert break_even({"validate": 1e-6, "transfer": 5e-6}, 4, 0.03) == float("inf")
+
+
+class TestOrmBench:
+    def test_bench_orm(self):
+        results = bench_orm(10, repeat=2)
+        assert [(r.library, r.case) for r in results] == [
+            ("pydantic", "company"),
+            ("pydantic-bulk", "company"),
+            ("pydantic-bulk", "company_rows"),
+        ]
+        assert all(r.records == 10 for r in results)
+
+
+class TestUnionBench:
+    def test_bench_unions(self):
+        results = bench_unions(3, records=6, repeat=2)
+        assert [r.library for r in results] == [
+            "pydantic",
+            "pydantic-discriminator",
+            "dispatch",
+        ]
+        assert {r.case for r in results} == {"union_3"}
+
+
+class TestTemporalBench:
+    def test_bench_temporal(self):
+        results = bench_temporal(records=6, repeat=2)
+        assert len(results) == 14
+        assert {r.library for r in results} == {
+            "pydantic",
+            "pydantic-fast",
+            "marshmallow",
+            "marshmallow-fast",
+        }
+        assert {r.case for r in results} == {"datetime", "date", "time", "duration"}
+
+
+class TestMemoryBench:
+    def test_bench_memory(self):
+        results = bench_memory(records=50)
+        assert {(r.library, r.case) for r in results} == {
+            (library, case)
+            for library in ("pydantic", "pydantic-compact")
+            for case in ("bar", "foo", "transaction")
+        }
+        assert all(r.bytes_per_instance > 0 for r in results)
+
+
+class TestNestedBench:
+    def test_bench_nested(self):
+        results = bench_nested(tasks=5, clients=2, repeat=2)
+        assert [(r.library, r.case) for r in results] == [
+            ("marshmallow", "client"),
+            ("marshmallow-nested", "client"),
+            ("marshmallow", "client_flat"),
+            ("marshmallow-nested", "client_flat"),
+        ]
+        assert all(r.records == 10 for r in results)
+
+
+class TestHooksBench:
+    def test_bench_hooks(self):
+        results = bench_hooks(records=4, hooks=2, repeat=2)
+        assert {(r.library, r.case, r.operation) for r in results} == {
+            (library, case, operation)
+            for library in ("marshmallow", "marshmallow-pipeline")
+            for case, operation in (
+                ("hooks_0", "load"),
+                ("hooks_0", "dump"),
+                ("hooks_2", "load"),
+                ("hooks_2", "dump"),
+                ("envelope", "load"),
+            )
+        }
+
+
+class TestStartupBench:
+    def test_bench_startup(self):
+        results = bench_startup(models=5, repeat=1)
+        assert [(r.library, r.case) for r in results] == [
+            (library, case)
+            for library in ("pydantic", "marshmallow")
+            for case in ("no-cache", "cache")
+        ]
+        assert all(r.models == 5 and r.seconds > 0 for r in results)
+
+
+class TestGenericsBench:
+    def test_bench_generics(self):
+        results = bench_generics(distinct_counts=(4, 12), maxsize=4, repeat=2)
+        assert [(r.library, r.case, r.count) for r in results] == [
+            (library, case, count)
+            for library in ("pydantic", "pydantic-cached")
+            for case, count in (("after_gc", 2), ("distinct", 4), ("distinct", 12))
+        ]
+        assert all(r.us_per_call > 0 for r in results)
@@ -1,2 +1,3 @@
 from .data_fixtures import *
-from .marshmellow_fixtures import *
\ No newline at end of file
+from .marshmellow_fixtures import *
+from .pydantic_fixtures import *
@@ -1,16 +1,9 @@
-import datetime as dt
+import asyncio
+import random
 
 import pytest
 
-
-class User:
-    def __init__(self, name, email):
-        self.name = name
-        self.email = email
-        self.created_at = dt.datetime.now()
-
-    def __repr__(self):
-        return "<User(name={self.name!r})>".format(self=self)
+from app.models import Client, Task, User
 
 
 @pytest.fixture
@@ -35,19 +28,6 @@ def user_2_dict_wichout_created_at():
     }
 
 
-class Client:
-    def __init__(self, name, email):
-        self.name = name
-        self.email = email
-        self.created_at = dt.datetime.now()
-        self.tasks = []
-
-
-class Task:
-    def __init__(self, title):
-        self.title = title
-
-
 @pytest.fixture
 def clien_wich_two_tasks():
     task_1 = Task("First task")
@@ -57,3 +37,90 @@ def clien_wich_two_tasks():
     client.tasks.append(task_2)
 
     return client
+
+
+def _iso_pieces(rng):
+    def two(top):
+        return f"{rng.randint(0, top):02d}"
+
+    fraction = "." + "".join(rng.choice("0123456789") for _ in range(rng.randint(1, 8)))
+    offset = rng.choice(["", "Z", f"+{two(23)}:{two(59)}", f"-{two(23)}:{two(59)}"])
+    date = f"{rng.randint(1, 9999):04d}-{two(13)}-{two(32)}"
+    time = f"{two(24)}:{two(60)}:{two(60)}" + rng.choice(["", fraction])
+    duration = "P" + "".join(
+        unit if unit == "T" else f"{rng.randint(0, 10 ** rng.randint(1, 10))}{unit}"
+        for unit in rng.choice(["D", "DTH", "TMS", "DTHMS", "TS", "HD", "T", "DT"])
+    )
+    return [
+        f"{date}{rng.choice('T ')}{time}{offset}",
+        date,
+        time,
+        time + offset,
+        duration,
+    ]
+
+
+_ISO_NOISE = ["", "x", "-", ":", ".", "T", " ", "+", "0", "9", "Z", "+99", "١"]
+
+
+@pytest.fixture
+def iso_fuzz_strings():
+    """Canonical ISO 8601 strings, out of range values and mutations of them."""
+    rng = random.Random(20141008)
+    strings = []
+    for _ in range(1500):
+        for value in _iso_pieces(rng):
+            strings.append(value)
+            i = rng.randrange(len(value) + 1)
+            strings.append(value[:i] + rng.choice(_ISO_NOISE) + value[i + 1 :])
+    return strings
+
+
+def outcome(parse, value):
+    """What ``parse(value)`` gives, comparable across parsers: error type or result."""
+    try:
+        result = parse(value)
+    except Exception as e:
+        return type(e)
+    tzinfo = getattr(result, "tzinfo", None)
+    return type(result), result, repr(tzinfo), tzinfo and tzinfo.tzname(None)
+
+
+class InMemoryStore:
+    """Async key-value store stand-in that records how it was called."""
+
+    def __init__(self, items, delay=0.001):
+        self.items = dict(items)
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _request(self, keys):
+        self.calls.append(keys)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+    async def get(self, key):
+        await self._request(key)
+        return self.items.get(key)
+
+    async def get_many(self, keys):
+        await self._request(list(keys))
+        return [self.items.get(key) for key in keys]
+
+
+@pytest.fixture
+def async_store():
+    return InMemoryStore(
+        {
+            "sku-1": {"stock": 10},
+            "sku-2": {"stock": 0},
+            "sku-3": {"stock": 100},
+            "user:guido": {"name": "Guido"},
+        }
+    )
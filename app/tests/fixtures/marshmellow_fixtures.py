@@ -1,11 +1,7 @@
+import pytest
 from marshmallow import Schema, fields, post_load
-from app.tests.fixtures.data_fixtures import User
-
-
-class UserSchema(Schema):
-    name = fields.Str()
-    email = fields.Email()
-    created_at = fields.DateTime()
+from app.compiled_dump import compile_dumper
+from app.models import CleintSchema, CleintSchemaFlat, TaskSchema, User, UserSchema
 
 
 class UserSchemaWichPostLoad(Schema):
@@ -20,19 +16,9 @@ class UserSchemaWichPostLoad(Schema):
         return User(**data)
 
 
-class TaskSchema(Schema):
-    title = fields.Str()
-
-
-class CleintSchema(Schema):
-    name = fields.Str()
-    email = fields.Email()
-    created_at = fields.DateTime()
-    tasks = fields.List(fields.Nested(TaskSchema))
-
-
-class CleintSchemaFlat(Schema):
-    name = fields.Str()
-    email = fields.Email()
-    created_at = fields.DateTime()
-    tasks = fields.Pluck(TaskSchema, "title", many=True)
+@pytest.fixture(params=["schema", "compiled"])
+def dump_path(request):
+    # run dump tests against both Schema.dump and the compiled dumper
+    if request.param == "compiled":
+        return compile_dumper
+    return lambda schema: schema
@@ -0,0 +1,9 @@
+from app.models import (
+    ClientModel,
+    ClientModelFlat,
+    CompanyModel,
+    CompanyOrm,
+    OrmBase,
+    TaskModel,
+    UserModel,
+)
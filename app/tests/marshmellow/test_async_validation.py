@@ -0,0 +1,197 @@
+import asyncio
+
+import pytest
+from app.async_validation import AsyncSchema, BatchLoader
+from app.tests.fixtures.data_fixtures import InMemoryStore, User
+from marshmallow import ValidationError, fields, post_load, validates, validates_schema
+
+
+def validate_quantity(n):
+    if n < 0:
+        raise ValidationError("Quantity must be greater than 0.")
+    if n > 30:
+        raise ValidationError("Quantity must not be greater than 30.")
+
+
+@pytest.fixture
+def item_schema(async_store: InMemoryStore):
+    class ItemSchema(AsyncSchema):
+        sku = fields.Str(required=True)
+        quantity = fields.Integer(validate=validate_quantity)
+
+        @validates("sku")
+        async def sku_exists(self, value):
+            if await async_store.get(value) is None:
+                raise ValidationError("Unknown SKU.")
+
+        @validates_schema
+        async def in_stock(self, data, **kwargs):
+            item = await async_store.get(data["sku"])
+            if item["stock"] < data.get("quantity", 0):
+                raise ValidationError("Not enough stock.", "quantity")
+
+    return ItemSchema
+
+
+class TestAsyncSchema:
+    def test_aload(self, item_schema):
+        schema = item_schema()
+        assert asyncio.run(schema.aload({"sku": "sku-1", "quantity": 3})) == {
+            "sku": "sku-1",
+            "quantity": 3,
+        }
+
+        with pytest.raises(ValidationError) as error:
+            asyncio.run(schema.aload({"sku": "sku-9", "quantity": 31}))
+        assert error.value.messages == {
+            "quantity": ["Quantity must not be greater than 30."],
+            "sku": ["Unknown SKU."],
+        }
+
+        with pytest.raises(ValidationError) as error:
+            asyncio.run(schema.aload({"sku": "sku-2", "quantity": 1}))
+        assert error.value.messages == {"quantity": ["Not enough stock."]}
+
+    def test_load_is_refused(self, item_schema):
+        with pytest.raises(TypeError):
+            item_schema().load({"sku": "sku-1"})
+
+    def test_many_coalesces_and_limits(self, item_schema, async_store):
+        records = [{"sku": f"sku-{i % 3 + 1}", "quantity": 0} for i in range(30)]
+        schema = item_schema(many=True)
+        result = asyncio.run(schema.aload(records, concurrency=2))
+        assert result == records
+        # one lookup per distinct sku for @validates, then one per record
+        assert len(async_store.calls) == 3 + 30
+        assert async_store.max_in_flight == 2
+
+    def test_many_errors_by_index(self, item_schema):
+        records = [
+            {"sku": "sku-1", "quantity": 1},
+            {"sku": "nope", "quantity": 1},
+            {"quantity": 40},
+        ]
+        schema = item_schema(many=True)
+        with pytest.raises(ValidationError) as error:
+            asyncio.run(schema.aload(records))
+        assert error.value.messages == {
+            1: {"sku": ["Unknown SKU."]},
+            2: {
+                "sku": ["Missing data for required field."],
+                "quantity": ["Quantity must not be greater than 30."],
+            },
+        }
+        assert error.value.valid_data[0] == records[0]
+        assert "sku" not in error.value.valid_data[1]
+
+    def test_async_validate_callables_and_post_load(self):
+        taken = InMemoryStore({"mick@stones.com": True})
+        calls = []
+
+        async def email_free(value):
+            calls.append(value)
+            if await taken.get(value):
+                raise ValidationError("Email is taken.")
+
+        async def not_blocked(value):
+            await asyncio.sleep(0)
+            return value != "blocked@stones.com"
+
+        class UserSchema(AsyncSchema):
+            name = fields.Str()
+            email = fields.Email(validate=[email_free, not_blocked])
+
+            @post_load
+            def make_user(self, data, **kwargs):
+                return User(**data)
+
+        schema = UserSchema(many=True)
+        users = asyncio.run(
+            schema.aload(
+                [
+                    {"name": "Keith", "email": "keith@stones.com"},
+                    {"name": "Ron", "email": "keith@stones.com"},
+                ]
+            )
+        )
+        assert [user.name for user in users] == ["Keith", "Ron"]
+        assert calls == ["keith@stones.com"]
+
+        with pytest.raises(ValidationError) as error:
+            asyncio.run(
+                schema.aload(
+                    [
+                        {"name": "Mick", "email": "mick@stones.com"},
+                        {"name": "Bill", "email": "blocked@stones.com"},
+                        {"name": "Bad", "email": "not-an-email"},
+                    ]
+                )
+            )
+        assert error.value.messages == {
+            0: {"email": ["Email is taken."]},
+            1: {"email": ["Invalid value."]},
+            2: {"email": ["Not a valid email address."]},
+        }
+
+    def test_schema_validator_skipped_on_field_errors(self):
+        seen = []
+
+        class NumberSchema(AsyncSchema):
+            field_a = fields.Integer()
+            field_b = fields.Integer()
+
+            @validates_schema
+            async def validate_numbers(self, data, **kwargs):
+                seen.append(data)
+                if data["field_b"] >= data["field_a"]:
+                    raise ValidationError("field_a must be greater than field_b")
+
+        with pytest.raises(ValidationError) as error:
+            asyncio.run(NumberSchema().aload({"field_a": 1, "field_b": 2}))
+        assert error.value.messages == {
+            "_schema": ["field_a must be greater than field_b"]
+        }
+        with pytest.raises(ValidationError):
+            asyncio.run(NumberSchema().aload({"field_a": "x", "field_b": 2}))
+        assert len(seen) == 1
+
+
+class TestBatchLoader:
+    def test_lookups_in_flight_go_in_one_batch(self, async_store: InMemoryStore):
+        loader = BatchLoader(async_store.get_many)
+
+        class OrderSchema(AsyncSchema):
+            sku = fields.Str()
+
+            @validates("sku")
+            async def sku_exists(self, value):
+                if await loader.load(value) is None:
+                    raise ValidationError("Unknown SKU.")
+
+        records = [{"sku": sku} for sku in ["sku-1", "sku-2", "sku-3", "nope"] * 5]
+        with pytest.raises(ValidationError) as error:
+            asyncio.run(OrderSchema(many=True).aload(records, concurrency=100))
+        assert set(error.value.messages) == {3, 7, 11, 15, 19}
+        assert async_store.calls == [["sku-1", "sku-2", "sku-3", "nope"]]
+        assert loader.batches == 1
+
+    def test_max_batch_size_and_failures(self, async_store: InMemoryStore):
+        async def run(loader, keys):
+            return await asyncio.gather(*(loader.load(key) for key in keys))
+
+        loader = BatchLoader(async_store.get_many, max_batch_size=2)
+        assert asyncio.run(run(loader, ["sku-1", "sku-2", "sku-3"])) == [
+            {"stock": 10},
+            {"stock": 0},
+            {"stock": 100},
+        ]
+        assert async_store.calls == [["sku-1", "sku-2"], ["sku-3"]]
+
+        async def broken(keys):
+            raise ConnectionError("store is down")
+
+        loader = BatchLoader(broken)
+        with pytest.raises(ConnectionError):
+            asyncio.run(run(loader, ["sku-1"]))
+        loader.batch_fn = async_store.get_many
+        assert asyncio.run(run(loader, ["sku-1"])) == [{"stock": 10}]
@@ -0,0 +1,96 @@
+import pytest
+from app.batch_validation import BatchSchema, BatchValidator
+from app.tests.fixtures.data_fixtures import User
+from marshmallow import Schema, ValidationError, fields, post_load
+
+CATALOGUE = {"sku-1", "sku-2", "sku-3"}
+
+
+def validate_quantity(n):
+    if n < 0:
+        raise ValidationError("Quantity must be greater than 0.")
+    if n > 30:
+        raise ValidationError("Quantity must not be greater than 30.")
+
+
+@pytest.fixture
+def lookups():
+    return []
+
+
+@pytest.fixture
+def item_schema(lookups):
+    def skus_exist(skus):
+        lookups.append(skus)
+        return {sku: "Unknown SKU." for sku in skus - CATALOGUE}
+
+    class ItemSchema(BatchSchema):
+        sku = fields.Str(required=True, validate=BatchValidator(skus_exist))
+        quantity = fields.Integer(validate=validate_quantity)
+
+    return ItemSchema
+
+
+class TestBatchSchema:
+    def test_one_call_per_load(self, item_schema, lookups):
+        records = [{"sku": f"sku-{i % 3 + 1}", "quantity": i % 30} for i in range(900)]
+        assert item_schema(many=True).load(records) == records
+        assert lookups == [CATALOGUE]
+
+    def test_errors_mapped_to_records(self, item_schema, lookups):
+        records = [
+            {"sku": "sku-1", "quantity": 1},
+            {"sku": "sku-9", "quantity": 31},
+            {"sku": "sku-9", "quantity": 2},
+            {"sku": 5},
+        ]
+        with pytest.raises(ValidationError) as error:
+            item_schema(many=True).load(records)
+        assert error.value.messages == {
+            1: {
+                "quantity": ["Quantity must not be greater than 30."],
+                "sku": ["Unknown SKU."],
+            },
+            2: {"sku": ["Unknown SKU."]},
+            3: {"sku": ["Not a valid string."]},
+        }
+        assert error.value.valid_data[2] == {"quantity": 2}
+        assert lookups == [{"sku-1", "sku-9"}]
+
+        assert item_schema(many=True).validate(records) == error.value.messages
+        assert item_schema().validate({"sku": "sku-9"}) == {"sku": ["Unknown SKU."]}
+
+    def test_single_load_and_post_load(self):
+        def emails_free(emails):
+            return {
+                email: ValidationError("Email is taken.")
+                for email in emails
+                if email.startswith("mick@")
+            }
+
+        class UserSchema(BatchSchema):
+            name = fields.Str()
+            email = fields.Email(validate=BatchValidator(emails_free))
+
+            @post_load
+            def make_user(self, data, **kwargs):
+                return User(**data)
+
+        user = UserSchema().load({"name": "Keith", "email": "keith@stones.com"})
+        assert isinstance(user, User)
+        with pytest.raises(ValidationError) as error:
+            UserSchema().load({"name": "Mick", "email": "mick@stones.com"})
+        assert error.value.messages == {"email": ["Email is taken."]}
+
+    def test_plain_schema_checks_each_value(self, lookups):
+        def skus_exist(skus):
+            lookups.append(skus)
+            return {sku: ["Unknown SKU."] for sku in skus - CATALOGUE}
+
+        class ItemSchema(Schema):
+            sku = fields.Str(validate=BatchValidator(skus_exist))
+
+        with pytest.raises(ValidationError) as error:
+            ItemSchema(many=True).load([{"sku": "sku-1"}, {"sku": "nope"}])
+        assert error.value.messages == {1: {"sku": ["Unknown SKU."]}}
+        assert lookups == [{"sku-1"}, {"nope"}]
@@ -0,0 +1,87 @@
+import pytest
+from app.bulk_load import SchemaBulkLoader
+from app.compiled_dump import SchemaCompileError
+from app.tests.fixtures.marshmellow_fixtures import UserSchema, UserSchemaWichPostLoad
+from marshmallow import INCLUDE, Schema, ValidationError, fields, validate
+
+
+class FileType(Schema):
+    id = fields.Integer(required=True)
+    size = fields.Float(validate=validate.Range(min=0))
+    type_file = fields.Str(validate=validate.OneOf(["FOLDER", "FILE"]))
+    name = fields.Str(load_default="noname")
+    created_at = fields.DateTime(allow_none=True)
+
+
+def load_both(schema: Schema, data: list, **kwargs):
+    """Return (result or messages, valid_data) of schema.load and the bulk loader."""
+    outcomes = []
+    for load in (
+        lambda: schema.load(data, many=True, **kwargs),
+        lambda: SchemaBulkLoader(schema).load(data, **kwargs),
+    ):
+        try:
+            outcomes.append((load(), None))
+        except ValidationError as err:
+            outcomes.append((err.messages, err.valid_data))
+    return outcomes
+
+
+class TestSchemaBulkLoader:
+    def test_load_same_as_schema(self, user_2_dict: dict):
+        data = [user_2_dict, dict(user_2_dict, name="Mick")]
+        result, bulk = load_both(UserSchema(), data)
+        assert result == bulk
+        assert result[0][0]["created_at"].year == 2014
+
+    def test_field_constrains(self):
+        data = [
+            {"id": 1, "type_file": "FOLDER", "size": 1.5},
+            {"id": "2", "type_file": "FILE", "size": 3, "created_at": None},
+            {"id": 3, "name": "named", "created_at": "2014-08-11T05:26:03.869245"},
+        ]
+        result, bulk = load_both(FileType(), data)
+        assert result == bulk
+        assert bulk[0][1] == {
+            "id": 2,
+            "type_file": "FILE",
+            "size": 3.0,
+            "created_at": None,
+            "name": "noname",
+        }
+
+    def test_errors_same_as_schema(self):
+        data = [
+            {"id": 1, "type_file": "NOT_FOLDER"},
+            {"id": True, "size": -1.0},
+            {"type_file": "FILE", "created_at": "not a date"},
+            {"id": 4, "size": float("nan"), "unknown_field": 1},
+            {"id": 5},
+        ]
+        result, bulk = load_both(FileType(), data)
+        assert result == bulk
+        messages, valid_data = bulk
+        assert messages[0] == {"type_file": ["Must be one of: FOLDER, FILE."]}
+        assert messages[3]["unknown_field"] == ["Unknown field."]
+        assert 4 not in messages
+        assert valid_data[4] == {"id": 5, "name": "noname"}
+
+    def test_unknown_include(self):
+        data = [{"id": 1, "extra": "value"}]
+        result, bulk = load_both(FileType(), data, unknown=INCLUDE)
+        assert result == bulk
+        assert bulk[0][0]["extra"] == "value"
+
+    def test_generator_input(self):
+        data = [{"id": 1}, {"id": "2", "size": 3}]
+        loaded = SchemaBulkLoader(FileType()).load(d for d in data)
+        assert loaded == FileType().load(data, many=True)
+
+    def test_unsupported_schema(self):
+        with pytest.raises(SchemaCompileError):
+            SchemaBulkLoader(UserSchemaWichPostLoad())
+
+    def test_invalid_input_type(self):
+        result, bulk = load_both(FileType(), [{"id": 1}, "not a dict"])
+        assert result == bulk
+        assert bulk[0] == {1: {"_schema": ["Invalid input type."]}}
@@ -0,0 +1,77 @@
+import json
+
+import pytest
+from app import columnar as columnar_module
+from app.columnar import columnar
+from app.tests.fixtures.marshmellow_fixtures import UserSchema
+from marshmallow import Schema, fields, post_dump
+
+
+@pytest.fixture(autouse=True)
+def without_numpy(monkeypatch):
+    monkeypatch.setattr(columnar_module, "numpy", None)
+
+
+@pytest.fixture
+def users():
+    data = [{"name": f"user {i}", "email": f"user{i % 2}@python.org"} for i in range(4)]
+    data[1]["created_at"] = "2014-08-11T05:26:03.869245"
+    return UserSchema(many=True).load(data)
+
+
+class Score(Schema):
+    name = fields.Str()
+    points = fields.Integer(data_key="score")
+    ratio = fields.Float()
+    passed = fields.Boolean()
+
+
+class TestColumnar:
+    def test_from_loaded(self, users):
+        columns = columnar(users, UserSchema)
+        assert columns.kinds == {"name": "str", "email": "str", "created_at": "object"}
+        assert columns.to_dicts() == users
+        assert columns[1].created_at == users[1]["created_at"]
+        assert columns[0].keys() == ["name", "email"]
+        with pytest.raises(AttributeError):
+            columns[0].created_at
+
+    def test_dumps(self, users):
+        columns = columnar(users, UserSchema())
+        assert columns.dumps() == UserSchema(many=True).dumps(users)
+        page = columns.filter(lambda row: row.email == "user1@python.org")
+        assert json.loads(page.dumps()) == UserSchema(many=True).dump(users[1::2])
+
+    def test_identity_dump(self):
+        schema = Score()
+        loaded = schema.load(
+            [{"name": "a", "score": 1, "ratio": 0.5, "passed": "yes"}], many=True
+        )
+        columns = columnar(loaded, schema)
+        assert columns.kinds == {
+            "name": "str",
+            "points": "int",
+            "ratio": "float",
+            "passed": "bool",
+        }
+        assert not columns._dump_is_identity()
+        assert columns.dump() == schema.dump(loaded, many=True)
+
+        class Plain(Schema):
+            name = fields.Str()
+            ratio = fields.Float()
+
+        columns = columnar([{"name": "a", "ratio": 0.5}], Plain)
+        assert columns._dump_is_identity()
+        assert columns.dumps() == Plain(many=True).dumps([{"name": "a", "ratio": 0.5}])
+
+    def test_hooks_use_schema(self):
+        class Upper(Schema):
+            name = fields.Str()
+
+            @post_dump
+            def upper(self, data, **kwargs):
+                return {"name": data["name"].upper()}
+
+        columns = columnar([{"name": "a"}], Upper)
+        assert columns.dump() == [{"name": "A"}]
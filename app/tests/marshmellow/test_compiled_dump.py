@@ -0,0 +1,66 @@
+import datetime as dt
+from collections import OrderedDict
+
+import pytest
+from app.compiled_dump import SchemaCompileError, compile_dumper
+from app.tests.fixtures.data_fixtures import User
+from app.tests.fixtures.marshmellow_fixtures import CleintSchema, UserSchema
+from marshmallow import Schema, fields, post_dump
+
+
+class TestCompiledDump:
+    def test_data_key_and_attribute(self):
+        class UserSchema(Schema):
+            name = fields.String()
+            email = fields.Email(data_key="emailAddress")
+            login = fields.Str(attribute="username")
+            city = fields.Str(attribute="address.city")
+
+        data = {
+            "name": "Mike",
+            "email": "foo@bar.com",
+            "username": "mike",
+            "address": {"city": "Moscow"},
+        }
+        assert compile_dumper(UserSchema).dump(data) == UserSchema().dump(data)
+        assert "emailAddress" in compile_dumper(UserSchema).dump(data)
+
+    def test_missing_none_and_defaults(self):
+        class EventSchema(Schema):
+            title = fields.Str()
+            note = fields.Str(dump_default="no note")
+            started = fields.DateTime(dump_default=dt.datetime(2017, 9, 29))
+            finished = fields.DateTime(format="%Y-%m-%d")
+            day = fields.Date()
+            stamp = fields.DateTime(format="timestamp")
+
+        moment = dt.datetime(2022, 9, 5, 18, 0, 25, 675255)
+        for data in (
+            {},
+            {"title": None, "finished": None},
+            {"title": b"bytes", "finished": moment, "day": moment.date()},
+            {"title": 42, "stamp": moment},
+        ):
+            assert compile_dumper(EventSchema).dump(data) == EventSchema().dump(data)
+
+    def test_ordered_and_exclude(self, user_1: User):
+        class OrderedUserSchema(UserSchema):
+            class Meta:
+                ordered = True
+
+        schema = OrderedUserSchema(exclude=("email",))
+        result = compile_dumper(schema).dump(user_1)
+        assert isinstance(result, OrderedDict)
+        assert list(result) == list(schema.dump(user_1))
+
+    def test_unsupported_schema(self):
+        class WithHook(UserSchema):
+            @post_dump
+            def wrap(self, data, **kwargs):
+                return data
+
+        with pytest.raises(SchemaCompileError):
+            compile_dumper(WithHook)
+
+        with pytest.raises(SchemaCompileError):
+            compile_dumper(CleintSchema)
@@ -0,0 +1,101 @@
+import pytest
+from app.error_modes import CountResult, FirstError, load, load_many
+from app.tests.fixtures import User, UserSchema, UserSchemaWichPostLoad
+from marshmallow import Schema, ValidationError, fields, validate, validates_schema
+
+
+class ItemSchema(Schema):
+    name = fields.Str(required=True)
+    quantity = fields.Integer(validate=validate.Range(min=0, max=30))
+    tags = fields.List(fields.Str(validate=validate.Length(max=3)))
+
+    @validates_schema
+    def check_name(self, data, **kwargs):
+        if data.get("name") == "forbidden":
+            raise ValidationError("forbidden name", "name")
+
+
+def first_of_full_report(schema, data):
+    with pytest.raises(ValidationError) as e:
+        schema.load(data)
+    loc, messages = (), e.value.messages
+    while isinstance(messages, dict):
+        key, messages = next(iter(messages.items()))
+        loc += (key,)
+    return loc
+
+
+class TestFirstError:
+    def test_default_is_full_report(self):
+        with pytest.raises(ValidationError) as e:
+            load(UserSchema(), {"name": "John", "email": "foo"})
+        assert e.value.messages == {"email": ["Not a valid email address."]}
+        assert e.value.valid_data == {"name": "John"}
+
+    @pytest.mark.parametrize(
+        "data, loc, code",
+        [
+            ({"name": "John", "email": "foo"}, ("email",), "invalid"),
+            ({"name": 1, "email": "foo"}, ("name",), "invalid"),
+            ({"email": "a@python.org", "age": 3}, ("age",), "unknown"),
+            ([], (), "type"),
+        ],
+    )
+    def test_first_error(self, data, loc, code):
+        with pytest.raises(FirstError) as e:
+            load(UserSchema(), data, errors="first")
+        assert (e.value.loc, e.value.code) == (loc, code)
+        if loc:
+            assert loc == first_of_full_report(UserSchema(), data)
+
+    @pytest.mark.parametrize(
+        "data, loc, code",
+        [
+            ({"quantity": 1}, ("name",), "required"),
+            ({"name": "a", "quantity": 31}, ("quantity",), "invalid"),
+            ({"name": "a", "tags": ["ok", "long"]}, ("tags", 1), "invalid"),
+            ({"name": "forbidden"}, ("name",), "invalid"),
+        ],
+    )
+    def test_validators(self, data, loc, code):
+        with pytest.raises(FirstError) as e:
+            load(ItemSchema(), data, errors="first")
+        assert (e.value.loc, e.value.code) == (loc, code)
+        assert loc == first_of_full_report(ItemSchema(), data)
+
+    def test_valid_data_same_as_load(self, user_2_dict_wichout_created_at):
+        data = user_2_dict_wichout_created_at
+        user = load(UserSchemaWichPostLoad(), data, errors="first")
+        assert isinstance(user, User)
+        assert user.email == data["email"]
+        assert load(ItemSchema(), {"name": "a", "quantity": "3"}, errors="first") == (
+            ItemSchema().load({"name": "a", "quantity": "3"})
+        )
+
+
+class TestLoadMany:
+    records = [
+        {"name": "a", "quantity": 1},
+        {"quantity": 1},
+        {"name": "b", "quantity": 99},
+        {"name": "c", "quantity": "x"},
+        {"name": "d"},
+    ]
+
+    def test_first(self):
+        with pytest.raises(FirstError) as e:
+            load_many(ItemSchema, self.records, errors="first")
+        assert (e.value.loc, e.value.code) == ((1, "name"), "required")
+        assert str(e.value) == "1 -> name: required"
+
+    def test_count(self):
+        result = load_many(ItemSchema, self.records, errors="count")
+        assert isinstance(result, CountResult)
+        assert result.valid == [{"name": "a", "quantity": 1}, {"name": "d"}]
+        assert result.invalid == 3
+        assert result.codes == {"required": 1, "invalid": 2}
+
+    def test_full(self):
+        with pytest.raises(ValidationError) as e:
+            load_many(ItemSchema, self.records)
+        assert set(e.value.messages) == {1, 2, 3}
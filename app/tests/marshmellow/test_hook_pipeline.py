@@ -0,0 +1,196 @@
+import pytest
+from app.hook_pipeline import PipelineSchema, Step, constructs
+from app.schema_cache import get_schema
+from app.tests.fixtures.data_fixtures import User
+from marshmallow import (
+    Schema,
+    ValidationError,
+    fields,
+    post_dump,
+    post_load,
+    pre_dump,
+    pre_load,
+    validates_schema,
+)
+from marshmallow.decorators import POST_LOAD, PRE_LOAD, VALIDATES_SCHEMA
+
+
+def envelope_schemas(base: type[Schema]) -> type[Schema]:
+    class BaseSchema(base):
+        __envelope__ = {"single": None, "many": None}
+        __model__ = User
+
+        def get_envelope_key(self, many):
+            key = self.__envelope__["many"] if many else self.__envelope__["single"]
+            assert key is not None, "Envelope key undefined"
+            return key
+
+        @pre_load(pass_many=True)
+        def unwrap_envelope(self, data, many, **kwargs):
+            return data[self.get_envelope_key(many)]
+
+        @post_dump(pass_many=True)
+        def wrap_with_envelope(self, data, many, **kwargs):
+            return {self.get_envelope_key(many): data}
+
+        make_object = constructs("__model__")
+
+    class UserSchema(BaseSchema):
+        __envelope__ = {"single": "user", "many": "users"}
+        name = fields.Str()
+        email = fields.Email()
+
+    return UserSchema
+
+
+def logging_schemas(base: type[Schema], log: list) -> type[Schema]:
+    class LoggingSchema(base):
+        value = fields.Int()
+
+        @pre_load
+        def b_pre_load(self, data, **kwargs):
+            log.append("b_pre_load")
+            return data
+
+        @pre_load(pass_many=True)
+        def a_pre_load_many(self, data, many, **kwargs):
+            log.append(("a_pre_load_many", many))
+            return data
+
+        @post_load(pass_original=True)
+        def post_load_original(self, data, original, **kwargs):
+            log.append(("post_load_original", original["value"]))
+            return data
+
+        @pre_dump
+        def pre_dump(self, obj, **kwargs):
+            log.append("pre_dump")
+            return obj
+
+        @post_dump(pass_many=True)
+        def a_post_dump_many(self, data, many, **kwargs):
+            log.append(("a_post_dump_many", many))
+            return data
+
+        @post_dump
+        def b_post_dump(self, data, **kwargs):
+            log.append("b_post_dump")
+            return data
+
+        @validates_schema(pass_many=True)
+        def check_many(self, data, many, **kwargs):
+            log.append(("check_many", many))
+
+        @validates_schema(pass_original=True)
+        def positive(self, data, original, **kwargs):
+            log.append("positive")
+            if data["value"] < 0:
+                raise ValidationError("must be positive", "value")
+
+        @validates_schema(skip_on_field_errors=False)
+        def always(self, data, **kwargs):
+            log.append("always")
+
+    return LoggingSchema
+
+
+class TestPipelineSchema:
+    def test_envelope(self):
+        schema = envelope_schemas(PipelineSchema)()
+        reference = envelope_schemas(Schema)()
+
+        user = User("Mick", email="mick@stones.org")
+        assert schema.dump(user) == reference.dump(user)
+        assert schema.dump(user) == {
+            "user": {"name": "Mick", "email": "mick@stones.org"}
+        }
+
+        users = [
+            User("Keith", email="keith@stones.org"),
+            User("Charlie", email="charlie@stones.org"),
+        ]
+        users_data = schema.dump(users, many=True)
+        assert users_data == reference.dump(users, many=True)
+        assert list(users_data) == ["users"]
+
+        user_objs = schema.load(users_data, many=True)
+        assert [type(u) for u in user_objs] == [User, User]
+        assert [u.name for u in user_objs] == ["Keith", "Charlie"]
+        assert isinstance(
+            schema.load({"user": {"name": "Mick", "email": "mick@stones.org"}}), User
+        )
+
+    def test_inherited_hooks_compiled(self):
+        schema_class = envelope_schemas(PipelineSchema)
+        assert schema_class._pipeline[PRE_LOAD] == (
+            Step("unwrap_envelope", True, False),
+        )
+        assert schema_class._pipeline[POST_LOAD] == (
+            Step("make_object", False, False, "__model__"),
+        )
+
+    @pytest.mark.parametrize("many", [False, True])
+    def test_same_calls_as_schema(self, many):
+        data = [{"value": 1}, {"value": 2}] if many else {"value": 1}
+        results = {}
+        for base in (Schema, PipelineSchema):
+            log = []
+            schema = logging_schemas(base, log)()
+            loaded = schema.load(data, many=many)
+            dumped = schema.dump(loaded, many=many)
+            results[base] = (loaded, dumped, log)
+        assert results[Schema] == results[PipelineSchema]
+        assert results[Schema][2][0] == ("a_pre_load_many", many)
+
+    @pytest.mark.parametrize(
+        "data, messages",
+        [
+            ([{"value": 1}, {"value": -1}], {1: {"value": ["must be positive"]}}),
+            # field errors skip ``positive``, not ``always``
+            ([{"value": -1}, {"value": "x"}], {1: {"value": ["Not a valid integer."]}}),
+        ],
+    )
+    def test_schema_validation_errors(self, data, messages):
+        errors = {}
+        for base in (Schema, PipelineSchema):
+            log = []
+            with pytest.raises(ValidationError) as exc_info:
+                logging_schemas(base, log)(many=True).load(data)
+            errors[base] = (exc_info.value.messages, log)
+        assert errors[Schema] == errors[PipelineSchema]
+        assert errors[Schema][0] == messages
+        assert errors[Schema][1].count("always") == 2
+
+    def test_constructs_runs_once_per_load(self):
+        models = []
+
+        class Recorder:
+            def __init__(self, **data):
+                models.append(data)
+
+        class RecordSchema(PipelineSchema):
+            value = fields.Int()
+            make_object = constructs(Recorder)
+
+        schema = RecordSchema(many=True)
+        # the hook method itself is not called per item
+        object.__setattr__(schema, "make_object", None)
+        loaded = schema.load([{"value": 1}, {"value": 2}])
+        assert [type(r) for r in loaded] == [Recorder, Recorder]
+        assert models == [{"value": 1}, {"value": 2}]
+
+    def test_constructs_in_plain_schema(self):
+        class UserSchema(Schema):
+            name = fields.Str()
+            email = fields.Email()
+            make_object = constructs(User)
+
+        user = UserSchema().load({"name": "Mick", "email": "mick@stones.org"})
+        assert isinstance(user, User)
+        assert user.email == "mick@stones.org"
+
+    def test_cached_schema(self):
+        schema = get_schema(envelope_schemas(PipelineSchema), many=True)
+        users = schema.load({"users": [{"name": "Keith", "email": "keith@stones.org"}]})
+        assert [u.name for u in users] == ["Keith"]
+        assert schema._calls[VALIDATES_SCHEMA, True] == ()
@@ -24,30 +24,30 @@ from marshmallow import (
 
 
 class TestSerializing:
-    def test_dump_to_dict(self, user_1: User) -> None:
-        schema = UserSchema()
+    def test_dump_to_dict(self, user_1: User, dump_path) -> None:
+        schema = dump_path(UserSchema())
         result_dict = schema.dump(user_1)
         assert isinstance(result_dict, dict)
 
-    def test_dump_to_json(self, user_1: User) -> None:
-        schema = UserSchema()
+    def test_dump_to_json(self, user_1: User, dump_path) -> None:
+        schema = dump_path(UserSchema())
         result_str_json = schema.dumps(user_1)
         assert isinstance(result_str_json, str)
 
-    def test_dump_to_dict_part(self, user_1: User) -> None:
+    def test_dump_to_dict_part(self, user_1: User, dump_path) -> None:
         # You can also exclude fields by passing in the exclude parameter.
-        schema = UserSchema(only=("name", "email"))
+        schema = dump_path(UserSchema(only=("name", "email")))
         result_dict = schema.dump(user_1)
 
         assert "name" in result_dict.keys()
         assert "email" in result_dict.keys()
         assert "created_at" not in result_dict.keys()
 
-    def test_dump_from_object_to_dict_many(self) -> None:
+    def test_dump_from_object_to_dict_many(self, dump_path) -> None:
         user1 = User(name="Mick", email="mick@stones.com")
         user2 = User(name="Keith", email="keith@stones.com")
         users = [user1, user2]
-        schema = UserSchemaWichPostLoad(many=True)
+        schema = dump_path(UserSchemaWichPostLoad(many=True))
         result_dict = schema.dump(
             users
         )  # OR UserSchemaWichPostLoad().dump(users, many=True)
@@ -55,6 +55,14 @@ class TestSerializing:
         assert isinstance(result_dict, list)
         assert isinstance(result_dict[0], dict)
 
+    def test_dump_to_json_same_as_schema(self, user_1: User, dump_path) -> None:
+        users = [user_1, User(name="Keith", email="keith@stones.com")]
+        for schema in (UserSchema(), UserSchema(only=("name", "email"))):
+            assert dump_path(schema).dumps(user_1) == schema.dumps(user_1)
+            assert dump_path(schema).dumps(users, many=True) == schema.dumps(
+                users, many=True
+            )
+
 
 class TestDeserializing:
     def test_deserializing_from_dict_to_dict_wich_type(self, user_2_dict: dict) -> None:
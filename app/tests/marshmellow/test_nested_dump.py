@@ -0,0 +1,161 @@
+import pytest
+from marshmallow import Schema, fields, post_dump
+from app.nested_dump import FastList, FastNested, FastPluck, fast_nested
+from app.schema_cache import get_schema
+from app.tests.fixtures.data_fixtures import Client, Task
+from app.tests.fixtures.marshmellow_fixtures import (
+    CleintSchema,
+    CleintSchemaFlat,
+    TaskSchema,
+)
+
+
+class Project:
+    def __init__(self, name, tasks, lead=None, parent=None):
+        self.name = name
+        self.tasks = tasks
+        self.lead = lead
+        self.parent = parent
+
+
+class TestFastNested:
+    def test_same_as_nested(self, clien_wich_two_tasks: Client):
+        schema = fast_nested(CleintSchema())
+        assert isinstance(schema.fields["tasks"], FastList)
+        assert isinstance(schema.fields["tasks"].inner, FastNested)
+
+        result = schema.dump(clien_wich_two_tasks)
+        assert result == CleintSchema().dump(clien_wich_two_tasks)
+        assert len(result["tasks"]) == 2
+        assert isinstance(result["tasks"][0], dict)
+        assert schema.dump([clien_wich_two_tasks] * 2, many=True) == CleintSchema(
+            many=True
+        ).dump([clien_wich_two_tasks] * 2)
+
+    def test_same_as_pluck(self, clien_wich_two_tasks: Client):
+        schema = fast_nested(CleintSchemaFlat())
+        assert isinstance(schema.fields["tasks"], FastPluck)
+
+        result = schema.dump(clien_wich_two_tasks)
+        assert result == CleintSchemaFlat().dump(clien_wich_two_tasks)
+        assert result["tasks"] == ["First task", "Two task"]
+        # titles were read off the tasks directly
+        assert schema.fields["tasks"]._pluck is not None
+
+    def test_child_serializer_resolved_once(self, clien_wich_two_tasks: Client):
+        schema = fast_nested(CleintSchema())
+        schema.dump(clien_wich_two_tasks)
+        child = schema.fields["tasks"].inner._child
+        schema.dump(clien_wich_two_tasks)
+        assert schema.fields["tasks"].inner._child is child
+        # TaskSchema is flat: its compiled dumper
+        assert child.__name__ == "dump_one"
+
+    def test_nested_only(self, clien_wich_two_tasks: Client):
+        schema = fast_nested(get_schema(CleintSchema, only=("name", "tasks.title")))
+        assert schema.dump(clien_wich_two_tasks) == {
+            "name": "Test client",
+            "tasks": [{"title": "First task"}, {"title": "Two task"}],
+        }
+
+    def test_none_and_empty(self):
+        client = Client("Test client", "test@mail.ru")
+        client.tasks = [Task("a"), None]
+        schema = fast_nested(CleintSchema())
+        assert schema.dump(client) == CleintSchema().dump(client)
+        assert schema.dump(client)["tasks"] == [{"title": "a"}, None]
+        client.tasks = []
+        for schema_class in (CleintSchema, CleintSchemaFlat):
+            schema = fast_nested(schema_class())
+            assert schema.dump(client)["tasks"] == []
+            client.tasks = None
+            assert schema.dump(client)["tasks"] is None
+            client.tasks = []
+
+    def test_deep_and_self_nesting(self):
+        class ProjectSchema(Schema):
+            name = fields.Str()
+            tasks = fields.Nested(TaskSchema, many=True)
+            lead = fields.Pluck(TaskSchema, "title")
+            parent = fields.Nested(lambda: ProjectSchema(exclude=("parent",)))
+            children = fields.Dict(values=fields.Nested(TaskSchema))
+
+        root = Project("root", [Task("a")])
+        project = Project("sub", [Task("b"), Task("c")], Task("lead"), root)
+        project.children = {"x": Task("d")}
+        expected = ProjectSchema().dump(project)
+        assert fast_nested(ProjectSchema()).dump(project) == expected
+        assert expected["parent"] == {
+            "name": "root",
+            "tasks": [{"title": "a"}],
+            "lead": None,
+        }
+        assert expected["children"] == {"x": {"title": "d"}}
+
+    def test_hooks_go_through_schema_dump(self, clien_wich_two_tasks: Client):
+        class LoudTaskSchema(TaskSchema):
+            @post_dump
+            def shout(self, data, **kwargs):
+                return {key: value.upper() for key, value in data.items()}
+
+        class ClientSchema(Schema):
+            tasks = FastNested(LoudTaskSchema, many=True)
+            titles = FastPluck(
+                LoudTaskSchema, "title", many=True, attribute="tasks", dump_only=True
+            )
+
+        result = ClientSchema().dump(clien_wich_two_tasks)
+        assert result == {
+            "tasks": [{"title": "FIRST TASK"}, {"title": "TWO TASK"}],
+            "titles": ["FIRST TASK", "TWO TASK"],
+        }
+
+    def test_schema_instances_not_changed(self, clien_wich_two_tasks: Client):
+        client_schema = CleintSchema()
+
+        class AccountSchema(Schema):
+            client = FastNested(client_schema)
+
+        account = Project("account", [])
+        account.client = clien_wich_two_tasks
+        result = AccountSchema().dump(account)
+        assert result == {"client": client_schema.dump(clien_wich_two_tasks)}
+        # the caller's schema keeps its own fields
+        assert type(client_schema.fields["tasks"]) is fields.List
+        assert type(client_schema.fields["tasks"].inner) is fields.Nested
+
+    def test_subclasses_left_alone(self):
+        class MyNested(fields.Nested):
+            pass
+
+        class ClientSchema(Schema):
+            tasks = fields.List(MyNested(TaskSchema))
+
+        schema = fast_nested(ClientSchema())
+        assert type(schema.fields["tasks"].inner) is MyNested
+
+
+class TestFastPluck:
+    def test_field_options(self):
+        class ItemSchema(Schema):
+            number = fields.Int(attribute="n", data_key="num")
+            label = fields.Str(dump_default="none")
+
+        class OrderSchema(Schema):
+            numbers = fields.Pluck(ItemSchema, "number", many=True)
+            label = fields.Pluck(ItemSchema, "label")
+
+        order = {"numbers": [{"n": "1"}, {"n": 2}], "label": {}}
+        expected = OrderSchema().dump(order)
+        assert expected == {"numbers": [1, 2], "label": "none"}
+        assert fast_nested(OrderSchema()).dump(order) == expected
+
+    def test_missing_value(self):
+        class OrderSchema(Schema):
+            titles = fields.Pluck(TaskSchema, "title", many=True)
+
+        order = {"titles": [{"title": "a"}, {}]}
+        with pytest.raises(KeyError):
+            OrderSchema().dump(order)
+        with pytest.raises(KeyError):
+            fast_nested(OrderSchema()).dump(order)
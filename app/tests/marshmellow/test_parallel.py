@@ -0,0 +1,49 @@
+import functools
+
+import pytest
+from app.parallel import ParallelValidator, validate_parallel
+from app.tests.fixtures.data_fixtures import User
+from app.tests.fixtures.marshmellow_fixtures import UserSchema, UserSchemaWichPostLoad
+from marshmallow import ValidationError
+
+
+@pytest.fixture
+def users_data(user_2_dict_wichout_created_at: dict) -> list[dict]:
+    return [dict(user_2_dict_wichout_created_at, name=f"user {i}") for i in range(10)]
+
+
+class TestParallelValidator:
+    def test_results_in_input_order(self, users_data: list[dict]):
+        with ParallelValidator(
+            UserSchemaWichPostLoad, workers=2, chunk_size=3, min_batch=0
+        ) as validator:
+            users = validator.validate(users_data)
+            assert [u.name for u in users] == [d["name"] for d in users_data]
+            assert all(isinstance(u, User) for u in users)
+            # the pool is reused between batches
+            assert len(validator.validate(users_data[:4])) == 4
+
+    def test_errors_merged_like_many(self, users_data: list[dict]):
+        users_data[1]["email"] = "foo"
+        users_data[7]["email"] = "bar"
+        users_data[8]["unknown"] = 1
+
+        with pytest.raises(ValidationError) as expected:
+            UserSchema().load(users_data, many=True)
+        for min_batch in (0, 1000):
+            with pytest.raises(ValidationError) as err:
+                validate_parallel(
+                    UserSchema(),
+                    users_data,
+                    workers=2,
+                    chunk_size=4,
+                    min_batch=min_batch,
+                )
+            assert err.value.messages == expected.value.messages
+
+    def test_factory(self, users_data: list[dict]):
+        target = functools.partial(UserSchema, only=("name",))
+        result = validate_parallel(
+            target, [{"name": d["name"]} for d in users_data], workers=2, min_batch=0
+        )
+        assert result[3] == {"name": "user 3"}
@@ -0,0 +1,157 @@
+import itertools
+
+import pytest
+from app.profiling import Profiler, profile
+from marshmallow import (
+    Schema,
+    ValidationError,
+    fields,
+    validate,
+    validates,
+    validates_schema,
+)
+
+
+class PinCode(fields.Field):
+    def _deserialize(self, value, attr, data, **kwargs):
+        try:
+            return [int(c) for c in value]
+        except ValueError as error:
+            raise ValidationError("Pin codes must contain only digits.") from error
+
+
+@pytest.fixture
+def profiler():
+    # every clock read is one microsecond later
+    ticks = itertools.count()
+    return Profiler(clock=lambda: next(ticks) * 1e-6)
+
+
+@pytest.fixture
+def user_schema(profiler: Profiler):
+    class UserSchema(Schema):
+        name = fields.Str(validate=validate.Length(min=2))
+        email = fields.Email()
+        pin_code = PinCode()
+
+        @validates("name")
+        def not_admin(self, value, **kwargs):
+            if value == "admin":
+                raise ValidationError("Reserved name.")
+
+        @validates_schema
+        def pin_for_named(self, data, **kwargs):
+            pass
+
+    return profile(UserSchema, profiler)
+
+
+class TestProfileSchema:
+    def test_counts_calls_and_errors(self, profiler: Profiler, user_schema):
+        data = {"name": "Monty", "email": "monty@python.org", "pin_code": "1234"}
+        with profiler:
+            assert user_schema().load(data)["pin_code"] == [1, 2, 3, 4]
+            with pytest.raises(ValidationError):
+                user_schema().load({**data, "pin_code": "12a4", "email": "nope"})
+
+        stats = profiler.stats()
+        assert stats["UserSchema"]["calls"] == 2
+        assert stats["UserSchema"]["errors"] == 1
+        assert stats["UserSchema.pin_code"] == {
+            "kind": "field",
+            "target": "UserSchema",
+            "field": "pin_code",
+            "validator": "",
+            "calls": 2,
+            "seconds": pytest.approx(2e-6),
+            "errors": 1,
+        }
+        assert stats["UserSchema.email:Email"]["errors"] == 1
+        assert stats["UserSchema.name:Length"]["calls"] == 2
+        assert stats["UserSchema.name:not_admin"]["kind"] == "validator"
+        # field errors skip the schema validator
+        assert stats["UserSchema:pin_for_named"]["calls"] == 1
+
+    def test_installed_while_enabled(self, profiler: Profiler, user_schema):
+        schema = user_schema()
+        with profiler:
+            assert "_do_load" in vars(user_schema)
+            schema.load({"email": "monty@python.org"})
+        assert profiler.stats()["UserSchema.email:Email"]["calls"] == 1
+
+        assert "_do_load" not in vars(user_schema)
+        assert "deserialize" not in vars(type(schema.fields["email"]))
+        assert (
+            schema.fields["email"].validators
+            == user_schema().fields["email"].validators
+        )
+        assert type(schema.fields["email"].validators[0]) is validate.Email
+
+    def test_disabled(self, profiler: Profiler, user_schema):
+        user = user_schema().load({"name": "Monty", "email": "monty@python.org"})
+        assert user == {"name": "Monty", "email": "monty@python.org"}
+        with pytest.raises(ValidationError) as exc_info:
+            user_schema().load({"name": "admin"})
+        assert exc_info.value.messages == {"name": ["Reserved name."]}
+        assert profiler.stats() == {}
+        assert profiler.collapsed() == ""
+
+    def test_nested_stacks(self, profiler: Profiler):
+        class TaskSchema(Schema):
+            title = fields.Str()
+
+        class ClientSchema(Schema):
+            name = fields.Str()
+            tasks = fields.List(fields.Nested(TaskSchema))
+
+        profile(TaskSchema, profiler)
+        profile(ClientSchema, profiler)
+        with profiler:
+            ClientSchema().load(
+                {"name": "c", "tasks": [{"title": "a"}, {"title": "b"}]}
+            )
+
+        lines = profiler.collapsed().splitlines()
+        # one µs per clock read: self time is one more than the direct callees
+        assert lines == [
+            "ClientSchema 3",
+            "ClientSchema;ClientSchema.name 1",
+            "ClientSchema;ClientSchema.tasks 3",
+            "ClientSchema;ClientSchema.tasks;TaskSchema 4",
+            "ClientSchema;ClientSchema.tasks;TaskSchema;TaskSchema.title 2",
+        ]
+        assert profiler.stats()["TaskSchema.title"]["calls"] == 2
+
+    def test_prometheus(self, profiler: Profiler, user_schema):
+        with profiler:
+            user_schema().load({"name": "Monty"})
+        text = profiler.prometheus()
+        assert "# TYPE validation_calls_total counter\n" in text
+        assert (
+            'validation_calls_total{kind="field",target="UserSchema",'
+            'field="name",validator=""} 1\n'
+        ) in text
+        assert (
+            'validation_errors_total{kind="schema",target="UserSchema",'
+            'field="",validator=""} 0\n'
+        ) in text
+
+    def test_instance_and_twice(self, profiler: Profiler):
+        class BandSchema(Schema):
+            name = fields.Str(validate=validate.Length(max=20))
+
+        schema = profile(profile(BandSchema(), profiler), profiler)
+        with profiler:
+            schema.load({"name": "The Band"})
+            BandSchema().load({"name": "Not profiled"})
+        stats = profiler.stats()
+        assert [name for name in stats] == [
+            "BandSchema",
+            "BandSchema.name",
+            "BandSchema.name:Length",
+        ]
+        assert all(entry["calls"] == 1 for entry in stats.values())
+
+    def test_rejects_other_targets(self):
+        with pytest.raises(TypeError):
+            profile(object())
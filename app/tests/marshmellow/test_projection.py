@@ -0,0 +1,37 @@
+import pytest
+from app.compiled_dump import CompiledDumper
+from app.projection import SchemaProjection, projection
+from app.schema_cache import get_schema
+from app.tests.fixtures.data_fixtures import Client, User
+from app.tests.fixtures.marshmellow_fixtures import CleintSchema, UserSchema
+
+
+class TestSchemaProjection:
+    def test_same_as_schema_only(self, user_1: User):
+        names = projection(UserSchema, only=("name", "email"))
+        assert isinstance(names, SchemaProjection)
+        users = [user_1, User(name="Keith", email="keith@stones.com")]
+
+        schema = UserSchema(only=("name", "email"))
+        assert names.dump(user_1) == schema.dump(user_1)
+        assert names.dump(users, many=True) == schema.dump(users, many=True)
+        assert names.dumps(users, many=True) == schema.dumps(users, many=True)
+
+    def test_shares_schema_and_compiles_flat_ones(self):
+        names = projection(UserSchema, exclude=("created_at",))
+        assert names.schema is get_schema(UserSchema, exclude=("created_at",))
+        assert isinstance(names._dumper, CompiledDumper)
+
+    def test_nested_only(self, clien_wich_two_tasks: Client):
+        project = projection(CleintSchema, only=("name", "tasks.title"))
+        assert project.dump(clien_wich_two_tasks) == {
+            "name": "Test client",
+            "tasks": [{"title": "First task"}, {"title": "Two task"}],
+        }
+        assert project.dump(clien_wich_two_tasks) == CleintSchema(
+            only=("name", "tasks.title")
+        ).dump(clien_wich_two_tasks)
+
+    def test_rejects_unknown_fields(self):
+        with pytest.raises(ValueError):
+            projection(UserSchema, only=("name", "phone"))
@@ -0,0 +1,102 @@
+import threading
+
+import pytest
+from app.schema_cache import SchemaRegistry
+from app.tests.fixtures.data_fixtures import Client, User
+from app.tests.fixtures.marshmellow_fixtures import (
+    CleintSchema,
+    UserSchema,
+    UserSchemaWichPostLoad,
+)
+from marshmallow import EXCLUDE, Schema, fields
+
+
+class TestSchemaRegistry:
+    def test_same_instance_for_same_key(self, user_1: User):
+        registry = SchemaRegistry()
+        schema = registry.get(UserSchema, only=("name", "email"))
+        assert registry.get(UserSchema, only=["email", "name"]) is schema
+        assert registry.get(UserSchema) is not schema
+        assert registry.get(UserSchema, only=("name", "email"), many=True) is not schema
+        assert registry.stats()["hits"] == 1
+        assert registry.stats()["misses"] == 3
+
+        assert isinstance(schema, UserSchema)
+        assert schema.dump(user_1) == UserSchema(only=("name", "email")).dump(user_1)
+
+    def test_behaves_like_fresh_schema(
+        self, user_2_dict_wichout_created_at: dict, clien_wich_two_tasks: Client
+    ):
+        registry = SchemaRegistry()
+        user = registry.get(UserSchemaWichPostLoad).load(user_2_dict_wichout_created_at)
+        assert isinstance(user, User)
+
+        data = dict(user_2_dict_wichout_created_at, extra=1)
+        assert "extra" not in registry.get(UserSchema, unknown=EXCLUDE).load(data)
+
+        result = registry.get(CleintSchema, exclude=("created_at",)).dump(
+            clien_wich_two_tasks
+        )
+        assert result["tasks"] == [{"title": "First task"}, {"title": "Two task"}]
+
+    def test_read_only(self):
+        schema = SchemaRegistry().get(UserSchema)
+        with pytest.raises(AttributeError):
+            schema.many = True
+        with pytest.raises(TypeError):
+            schema.fields["name"] = fields.Str()
+
+    def test_context(self):
+        class ContextSchema(Schema):
+            greeting = fields.Method("greet")
+
+            def greet(self, obj):
+                return f"{self.context['prefix']} {obj['name']}"
+
+        registry = SchemaRegistry()
+        with pytest.warns(DeprecationWarning):
+            schema = registry.get(ContextSchema, context={"prefix": "Hi"})
+        assert schema.dump({"name": "Ken"}) == {"greeting": "Hi Ken"}
+        with pytest.raises(TypeError):
+            schema.context["prefix"] = "Bye"
+
+        # per-call context is never shared or kept, hashable or not
+        request = object()
+        with pytest.warns(DeprecationWarning):
+            first = registry.get(ContextSchema, context={"request": {"user": 1}})
+            second = registry.get(ContextSchema, context={"request": {"user": 1}})
+            third = registry.get(ContextSchema, context={"request": request})
+            fourth = registry.get(ContextSchema, context={"request": request})
+            keys = registry.get(ContextSchema, context={"prefix": ("a", 1, None)})
+        assert first is not second
+        assert third is not fourth
+        assert registry.stats()["uncacheable"] == 4
+        assert registry.stats()["size"] == 2
+        assert keys.context["prefix"] == ("a", 1, None)
+
+    def test_lru_eviction(self):
+        registry = SchemaRegistry(maxsize=2)
+        first = registry.get(UserSchema, only=("name",))
+        registry.get(UserSchema, only=("email",))
+        registry.get(UserSchema, only=("name",))
+        registry.get(UserSchema, only=("created_at",))
+        assert registry.stats()["evictions"] == 1
+        assert registry.get(UserSchema, only=("name",)) is first
+        assert registry.stats()["size"] == 2
+
+    def test_thread_safe(self):
+        registry = SchemaRegistry(maxsize=4)
+        results = []
+
+        def worker():
+            for i in range(50):
+                only = [("name",), ("email",), ("created_at",)][i % 3]
+                results.append(registry.get(UserSchema, only=only))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len({id(schema) for schema in results}) == 3
+        assert registry.hits + registry.misses == 400
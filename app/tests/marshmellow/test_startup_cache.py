@@ -0,0 +1,71 @@
+import pytest
+from app.hook_pipeline import PipelineSchema, constructs
+from app.startup_cache import StartupCache
+from app.tests.fixtures.data_fixtures import User
+from marshmallow import Schema, fields, post_dump, post_load, pre_load, validates
+from marshmallow.schema import SchemaMeta
+
+
+def make_schemas(base: type[Schema]) -> dict[str, type[Schema]]:
+    class TimestampMixin:
+        created_at = fields.DateTime()
+
+        @post_dump
+        def stamp(self, data, **kwargs):
+            return data
+
+    class BaseSchema(base):
+        name = fields.Str()
+
+        @pre_load(pass_many=True)
+        def unwrap(self, data, many, **kwargs):
+            return data
+
+        @post_load
+        def override_me(self, data, **kwargs):
+            return data
+
+    class UserSchema(TimestampMixin, BaseSchema):
+        email = fields.Email()
+        make_user = constructs(User)
+
+        # no longer a hook
+        def override_me(self, data, **kwargs):
+            return data
+
+        @validates("email")
+        def check_email(self, value, **kwargs):
+            pass
+
+    return {"base": BaseSchema, "user": UserSchema}
+
+
+@pytest.fixture
+def cache():
+    cache = StartupCache()
+    yield cache
+    cache.disable()
+
+
+class TestStartupCacheSchemas:
+    @pytest.mark.parametrize("base", [Schema, PipelineSchema])
+    def test_same_hooks_and_fields(self, cache: StartupCache, base: type[Schema]):
+        expected = make_schemas(base)
+        with cache:
+            schemas = make_schemas(base)
+        for name, schema_class in schemas.items():
+            assert schema_class._hooks == expected[name]._hooks
+            assert list(schema_class._declared_fields) == list(
+                expected[name]._declared_fields
+            )
+        user = schemas["user"]
+        assert list(user._declared_fields) == ["name", "created_at", "email"]
+        assert [name for name, _, _ in user._hooks["post_load"]] == ["make_user"]
+        loaded = user().load({"name": "Mick", "email": "mick@stones.org"})
+        assert isinstance(loaded, User)
+
+    def test_disable_restores(self, cache: StartupCache):
+        resolve_hooks = SchemaMeta.resolve_hooks
+        with cache:
+            assert SchemaMeta.resolve_hooks is not resolve_hooks
+        assert SchemaMeta.resolve_hooks is resolve_hooks
@@ -0,0 +1,178 @@
+import io
+import json
+
+import pytest
+from app.streaming import (
+    RecordError,
+    StreamWriter,
+    dump_stream,
+    iter_json_records,
+    load_stream,
+)
+from app.tests.fixtures.data_fixtures import User
+from app.tests.fixtures.marshmellow_fixtures import UserSchema, UserSchemaWichPostLoad
+from marshmallow import Schema, ValidationError, fields, post_dump
+
+
+@pytest.fixture
+def users_data(user_2_dict: dict) -> list[dict]:
+    return [dict(user_2_dict, name=f"user {i}") for i in range(7)]
+
+
+class TestIterJsonRecords:
+    def test_json_lines(self, tmp_path, users_data: list[dict]):
+        path = tmp_path / "users.jsonl"
+        path.write_text("\n".join(json.dumps(d) for d in users_data) + "\n\n")
+        assert list(iter_json_records(path)) == users_data
+        assert list(iter_json_records(str(path), read_size=7)) == users_data
+
+    def test_top_level_array(self, users_data: list[dict]):
+        text = " \n" + json.dumps(users_data + [12345, "x", None], indent=2)
+        for read_size in (1, 3, 64, 100_000):
+            records = list(iter_json_records(io.StringIO(text), read_size=read_size))
+            assert records == users_data + [12345, "x", None]
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("[1e5, 2]", [1e5, 2]),
+            ("[12.5,-7e-3 ,true]", [12.5, -7e-3, True]),
+            ("[3.25]", [3.25]),
+            ("[123456]", [123456]),
+        ],
+    )
+    def test_numbers_across_reads(self, text: str, expected: list):
+        # read_size=3 cuts "12.|5", "1e|5", "-7e|-3"
+        for read_size in (1, 2, 3, 4):
+            records = iter_json_records(io.StringIO(text), read_size=read_size)
+            assert list(records) == expected
+
+    @pytest.mark.parametrize(
+        "text", ["[1,2]\n[3,4]\n", '[{"a":1}] garbage', "[1]\n\n  ]"]
+    )
+    def test_data_after_array(self, text: str):
+        for read_size in (1, 4, 64):
+            with pytest.raises(ValueError, match="after the top-level JSON array"):
+                list(iter_json_records(io.StringIO(text), read_size=read_size))
+        assert list(iter_json_records(io.StringIO("[1, 2] \n\n"))) == [1, 2]
+
+    def test_binary_file(self, users_data: list[dict]):
+        data = json.dumps(users_data, ensure_ascii=False).replace("Ken", "Кен")
+        fp = io.BytesIO(data.encode("utf-8"))
+        assert list(iter_json_records(fp, read_size=5))[0]["email"] == "ken@yahoo.com"
+
+    def test_empty_and_broken(self):
+        assert list(iter_json_records(io.StringIO("  \n"))) == []
+        assert list(iter_json_records(io.StringIO("[]"))) == []
+        with pytest.raises(ValueError):
+            list(iter_json_records(io.StringIO('[{"a": 1}')))
+
+
+class TestLoadStream:
+    def test_load_to_objects(self, user_2_dict_wichout_created_at: dict):
+        # User.__init__ does not take created_at
+        users_data = [
+            dict(user_2_dict_wichout_created_at, name=f"user {i}") for i in range(7)
+        ]
+        fp = io.StringIO("\n".join(json.dumps(d) for d in users_data))
+        users = list(load_stream(fp, UserSchemaWichPostLoad(), chunk_size=3))
+        assert len(users) == 7
+        assert all(isinstance(u, User) for u in users)
+        assert users[6].name == "user 6"
+
+    def test_errors_yield_and_skip(self, users_data: list[dict]):
+        users_data[4]["email"] = "foo"
+        text = json.dumps(users_data)
+
+        result = list(load_stream(io.StringIO(text), UserSchema, errors="yield"))
+        assert result[4] == RecordError(4, {"email": ["Not a valid email address."]})
+        assert result[5]["name"] == "user 5"
+
+        result = list(
+            load_stream(io.StringIO(text), UserSchema, chunk_size=2, errors="skip")
+        )
+        assert [d["name"] for d in result] == [f"user {i}" for i in (0, 1, 2, 3, 5, 6)]
+
+    def test_errors_raise(self, users_data: list[dict]):
+        users_data[4]["email"] = "foo"
+        stream = load_stream(
+            io.StringIO(json.dumps(users_data)), UserSchema, chunk_size=3
+        )
+        with pytest.raises(ValidationError) as err:
+            list(stream)
+        assert err.value.messages == {4: {"email": ["Not a valid email address."]}}
+
+
+class TestStreamWriter:
+    def test_array_same_as_dumps(self, tmp_path):
+        users = [User(name=f"user {i}", email=f"user{i}@python.org") for i in range(5)]
+        path = tmp_path / "users.json"
+
+        written = dump_stream(users, path, UserSchema(), format="array", buffer_size=16)
+        assert path.read_text() == UserSchema().dumps(users, many=True)
+        assert written == path.stat().st_size
+
+        fp = io.StringIO()
+        dump_stream([], fp, UserSchema(), format="array")
+        assert fp.getvalue() == "[]"
+
+    def test_json_lines(self):
+        users = [User(name=f"user {i}", email=f"user{i}@python.org") for i in range(3)]
+        fp = io.BytesIO()
+        with StreamWriter(fp, UserSchema) as writer:
+            writer.write(users[0])
+            assert writer.bytes_written == 0  # still buffered
+            writer.write_many(users[1:])
+        assert writer.records_written == 3
+        assert writer.bytes_written == len(fp.getvalue())
+        lines = fp.getvalue().decode().splitlines()
+        assert [json.loads(line) for line in lines] == UserSchema(many=True).dump(users)
+
+    def test_socket(self):
+        class Socket:
+            def __init__(self):
+                self.sent = b""
+
+            def sendall(self, data: bytes):
+                self.sent += data
+
+        sock = Socket()
+        dump_stream([{"name": "Mike", "email": "foo@bar.com"}], sock, UserSchema)
+        assert json.loads(sock.sent) == {"name": "Mike", "email": "foo@bar.com"}
+
+    def test_post_dump_envelope(self):
+        class BaseSchema(Schema):
+            __envelope__ = {"single": None, "many": None}
+
+            def get_envelope_key(self, many):
+                key = self.__envelope__["many"] if many else self.__envelope__["single"]
+                assert key is not None, "Envelope key undefined"
+                return key
+
+            @post_dump(pass_many=True)
+            def wrap_with_envelope(self, data, many, **kwargs):
+                key = self.get_envelope_key(many)
+                return {key: data}
+
+            @post_dump
+            def upper_name(self, data, many, **kwargs):
+                data["name"] = data["name"].upper()
+                return data
+
+        class UserSchema(BaseSchema):
+            __envelope__ = {"single": "user", "many": "users"}
+            name = fields.Str()
+            email = fields.Email()
+
+        users = [
+            User("Keith", email="keith@stones.org"),
+            User("Charlie", email="charlie@stones.org"),
+        ]
+        fp = io.StringIO()
+        dump_stream(iter(users), fp, UserSchema(), format="array")
+        assert fp.getvalue() == UserSchema().dumps(users, many=True)
+        assert json.loads(fp.getvalue())["users"][0]["name"] == "KEITH"
+
+        fp = io.StringIO()
+        dump_stream(users, fp, UserSchema(), format="array", envelope="data")
+        assert list(json.loads(fp.getvalue())) == ["data"]
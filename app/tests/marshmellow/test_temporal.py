@@ -0,0 +1,90 @@
+import pytest
+from app import temporal
+from app.temporal import (
+    FAST_BACKEND,
+    REGEX_BACKEND,
+    FastDate,
+    FastDateTime,
+    FastTime,
+    use_backend,
+)
+from app.tests.fixtures.data_fixtures import outcome
+from marshmallow import Schema, ValidationError, fields, utils
+
+
+class EventSchema(Schema):
+    at = fields.DateTime()
+    day = fields.Date()
+    start = fields.Time()
+    aware = fields.AwareDateTime(default_timezone=None)
+
+
+class FastEventSchema(Schema):
+    at = FastDateTime()
+    day = FastDate()
+    start = FastTime()
+    aware = fields.AwareDateTime(default_timezone=None)
+
+
+def load(schema, data):
+    try:
+        return schema.load(data)
+    except ValidationError as e:
+        return e.messages
+
+
+class TestFastParsers:
+    @pytest.mark.parametrize(
+        "fast, regex",
+        [
+            (temporal.from_iso_datetime, utils.from_iso_datetime),
+            (temporal.from_iso_date, utils.from_iso_date),
+            (temporal.from_iso_time, utils.from_iso_time),
+        ],
+    )
+    def test_fuzz_same_as_marshmallow(self, fast, regex, iso_fuzz_strings):
+        for value in iso_fuzz_strings:
+            assert outcome(fast, value) == outcome(regex, value), value
+
+    def test_named_offsets(self):
+        at = temporal.from_iso_datetime("2014-08-11T05:26:03-02:30")
+        assert at.tzname() == "-0230"
+        assert at.tzinfo == utils.from_iso_datetime("2014-08-11T05:26:03-02:30").tzinfo
+
+    def test_time_offset_ignored(self):
+        # marshmallow matches the time and drops the rest
+        value = "05:26:03+02:00"
+        assert outcome(temporal.from_iso_time, value) == outcome(
+            utils.from_iso_time, value
+        )
+
+
+class TestFastFields:
+    @pytest.mark.parametrize(
+        "data",
+        [
+            dict(at="2014-08-11T05:26:03.869245", day="2014-08-11", start="05:26:03"),
+            dict(at="2014-08-11 05:26:03+02:30", day="2014-02-30", start="25:00:00"),
+            dict(at=1407734763, day="11.08.2014", start="05:26"),
+            dict(aware="2014-08-11T05:26:03"),
+        ],
+    )
+    def test_same_as_fields(self, data):
+        assert load(FastEventSchema(), data) == load(EventSchema(), data)
+
+    def test_explicit_format_untouched(self):
+        field = FastDateTime(format="%d.%m.%Y")
+        assert field.deserialize("11.08.2014").day == 11
+
+
+class TestBackend:
+    def test_use_backend(self):
+        field = fields.DateTime()
+        with use_backend(FAST_BACKEND):
+            assert field.DESERIALIZATION_FUNCS["iso"] is temporal.from_iso_datetime
+            assert fields.AwareDateTime.DESERIALIZATION_FUNCS["iso8601"] is (
+                temporal.from_iso_datetime
+            )
+            assert field.deserialize("2014-08-11T05:26:03Z").tzname() == "UTC"
+        assert temporal.get_backend() is REGEX_BACKEND
+        assert field.DESERIALIZATION_FUNCS["iso"] is utils.from_iso_datetime
@@ -0,0 +1,130 @@
+import pytest
+from app.tests.fixtures.marshmellow_fixtures import UserSchema
+from app.validation_cache import (
+    CachedValidator,
+    ValidationCache,
+    cache_validators,
+    pure_validator,
+)
+from marshmallow import Schema, ValidationError, fields, validate
+
+
+def load(schema, data):
+    try:
+        return schema.load(data)
+    except ValidationError as e:
+        return e.messages
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCachedSchema:
+    def test_same_results_and_messages(self):
+        cache = ValidationCache()
+        cached = cache_validators(UserSchema(), cache)
+        for data in (
+            {"name": "Monty", "email": "monty@python.org"},
+            {"name": "Monty", "email": "monty"},
+            {"name": "Monty", "email": "monty"},
+            {"email": 42},
+        ):
+            assert load(cached, data) == load(UserSchema(), data)
+        assert load(cached, {"email": "monty"}) == {
+            "email": ["Not a valid email address."]
+        }
+        assert cache.stats()["hits"] == 2
+        assert cache.stats()["size"] == 2
+
+    def test_schema_class_shares_cache(self):
+        cache = ValidationCache()
+
+        class Contacts(Schema):
+            emails = fields.List(fields.Email())
+            code = fields.Str(validate=validate.OneOf(["a", "b"]))
+
+        cache_validators(Contacts, cache)
+        assert isinstance(Contacts().fields["code"].validators[0], CachedValidator)
+        Contacts().load({"emails": ["a@python.org"], "code": "a"})
+        Contacts().load({"emails": ["a@python.org"], "code": "a"})
+        assert cache.hits == 2
+        assert cache.hit_rate == 0.5
+
+    def test_impure_validators_not_cached(self):
+        calls = []
+
+        def seen(value):
+            calls.append(value)
+
+        @pure_validator
+        def not_blank(value):
+            if not value.strip():
+                raise ValidationError("Blank.")
+
+        field = cache_validators(fields.Str(validate=[seen, not_blank]))
+        assert field.validators[0] is seen
+        assert isinstance(field.validators[1], CachedValidator)
+        for _ in range(3):
+            with pytest.raises(ValidationError) as e:
+                field.deserialize(" ")
+            assert e.value.messages == ["Blank."]
+        assert calls == [" ", " ", " "]
+
+    def test_subclass_not_cached(self):
+        class Lower(validate.Regexp):
+            def __call__(self, value):
+                return super().__call__(value).lower()
+
+        field = cache_validators(fields.Str(validate=Lower("[a-z]+")))
+        assert not isinstance(field.validators[0], CachedValidator)
+
+    def test_false_from_validator_passes(self):
+        class Flags(Schema):
+            on = fields.Boolean(validate=validate.OneOf([True, False]))
+            off = fields.Raw(validate=validate.Equal(False))
+
+        cached = cache_validators(Flags(), ValidationCache())
+        assert isinstance(cached.fields["off"].validators[0], CachedValidator)
+        assert cached.load({"on": False, "off": False}) == {"on": False, "off": False}
+        assert load(cached, {"off": True}) == {"off": ["Must be equal to False."]}
+
+    def test_wrong_target(self):
+        with pytest.raises(TypeError):
+            cache_validators(object())
+
+
+class TestValidationCache:
+    def test_lru_eviction(self):
+        cache = ValidationCache(maxsize=2)
+        cache.put(("a",), (True, "a"))
+        cache.put(("b",), (True, "b"))
+        cache.get(("a",))
+        cache.put(("c",), (True, "c"))
+        assert cache.get(("b",)) is not cache.get(("a",))
+        assert cache.stats()["evictions"] == 1
+        assert cache.get(("a",)) == (True, "a")
+
+    def test_ttl(self):
+        clock = Clock()
+        cache = ValidationCache(ttl=10, clock=clock)
+        cache.put(("a",), (True, "a"))
+        clock.now = 9.9
+        assert cache.get(("a",)) == (True, "a")
+        clock.now = 10
+        cache.get(("a",))
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 1, 1)
+        assert stats["size"] == 0
+
+    def test_clear(self):
+        cache = ValidationCache()
+        cache.put(("a",), (True, "a"))
+        cache.get(("a",))
+        cache.clear()
+        assert cache.stats()["size"] == 0
+        assert cache.hit_rate == 0.0
@@ -0,0 +1,185 @@
+import asyncio
+
+import pytest
+from app.async_validation import AsyncModel, BatchLoader
+from app.tests.fixtures.data_fixtures import InMemoryStore
+from pydantic import (
+    PrivateAttr,
+    ValidationError,
+    conint,
+    root_validator,
+    validator,
+)
+from pydantic.errors import ConfigError
+
+
+@pytest.fixture
+def order_model(async_store: InMemoryStore):
+    class Order(AsyncModel):
+        sku: str
+        quantity: conint(ge=0, le=30)
+        customer: str = "user:guido"
+        _note: str = PrivateAttr("")
+
+        @validator("sku", allow_reuse=True)
+        def normalise_sku(cls, v):
+            return v.lower()
+
+        @validator("sku", allow_reuse=True)
+        async def sku_exists(cls, v):
+            if await async_store.get(v) is None:
+                raise ValueError("unknown SKU")
+            return v
+
+        @validator("customer", allow_reuse=True)
+        async def customer_exists(cls, v, values):
+            if await async_store.get(v) is None:
+                raise ValueError("unknown customer")
+            return v.removeprefix("user:")
+
+        @root_validator(skip_on_failure=True, allow_reuse=True)
+        async def in_stock(cls, values):
+            item = await async_store.get(values["sku"])
+            if item["stock"] < values["quantity"]:
+                raise ValueError("not enough stock")
+            return values
+
+    return Order
+
+
+class TestAsyncModel:
+    def test_avalidate(self, order_model):
+        order = asyncio.run(order_model.avalidate({"sku": "SKU-1", "quantity": 3}))
+        assert order.dict() == {"sku": "sku-1", "quantity": 3, "customer": "guido"}
+        assert order.__fields_set__ == {"sku", "quantity"}
+        assert order._note == ""
+
+    def test_errors(self, order_model):
+        with pytest.raises(ValidationError) as error:
+            asyncio.run(
+                order_model.avalidate(
+                    {"sku": "nope", "quantity": 31, "customer": "user:nobody"}
+                )
+            )
+        assert [(e["loc"], e["msg"]) for e in error.value.errors()] == [
+            (("quantity",), "ensure this value is less than or equal to 30"),
+            (("sku",), "unknown SKU"),
+            (("customer",), "unknown customer"),
+        ]
+
+        with pytest.raises(ValidationError) as error:
+            asyncio.run(order_model.avalidate({"sku": "sku-2", "quantity": 1}))
+        assert error.value.errors() == [
+            {"loc": ("__root__",), "msg": "not enough stock", "type": "value_error"}
+        ]
+
+    def test_constructor_is_refused(self, order_model):
+        with pytest.raises(TypeError):
+            order_model(sku="sku-1", quantity=1)
+
+    def test_avalidate_many(self, order_model, async_store: InMemoryStore):
+        records = [{"sku": f"sku-{i % 2 + 1}", "quantity": 0} for i in range(20)]
+        orders = asyncio.run(order_model.avalidate_many(records, concurrency=3))
+        assert [o.sku for o in orders] == [r["sku"] for r in records]
+        # sku_exists once per sku; customer_exists takes values, the root
+        # validator the record: once per record
+        assert len(async_store.calls) == 2 + 20 + 20
+        assert async_store.max_in_flight == 3
+
+    def test_avalidate_many_errors(self, order_model):
+        records = [
+            {"sku": "sku-1", "quantity": 1},
+            {"sku": "nope", "quantity": 1},
+            {"sku": "sku-1", "quantity": -1},
+        ]
+        with pytest.raises(ValidationError) as error:
+            asyncio.run(order_model.avalidate_many(records))
+        assert [(e["loc"], e["msg"]) for e in error.value.errors()] == [
+            (("__root__", 1, "sku"), "unknown SKU"),
+            (
+                ("__root__", 2, "quantity"),
+                "ensure this value is greater than or equal to 0",
+            ),
+        ]
+
+    def test_async_pre_root_validator(self, async_store: InMemoryStore):
+        class Signup(AsyncModel):
+            username: str
+
+            @root_validator(pre=True)
+            async def resolve_alias(cls, values):
+                user = await async_store.get(f"user:{values['username']}")
+                if user is not None:
+                    values = {**values, "username": user["name"]}
+                return values
+
+        user = asyncio.run(Signup.avalidate({"username": "guido"}))
+        assert user.username == "Guido"
+
+    @pytest.mark.parametrize("sync", [True, False])
+    def test_values_after_async_validators(self, sync: bool):
+        class Pair(AsyncModel):
+            a: str
+            b: str
+            c: str = "z"
+
+            @validator("a", allow_reuse=True)
+            async def upper(cls, v):
+                await asyncio.sleep(0)
+                if v == "bad":
+                    raise ValueError("bad a")
+                return v.upper()
+
+            if sync:
+
+                @validator("b", allow_reuse=True)
+                def joined(cls, v, values):
+                    return f"{values.get('a')}-{v}"
+
+            else:
+
+                @validator("b", allow_reuse=True)
+                async def joined(cls, v, values):
+                    return f"{values.get('a')}-{v}"
+
+            @root_validator(allow_reuse=True)
+            def sees_async_results(cls, values):
+                assert values.get("a") != "x", "root saw unvalidated a"
+                return values
+
+        pair = asyncio.run(Pair.avalidate({"a": "x", "b": "y"}))
+        assert pair.dict() == {"a": "X", "b": "X-y", "c": "z"}
+        assert pair.__fields_set__ == {"a", "b"}
+        with pytest.raises(ValidationError) as e:
+            asyncio.run(Pair.avalidate({"a": "bad", "b": "y"}))
+        assert [err["loc"] for err in e.value.errors()] == [("a",)]
+        with pytest.raises(ValidationError) as e:
+            asyncio.run(Pair.avalidate({"a": "x"}))
+        assert [err["loc"] for err in e.value.errors()] == [("b",)]
+
+    def test_batch_loader(self, async_store: InMemoryStore):
+        loader = BatchLoader(async_store.get_many)
+
+        class Line(AsyncModel):
+            sku: str
+
+            @validator("sku")
+            async def sku_exists(cls, v):
+                if await loader.load(v) is None:
+                    raise ValueError("unknown SKU")
+                return v
+
+        records = [{"sku": sku} for sku in ["sku-1", "sku-2", "sku-3"] * 10]
+        lines = asyncio.run(Line.avalidate_many(records, concurrency=50))
+        assert len(lines) == 30
+        assert async_store.calls == [["sku-1", "sku-2", "sku-3"]]
+
+    def test_unsupported_validators(self):
+        with pytest.raises(ConfigError):
+
+            class Tags(AsyncModel):
+                tags: list[str]
+
+                @validator("tags", each_item=True)
+                async def known(cls, v):
+                    return v
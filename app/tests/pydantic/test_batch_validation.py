@@ -0,0 +1,94 @@
+import pytest
+from app.batch_validation import BatchModel, batch_validator
+from pydantic import ValidationError, conint, parse_obj_as, validator
+from pydantic.errors import ConfigError
+
+CATALOGUE = {"sku-1", "sku-2", "sku-3"}
+
+
+@pytest.fixture
+def lookups():
+    return []
+
+
+@pytest.fixture
+def item_model(lookups):
+    class Item(BatchModel):
+        sku: str
+        quantity: conint(ge=0, le=30)
+        warehouse: str = "main"
+
+        @validator("sku", allow_reuse=True)
+        def normalise_sku(cls, v):
+            return v.lower()
+
+        @batch_validator("sku")
+        def skus_exist(cls, skus):
+            lookups.append(skus)
+            return {sku: "unknown SKU" for sku in skus - CATALOGUE}
+
+        @batch_validator("sku", "warehouse")
+        def not_blocked(cls, values):
+            return {"blocked": TypeError("blocked value")}
+
+    return Item
+
+
+class TestBatchModel:
+    def test_validate_many_calls_once(self, item_model, lookups):
+        records = [{"sku": f"SKU-{i % 3 + 1}", "quantity": i % 30} for i in range(900)]
+        items = item_model.validate_many(records)
+        assert lookups == [CATALOGUE]
+        assert items == parse_obj_as(list[item_model], records)
+        assert items[0].__fields_set__ == {"sku", "quantity"}
+
+    def test_errors_as_parse_obj_as(self, item_model, lookups):
+        records = [
+            {"sku": "sku-1", "quantity": 1},
+            {"sku": "sku-9", "quantity": 31},
+            {"sku": "SKU-9", "quantity": 2},
+            {"sku": "sku-2", "quantity": 2, "warehouse": "blocked"},
+            [("sku", "blocked")],
+        ]
+        with pytest.raises(ValidationError) as error:
+            item_model.validate_many(records)
+        assert [(e["loc"], e["msg"]) for e in error.value.errors()] == [
+            (
+                ("__root__", 1, "quantity"),
+                "ensure this value is less than or equal to 30",
+            ),
+            (("__root__", 1, "sku"), "unknown SKU"),
+            (("__root__", 2, "sku"), "unknown SKU"),
+            (("__root__", 3, "warehouse"), "blocked value"),
+            (("__root__", 4, "quantity"), "field required"),
+            # failed the first batch validator, the second does not see it
+            (("__root__", 4, "sku"), "unknown SKU"),
+        ]
+        assert lookups == [{"sku-1", "sku-9", "sku-2", "blocked"}]
+
+    def test_single_records(self, item_model, lookups):
+        assert item_model(sku="SKU-1", quantity=1).sku == "sku-1"
+        with pytest.raises(ValidationError) as error:
+            item_model.parse_obj({"sku": "nope", "quantity": 1})
+        assert error.value.errors() == [
+            {"loc": ("sku",), "msg": "unknown SKU", "type": "value_error"}
+        ]
+        assert lookups == [{"sku-1"}, {"nope"}]
+
+    def test_inherited_validators(self, item_model, lookups):
+        class Line(item_model):
+            note: str = ""
+
+        with pytest.raises(ValidationError):
+            Line.validate_many([{"sku": "nope", "quantity": 1}])
+        assert lookups == [{"nope"}]
+
+    def test_unknown_field(self):
+        with pytest.raises(ConfigError):
+
+            class Item(BatchModel):
+                sku: str
+
+                @batch_validator("code")
+                def codes_exist(cls, codes):
+                    return {}
@@ -0,0 +1,103 @@
+from datetime import datetime
+
+import pytest
+from app.bulk_load import ModelBulkLoader
+from app.compiled_dump import SchemaCompileError
+from pydantic import BaseModel, ValidationError, conint, parse_obj_as, validator
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+    price: float = 1.0
+    quantity: conint(ge=0, lt=100) = 0
+    created_at: datetime | None = None
+    tags: list[str] = []
+
+
+def parse_both(data: list):
+    outcomes = []
+    for parse in (
+        lambda: parse_obj_as(list[Item], data),
+        lambda: ModelBulkLoader(Item).parse(data),
+    ):
+        try:
+            outcomes.append(parse())
+        except ValidationError as e:
+            outcomes.append((str(e), e.errors()))
+    return outcomes
+
+
+class TestModelBulkLoader:
+    def test_parse_as(self):
+        item_data = [{"id": 1, "name": "My Item"}]
+
+        items = ModelBulkLoader(Item).parse(item_data)
+        assert len(items) == 1
+        assert isinstance(items[0], Item)
+        assert items == parse_obj_as(list[Item], item_data)
+        assert items[0].__fields_set__ == {"id", "name"}
+
+    def test_coercion_same_as_parse_obj_as(self):
+        data = [
+            {"id": 1, "name": "a", "price": 2.5, "quantity": 5},
+            {"id": "2", "name": "b", "price": 3, "created_at": "2032-04-23T10:20:30"},
+            {"id": 3.7, "name": "c", "tags": ["x"], "created_at": datetime(2020, 1, 1)},
+            Item(id=4, name="d"),
+        ]
+        result, bulk = parse_both(data)
+        assert result == bulk
+        assert [item.__fields_set__ for item in result] == [
+            item.__fields_set__ for item in bulk
+        ]
+        assert bulk[1].created_at == datetime(2032, 4, 23, 10, 20, 30)
+
+    def test_errors_same_as_parse_obj_as(self):
+        data = [
+            {"id": 1, "name": "ok"},
+            {"id": "bad", "name": "a"},
+            {"name": "no id", "quantity": 100},
+            {"id": 3, "name": "c", "created_at": "yesterday"},
+            "not a dict",
+        ]
+        result, bulk = parse_both(data)
+        assert result == bulk
+        assert [error["loc"][:2] for error in bulk[1]] == [
+            ("__root__", 1),
+            ("__root__", 2),
+            ("__root__", 2),
+            ("__root__", 3),
+            ("__root__", 4),
+        ]
+
+    def test_validate_all_defaults(self):
+        class Validated(BaseModel):
+            id: int
+            x: int = "5"
+            y: conint(lt=0) = 1
+
+            class Config:
+                validate_all = True
+
+        data = [{"id": 1, "y": -1}, {"id": 2}]
+        items = ModelBulkLoader(Validated).parse(data[:1])
+        assert items[0].x == 5
+        assert items == parse_obj_as(list[Validated], data[:1])
+        assert items[0].__fields_set__ == {"id", "y"}
+        with pytest.raises(ValidationError) as e:
+            ModelBulkLoader(Validated).parse(data)
+        with pytest.raises(ValidationError) as expected:
+            parse_obj_as(list[Validated], data)
+        assert e.value.errors() == expected.value.errors()
+
+    def test_unsupported_model(self):
+        class Checked(BaseModel):
+            id: int
+
+            @validator("id")
+            def positive(cls, v):
+                assert v > 0
+                return v
+
+        with pytest.raises(SchemaCompileError):
+            ModelBulkLoader(Checked)
@@ -0,0 +1,135 @@
+import json
+from array import array
+from enum import Enum, IntEnum
+
+import pytest
+from app import columnar as columnar_module
+from app.columnar import Columns, columnar
+from pydantic import BaseModel, Field, conint, parse_obj_as
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+    price: float = 1.0
+    active: bool = True
+    tags: list[str] = []
+    note: str | None = None
+
+
+@pytest.fixture
+def items():
+    data = [
+        {"id": i, "name": f"item {i % 3}", "price": i / 2, "tags": ["a"] * (i % 2)}
+        for i in range(10)
+    ]
+    return parse_obj_as(list[Item], data)
+
+
+@pytest.fixture(autouse=True)
+def without_numpy(monkeypatch):
+    monkeypatch.setattr(columnar_module, "numpy", None)
+
+
+class TestColumnar:
+    def test_columns(self, items):
+        columns = columnar(items)
+        assert len(columns) == 10
+        assert columns.kinds == {
+            "id": "int",
+            "name": "str",
+            "price": "float",
+            "active": "bool",
+            "tags": "object",
+            "note": "object",
+        }
+        assert columns.column("id") == array("q", range(10))
+        assert columns["price"] == array("d", [i / 2 for i in range(10)])
+        names = columns.column("name")
+        assert names[0] is names[3]
+
+    def test_rows(self, items):
+        columns = columnar(items)
+        assert columns[4].dict() == items[4].dict()
+        assert columns[-1].name == "item 0"
+        assert [row.id for row in columns] == list(range(10))
+        with pytest.raises(IndexError):
+            columns[10]
+        with pytest.raises(AttributeError):
+            columns[0].missing
+
+    def test_slicing_and_filter(self, items):
+        columns = columnar(items)
+        page = columns.select("id", "name")[2:8:2]
+        assert page.names == ["id", "name"]
+        assert page.to_dicts() == [
+            {"id": 2, "name": "item 2"},
+            {"id": 4, "name": "item 1"},
+            {"id": 6, "name": "item 0"},
+        ]
+        cheap = columns.filter(lambda row: row.price < 2)
+        assert cheap.column("id") == array("q", [0, 1, 2, 3])
+        odd = columns.filter([i % 2 == 1 for i in range(10)])
+        assert odd.column("tags") == [["a"]] * 5
+        with pytest.raises(ValueError):
+            columns.filter([True])
+
+    def test_dumps(self, items):
+        columns = columnar(items)
+        assert json.loads(columns.dumps()) == [item.dict() for item in items]
+        assert columns.dump() == [item.dict() for item in items]
+        assert columns.select("id").dump() == [{"id": i} for i in range(10)]
+        assert json.loads(columns.select("id", "price").dumps()) == [
+            item.dict(include={"id", "price"}) for item in items
+        ]
+
+    def test_field_exclude_and_nested(self):
+        class Secret(BaseModel):
+            id: int
+            token: str = Field(exclude=True)
+            item: Item
+
+        secrets = [Secret(id=1, token="t", item=Item(id=1, name="x"))]
+        assert json.loads(columnar(secrets).dumps()) == [secrets[0].dict()]
+
+    def test_big_ints_stay_in_lists(self):
+        class Big(BaseModel):
+            value: int
+
+        columns = columnar([Big(value=2**70), Big(value=1)])
+        assert columns.column("value") == [2**70, 1]
+
+    def test_enums_keep_their_type(self):
+        class Priority(IntEnum):
+            low = 1
+
+        class Colour(str, Enum):
+            red = "red"
+
+        class Ticket(BaseModel):
+            priority: Priority
+            colour: Colour
+            count: conint(ge=0)
+
+        columns = columnar([Ticket(priority=1, colour="red", count=2)])
+        assert columns.column("priority") == [Priority.low]
+        assert columns[0].colour is Colour.red
+        assert isinstance(columns.column("count"), array)
+
+    def test_needs_schema_for_dicts(self):
+        with pytest.raises(TypeError):
+            columnar([{"id": 1}])
+        assert isinstance(columnar([Item(id=1, name="x")], Item), Columns)
+
+
+class TestNumpy:
+    def test_numpy_columns(self, items, monkeypatch):
+        numpy = pytest.importorskip("numpy")
+        monkeypatch.setattr(columnar_module, "numpy", numpy)
+        columns = columnar(items)
+        assert columns.column("price").dtype == numpy.float64
+        assert columns.column("active").dtype == numpy.bool_
+        assert type(columns[1].id) is int
+        mask = columns.column("price") > 2
+        assert columns.filter(mask).column("id").tolist() == [5, 6, 7, 8, 9]
+        assert json.loads(columns.dumps()) == [item.dict() for item in items]
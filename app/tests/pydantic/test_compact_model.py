@@ -0,0 +1,180 @@
+import gc
+import pickle
+from typing import ClassVar, Final
+
+import pytest
+from app.compact_model import CompactModel
+from app.tests.fixtures.pydantic_fixtures import CompanyModel, CompanyOrm
+from pydantic import BaseModel, Field, SecretStr, ValidationError, constr
+from pydantic.errors import ConfigError
+from pydantic.main import ModelMetaclass
+
+
+class User(CompactModel):
+    id: int
+    username: str
+    password: SecretStr = Field(exclude=True)
+
+
+class Transaction(CompactModel):
+    id: str
+    user: User
+    value: int
+
+
+class Bar(CompactModel):
+    count: int
+    name = "Jane Doe"
+
+
+class CompactCompany(CompactModel):
+    id: int
+    public_key: constr(max_length=20)
+    name: constr(max_length=63)
+    domains: list[constr(max_length=255)]
+
+    class Config:
+        orm_mode = True
+
+
+@pytest.fixture
+def transaction():
+    return Transaction(
+        id="1234567890",
+        user=User(id=42, username="JohnDoe", password="hashedpassword"),
+        value=9876543210,
+    )
+
+
+class TestCompactModel:
+    def test_no_instance_dict(self):
+        bar = Bar(count=1)
+        assert not any(isinstance(r, (dict, set)) for r in gc.get_referents(bar))
+        assert bar.__dict__ == {"count": 1, "name": "Jane Doe"}
+        assert bar.__fields_set__ == {"count"}
+
+    def test_shared_defaults_and_fields_set(self):
+        a, b = Bar(count=1), Bar(count=2)
+        assert a.name is b.name
+        assert a.__fields_set__ is not b.__fields_set__
+        (shared,) = [r for r in gc.get_referents(a) if isinstance(r, frozenset)]
+        assert any(r is shared for r in gc.get_referents(b))
+
+    def test_export(self, transaction):
+        assert transaction.dict() == {
+            "id": "1234567890",
+            "user": {"id": 42, "username": "JohnDoe"},
+            "value": 9876543210,
+        }
+        assert transaction.dict(exclude={"user", "value"}) == {"id": "1234567890"}
+        assert transaction.dict(
+            exclude={"user": {"username", "password"}, "value": True}
+        ) == {"id": "1234567890", "user": {"id": 42}}
+        assert transaction.dict(include={"id": True, "user": {"id"}}) == {
+            "id": "1234567890",
+            "user": {"id": 42},
+        }
+        assert transaction.json(exclude_unset=True, include={"value"}) == (
+            '{"value": 9876543210}'
+        )
+
+    def test_orm_mode(self):
+        company = CompanyOrm(
+            id=123,
+            public_key="foobar",
+            name="Testing",
+            domains=["example.com", "foobar.com"],
+        )
+        compact = CompactCompany.from_orm(company)
+        assert compact.dict() == CompanyModel.from_orm(company).dict()
+        company.public_key = "x" * 21
+        with pytest.raises(ValidationError):
+            CompactCompany.from_orm(company)
+
+    def test_assignment(self):
+        class Strict(CompactModel):
+            count: int
+            name = "Jane Doe"
+
+            class Config:
+                validate_assignment = True
+
+        bar = Bar(count=1)
+        bar.name = "John"
+        assert bar.dict() == {"count": 1, "name": "John"}
+        assert bar.__fields_set__ == {"count", "name"}
+        strict = Strict(count=1)
+        strict.count = "2"
+        assert strict.count == 2
+        with pytest.raises(ValidationError):
+            strict.count = "x"
+        with pytest.raises(ValueError):
+            bar.missing = 1
+
+    def test_copy_pickle_and_equality(self, transaction):
+        assert pickle.loads(pickle.dumps(transaction)) == transaction
+        copy = transaction.copy(update={"value": 1})
+        assert copy.value == 1 and copy.user is transaction.user
+        assert Bar(count=1) == Bar(count=1)
+
+    def test_subclass_and_nesting(self):
+        class Child(Bar):
+            extra: int = 0
+
+        class Plain(BaseModel):
+            bar: Bar
+
+        child = Child(count=1, extra=2)
+        assert set(Child.__slots__) == {"extra"}
+        assert child.dict() == {"count": 1, "name": "Jane Doe", "extra": 2}
+        assert Plain(bar={"count": 3}).dict() == {
+            "bar": {"count": 3, "name": "Jane Doe"}
+        }
+
+    def test_created_once(self, monkeypatch):
+        created = []
+        new = ModelMetaclass.__new__
+
+        def counting_new(mcs, name, *args, **kwargs):
+            created.append(name)
+            return new(mcs, name, *args, **kwargs)
+
+        monkeypatch.setattr(ModelMetaclass, "__new__", counting_new)
+
+        class Account(Bar):
+            limit: ClassVar[int] = 10
+            kind: Final = "account"
+            balance: float = 0.0
+            owner = "nobody"
+            _secret: str = "x"
+
+            @property
+            def rich(self) -> bool:
+                return self.balance > self.limit
+
+            def describe(self) -> str:
+                return f"{self.owner}: {self.balance}"
+
+        assert created == ["Account"]
+        assert set(Account.__slots__) == {"balance", "owner"}
+        account = Account(count=1, balance=11)
+        assert account.rich
+        assert account.describe() == "nobody: 11.0"
+        assert account.dict() == {
+            "count": 1,
+            "name": "Jane Doe",
+            "balance": 11.0,
+            "owner": "nobody",
+        }
+
+    def test_construct(self):
+        assert Bar.construct(name="x").dict() == {"name": "x"}
+
+    def test_extra_allow_rejected(self):
+        with pytest.raises(ConfigError):
+
+            class Open(CompactModel):
+                count: int
+
+                class Config:
+                    extra = "allow"
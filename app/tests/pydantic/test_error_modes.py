@@ -0,0 +1,88 @@
+import pytest
+from app.error_modes import FirstError, load, load_many
+from pydantic import BaseModel, Extra, ValidationError, conint, root_validator
+
+
+class Location(BaseModel):
+    lat: float = 0.1
+    lng: float = 10.1
+
+
+class Model(BaseModel):
+    is_required: float
+    gt_int: conint(gt=42)
+    list_of_ints: list[int] = None
+    a_float: float = None
+    recursive_model: Location = None
+
+
+class Strict(BaseModel):
+    a: int
+    b: int = 0
+
+    @root_validator
+    def a_below_b(cls, values):
+        if values["a"] > values["b"]:
+            raise ValueError("a must not exceed b")
+        return values
+
+    class Config:
+        extra = Extra.forbid
+
+
+def first_of_full_report(model, data):
+    with pytest.raises(ValidationError) as e:
+        model.parse_obj(data)
+    first = e.value.errors()[0]
+    return first["loc"], first["type"]
+
+
+class TestFirstError:
+    @pytest.mark.parametrize(
+        "data",
+        [
+            dict(
+                list_of_ints=["1", 2, "bad"],
+                a_float="not a float",
+                recursive_model={"lat": 4.2, "lng": "New York"},
+                gt_int=21,
+            ),
+            dict(is_required=1, gt_int=21),
+            dict(is_required=1, gt_int=43, list_of_ints=["1", 2, "bad"]),
+            dict(is_required=1, gt_int=43, recursive_model={"lng": "New York"}),
+        ],
+    )
+    def test_same_as_first_of_full_report(self, data):
+        with pytest.raises(FirstError) as e:
+            load(Model, data, errors="first")
+        assert (e.value.loc, e.value.code) == first_of_full_report(Model, data)
+
+    def test_root_validator_and_extra(self):
+        for data in ({"a": 2, "b": 1}, {"a": 1, "c": 1}, "not a dict"):
+            with pytest.raises(FirstError) as e:
+                load(Strict, data, errors="first")
+            assert (e.value.loc, e.value.code) == first_of_full_report(Strict, data)
+
+    def test_valid_same_as_parse_obj(self):
+        data = dict(is_required="1.5", gt_int="43", recursive_model={"lat": 1})
+        model = load(Model, data, errors="first")
+        assert model == Model.parse_obj(data)
+        assert model.__fields_set__ == Model.parse_obj(data).__fields_set__
+
+    def test_count(self):
+        records = [
+            dict(is_required=1, gt_int=43),
+            dict(gt_int=43),
+            dict(is_required=1, gt_int=1),
+            dict(is_required=1, gt_int=44),
+        ]
+        result = load_many(Model, records, errors="count")
+        assert [m.gt_int for m in result.valid] == [43, 44]
+        assert result.invalid == 2
+        assert result.codes == {
+            "value_error.missing": 1,
+            "value_error.number.not_gt": 1,
+        }
+        with pytest.raises(FirstError) as e:
+            load_many(Model, records, errors="first")
+        assert e.value.loc == (1, "is_required")
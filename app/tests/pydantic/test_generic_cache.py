@@ -0,0 +1,137 @@
+import gc
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Generic, Literal, TypeVar
+
+import pytest
+from app.generic_cache import GenericCache
+from pydantic import BaseModel, ValidationError, validator
+from pydantic import generics
+from pydantic.generics import GenericModel
+
+DataT = TypeVar("DataT")
+
+
+class Error(BaseModel):
+    code: int
+    message: str
+
+
+class DataModel(BaseModel):
+    numbers: list[int]
+    people: list[str]
+
+
+class Response(GenericModel, Generic[DataT]):
+    data: DataT | None
+    error: Error | None
+
+    @validator("error", always=True)
+    def check_consistency(cls, v, values):
+        if v is not None and values["data"] is not None:
+            raise ValueError("must not provide both data and error")
+        if v is None and values.get("data") is None:
+            raise ValueError("must provide data or error")
+        return v
+
+
+def parametrise(*params) -> None:
+    # nothing outside keeps the classes
+    for each in params:
+        Response[each]
+
+
+@pytest.fixture
+def cache():
+    cache = GenericCache(maxsize=8)
+    cache.enable()
+    yield cache
+    cache.disable()
+
+
+class TestGenericCache:
+    def test_same_models(self, cache: GenericCache):
+        data = DataModel(numbers=[1, 2, 3], people=[])
+        assert Response[int](data=1).dict() == {"data": 1, "error": None}
+        assert Response[DataModel](data=data).dict() == {
+            "data": {"numbers": [1, 2, 3], "people": []},
+            "error": None,
+        }
+        with pytest.raises(ValidationError):
+            Response[int](data="a")
+        assert Response[int] is Response[int]
+        assert Response[int].__name__ == "Response[int]"
+        assert cache.stats()["misses"] == 2
+
+    def test_kept_after_gc(self, cache: GenericCache):
+        ref = weakref.ref(Response[Literal["kept"]])
+        gc.collect()
+        assert ref() is not None
+        assert Response[Literal["kept"]] is ref()
+        assert cache.stats()["misses"] == 1
+
+        # pydantic's own cache lets it go
+        cache.disable()
+        cache.clear()
+        gc.collect()
+        assert ref() is None
+
+    def test_capped(self, cache: GenericCache):
+        refs = []
+        for i in range(20):
+            model = Response[Literal[f"capped{i}"]]
+            refs.append(weakref.ref(model))
+            del model
+        gc.collect()
+        stats = cache.stats()
+        assert stats["size"] == len(cache) == 8
+        assert stats["evictions"] == 40 - 8
+        # one class per two entries, Response[X] and Response[(X,)]
+        assert sum(ref() is not None for ref in refs) == 4
+
+    def test_evicted_class_in_use_is_found(self, cache: GenericCache):
+        kept = Response[int]
+        parametrise(*(Literal[f"evict{i}"] for i in range(8)))
+        assert cache.stats()["evictions"] > 0
+        gc.collect()
+        assert Response[int] is kept
+        assert cache.stats()["revivals"] == 1
+
+    def test_warm(self, cache: GenericCache):
+        models = cache.warm(Response, [int, DataModel])
+        assert [model.__name__ for model in models] == [
+            "Response[int]",
+            "Response[DataModel]",
+        ]
+        assert models[1].__module__ == __name__
+        misses = cache.stats()["misses"]
+        assert Response[DataModel] is models[1]
+        assert cache.stats()["misses"] == misses
+
+        cache.disable()
+        with pytest.raises(RuntimeError):
+            cache.warm(Response, [str])
+
+    def test_enable_disable(self):
+        before = Response[str]
+        replaced = generics._generic_types_cache
+        cache = GenericCache()
+        with cache:
+            assert cache.enabled
+            assert Response[str] is before
+            during = Response[bytes]
+        assert generics._generic_types_cache is replaced
+        assert Response[bytes] is during
+
+    def test_one_enabled_at_a_time(self, cache: GenericCache):
+        with pytest.raises(RuntimeError):
+            GenericCache().enable()
+
+    def test_threads(self, cache: GenericCache):
+        kept = cache.warm(Response, [int, str, float])
+        params = [int, str, float, Literal[1], Literal[2]] * 40
+        with ThreadPoolExecutor(8) as pool:
+            models = list(pool.map(lambda each: Response[each], params))
+        assert models[:3] == kept
+        assert models == [Response[each] for each in params]
+        assert len(cache) <= cache.maxsize
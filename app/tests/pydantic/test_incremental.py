@@ -0,0 +1,144 @@
+import pytest
+from app.incremental import depends_on, patch, update_plan
+from pydantic import BaseModel, PrivateAttr, ValidationError, root_validator, validator
+
+calls = []
+
+
+def check_all(values):
+    return len(values) > 100
+
+
+class UserModel(BaseModel):
+    name: str
+    username: str
+    password1: str
+    password2: str
+    tags: list[str] = []
+    _session: int = PrivateAttr(0)
+
+    @validator("name")
+    def name_must_contain_space(cls, v):
+        calls.append("name")
+        if " " not in v:
+            raise ValueError("must contain a space")
+        return v.title()
+
+    @validator("password2")
+    def passwords_match(cls, v, values, **kwargs):
+        calls.append("password2")
+        if "password1" in values and v != values["password1"]:
+            raise ValueError("passwords do not match")
+        return v
+
+    @validator("username")
+    def username_alphanumeric(cls, v):
+        calls.append("username")
+        assert v.isalnum(), "must be alphanumeric"
+        return v
+
+    @root_validator(pre=True)
+    def check_card_number_omitted(cls, values):
+        calls.append("pre_root")
+        assert "card_number" not in values, "card_number should not be included"
+        return values
+
+    @root_validator
+    def check_passwords_match(cls, values):
+        calls.append("root")
+        pw1, pw2 = values.get("password1"), values.get("password2")
+        if pw1 is not None and pw2 is not None and pw1 != pw2:
+            raise ValueError("passwords do not match")
+        return values
+
+
+@pytest.fixture
+def user():
+    user = UserModel(
+        name="samuel colvin",
+        username="scolvin",
+        password1="zxcvbn",
+        password2="zxcvbn",
+        tags=["admin"],
+    )
+    calls.clear()
+    return user
+
+
+def rebuilt(user, changes):
+    try:
+        return UserModel(**{**user.dict(), **changes})
+    except ValidationError as e:
+        return e.errors()
+
+
+def patched(user, changes):
+    try:
+        return patch(user, changes)
+    except ValidationError as e:
+        return e.errors()
+
+
+class TestPatch:
+    def test_only_changed_field(self, user):
+        new = patch(user, {"name": "guido van rossum"})
+        assert calls == ["name"]
+        assert new == rebuilt(user, {"name": "guido van rossum"})
+        assert new.tags is user.tags
+        assert user.name == "Samuel Colvin"
+
+    def test_dependent_validators(self, user):
+        patch(user, {"password1": "qwerty", "password2": "qwerty"})
+        assert calls == ["password2", "root"]
+
+    @pytest.mark.parametrize(
+        "changes",
+        [
+            {"password1": "qwerty"},
+            {"name": "samuel", "password2": "zxcvbn2"},
+            {"username": "s colvin", "tags": "admin"},
+            {"tags": ["a", "b"], "name": "a b"},
+        ],
+    )
+    def test_same_as_rebuilding(self, user, changes):
+        assert patched(user, changes) == rebuilt(user, changes)
+
+    def test_fields_set_and_private_attributes(self, user):
+        user._session = 7
+        new = patch(user, {"name": "a b"})
+        assert new.__fields_set__ == user.__fields_set__
+        assert new._session == 7
+
+    def test_unknown_field(self, user):
+        with pytest.raises(ValueError, match="no fields"):
+            patch(user, {"card_number": "1234"})
+
+
+class TestUpdatePlan:
+    def test_inferred(self):
+        plan = update_plan(UserModel)
+        assert plan.dependents["password1"] == {"password2"}
+        assert plan.dependents["name"] == set()
+        assert plan.pre_roots[0][1] == frozenset()
+        assert plan.post_roots[0][2] == {"password1", "password2"}
+
+    def test_unknown_use_reads_everything(self):
+        class Model(BaseModel):
+            a: int
+            b: int
+            c: int
+
+            @validator("c")
+            def check(cls, v, values):
+                check_all(values)
+                return v
+
+            @root_validator(skip_on_failure=True)
+            @depends_on("a")
+            def declared(cls, values):
+                check_all(values)
+                return values
+
+        plan = update_plan(Model)
+        assert plan.dependents == {"a": {"c"}, "b": {"c"}, "c": set()}
+        assert plan.post_roots[0][2] == {"a"}
@@ -0,0 +1,151 @@
+import pickle
+
+import pytest
+from app.lazy_model import LazyModel
+from pydantic import BaseModel, Extra, ValidationError, root_validator, validator
+
+
+class Foo(BaseModel):
+    count: int
+    size: float | None = None
+
+
+class Bar(BaseModel):
+    apple = "x"
+    banana = "y"
+
+
+class EagerSpam(BaseModel):
+    name: str = "spam"
+    foo: Foo
+    bars: list[Bar]
+    tags: dict[str, int] = {}
+
+
+class Spam(LazyModel):
+    name: str = "spam"
+    foo: Foo
+    bars: list[Bar]
+    tags: dict[str, int] = {}
+
+
+def errors_of(model: type[BaseModel], **data) -> list[dict]:
+    with pytest.raises(ValidationError) as e:
+        model(**data).dict()
+    return e.value.errors()
+
+
+class TestLazyModel:
+    def test_recursive_models(self):
+        m = Spam(foo={"count": 4}, bars=[{"apple": "x1"}, {"apple": "x2"}])
+        assert m.lazy_pending == {"foo", "bars"}
+        assert m.foo.count == 4
+        assert m.lazy_pending == {"bars"}
+        assert isinstance(m.bars[0], Bar)
+        assert m.lazy_pending == frozenset()
+
+        eager = EagerSpam(foo={"count": 4}, bars=[{"apple": "x1"}, {"apple": "x2"}])
+        assert m.dict() == eager.dict()
+        assert list(m.dict()) == list(eager.dict())
+        assert m.json() == eager.json()
+        assert m.__fields_set__ == eager.__fields_set__
+
+    def test_dict_forces_validation(self):
+        m = Spam(foo={"count": 4}, bars=[{"apple": "x1"}, "not a bar"])
+        assert m.foo.count == 4  # the broken bar is not touched
+        with pytest.raises(ValidationError) as e:
+            m.dict()
+        assert e.value.errors()[0]["loc"] == ("bars", 1)
+        with pytest.raises(ValidationError):
+            m.json()
+        with pytest.raises(ValidationError):
+            m.bars
+        assert "not a bar" in repr(m)
+
+    def test_same_errors_as_eager(self):
+        cases = [
+            dict(foo={"count": "x"}, bars=[{"apple": []}], name=[]),
+            dict(bars=[{"apple": 1}]),
+            dict(foo={}, bars=[Bar(), "bad"], tags={"a": "b"}),
+        ]
+        for data in cases:
+            assert errors_of(Spam, **data) == errors_of(EagerSpam, **data)
+
+    def test_assignment_and_pickle(self):
+        m = Spam(foo={"count": 4}, bars=[])
+        m.foo = Foo(count=5)
+        assert m.lazy_pending == {"bars"}
+        assert m.foo.count == 5
+
+        restored = pickle.loads(pickle.dumps(m))
+        assert restored.bars == []
+        assert restored == m
+
+    def test_root_validator_is_eager(self):
+        class Checked(LazyModel):
+            foo: Foo
+            bars: list[Bar]
+
+            @root_validator
+            def has_bars(cls, values):
+                assert values.get("bars"), "need bars"
+                return values
+
+            class Config:
+                extra = Extra.forbid
+
+        m = Checked(foo={"count": 1}, bars=[{}])
+        assert m.lazy_pending == frozenset()
+        with pytest.raises(ValidationError):
+            Checked(foo={"count": 1}, bars=[])
+
+    def test_pre_root_validator_is_eager(self):
+        class Wrapped(LazyModel):
+            foo: Foo
+            bars: list[Bar]
+
+            @root_validator(pre=True)
+            def wrap_bars(cls, values):
+                if isinstance(values.get("bars"), dict):
+                    values["bars"] = [values["bars"]]
+                assert values.get("foo"), "need foo"
+                return values
+
+        m = Wrapped(foo={"count": 1}, bars={"apple": "z"})
+        assert m.lazy_pending == frozenset()
+        assert m.bars == [Bar(apple="z")]
+        with pytest.raises(ValidationError):
+            Wrapped(bars=[])
+
+    def test_values_reading_validator(self):
+        class Order(LazyModel):
+            foo: Foo
+            bars: list[Bar]
+            total: int
+            tags: dict[str, int] = {}
+
+            @validator("total")
+            def count_bars(cls, v, values):
+                assert v == len(values["bars"]), "wrong total"
+                return v
+
+        m = Order(foo={"count": 1}, bars=[{"apple": 1}], total=1, tags={"a": 1})
+        assert m.total == 1
+        assert m.lazy_pending == {"tags"}
+        with pytest.raises(ValidationError):
+            Order(foo={"count": 1}, bars=[], total=1)
+
+    def test_lazy_field_validator_sees_preceding_values(self):
+        class Tagged(LazyModel):
+            name: str
+            tags: dict[str, int] = {}
+            after: str = "later"
+
+            @validator("tags")
+            def no_later_fields(cls, v, values):
+                assert list(values) == ["name"]
+                return v
+
+        m = Tagged(name="x", tags={"a": 1})
+        assert m.lazy_pending == {"tags"}
+        assert m.tags == {"a": 1}
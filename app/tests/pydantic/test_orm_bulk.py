@@ -0,0 +1,193 @@
+from collections import namedtuple
+
+import pytest
+from app.compiled_dump import SchemaCompileError
+from app.orm_bulk import OrmBulkConverter, from_orm_many
+from app.tests.fixtures import CompanyModel, CompanyOrm
+from pydantic import BaseModel, ValidationError, constr, root_validator, validator
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, select
+
+CompanyRow = namedtuple("CompanyRow", "id public_key name domains")
+
+
+def companies(n: int) -> list[CompanyOrm]:
+    return [
+        CompanyOrm(
+            id=i,
+            public_key=f"key{i}",
+            name=f"company {i}",
+            domains=[f"a{i}.com", f"b{i}.com"],
+        )
+        for i in range(n)
+    ]
+
+
+def from_orm_each(model, rows):
+    errors = []
+    result = []
+    for index, row in enumerate(rows):
+        try:
+            result.append(model.from_orm(row))
+        except ValidationError as e:
+            errors.append((index, e.errors()))
+    return result, errors
+
+
+def bulk_errors(model, rows, **kwargs):
+    with pytest.raises(ValidationError) as e:
+        from_orm_many(model, rows, **kwargs)
+    by_index = {}
+    for error in e.value.errors():
+        _, index, *loc = error["loc"]
+        by_index.setdefault(index, []).append({**error, "loc": tuple(loc)})
+    return sorted(by_index.items())
+
+
+class TestFromOrmMany:
+    def test_same_as_from_orm(self):
+        rows = companies(5)
+        result = from_orm_many(CompanyModel, rows, batch_size=2)
+        assert result == [CompanyModel.from_orm(row) for row in rows]
+        assert all(isinstance(m, CompanyModel) for m in result)
+        assert [m.__fields_set__ for m in result] == [
+            CompanyModel.from_orm(row).__fields_set__ for row in rows
+        ]
+
+    def test_rows(self):
+        rows = [CompanyRow(c.id, c.public_key, c.name, c.domains) for c in companies(3)]
+        result = from_orm_many(CompanyModel, rows, CompanyOrm)
+        assert result == [CompanyModel.from_orm(row) for row in rows]
+        # ARRAY(String(255)) values are taken without copying
+        assert result[0].domains is rows[0].domains
+
+    def test_sqlalchemy_result(self):
+        table = Table(
+            "companies",
+            MetaData(),
+            Column("id", Integer, primary_key=True),
+            Column("public_key", String(20), nullable=False),
+            Column("name", String(63)),
+        )
+
+        class CompanyName(BaseModel):
+            id: int
+            public_key: constr(max_length=20)
+            name: constr(max_length=63)
+
+            class Config:
+                orm_mode = True
+
+        engine = create_engine("sqlite://")
+        table.create(engine)
+        with engine.begin() as conn:
+            conn.execute(
+                table.insert(),
+                [
+                    {"id": 1, "public_key": "k1", "name": "one"},
+                    {"id": 2, "public_key": "k2", "name": "two"},
+                ],
+            )
+            rows = conn.execute(select(table).order_by(table.c.id)).all()
+        result = from_orm_many(CompanyName, rows, table)
+        assert result == [
+            CompanyName(id=1, public_key="k1", name="one"),
+            CompanyName(id=2, public_key="k2", name="two"),
+        ]
+
+    def test_errors_same_as_from_orm(self):
+        rows = companies(4)
+        rows[1].name = None  # nullable column, required field
+        rows[2].id = "x"
+        rows[3].domains = ["ok.com", None]
+        _, expected = from_orm_each(CompanyModel, rows)
+        assert bulk_errors(CompanyModel, rows, batch_size=3) == expected
+
+    def test_constraints_not_guaranteed_by_column(self):
+        class ShortName(BaseModel):
+            id: int
+            # String(63) may hold longer names
+            name: constr(max_length=5)
+
+            class Config:
+                orm_mode = True
+
+        rows = companies(12)
+        _, expected = from_orm_each(ShortName, rows)
+        assert expected
+        assert bulk_errors(ShortName, rows) == expected
+
+    def test_missing_attributes_and_defaults(self):
+        class WithExtra(BaseModel):
+            id: int
+            slug: str = "-"
+            owner: str
+
+            class Config:
+                orm_mode = True
+
+        rows = [CompanyRow(1, "k", "n", [])]
+        assert bulk_errors(WithExtra, rows, mapped=CompanyOrm) == [
+            (
+                0,
+                [
+                    {
+                        "loc": ("owner",),
+                        "msg": "field required",
+                        "type": "value_error.missing",
+                    }
+                ],
+            )
+        ]
+
+    def test_validate_all_defaults(self):
+        class Defaults(BaseModel):
+            id: int
+            x: int = "5"
+            tag: str = None
+
+            @validator("tag", always=True)
+            def tag_from_id(cls, v, values):
+                return v or f"tag{values['id']}"
+
+            class Config:
+                orm_mode = True
+                validate_all = True
+
+        rows = companies(2)
+        models = from_orm_many(Defaults, rows)
+        assert models == [Defaults.from_orm(row) for row in rows]
+        assert [(m.x, m.tag) for m in models] == [(5, "tag0"), (5, "tag1")]
+
+    def test_validators_run(self):
+        class Upper(BaseModel):
+            public_key: constr(max_length=20)
+            name: str
+
+            @validator("name")
+            def upper(cls, v, values):
+                return f"{values['public_key']}:{v.upper()}"
+
+            class Config:
+                orm_mode = True
+
+        rows = companies(2)
+        assert from_orm_many(Upper, rows) == [Upper.from_orm(row) for row in rows]
+
+    def test_unsupported_models(self):
+        class Rooted(BaseModel):
+            id: int
+
+            @root_validator
+            def check(cls, values):
+                return values
+
+            class Config:
+                orm_mode = True
+
+        class NotOrm(BaseModel):
+            id: int
+
+        with pytest.raises(SchemaCompileError):
+            OrmBulkConverter(Rooted)
+        with pytest.raises(Exception, match="orm_mode"):
+            OrmBulkConverter(NotOrm)
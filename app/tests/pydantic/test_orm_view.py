@@ -0,0 +1,147 @@
+import json
+from collections import namedtuple
+from datetime import datetime
+
+import pytest
+from app.orm_view import OrmView, orm_view
+from app.tests.fixtures import CompanyModel, CompanyOrm
+from pydantic import BaseModel, ValidationError, constr, validator
+
+CompanyRow = namedtuple("CompanyRow", "id public_key name domains")
+
+
+def company(i: int = 1, **kwargs) -> CompanyOrm:
+    values = dict(
+        id=i, public_key=f"key{i}", name=f"company {i}", domains=[f"a{i}.com"]
+    )
+    return CompanyOrm(**{**values, **kwargs})
+
+
+class Owner(BaseModel):
+    login: str
+
+    class Config:
+        orm_mode = True
+
+
+class Project(BaseModel):
+    id: int
+    title: constr(max_length=5)
+    started_at: datetime | None = None
+    owner: Owner
+    tags: list[str] = []
+
+    @validator("title")
+    def with_id(cls, v, values):
+        return f"{values.get('id')}-{v}"
+
+    class Config:
+        orm_mode = True
+
+
+class ProjectOrm:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class TestOrmView:
+    def test_same_output_as_from_orm(self):
+        CompanyView = orm_view(CompanyModel, CompanyOrm)
+        row = company()
+        view = CompanyView(row)
+        model = CompanyModel.from_orm(row)
+        assert view.name == model.name
+        assert view.domains == model.domains
+        assert view.dict() == model.dict()
+        assert view.json() == model.json()
+        assert view == model
+        assert view.to_model() == model
+        assert repr(view).startswith("CompanyModelView(id=1, ")
+
+    def test_no_copy_of_guaranteed_columns(self):
+        row = CompanyRow(1, "k", "n", ["a.com"])
+        view = orm_view(CompanyModel, CompanyOrm)(row)
+        assert view.domains is row.domains
+        assert view.source is row
+        # without the mapping the length of the constr is checked
+        assert orm_view(CompanyModel)(row).domains is not row.domains
+
+    def test_json_many(self):
+        rows = [company(i) for i in range(3)]
+        CompanyView = orm_view(CompanyModel, CompanyOrm)
+        expected = json.dumps([CompanyModel.from_orm(r).dict() for r in rows])
+        assert CompanyView.json_many(rows) == expected
+        assert CompanyView.json_many([]) == "[]"
+
+    def test_validated_on_access(self):
+        row = company(name=None)
+        view = orm_view(CompanyModel, CompanyOrm)(row)
+        assert view.id == 1
+        with pytest.raises(ValidationError) as e:
+            view.name
+        with pytest.raises(ValidationError) as from_orm_error:
+            CompanyModel.from_orm(row)
+        assert e.value.errors() == from_orm_error.value.errors()
+        with pytest.raises(ValidationError):
+            view.json()
+
+    def test_nested_defaults_and_validators(self):
+        row = ProjectOrm(
+            id="7",
+            title="abc",
+            started_at="2032-04-23T10:20:30",
+            owner=ProjectOrm(login="x"),
+        )
+        view = orm_view(Project)(row)
+        model = Project.from_orm(row)
+        assert view.title == "7-abc"
+        assert view.owner == Owner(login="x")
+        assert view.tags == []
+        assert view.dict() == model.dict()
+        assert view.json() == model.json()
+
+        bad = ProjectOrm(id="x", title="too long")
+        with pytest.raises(ValidationError) as e:
+            orm_view(Project)(bad).dict()
+        with pytest.raises(ValidationError) as expected:
+            Project.from_orm(bad)
+        assert e.value.errors() == expected.value.errors()
+
+    def test_validators_see_none(self):
+        class Member(BaseModel):
+            name: str | None
+            nick: str | None
+
+            @validator("name")
+            def anonymous(cls, v):
+                return v or "anon"
+
+            class Config:
+                orm_mode = True
+
+        row = ProjectOrm(name=None, nick=None)
+        view = orm_view(Member)(row)
+        assert view.name == "anon"
+        assert view.nick is None
+        assert view.dict() == Member.from_orm(row).dict()
+
+    def test_json_many_values_per_row(self):
+        rows = [
+            ProjectOrm(id=i, title=f"t{i}", owner=ProjectOrm(login=f"o{i}"))
+            for i in range(3)
+        ]
+        expected = json.dumps([json.loads(Project.from_orm(r).json()) for r in rows])
+        assert orm_view(Project).json_many(rows) == expected
+        assert json.loads(expected)[2]["title"] == "2-t2"
+
+    def test_read_only(self):
+        CompanyView = orm_view(CompanyModel, CompanyOrm)
+        view = CompanyView(company())
+        with pytest.raises(AttributeError, match="read-only"):
+            view.name = "other"
+        with pytest.raises(AttributeError, match="read-only"):
+            del view.name
+        assert not hasattr(view, "__dict__")
+        assert orm_view(CompanyModel, CompanyOrm) is CompanyView
+        assert issubclass(CompanyView, OrmView)
+        assert CompanyModel.from_orm(company()) == view
@@ -0,0 +1,24 @@
+import pytest
+from app.parallel import validate_parallel
+from app.tests.fixtures.pydantic_fixtures import UserModel
+from pydantic import ValidationError, parse_obj_as
+
+
+class TestParallelValidator:
+    def test_parse_as(self, user_2_dict: dict):
+        data = [dict(user_2_dict, name=f"user {i}") for i in range(9)]
+        result = validate_parallel(
+            UserModel, data, workers=2, chunk_size=2, min_batch=0
+        )
+        assert result == parse_obj_as(list[UserModel], data)
+
+    def test_errors(self, user_2_dict: dict):
+        data = [dict(user_2_dict, name=f"user {i}") for i in range(9)]
+        data[2]["created_at"] = "not a date"
+        del data[6]["name"]
+
+        with pytest.raises(ValidationError) as expected:
+            parse_obj_as(list[UserModel], data)
+        with pytest.raises(ValidationError) as e:
+            validate_parallel(UserModel, data, workers=2, chunk_size=2, min_batch=0)
+        assert e.value.errors() == expected.value.errors()
@@ -0,0 +1,134 @@
+import itertools
+
+import pytest
+from app.profiling import Profiler, profile
+from pydantic import BaseModel, ValidationError, root_validator, validator
+from pydantic.fields import ModelField
+
+
+@pytest.fixture
+def profiler():
+    # every clock read is one microsecond later
+    ticks = itertools.count()
+    return Profiler(clock=lambda: next(ticks) * 1e-6)
+
+
+@pytest.fixture
+def models(profiler: Profiler):
+    class Task(BaseModel):
+        title: str
+
+    class Client(BaseModel):
+        name: str
+        tasks: list[Task] = []
+
+        @validator("name", allow_reuse=True)
+        def no_spaces(cls, v):
+            if " " in v:
+                raise ValueError("no spaces")
+            return v
+
+        @root_validator(pre=True, allow_reuse=True)
+        def strip_id(cls, values):
+            values.pop("id", None)
+            return values
+
+        @root_validator(allow_reuse=True)
+        def named(cls, values):
+            return values
+
+    profile(Task, profiler)
+    profile(Client, profiler)
+    return Client, Task
+
+
+class TestProfileModel:
+    def test_counts_calls_and_errors(self, profiler: Profiler, models):
+        Client, _ = models
+        with profiler:
+            client = Client(id=1, name="guido", tasks=[{"title": "a"}])
+            with pytest.raises(ValidationError):
+                Client(name="guido van rossum")
+        assert client.tasks[0].title == "a"
+
+        stats = profiler.stats()
+        assert stats["Client"]["calls"] == 2
+        assert stats["Client"]["errors"] == 1
+        assert stats["Client.name:no_spaces"]["errors"] == 1
+        assert stats["Client.name:str_validator"]["calls"] == 2
+        assert stats["Client:strip_id"]["calls"] == 2
+        # skip_on_failure is off: runs after the field error too
+        assert stats["Client:named"]["calls"] == 2
+        assert stats["Task.title"] == {
+            "kind": "field",
+            "target": "Task",
+            "field": "title",
+            "validator": "",
+            "calls": 1,
+            "seconds": pytest.approx(3e-6),
+            "errors": 0,
+        }
+
+    def test_nested_stacks(self, profiler: Profiler, models):
+        Client, _ = models
+        with profiler:
+            Client(name="guido", tasks=[{"title": "a"}])
+        stacks = [line.rsplit(" ", 1)[0] for line in profiler.collapsed().splitlines()]
+        assert "Client;Client.tasks;Task;Task.title;Task.title:str_validator" in stacks
+        assert "Client;Client:strip_id" in stacks
+
+    def test_disabled(self, profiler: Profiler, models):
+        Client, _ = models
+        assert Client(name="guido").dict() == {"name": "guido", "tasks": []}
+        with pytest.raises(ValidationError) as exc_info:
+            Client(name="guido van rossum")
+        assert exc_info.value.errors()[0]["msg"] == "no spaces"
+        assert profiler.stats() == {}
+
+    def test_installed_while_enabled(self, profiler: Profiler, models):
+        Client, _ = models
+        with profiler:
+            assert type(Client.__fields__["name"]) is not ModelField
+            Client(name="guido")
+        assert type(Client.__fields__["name"]) is ModelField
+        assert "__init__" not in vars(Client)
+        assert [v.__name__ for v in Client.__fields__["name"].post_validators] == [
+            "no_spaces"
+        ]
+        assert profiler.stats()["Client"]["calls"] == 1
+
+    def test_subclass_created_while_profiling(self, profiler: Profiler, models):
+        Client, _ = models
+        with profiler:
+
+            class VipClient(Client):
+                level: int = 0
+
+            VipClient(name="guido")
+        field = VipClient.__fields__["name"]
+        assert type(field) is ModelField
+        assert [v.__name__ for v in field.post_validators] == ["no_spaces"]
+        # only the construction, under its own name
+        assert {name for name in profiler.stats()} == {"VipClient"}
+
+        profile(VipClient, profiler)
+        profiler.clear()
+        with profiler:
+            VipClient(name="guido")
+            Client(name="guido")
+        stats = profiler.stats()
+        assert stats["VipClient.name"]["calls"] == 1
+        assert stats["VipClient:named"]["calls"] == 1
+        assert stats["Client.name"]["calls"] == 1
+        assert stats["Client:named"]["calls"] == 1
+
+    def test_twice(self, profiler: Profiler, models):
+        _, Task = models
+        profile(Task, profiler)
+        with profiler:
+            Task(title="a")
+        assert {name: entry["calls"] for name, entry in profiler.stats().items()} == {
+            "Task": 1,
+            "Task.title": 1,
+            "Task.title:str_validator": 1,
+        }
@@ -0,0 +1,195 @@
+import itertools
+from enum import Enum
+
+import pytest
+from app.compact_model import CompactModel
+from app.projection import ModelProjection, projection
+from pydantic import BaseModel, Extra, Field, SecretStr
+
+
+class User(BaseModel):
+    id: int
+    username: str
+    password: SecretStr = Field(exclude=True)
+
+
+class Item(BaseModel):
+    name: str
+    tags: list[str] = []
+    price: float = 1.0
+    note: str | None = None
+
+
+class Transaction(BaseModel):
+    id: str
+    user: User
+    value: int
+    items: list[Item] = []
+    by_key: dict[str, Item] = {}
+    pair: tuple[int, Item] = (0, Item(name="pair"))
+
+
+class CompactItem(CompactModel):
+    name: str
+    price: float = 1.0
+
+
+class Basket(BaseModel):
+    items: list[CompactItem]
+
+
+@pytest.fixture
+def transaction():
+    return Transaction(
+        id="1234567890",
+        user=User(id=42, username="JohnDoe", password="hashedpassword"),
+        value=9876543210,
+        items=[
+            Item(name="a", tags=["x", "y"]),
+            Item(name="b", note="fragile"),
+            Item(name="c", price=2),
+        ],
+        by_key={"a": Item(name="a"), "b": Item(name="b")},
+    )
+
+
+SPECS = [
+    None,
+    {},
+    {"user", "value"},
+    {"user": {"username", "password"}, "value": True},
+    {"id": True, "user": {"id"}},
+    {"items": {"__all__": {"name"}}},
+    {"items": {0: True, "__all__": {"tags"}}},
+    {"items": {1: {"note"}, 2: True}},
+    {"items": {-1: True}},
+    {"items": {"__all__": True}},
+    {"items": {}},
+    {"by_key": {"a": {"name"}}},
+    {"pair": {1: {"price"}}},
+]
+
+
+class TestModelProjection:
+    def test_export_to_dict_projections(self, transaction: Transaction):
+        public = projection(Transaction, exclude={"user": {"username"}, "value": True})
+        assert isinstance(public, ModelProjection)
+        assert public(transaction) == transaction.dict(
+            exclude={"user": {"username"}, "value": True}
+        )
+        assert public(transaction)["user"] == {"id": 42}
+
+        ids = projection(Transaction, include={"id": True, "user": {"id"}})
+        assert ids(transaction) == {"id": "1234567890", "user": {"id": 42}}
+
+    @pytest.mark.parametrize("include,exclude", list(itertools.product(SPECS, SPECS)))
+    def test_same_as_dict(self, transaction: Transaction, include, exclude):
+        expected = transaction.dict(include=include, exclude=exclude)
+        result = projection(Transaction, include=include, exclude=exclude)(transaction)
+        assert result == expected
+        assert list(result) == list(expected)
+
+    @pytest.mark.parametrize(
+        "option", ["by_alias", "exclude_unset", "exclude_defaults", "exclude_none"]
+    )
+    def test_options(self, transaction: Transaction, option: str):
+        spec = {"items": {"__all__": {"tags"}}}
+        expected = transaction.dict(exclude=spec, **{option: True})
+        assert projection(Transaction, exclude=spec, **{option: True})(transaction) == (
+            expected
+        )
+
+    def test_aliases_and_extras(self):
+        class Model(BaseModel):
+            name: str = Field(alias="fullName")
+            secret: str = "s"
+
+            class Config:
+                extra = Extra.allow
+
+        m = Model(fullName="Jane", extra_1=1, extra_2=[1, 2])
+        spec = {"secret": True, "extra_2": {0}}
+        project = projection(Model, exclude=spec, by_alias=True)
+        assert project(m) == m.dict(exclude=spec, by_alias=True)
+        assert project(m) == {"fullName": "Jane", "extra_1": 1, "extra_2": [2]}
+
+    def test_many_and_json(self, transaction: Transaction):
+        spec = {"user": {"username"}, "items": {"__all__": {"tags", "note"}}}
+        project = projection(Transaction, exclude=spec)
+        assert (
+            project.many([transaction, transaction])
+            == [transaction.dict(exclude=spec)] * 2
+        )
+        assert project.json(transaction) == transaction.json(exclude=spec)
+
+    def test_nested_subclass_and_compact_models(self, transaction: Transaction):
+        class SpecialItem(Item):
+            code: str = "X1"
+
+        transaction.items.append(SpecialItem(name="d"))
+        spec = {"items": {"__all__": {"price"}}}
+        project = projection(Transaction, exclude=spec)
+        assert project(transaction) == transaction.dict(exclude=spec)
+        assert project(transaction)["items"][-1] == {
+            "name": "d",
+            "tags": [],
+            "note": None,
+            "code": "X1",
+        }
+
+        basket = Basket(items=[CompactItem(name="a"), CompactItem(name="b", price=2)])
+        project = projection(Basket, include={"items": {"__all__": {"name"}}})
+        assert project(basket) == {"items": [{"name": "a"}, {"name": "b"}]}
+
+    def test_root_models_and_enum_values(self):
+        class Colour(Enum):
+            RED = "red"
+
+        class Palette(BaseModel):
+            __root__: list[Colour]
+
+        class Picture(BaseModel):
+            palette: Palette
+            main: Colour
+
+            class Config:
+                use_enum_values = True
+
+        picture = Picture.construct(
+            palette=Palette(__root__=[Colour.RED]), main=Colour.RED
+        )
+        assert projection(Picture)(picture) == picture.dict()
+        assert projection(Picture)(picture) == {
+            "palette": [Colour.RED],
+            "main": "red",
+        }
+
+    def test_custom_dict_is_called(self):
+        class Masked(BaseModel):
+            card: str
+            holder: str
+
+            def dict(self, **kwargs):
+                data = super().dict(**kwargs)
+                if "card" in data:
+                    data["card"] = "*" * len(data["card"])
+                return data
+
+        class Payment(BaseModel):
+            masked: Masked
+            amount: int
+
+        payment = Payment(masked=Masked(card="1234", holder="Jane"), amount=1)
+        project = projection(Payment, exclude={"masked": {"holder"}})
+        assert project(payment) == {"masked": {"card": "****"}, "amount": 1}
+
+    def test_invalid_index_spec_raises_like_dict(self, transaction: Transaction):
+        project = projection(Transaction, exclude={"items": {"a": True}})
+        with pytest.raises(TypeError):
+            transaction.dict(exclude={"items": {"a": True}})
+        with pytest.raises(TypeError):
+            project(transaction)
+
+    def test_rejects_other_targets(self, transaction: Transaction):
+        with pytest.raises(TypeError):
+            projection(transaction)
@@ -0,0 +1,131 @@
+import pytest
+from app.startup_cache import StartupCache
+from pydantic import BaseModel, ValidationError, conint, constr, validator
+from pydantic import fields as pydantic_fields
+from pydantic.errors import ConfigError
+
+
+def make_model():
+    class Client(BaseModel):
+        name: constr(strip_whitespace=True, max_length=10)
+        age: conint(ge=0) = 0
+        tags: list[str] = []
+        email: str | None = None
+
+        @validator("name", allow_reuse=True)
+        def no_spaces(cls, v):
+            if " " in v:
+                raise ValueError("no spaces")
+            return v
+
+        @validator("email", allow_reuse=True)
+        def email_after_name(cls, v, values, field, config):
+            return f"{values['name']}@{v}" if v else v
+
+        @validator("tags", each_item=True, pre=True, allow_reuse=True)
+        def lower(v):
+            return str(v).lower()
+
+    return Client
+
+
+PAYLOADS = [
+    {"name": " Mick ", "age": 3, "tags": ["A", "b"], "email": "stones.org"},
+    {"name": "Keith Richards", "age": -1},
+    {"name": "x" * 11, "tags": [1]},
+]
+
+
+def outcomes(model: type[BaseModel]) -> list:
+    results = []
+    for payload in PAYLOADS:
+        try:
+            results.append(model(**payload).dict())
+        except ValidationError as exc:
+            results.append(exc.errors())
+    return results
+
+
+@pytest.fixture
+def cache():
+    cache = StartupCache()
+    yield cache
+    cache.disable()
+
+
+class TestStartupCache:
+    def test_same_models(self, cache: StartupCache):
+        expected = outcomes(make_model())
+        with cache:
+            model = make_model()
+        assert outcomes(model) == expected
+        assert outcomes(model)[0]["email"] == "Mick@stones.org"
+        assert cache.stats()["misses"] > 0
+
+    def test_signatures_read_once(self, cache: StartupCache):
+        with cache:
+            make_model()
+            misses = cache.stats()["misses"]
+            model = make_model()
+        assert cache.stats()["misses"] == misses
+        assert cache.stats()["hits"] > 0
+        assert outcomes(model) == outcomes(make_model())
+
+    def test_changed_validator_is_a_miss(self, cache: StartupCache):
+        with cache:
+            make_model()
+            misses = cache.stats()["misses"]
+
+            class Other(BaseModel):
+                name: str
+
+                @validator("name")
+                def no_spaces(cls, v, values):
+                    return v
+
+        assert cache.stats()["misses"] == misses + 1
+
+    def test_shared_wrappers(self, cache: StartupCache):
+        with cache:
+            first, second = make_model(), make_model()
+        # str_validator, built once for every str field
+        assert (
+            first.__fields__["tags"].sub_fields[0].validators[-1]
+            is second.__fields__["email"].validators[-1]
+        )
+
+    def test_invalid_validators(self, cache: StartupCache):
+        errors = []
+        for enabled in (False, True):
+            if enabled:
+                cache.enable()
+            for signature in ("self, v", "cls, v, other"):
+                namespace = {}
+                exec(f"def check({signature}): return v", namespace)
+                with pytest.raises(ConfigError) as exc_info:
+
+                    class Invalid(BaseModel):
+                        name: str
+                        check_name = validator("name", allow_reuse=True)(
+                            namespace["check"]
+                        )
+
+                errors.append(str(exc_info.value).split(":", 1)[1])
+        assert errors[:2] == errors[2:]
+        assert errors[3].startswith(" (cls, v, other), should be")
+
+    def test_enable_disable(self, cache: StartupCache):
+        prep_validators = pydantic_fields.prep_validators
+        cache.enable()
+        assert cache.enabled
+        with pytest.raises(RuntimeError):
+            StartupCache().enable()
+        cache.disable()
+        assert not cache.enabled
+        assert pydantic_fields.prep_validators is prep_validators
+
+    def test_clear(self, cache: StartupCache):
+        with cache:
+            make_model()
+        cache.clear()
+        assert cache.stats() == {"entries": 0, "hits": 0, "misses": 0}
@@ -0,0 +1,61 @@
+import io
+import json
+
+import pytest
+from app.streaming import RecordError, dump_stream, load_stream
+from app.tests.fixtures.pydantic_fixtures import ClientModel
+from pydantic import BaseModel, ValidationError, parse_obj_as
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+class TestLoadStream:
+    def test_parse_as(self, tmp_path):
+        item_data = [{"id": i, "name": f"item {i}"} for i in range(5)]
+        path = tmp_path / "items.jsonl"
+        path.write_text("\n".join(json.dumps(d) for d in item_data))
+
+        items = list(load_stream(path, Item, chunk_size=2))
+        assert items == parse_obj_as(list[Item], item_data)
+
+    def test_errors(self):
+        item_data = [{"id": 1, "name": "ok"}, {"id": "bad", "name": "x"}, {"id": 3}]
+
+        result = list(
+            load_stream(io.StringIO(json.dumps(item_data)), Item, errors="yield")
+        )
+        assert isinstance(result[0], Item)
+        assert isinstance(result[1], RecordError)
+        assert result[1].index == 1
+        assert result[1].errors[0]["loc"] == ("id",)
+
+        with pytest.raises(ValidationError) as e:
+            list(load_stream(io.StringIO(json.dumps(item_data)), Item))
+        with pytest.raises(ValidationError) as expected:
+            parse_obj_as(list[Item], item_data)
+        assert e.value.errors() == expected.value.errors()
+
+
+class TestStreamWriter:
+    def test_models_and_orm_objects(self, clien_wich_two_tasks):
+        fp = io.StringIO()
+        client = ClientModel.from_orm(clien_wich_two_tasks)
+        written = dump_stream(
+            [client, clien_wich_two_tasks],
+            fp,
+            ClientModel,
+            format="array",
+            envelope="clients",
+        )
+        data = json.loads(fp.getvalue())
+        assert data["clients"][0] == data["clients"][1] == json.loads(client.json())
+        assert written == len(fp.getvalue())
+
+    def test_json_lines(self):
+        items = [Item(id=i, name=f"item {i}") for i in range(3)]
+        fp = io.StringIO()
+        dump_stream(items, fp, Item)
+        assert fp.getvalue() == "".join(item.json() + "\n" for item in items)
@@ -0,0 +1,125 @@
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from app import temporal
+from app.temporal import FAST_BACKEND, REGEX_BACKEND, FastTemporalModel, use_backend
+from app.tests.fixtures.data_fixtures import outcome
+from pydantic import BaseModel, ValidationError, datetime_parse, validator
+from pydantic import validators as pydantic_validators
+
+
+class Event(BaseModel):
+    at: datetime
+    day: date
+    start: time | None = None
+    length: timedelta = timedelta()
+    history: list[datetime] = []
+
+
+class FastEvent(FastTemporalModel):
+    at: datetime
+    day: date
+    start: time | None = None
+    length: timedelta = timedelta()
+    history: list[datetime] = []
+
+
+def errors(model, data):
+    try:
+        return model(**data).dict()
+    except ValidationError as e:
+        return e.errors()
+
+
+def parser(model, name):
+    # pydantic wraps validators, the original is kept in __wrapped__
+    field = model.__fields__[name]
+    if field.sub_fields:
+        field = field.sub_fields[0]
+    return field.validators[0].__wrapped__
+
+
+class TestFastParsers:
+    @pytest.mark.parametrize(
+        "fast, regex",
+        [
+            (temporal.parse_datetime, datetime_parse.parse_datetime),
+            (temporal.parse_date, datetime_parse.parse_date),
+            (temporal.parse_time, datetime_parse.parse_time),
+            (temporal.parse_duration, datetime_parse.parse_duration),
+        ],
+    )
+    def test_fuzz_same_as_pydantic(self, fast, regex, iso_fuzz_strings):
+        for value in iso_fuzz_strings:
+            assert outcome(fast, value) == outcome(regex, value), value
+
+    def test_offsets(self):
+        at = temporal.parse_datetime("2014-08-11T05:26:03.869+02:30")
+        assert at == datetime_parse.parse_datetime("2014-08-11T05:26:03.869+02:30")
+        assert at.utcoffset() == timedelta(hours=2, minutes=30)
+        assert temporal.parse_datetime("2014-08-11 05:26:03Z").tzname() == "UTC"
+
+    @pytest.mark.parametrize(
+        "value", [1407734763, b"2014-08-11", "P1.5D", "-P1D", "1 day, 2:00:00", ""]
+    )
+    def test_non_canonical_falls_back(self, value):
+        for fast, regex in (
+            (temporal.parse_datetime, datetime_parse.parse_datetime),
+            (temporal.parse_duration, datetime_parse.parse_duration),
+        ):
+            assert outcome(fast, value) == outcome(regex, value)
+
+
+class TestFastTemporalModel:
+    @pytest.mark.parametrize(
+        "data",
+        [
+            dict(at="2014-08-11T05:26:03+02:30", day="2014-08-11", length="PT5M"),
+            dict(at="2014-08-11T05:26:03", day="2014-13-11", start="05:26:03Z"),
+            dict(at=1407734763, day="2014-08-11", history=["2014-08-11 05:26", "x"]),
+            dict(at="2014-08-11T25:26:03", day=b"2014-08-11", length="P3DT1H"),
+        ],
+    )
+    def test_same_as_base_model(self, data):
+        assert errors(FastEvent, data) == errors(Event, data)
+
+    def test_uses_fast_parsers(self):
+        assert parser(FastEvent, "at") is temporal.parse_datetime
+        assert parser(FastEvent, "history") is temporal.parse_datetime
+        assert parser(FastEvent, "length") is temporal.parse_duration
+        assert parser(Event, "at") is datetime_parse.parse_datetime
+
+    def test_global_validators_untouched(self, monkeypatch):
+        # a tuple: swapping the shared table would fail
+        table = tuple(pydantic_validators._VALIDATORS)
+        monkeypatch.setattr(pydantic_validators, "_VALIDATORS", table)
+
+        class Schedule(FastTemporalModel):
+            days: dict[str, date] = {}
+
+            @validator("days", each_item=True)
+            def weekday(cls, v):
+                assert v.weekday() < 5, "weekend"
+                return v
+
+        assert parser(Schedule, "days") is temporal.parse_date
+        assert Schedule(days={"a": "2014-08-11"}).days == {"a": date(2014, 8, 11)}
+        with pytest.raises(ValidationError, match="weekend"):
+            Schedule(days={"a": "2014-08-10"})
+        assert pydantic_validators._VALIDATORS is table
+
+
+class TestBackend:
+    def test_use_backend(self):
+        assert temporal.get_backend() is REGEX_BACKEND
+        with use_backend(FAST_BACKEND):
+
+            class Model(BaseModel):
+                at: datetime
+
+        class After(BaseModel):
+            at: datetime
+
+        assert temporal.get_backend() is REGEX_BACKEND
+        assert parser(Model, "at") is temporal.parse_datetime
+        assert parser(After, "at") is datetime_parse.parse_datetime
@@ -0,0 +1,133 @@
+from collections.abc import Sequence
+from typing import Annotated, Literal
+from uuid import UUID
+
+import pytest
+from app.union_dispatch import DispatchField, DispatchModel
+from pydantic import BaseModel, Field, ValidationError
+
+
+class Cat(BaseModel):
+    pet_type: Literal["cat"]
+    meows: int
+
+
+class Dog(BaseModel):
+    pet_type: Literal["dog"]
+    barks: float
+
+
+class Lizard(BaseModel):
+    pet_type: Literal["reptile", "lizard"]
+    scales: bool
+
+
+class Plain(BaseModel):
+    pet: Cat | Dog | Lizard
+    pets: list[Cat | Dog | Lizard] = []
+    n: int
+
+
+class Dispatched(DispatchModel):
+    pet: Cat | Dog | Lizard
+    pets: list[Cat | Dog | Lizard] = []
+    n: int
+
+
+def outcome(model, data):
+    try:
+        return model(**data).dict()
+    except ValidationError as e:
+        return e.errors()
+
+
+class TestDispatchModel:
+    def test_routes_on_shared_literal(self):
+        field = Dispatched.__fields__["pet"]
+        assert isinstance(field, DispatchField)
+        assert field.dispatch.tag == "pet_type"
+        assert field.dispatch.by_tag == {
+            "cat": (0,),
+            "dog": (1,),
+            "reptile": (2,),
+            "lizard": (2,),
+        }
+        result = Dispatched(pet={"pet_type": "reptile", "scales": 1}, n=1)
+        assert isinstance(result.pet, Lizard)
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            dict(pet={"pet_type": "dog", "barks": 3.14}, n=1),
+            dict(pet={"pet_type": "lizard", "scales": "yes"}, pets=[], n=1),
+            dict(pet=Cat(pet_type="cat", meows=1), n=1),
+            dict(pet={"pet_type": "dog"}, n=1),
+            dict(pet={"pet_type": "fish"}, n=1),
+            dict(pet={"barks": 1}, n=1),
+            dict(pet={"pet_type": ["cat"]}, n=1),
+            dict(pet="cat", n=1),
+            dict(pet={"pet_type": "cat", "meows": 1}, pets=[{"pet_type": "dog"}], n=1),
+        ],
+    )
+    def test_same_as_plain_union(self, data):
+        assert outcome(Dispatched, data) == outcome(Plain, data)
+
+    def test_smart_union(self):
+        class Smart(DispatchModel):
+            id: int | str | UUID
+            items: list[int] | Sequence[str] | str = ""
+
+            class Config:
+                smart_union = True
+
+        class PydanticSmart(BaseModel):
+            id: int | str | UUID
+            items: list[int] | Sequence[str] | str = ""
+
+            class Config:
+                smart_union = True
+
+        uuid = UUID("cf57432e-809e-4353-adbd-9d5c0d733868")
+        for data in (
+            {"id": "1234"},
+            {"id": 1234},
+            {"id": True},
+            {"id": uuid},
+            {"id": 1.5},
+            {"id": 1, "items": ["1", 2]},
+            {"id": 1, "items": ("a",)},
+            {"id": 1, "items": {"a"}},
+        ):
+            assert outcome(Smart, data) == outcome(PydanticSmart, data)
+        assert Smart(id="1234").id == "1234"
+        assert Smart(id=uuid).id is uuid
+
+    def test_discriminator_left_to_pydantic(self):
+        class BlackCat(BaseModel):
+            pet_type: Literal["cat"]
+            color: Literal["black"]
+
+        class WhiteCat(BaseModel):
+            pet_type: Literal["cat"]
+            color: Literal["white"]
+
+        AnyCat = Annotated[BlackCat | WhiteCat, Field(discriminator="color")]
+
+        class Model(DispatchModel):
+            pet: AnyCat | Dog = Field(..., discriminator="pet_type")
+
+        assert not isinstance(Model.__fields__["pet"], DispatchField)
+        pet = Model(pet={"pet_type": "cat", "color": "white"}).pet
+        assert isinstance(pet, WhiteCat)
+        with pytest.raises(ValidationError):
+            Model(pet={"pet_type": "cat", "color": "red"})
+
+    def test_subclass(self):
+        class Child(Dispatched):
+            extra: int | str = 0
+
+        assert isinstance(Child.__fields__["pet"], DispatchField)
+        assert isinstance(Child.__fields__["extra"], DispatchField)
+        assert Child.__fields__["extra"].dispatch.tag is None
+        child = Child(pet={"pet_type": "cat", "meows": 2}, n=1, extra="3")
+        assert child.extra == 3
@@ -0,0 +1,81 @@
+from app.validation_cache import (
+    CachedChain,
+    ValidationCache,
+    cache_validators,
+    pure_validator,
+)
+from pydantic import BaseModel, ValidationError, conint, constr, validator
+
+
+class Model(BaseModel):
+    big_int: conint(gt=1000, lt=1024)
+    upper_str: constr(to_upper=True)
+    short_str: constr(min_length=2, max_length=10)
+    codes: list[constr(regex="^[A-Z]{3}$")] = []
+    name: str = ""
+
+
+def outcome(model, data):
+    try:
+        return model(**data).dict()
+    except ValidationError as e:
+        return e.errors()
+
+
+class TestCachedModel:
+    def test_same_results_and_errors(self):
+        cache = ValidationCache()
+
+        class Cached(Model):
+            pass
+
+        cache_validators(Cached, cache)
+        for data in (
+            dict(big_int=1001, upper_str="upper", short_str="123"),
+            dict(big_int=1001, upper_str="upper", short_str="1" * 11),
+            dict(big_int=1001, upper_str=b"upper", short_str="1" * 11),
+            dict(big_int=1001, upper_str=1, short_str="1", codes=["EUR", "eu"]),
+            dict(big_int=1001, upper_str="upper", short_str="1", codes=["EUR"]),
+        ):
+            assert outcome(Cached, data) == outcome(Model, data)
+        assert cache.hits == 5
+        assert cache.stats()["size"] == 6
+
+    def test_only_string_chains(self):
+        class Cached(Model):
+            pass
+
+        cache_validators(Cached, ValidationCache())
+        fields = Cached.__fields__
+        assert isinstance(fields["upper_str"].validators[0], CachedChain)
+        assert isinstance(fields["codes"].sub_fields[0].validators[0], CachedChain)
+        assert not isinstance(fields["big_int"].validators[0], CachedChain)
+        assert not isinstance(fields["name"].validators[0], CachedChain)
+        assert not isinstance(Model.__fields__["upper_str"].validators[0], CachedChain)
+
+    def test_class_validators(self):
+        calls = []
+
+        class Checked(BaseModel):
+            code: constr(max_length=3)
+            tag: constr(max_length=3)
+
+            @validator("code", each_item=True)
+            def count(cls, v):
+                calls.append(v)
+                return v
+
+            @validator("tag", each_item=True)
+            @pure_validator
+            def lower(cls, v):
+                return v.lower()
+
+        cache_validators(Checked, ValidationCache())
+        for _ in range(2):
+            assert Checked(code="abc", tag="ABC").dict() == {
+                "code": "abc",
+                "tag": "abc",
+            }
+        assert calls == ["abc", "abc"]
+        assert not isinstance(Checked.__fields__["code"].validators[0], CachedChain)
+        assert isinstance(Checked.__fields__["tag"].validators[0], CachedChain)
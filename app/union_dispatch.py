@@ -0,0 +1,202 @@
+"""Table driven validation of ``Union`` fields.
+
+A plain ``Union`` tries its members in order, so with 40+ event models a record
+of the last type is validated against every other model first. With
+``DispatchModel`` as base, union fields get dispatch tables built at class
+creation:
+
+    class Cat(BaseModel):
+        pet_type: Literal["cat"]
+
+    class Lizard(BaseModel):
+        pet_type: Literal["reptile", "lizard"]
+
+    class Model(DispatchModel):
+        pet: Cat | Lizard           # routed on ``pet_type``, no Field needed
+        id: int | str | UUID        # with Config.smart_union: routed on type(v)
+
+* When every member is a model with a ``Literal`` field under the same alias,
+  dicts are routed on that field: only the members whose literal values
+  include the input's value are tried. Other members could not accept it
+  anyway, so results are the same as trying them all in order.
+* With ``Config.smart_union = True`` a value whose class (or a base class) is
+  a member is taken as is, as pydantic's ``smart_union`` does, but found with
+  a dict lookup instead of two passes over the members.
+* Everything else, and every value that fails, takes the usual in-order pass,
+  so errors are the ones pydantic reports.
+
+``Field(discriminator=...)`` unions, nested ones included, are left to
+pydantic: it already routes them with a table built at class creation.
+"""
+
+import typing
+
+from pydantic import BaseModel
+from pydantic.fields import SHAPE_SINGLETON, ModelField
+from pydantic.typing import all_literal_values, get_origin, is_literal_type, is_union
+
+
+class UnionDispatch(typing.NamedTuple):
+    # alias of the Literal field shared by all members, if any
+    tag: str | None
+    # literal value -> indices of the members that accept it
+    by_tag: dict[typing.Any, tuple[int, ...]]
+    # member class -> index of the first member of that class
+    by_class: dict[type, int]
+    # generic members (``list[int]``) by origin -> indices; these are validated
+    by_origin: dict[type, tuple[int, ...]]
+    # members with a custom __instancecheck__ (ABCs), always checked
+    instance_checks: frozenset[int]
+    smart: bool
+
+
+def _tag_values(member: ModelField) -> dict[str, tuple] | None:
+    """Literal fields of a member model: alias -> literal values."""
+    model = member.outer_type_
+    if not (
+        member.shape == SHAPE_SINGLETON
+        and not member.class_validators
+        and isinstance(model, type)
+        and issubclass(model, BaseModel)
+        and not model.__pre_root_validators__
+        # a custom ``validate`` may rewrite the input
+        and model.validate.__func__ is BaseModel.validate.__func__
+    ):
+        return None
+    return {
+        field.alias: all_literal_values(field.outer_type_)
+        for field in model.__fields__.values()
+        if field.shape == SHAPE_SINGLETON
+        and is_literal_type(field.outer_type_)
+        and not field.allow_none
+        and not field.class_validators
+        and not field.pre_validators
+    }
+
+
+def _build_dispatch(field: ModelField) -> UnionDispatch:
+    members = field.sub_fields
+    tag, by_tag = None, {}
+    tags = [_tag_values(member) for member in members]
+    if all(t is not None for t in tags):
+        common = [alias for alias in tags[0] if all(alias in t for t in tags)]
+        if common:
+            tag = common[0]
+            routes: dict[typing.Any, list[int]] = {}
+            for index, values in enumerate(tags):
+                for value in values[tag]:
+                    routes.setdefault(value, []).append(index)
+            by_tag = {value: tuple(indices) for value, indices in routes.items()}
+
+    by_class, by_origin, instance_checks = {}, {}, set()
+    for index, member in enumerate(members):
+        type_ = member.outer_type_
+        origin = get_origin(type_)
+        cls = origin or type_
+        if not isinstance(cls, type):
+            continue
+        # models are ABCs too, but nothing registers virtual subclasses of them
+        if type(cls).__instancecheck__ is not type.__instancecheck__ and not (
+            issubclass(cls, BaseModel)
+        ):
+            instance_checks.add(index)
+        elif origin:
+            by_origin.setdefault(origin, []).append(index)
+        else:
+            by_class.setdefault(type_, index)
+    return UnionDispatch(
+        tag,
+        by_tag,
+        by_class,
+        {origin: tuple(indices) for origin, indices in by_origin.items()},
+        frozenset(instance_checks),
+        bool(field.model_config.smart_union),
+    )
+
+
+class DispatchField(ModelField):
+    """``ModelField`` of a ``Union`` validated through a ``UnionDispatch``."""
+
+    __slots__ = ("dispatch",)
+
+    def _smart_candidates(self, cls: type) -> list[int]:
+        # members ``isinstance`` accepts, found through the MRO
+        dispatch = self.dispatch
+        found = set(dispatch.instance_checks)
+        for base in cls.__mro__:
+            index = dispatch.by_class.get(base)
+            if index is not None:
+                found.add(index)
+            found.update(dispatch.by_origin.get(base, ()))
+        return sorted(found)
+
+    def _validate_singleton(self, v, values, loc, cls):
+        dispatch = self.dispatch
+        sub_fields = self.sub_fields
+
+        if dispatch.smart:
+            if v.__class__ in dispatch.by_class:
+                return v, None
+            for index in self._smart_candidates(v.__class__):
+                member = sub_fields[index]
+                origin = get_origin(member.outer_type_)
+                if index in dispatch.instance_checks and not isinstance(
+                    v, origin or member.outer_type_
+                ):
+                    continue
+                if not origin:
+                    return v, None
+                # compound type: ``isinstance`` can only check the origin
+                value, error = member.validate(v, values, loc=loc, cls=cls)
+                if not error:
+                    return value, None
+
+        if dispatch.tag is not None and v.__class__ is dict:
+            try:
+                indices = dispatch.by_tag.get(v[dispatch.tag], ())
+            except (KeyError, TypeError):
+                indices = ()
+            for index in indices:
+                value, error = sub_fields[index].validate(v, values, loc=loc, cls=cls)
+                if not error:
+                    return value, None
+
+        errors = []
+        for member in sub_fields:
+            value, error = member.validate(v, values, loc=loc, cls=cls)
+            if error:
+                errors.append(error)
+            else:
+                return value, None
+        return v, errors
+
+
+def _copy_field(field: ModelField, field_class: type[ModelField]) -> ModelField:
+    copy = field_class.__new__(field_class)
+    for name in ModelField.__slots__:
+        setattr(copy, name, getattr(field, name))
+    return copy
+
+
+def with_dispatch(field: ModelField) -> ModelField:
+    """``field`` with dispatch tables on its unions (nested ones included)."""
+    if not field.sub_fields or field.discriminator_key is not None:
+        return field
+    sub_fields = [with_dispatch(sub_field) for sub_field in field.sub_fields]
+    if is_union(get_origin(field.type_)) and field.shape == SHAPE_SINGLETON:
+        field = _copy_field(field, DispatchField)
+        field.sub_fields = sub_fields
+        field.dispatch = _build_dispatch(field)
+    elif any(new is not old for new, old in zip(sub_fields, field.sub_fields)):
+        field = _copy_field(field, ModelField)
+        field.sub_fields = sub_fields
+    return field
+
+
+class DispatchModel(BaseModel):
+    """``BaseModel`` whose ``Union`` fields are validated through dispatch tables."""
+
+    def __init_subclass__(cls, **kwargs: typing.Any) -> None:
+        super().__init_subclass__(**kwargs)
+        for name, field in cls.__fields__.items():
+            cls.__fields__[name] = with_dispatch(field)
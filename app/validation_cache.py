@@ -0,0 +1,314 @@
+"""Cached outcomes of pure string validators.
+
+``fields.Email()`` runs its regexes and ``constr(max_length=10, to_upper=True)``
+its whole validator chain for every record, even when the same few thousand
+addresses and codes come back over and over. ``cache_validators`` puts a
+bounded cache (LRU, optional TTL) in front of them:
+
+    cache_validators(UserSchema)              # schema class, instance or field
+    cache_validators(Model, ValidationCache(maxsize=50_000, ttl=600))
+    validation_cache.stats()["hit_rate"]
+
+Only ``str`` values and validators known to be pure are cached: marshmallow's
+own ``validate.*`` classes, pydantic's string validators and ``constr`` chains,
+and functions marked with ``@pure_validator``. Anything else is left as is, so
+a user validator that reads a database or a clock is never cached. Failures are
+cached too and raise the original messages and error types.
+"""
+
+import threading
+import time
+import typing
+from collections import OrderedDict
+
+import marshmallow
+from marshmallow import fields, validate
+from pydantic import BaseModel, ConstrainedStr, EmailStr
+from pydantic import validators as pydantic_validators
+from pydantic.fields import ModelField
+
+DEFAULT_MAXSIZE = 10_000
+
+_MISS = object()
+
+
+class ValidationCache:
+    """Thread-safe LRU cache of validation outcomes, with an optional TTL.
+
+    Lookups take no lock, so under concurrent use the hit and miss counters
+    are approximate.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_MAXSIZE,
+        ttl: float | None = None,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        # key -> (expires at, outcome)
+        self._entries: OrderedDict[tuple, tuple[float | None, tuple]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __deepcopy__(self, memo: dict) -> "ValidationCache":
+        # schemas and models deep copy their fields, the cache stays shared
+        return self
+
+    def get(self, key: tuple) -> typing.Any:
+        """Outcome stored under ``key``, or ``_MISS``."""
+        # reads skip the lock: single OrderedDict calls are atomic, an entry
+        # evicted in between is a miss
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, outcome = entry
+            if expires is None or self.clock() < expires:
+                try:
+                    self._entries.move_to_end(key)
+                except KeyError:
+                    pass
+                else:
+                    self.hits += 1
+                    return outcome
+            else:
+                with self._lock:
+                    if self._entries.pop(key, None) is not None:
+                        self.expirations += 1
+        self.misses += 1
+        return _MISS
+
+    def put(self, key: tuple, outcome: tuple) -> None:
+        expires = None if self.ttl is None else self.clock() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires, outcome)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict[str, typing.Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hit_rate,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+
+validation_cache = ValidationCache()
+
+_F = typing.TypeVar("_F", bound=typing.Callable)
+
+
+def pure_validator(func: _F) -> _F:
+    """Mark ``func`` as pure: same input, same result or error, no side effects."""
+    func.__pure_validator__ = True
+    return func
+
+
+def _marked_pure(func: typing.Any) -> bool:
+    return getattr(func, "__pure_validator__", False) is True
+
+
+# marshmallow
+
+# exact classes: a subclass may override __call__
+_PURE_VALIDATOR_CLASSES = frozenset(
+    {
+        validate.Email,
+        validate.URL,
+        validate.Length,
+        validate.Range,
+        validate.Regexp,
+        validate.OneOf,
+        validate.NoneOf,
+        validate.Equal,
+        validate.ContainsOnly,
+        validate.ContainsNoneOf,
+    }
+)
+
+
+class CachedValidator:
+    """marshmallow validator that caches the outcome of a pure one on ``str``."""
+
+    __slots__ = ("validator", "cache")
+
+    def __init__(self, validator: typing.Callable, cache: ValidationCache):
+        self.validator = validator
+        self.cache = cache
+
+    def __deepcopy__(self, memo: dict) -> "CachedValidator":
+        return self
+
+    def __repr__(self) -> str:
+        return f"<CachedValidator({self.validator!r})>"
+
+    def _run(self, value: typing.Any) -> typing.Any:
+        result = self.validator(value)
+        # marshmallow only fails a False result from a plain function
+        if result is False and isinstance(self.validator, validate.Validator):
+            return None
+        return result
+
+    def __call__(self, value: typing.Any) -> typing.Any:
+        if value.__class__ is not str:
+            return self._run(value)
+        key = (self.validator, value)
+        outcome = self.cache.get(key)
+        if outcome is _MISS:
+            try:
+                result = self._run(value)
+            except marshmallow.ValidationError as error:
+                self.cache.put(key, (False, error.messages))
+                raise
+            self.cache.put(key, (True, result))
+            return result
+        ok, result = outcome
+        if ok:
+            return result
+        raise marshmallow.ValidationError(
+            result.copy() if isinstance(result, (list, dict)) else result
+        )
+
+
+def _is_pure_marshmallow(validator: typing.Any) -> bool:
+    return type(validator) in _PURE_VALIDATOR_CLASSES or _marked_pure(validator)
+
+
+def _cache_field(field: fields.Field, cache: ValidationCache) -> None:
+    field.validators = [
+        CachedValidator(v, cache) if _is_pure_marshmallow(v) else v
+        for v in field.validators
+    ]
+    for inner in (
+        getattr(field, "inner", None),
+        getattr(field, "key_field", None),
+        getattr(field, "value_field", None),
+        *getattr(field, "tuple_fields", ()),
+    ):
+        if isinstance(inner, fields.Field):
+            _cache_field(inner, cache)
+
+
+# pydantic
+
+_PURE_PYDANTIC = frozenset(
+    {
+        pydantic_validators.str_validator,
+        pydantic_validators.strict_str_validator,
+        pydantic_validators.constr_strip_whitespace,
+        pydantic_validators.constr_upper,
+        pydantic_validators.constr_lower,
+        pydantic_validators.constr_length_validator,
+        pydantic_validators.anystr_strip_whitespace,
+        pydantic_validators.anystr_upper,
+        pydantic_validators.anystr_lower,
+        pydantic_validators.anystr_length_validator,
+        ConstrainedStr.validate.__func__,
+        EmailStr.validate.__func__,
+    }
+)
+
+
+def _is_pure_pydantic(validator: typing.Any) -> bool:
+    func = getattr(validator, "__wrapped__", validator)
+    func = getattr(func, "__func__", func)
+    return func in _PURE_PYDANTIC or _marked_pure(func)
+
+
+class CachedChain:
+    """pydantic field validators, run once per distinct ``str`` value."""
+
+    __slots__ = ("validators", "cache")
+
+    def __init__(self, validators: list, cache: ValidationCache):
+        self.validators = validators
+        self.cache = cache
+
+    def __deepcopy__(self, memo: dict) -> "CachedChain":
+        return self
+
+    def __call__(self, cls, v, values, field, config):
+        if v.__class__ is not str:
+            for validator in self.validators:
+                v = validator(cls, v, values, field, config)
+            return v
+        key = (self, v)
+        outcome = self.cache.get(key)
+        if outcome is _MISS:
+            value = v
+            try:
+                for validator in self.validators:
+                    value = validator(cls, value, values, field, config)
+            except (ValueError, TypeError, AssertionError) as exc:
+                self.cache.put(key, (False, exc))
+                raise
+            self.cache.put(key, (True, value))
+            return value
+        ok, result = outcome
+        if ok:
+            return result
+        raise result.with_traceback(None)
+
+
+def _cache_model_field(field: ModelField, cache: ValidationCache) -> None:
+    for sub_field in field.sub_fields or ():
+        _cache_model_field(sub_field, cache)
+    validators = field.validators
+    # a lone str_validator is cheaper than a cache lookup
+    if (
+        len(validators) > 1
+        and isinstance(field.type_, type)
+        and issubclass(field.type_, str)
+        and all(_is_pure_pydantic(v) for v in validators)
+    ):
+        field.validators = [CachedChain(validators, cache)]
+
+
+Target = typing.TypeVar("Target")
+
+
+def cache_validators(target: Target, cache: ValidationCache | None = None) -> Target:
+    """Cache the pure string validators of a schema, field or model, in place.
+
+    ``target`` is a marshmallow ``Schema`` class or instance, a marshmallow
+    ``Field`` or a pydantic model class. Returns ``target``.
+    """
+    cache = validation_cache if cache is None else cache
+    if isinstance(target, fields.Field):
+        _cache_field(target, cache)
+    elif isinstance(target, marshmallow.Schema):
+        for field in target.fields.values():
+            _cache_field(field, cache)
+    elif isinstance(target, type) and issubclass(target, marshmallow.Schema):
+        for field in target._declared_fields.values():
+            _cache_field(field, cache)
+    elif isinstance(target, type) and issubclass(target, BaseModel):
+        for field in target.__fields__.values():
+            _cache_model_field(field, cache)
+    else:
+        raise TypeError(
+            f"expected a marshmallow Schema or Field or a pydantic model, got {target!r}"
+        )
+    return target